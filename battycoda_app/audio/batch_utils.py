@@ -7,9 +7,12 @@ import tempfile
 import zipfile
 from pathlib import Path
 
+from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import transaction
 
+from ..utils_modules.cleanup import safe_remove_file
+from .modules.file_utils import move_file_to_media
 from .utils import process_pickle_file
 
 # Configure logging
@@ -80,12 +83,11 @@ def process_batch_upload(wav_zip, pickle_zip, form_data, user, group):
         # Process each WAV file
         for wav_path in wav_files:
             try:
-                # Open the file for Django to save
-                with open(wav_path, "rb") as wav_file_obj:
-                    # Create a Django file object
-                    wav_file_name = os.path.basename(wav_path)
-                    wav_file = SimpleUploadedFile(wav_file_name, wav_file_obj.read(), content_type="audio/wav")
+                # Move the extracted file into recording storage instead of reading it into memory
+                wav_file_name = os.path.basename(wav_path)
+                wav_file = move_file_to_media(wav_path, "recordings/", wav_file_name)
 
+                try:
                     with transaction.atomic():
                         # Create a Recording object for this file
                         file_name = Path(wav_file_name).stem  # Get file name without extension
@@ -170,6 +172,9 @@ def process_batch_upload(wav_zip, pickle_zip, form_data, user, group):
                                 segmented_count = segmented_count
 
                         success_count += 1
+                except Exception:
+                    safe_remove_file(os.path.join(settings.MEDIA_ROOT, wav_file), "orphaned recording file")
+                    raise
             except Exception:
                 # Exception during WAV processing
                 error_count += 1
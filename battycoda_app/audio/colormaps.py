@@ -6,8 +6,11 @@ by both Python (here) and JavaScript (static/js/utils/colormaps.js).
 """
 
 import json
+from functools import lru_cache
 from pathlib import Path
 
+import numpy as np
+
 # Load colormap from JSON - single source of truth
 _COLORMAP_JSON_PATH = Path(__file__).parent.parent.parent / "static" / "data" / "colormaps.json"
 
@@ -20,3 +23,15 @@ ROSEUS_COLORMAP = _COLORMAPS["roseus"]
 def get_colormap(name):
     """Get a colormap by name. Falls back to roseus if the name is unknown."""
     return _COLORMAPS.get(name, _COLORMAPS["roseus"])
+
+
+@lru_cache(maxsize=None)
+def _colormap_array(name):
+    array = np.array(_COLORMAPS[name], dtype=np.uint8)
+    array.setflags(write=False)
+    return array
+
+
+def get_colormap_array(name):
+    """Get a colormap as a read-only (256, 3) uint8 lookup table, built once per process."""
+    return _colormap_array(name if name in _COLORMAPS else "roseus")
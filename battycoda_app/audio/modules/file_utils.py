@@ -46,6 +46,12 @@ class AudioSplitError(AudioFileError):
     pass
 
 
+class AudioFingerprintError(AudioFileError):
+    """Raised when fingerprinting an audio file fails."""
+
+    pass
+
+
 # =============================================================================
 # Restricted Pickle Unpickler for Security
 # =============================================================================
@@ -348,6 +354,99 @@ def process_pickle_file(pickle_file, max_duration=None):
         raise PickleProcessingError(f"Error processing pickle file '{os.path.basename(filename)}': {str(e)}") from e
 
 
+def move_file_to_media(src_path, upload_to, filename=None):
+    """
+    Move a finished file on disk into MEDIA_ROOT without reading it into memory.
+
+    The file is hard-linked into place when source and media share a filesystem,
+    otherwise it is copied in fixed-size blocks. The source is removed afterwards.
+    The returned name can be assigned directly to a FileField, e.g.
+    ``recording.wav_file.name = move_file_to_media(path, "recordings/")``.
+
+    Args:
+        src_path: Path to the file to move
+        upload_to: Storage directory relative to MEDIA_ROOT (e.g. "recordings/")
+        filename: Name to store the file under (defaults to the source basename)
+
+    Returns:
+        str: Storage name of the file, relative to MEDIA_ROOT
+    """
+    import shutil
+
+    from django.core.files.storage import default_storage
+
+    filename = default_storage.get_valid_name(os.path.basename(filename or src_path))
+    name = default_storage.generate_filename(os.path.join(upload_to, filename))
+    os.makedirs(os.path.dirname(default_storage.path(name)), exist_ok=True)
+
+    while True:
+        name = default_storage.get_available_name(name)
+        dest_path = default_storage.path(name)
+        try:
+            # A hard link never overwrites, so a concurrent upload claiming the same name just retries
+            os.link(src_path, dest_path)
+            break
+        except FileExistsError:
+            continue
+        except OSError:
+            # Cross-device or links unsupported: stream the bytes instead
+            pass
+
+        try:
+            with open(src_path, "rb") as src, open(dest_path, "xb") as dest:
+                shutil.copyfileobj(src, dest, 1024 * 1024)
+            break
+        except FileExistsError:
+            continue
+        except Exception:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+            raise
+
+    if default_storage.file_permissions_mode is not None:
+        os.chmod(dest_path, default_storage.file_permissions_mode)
+
+    os.remove(src_path)
+    return name
+
+
+def create_recording_from_file(src_path, filename=None, **fields):
+    """
+    Move a finished file into recording storage and create a ready Recording for it.
+
+    The file is moved with move_file_to_media, so it is never read into memory
+    and src_path no longer exists afterwards. The recording is saved before it
+    is marked file_ready, as form uploads are. If the recording cannot be
+    created, the moved file is removed again instead of being left orphaned.
+
+    Args:
+        src_path: Path to the audio file to move
+        filename: Name to store the file under (defaults to the source basename)
+        **fields: Recording field values
+
+    Returns:
+        Recording: The saved recording
+    """
+    from django.core.files.storage import default_storage
+    from django.db import transaction
+
+    from ...models.recording import Recording
+    from ...utils_modules.cleanup import safe_remove_file
+
+    stored_name = move_file_to_media(src_path, Recording._meta.get_field("wav_file").upload_to, filename)
+    try:
+        with transaction.atomic():
+            recording = Recording(wav_file=stored_name, **fields)
+            recording.save()
+            recording.file_ready = True
+            recording.save(update_fields=["file_ready"])
+    except Exception:
+        safe_remove_file(default_storage.path(stored_name), "orphaned recording file")
+        raise
+
+    return recording
+
+
 def get_audio_duration(audio_file_path):
     """
     Get the duration of an audio file in seconds.
@@ -368,13 +467,172 @@ def get_audio_duration(audio_file_path):
         raise AudioDurationError(f"Error getting audio duration for '{audio_file_path}': {str(e)}") from e
 
 
-def split_audio_file(audio_file_path, chunk_duration_seconds=60):
+# Frames copied per read/write when streaming chunks through soundfile
+SPLIT_BLOCK_FRAMES = 65536
+
+# numpy dtype that holds each PCM/float subtype without a lossy conversion
+SUBTYPE_READ_DTYPES = {
+    "PCM_S8": "int16",
+    "PCM_U8": "int16",
+    "PCM_16": "int16",
+    "PCM_24": "int32",
+    "PCM_32": "int32",
+    "FLOAT": "float32",
+    "DOUBLE": "float64",
+}
+
+
+def read_pcm_wav_layout(audio_file_path):
+    """
+    Locate the sample data of a plain PCM WAV file by walking its RIFF chunks.
+
+    Args:
+        audio_file_path: Path to the audio file
+
+    Returns:
+        dict with fmt_chunk (raw bytes), block_align, sample_rate, data_offset and data_size,
+        or None if the file is not a RIFF/WAVE file with integer PCM samples
+    """
+    import struct
+
+    file_size = os.path.getsize(audio_file_path)
+    with open(audio_file_path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+
+        fmt_chunk = None
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return None
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+
+            if chunk_id == b"fmt ":
+                fmt_chunk = f.read(chunk_size)
+                if chunk_size % 2:
+                    f.seek(1, os.SEEK_CUR)
+            elif chunk_id == b"data":
+                data_offset = f.tell()
+                # Streaming writers may leave the size unset, so trust the file length over the header
+                data_size = min(chunk_size, file_size - data_offset)
+                break
+            else:
+                f.seek(chunk_size + (chunk_size % 2), os.SEEK_CUR)
+
+    if fmt_chunk is None or len(fmt_chunk) < 16:
+        return None
+
+    format_tag, channels, sample_rate, _, block_align, bits_per_sample = struct.unpack("<HHIIHH", fmt_chunk[:16])
+    if format_tag == 0xFFFE and len(fmt_chunk) >= 26:
+        # WAVE_FORMAT_EXTENSIBLE stores the real format in the first two bytes of the subformat GUID
+        format_tag = struct.unpack("<H", fmt_chunk[24:26])[0]
+    if format_tag != 1 or channels < 1 or block_align < 1 or bits_per_sample < 8:
+        return None
+
+    return {
+        "fmt_chunk": fmt_chunk,
+        "block_align": block_align,
+        "sample_rate": sample_rate,
+        "data_offset": data_offset,
+        "data_size": data_size - (data_size % block_align),
+    }
+
+
+def _write_wav_byte_range(source, layout, start_frame, end_frame, chunk_path):
+    """Write frames [start_frame, end_frame) of a PCM WAV to a new file by copying raw bytes."""
+    import struct
+
+    block_align = layout["block_align"]
+    fmt_chunk = layout["fmt_chunk"]
+    data_size = (end_frame - start_frame) * block_align
+    pad = data_size % 2
+
+    with open(chunk_path, "wb") as out:
+        riff_size = 4 + (8 + len(fmt_chunk) + len(fmt_chunk) % 2) + (8 + data_size + pad)
+        out.write(struct.pack("<4sI4s", b"RIFF", riff_size, b"WAVE"))
+        out.write(struct.pack("<4sI", b"fmt ", len(fmt_chunk)))
+        out.write(fmt_chunk)
+        if len(fmt_chunk) % 2:
+            out.write(b"\x00")
+        out.write(struct.pack("<4sI", b"data", data_size))
+
+        source.seek(layout["data_offset"] + start_frame * block_align)
+        remaining = data_size
+        while remaining > 0:
+            block = source.read(min(remaining, 1024 * 1024))
+            if not block:
+                break
+            out.write(block)
+            remaining -= len(block)
+        if pad:
+            out.write(b"\x00")
+
+
+def _split_pcm_wav(audio_file_path, layout, samples_per_chunk, chunk_path_for):
+    """Split a plain PCM WAV into chunks by copying byte ranges, without decoding samples."""
+    total_frames = layout["data_size"] // layout["block_align"]
+    num_chunks = int(np.ceil(total_frames / samples_per_chunk))
+    chunk_paths = []
+
+    with open(audio_file_path, "rb") as source:
+        for i in range(num_chunks):
+            start_frame = i * samples_per_chunk
+            end_frame = min(start_frame + samples_per_chunk, total_frames)
+            chunk_path = chunk_path_for(i)
+            _write_wav_byte_range(source, layout, start_frame, end_frame, chunk_path)
+            chunk_paths.append(chunk_path)
+
+            logger.info(f"Created chunk {i + 1}/{num_chunks}: {os.path.basename(chunk_path)} (byte copy)")
+
+    return chunk_paths
+
+
+def _split_with_soundfile(audio_file_path, chunk_duration_seconds, chunk_path_for):
+    """Split any soundfile-readable file into chunks, streaming blocks and keeping the source subtype."""
+    chunk_paths = []
+
+    with sf.SoundFile(audio_file_path) as source:
+        samplerate = source.samplerate
+        samples_per_chunk = int(chunk_duration_seconds * samplerate)
+        num_chunks = int(np.ceil(source.frames / samples_per_chunk))
+        dtype = SUBTYPE_READ_DTYPES.get(source.subtype, "float32")
+        # Chunks are always WAV; keep the subtype where WAV supports it
+        subtype = source.subtype if sf.check_format("WAV", source.subtype) else None
+
+        for i in range(num_chunks):
+            chunk_path = chunk_path_for(i)
+            frames_left = min(samples_per_chunk, source.frames - i * samples_per_chunk)
+
+            with sf.SoundFile(
+                chunk_path, "w", samplerate=samplerate, channels=source.channels, format="WAV", subtype=subtype
+            ) as out:
+                while frames_left > 0:
+                    block = source.read(min(SPLIT_BLOCK_FRAMES, frames_left), dtype=dtype, always_2d=True)
+                    if len(block) == 0:
+                        break
+                    out.write(block)
+                    frames_left -= len(block)
+
+            chunk_paths.append(chunk_path)
+
+            logger.info(f"Created chunk {i + 1}/{num_chunks}: {os.path.basename(chunk_path)}")
+
+    return chunk_paths
+
+
+def split_audio_file(audio_file_path, chunk_duration_seconds=60, byte_copy=True):
     """
     Split an audio file into chunks of specified duration.
 
+    The file is never loaded whole: plain PCM WAV files are split by copying byte
+    ranges behind a rewritten header (no decode at all), and everything else is
+    streamed block by block through soundfile, keeping the source sample format.
+
     Args:
         audio_file_path: Path to the audio file to split
         chunk_duration_seconds: Duration of each chunk in seconds (default: 60)
+        byte_copy: Copy raw PCM bytes for plain WAV files instead of decoding and re-encoding
 
     Returns:
         list: List of paths to the chunk files (temporary files that should be cleaned up by caller)
@@ -383,48 +641,122 @@ def split_audio_file(audio_file_path, chunk_duration_seconds=60):
         AudioSplitError: If the file cannot be split
     """
     try:
-        # Read the audio file
-        data, samplerate = sf.read(audio_file_path)
-
-        # Calculate total duration and number of chunks needed
-        total_duration = len(data) / samplerate
-        num_chunks = int(np.ceil(total_duration / chunk_duration_seconds))
-
-        # Calculate samples per chunk
-        samples_per_chunk = int(chunk_duration_seconds * samplerate)
-
         # Create temporary directory for chunks
         temp_dir = tempfile.mkdtemp()
-        chunk_paths = []
 
         # Get the original filename for naming chunks
         original_name = os.path.splitext(os.path.basename(audio_file_path))[0]
 
-        # Split into chunks
-        for i in range(num_chunks):
-            start_sample = i * samples_per_chunk
-            end_sample = min((i + 1) * samples_per_chunk, len(data))
+        def chunk_path_for(index):
+            return os.path.join(temp_dir, f"{original_name}_chunk_{index + 1:03d}.wav")
 
-            # Extract chunk data
-            if len(data.shape) > 1:
-                # Multi-channel audio
-                chunk_data = data[start_sample:end_sample, :]
-            else:
-                # Mono audio
-                chunk_data = data[start_sample:end_sample]
+        layout = read_pcm_wav_layout(audio_file_path) if byte_copy else None
+        if layout:
+            samples_per_chunk = int(chunk_duration_seconds * layout["sample_rate"])
+            return _split_pcm_wav(audio_file_path, layout, samples_per_chunk, chunk_path_for)
 
-            # Create chunk filename
-            chunk_filename = f"{original_name}_chunk_{i + 1:03d}.wav"
-            chunk_path = os.path.join(temp_dir, chunk_filename)
+        return _split_with_soundfile(audio_file_path, chunk_duration_seconds, chunk_path_for)
+
+    except Exception as e:
+        logger.error(f"Error splitting audio file '{audio_file_path}': {str(e)}")
+        raise AudioSplitError(f"Error splitting audio file '{audio_file_path}': {str(e)}") from e
+
+
+# Bytes of sample data at each end of a file covered by the quick hash
+QUICK_HASH_EDGE_BYTES = 64 * 1024
+
+# Bytes read per block while hashing raw PCM data
+FINGERPRINT_BLOCK_BYTES = 1024 * 1024
 
-            # Write chunk to file
-            sf.write(chunk_path, chunk_data, samplerate)
-            chunk_paths.append(chunk_path)
 
-            logger.info(f"Created chunk {i + 1}/{num_chunks}: {chunk_filename} ({len(chunk_data) / samplerate:.2f}s)")
+def _fingerprint_pcm_wav(audio_file_path, layout, full):
+    """Hash the raw sample bytes of a plain PCM WAV file."""
+    import hashlib
 
-        return chunk_paths
+    data_offset = layout["data_offset"]
+    data_size = layout["data_size"]
+    # Format tag, channels, sample rate, byte rate, block align and bit depth, plus the data length
+    header = layout["fmt_chunk"][:16] + data_size.to_bytes(8, "little")
 
+    with open(audio_file_path, "rb") as f:
+        quick = hashlib.sha256(header)
+        head_size = min(QUICK_HASH_EDGE_BYTES, data_size)
+        f.seek(data_offset)
+        quick.update(f.read(head_size))
+        tail_start = max(head_size, data_size - QUICK_HASH_EDGE_BYTES)
+        f.seek(data_offset + tail_start)
+        quick.update(f.read(data_size - tail_start))
+
+        if not full:
+            return quick.hexdigest(), None
+
+        content = hashlib.sha256(header)
+        f.seek(data_offset)
+        remaining = data_size
+        while remaining > 0:
+            block = f.read(min(remaining, FINGERPRINT_BLOCK_BYTES))
+            if not block:
+                break
+            content.update(block)
+            remaining -= len(block)
+
+    return quick.hexdigest(), content.hexdigest()
+
+
+def _fingerprint_with_soundfile(audio_file_path, full):
+    """Hash the decoded samples of any soundfile-readable file, streaming blocks."""
+    import hashlib
+
+    with sf.SoundFile(audio_file_path) as source:
+        dtype = SUBTYPE_READ_DTYPES.get(source.subtype, "float32")
+        header = f"{source.samplerate}:{source.channels}:{source.subtype}:{source.frames}".encode()
+        edge_frames = max(1, QUICK_HASH_EDGE_BYTES // (np.dtype(dtype).itemsize * source.channels))
+
+        quick = hashlib.sha256(header)
+        head_frames = min(edge_frames, source.frames)
+        quick.update(source.read(head_frames, dtype=dtype, always_2d=True).tobytes())
+        tail_start = max(head_frames, source.frames - edge_frames)
+        if tail_start < source.frames:
+            source.seek(tail_start)
+            quick.update(source.read(dtype=dtype, always_2d=True).tobytes())
+
+        if not full:
+            return quick.hexdigest(), None
+
+        content = hashlib.sha256(header)
+        source.seek(0)
+        for block in source.blocks(blocksize=SPLIT_BLOCK_FRAMES, dtype=dtype, always_2d=True):
+            content.update(block.tobytes())
+
+    return quick.hexdigest(), content.hexdigest()
+
+
+def audio_fingerprint(audio_file_path, full=True):
+    """
+    Compute content fingerprints of the sample data of an audio file.
+
+    Only the audio format and the samples are hashed, not the file name or any
+    metadata chunks, so renamed and re-tagged copies get the same fingerprint.
+    Plain PCM WAV files are hashed as raw bytes; other formats are decoded
+    block by block through soundfile.
+
+    Args:
+        audio_file_path: Path to the audio file
+        full: Also hash all of the sample data (False computes only the quick hash)
+
+    Returns:
+        tuple: (quick_hash, content_hash) SHA-256 hex digests. The quick hash only
+        covers the format, the length and the first and last QUICK_HASH_EDGE_BYTES
+        of sample data, so it is cheap to compute for a first-pass comparison.
+        content_hash is None when full is False.
+
+    Raises:
+        AudioFingerprintError: If the file cannot be read
+    """
+    try:
+        layout = read_pcm_wav_layout(audio_file_path)
+        if layout:
+            return _fingerprint_pcm_wav(audio_file_path, layout, full)
+        return _fingerprint_with_soundfile(audio_file_path, full)
     except Exception as e:
-        logger.error(f"Error splitting audio file '{audio_file_path}': {str(e)}")
-        raise AudioSplitError(f"Error splitting audio file '{audio_file_path}': {str(e)}") from e
+        raise AudioFingerprintError(f"Error fingerprinting audio file '{audio_file_path}': {str(e)}") from e
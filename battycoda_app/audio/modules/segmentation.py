@@ -114,6 +114,63 @@ def _find_segments_from_mask(binary_mask, sample_rate, min_duration_ms):
     return onsets, offsets
 
 
+def amplitude_envelope(audio_data):
+    """Return the amplitude envelope (absolute value) of a signal."""
+    return np.abs(audio_data)
+
+
+def energy_envelope(audio_data, sample_rate):
+    """
+    Return the short-time energy of a signal, interpolated back to the signal length.
+
+    Energy is computed over 0.4ms frames for precise onset detection.
+    """
+    frame_size = max(1, int(0.0004 * sample_rate))
+    num_frames = len(audio_data) // frame_size
+    frames = audio_data[: num_frames * frame_size].reshape(num_frames, frame_size)
+    energy = np.sum(frames**2, axis=1) / frame_size
+
+    return np.interp(np.linspace(0, len(energy), len(audio_data)), np.arange(len(energy)), energy)
+
+
+def detection_envelope(audio_data, sample_rate, algorithm_type="threshold"):
+    """Return the envelope the given algorithm type thresholds: short-time energy or amplitude."""
+    if algorithm_type == "energy":
+        return energy_envelope(audio_data, sample_rate)
+    return amplitude_envelope(audio_data)
+
+
+def smooth_envelope(envelope, smooth_window):
+    """Smooth an envelope with a moving average filter of smooth_window samples."""
+    if smooth_window > 1:
+        kernel = np.ones(smooth_window) / smooth_window
+        return np.convolve(envelope, kernel, mode="same")
+    return envelope
+
+
+def segments_above_threshold(smoothed, sample_rate, threshold_factor, min_duration_ms, stats=None):
+    """
+    Apply the adaptive threshold (mean + threshold_factor * std) to a smoothed envelope.
+
+    Args:
+        smoothed: Smoothed envelope
+        sample_rate: Sample rate in Hz
+        threshold_factor: Threshold factor applied to the envelope standard deviation
+        min_duration_ms: Minimum segment duration in milliseconds
+        stats: Optional precomputed (mean, std) of the envelope
+
+    Returns:
+        tuple: (onsets, offsets) as lists of floats in seconds
+    """
+    if stats is None:
+        stats = (np.mean(smoothed), np.std(smoothed))
+    mean, std = stats
+    threshold = mean + (threshold_factor * std)
+
+    binary_mask = smoothed > threshold
+    return _find_segments_from_mask(binary_mask, sample_rate, min_duration_ms)
+
+
 def auto_segment_audio(
     audio_path, min_duration_ms=10, smooth_window=3, threshold_factor=0.5, low_freq=None, high_freq=None
 ):
@@ -139,23 +196,8 @@ def auto_segment_audio(
     """
     audio_data, sample_rate = _load_and_filter_audio(audio_path, low_freq, high_freq)
 
-    # Take absolute value of the signal
-    abs_signal = np.abs(audio_data)
-
-    # Smooth with moving average filter
-    if smooth_window > 1:
-        kernel = np.ones(smooth_window) / smooth_window
-        smoothed_signal = np.convolve(abs_signal, kernel, mode="same")
-    else:
-        smoothed_signal = abs_signal
-
-    # Apply adaptive threshold
-    signal_mean = np.mean(smoothed_signal)
-    signal_std = np.std(smoothed_signal)
-    threshold = signal_mean + (threshold_factor * signal_std)
-
-    binary_mask = smoothed_signal > threshold
-    return _find_segments_from_mask(binary_mask, sample_rate, min_duration_ms)
+    smoothed_signal = smooth_envelope(amplitude_envelope(audio_data), smooth_window)
+    return segments_above_threshold(smoothed_signal, sample_rate, threshold_factor, min_duration_ms)
 
 
 def energy_based_segment_audio(
@@ -183,31 +225,5 @@ def energy_based_segment_audio(
     """
     audio_data, sample_rate = _load_and_filter_audio(audio_path, low_freq, high_freq)
 
-    # Calculate short-time energy (0.4ms frames for precise onset detection)
-    frame_size = int(0.0004 * sample_rate)
-    num_frames = len(audio_data) // frame_size
-    energy = np.zeros(num_frames)
-
-    for i in range(num_frames):
-        start = i * frame_size
-        end = min(start + frame_size, len(audio_data))
-        frame = audio_data[start:end]
-        energy[i] = np.sum(frame**2) / len(frame)
-
-    # Interpolate energy back to signal length
-    energy_full = np.interp(np.linspace(0, len(energy), len(audio_data)), np.arange(len(energy)), energy)
-
-    # Smooth the energy curve
-    if smooth_window > 1:
-        kernel = np.ones(smooth_window) / smooth_window
-        smoothed_energy = np.convolve(energy_full, kernel, mode="same")
-    else:
-        smoothed_energy = energy_full
-
-    # Apply adaptive threshold
-    energy_mean = np.mean(smoothed_energy)
-    energy_std = np.std(smoothed_energy)
-    threshold = energy_mean + (threshold_factor * energy_std)
-
-    binary_mask = smoothed_energy > threshold
-    return _find_segments_from_mask(binary_mask, sample_rate, min_duration_ms)
+    smoothed_energy = smooth_envelope(energy_envelope(audio_data, sample_rate), smooth_window)
+    return segments_above_threshold(smoothed_energy, sample_rate, threshold_factor, min_duration_ms)
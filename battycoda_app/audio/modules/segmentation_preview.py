@@ -0,0 +1,159 @@
+"""
+In-memory segmentation preview for a short slice of a recording.
+
+The expensive part of segmenting a slice - reading it, bandpass filtering it,
+computing the detection envelope and rendering its spectrogram - depends only
+on the slice, the filter band and the algorithm type. Those results are kept in
+a small per-process LRU cache, so as the user drags the threshold and minimum
+duration sliders each preview request only re-runs the threshold step.
+"""
+
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import soundfile as sf
+
+from .segmentation import apply_bandpass_filter, detection_envelope, segments_above_threshold, smooth_envelope
+
+# Longest slice a preview may cover, in seconds
+PREVIEW_MAX_DURATION = 10.0
+
+# Number of analysed slices kept per process
+PREVIEW_CACHE_SIZE = 8
+
+_preview_cache = OrderedDict()
+_preview_cache_lock = threading.Lock()
+
+
+class SegmentationPreview:
+    """Filtered detection envelope and spectrogram of one audio slice."""
+
+    def __init__(self, audio_data, sample_rate, start_time, algorithm_type="threshold", low_freq=None, high_freq=None):
+        self.sample_rate = sample_rate
+        self.start_time = start_time
+        self.duration = len(audio_data) / sample_rate
+        self.spectrogram_png = _render_spectrogram_png(audio_data)
+
+        filtered = apply_bandpass_filter(audio_data, sample_rate, low_freq, high_freq)
+        self._envelope = detection_envelope(filtered, sample_rate, algorithm_type)
+        # Only the most recent smoothing is kept; the threshold sliders reuse it
+        self._smoothed = None
+        self._lock = threading.Lock()
+
+    def _smoothed_envelope(self, smooth_window):
+        with self._lock:
+            if self._smoothed is None or self._smoothed[0] != smooth_window:
+                smoothed = smooth_envelope(self._envelope, smooth_window)
+                self._smoothed = (smooth_window, smoothed, (np.mean(smoothed), np.std(smoothed)))
+            return self._smoothed[1:]
+
+    def segment(self, threshold_factor, min_duration_ms, smooth_window=3):
+        """
+        Detect segments in the slice.
+
+        Returns:
+            tuple: (onsets, offsets) as lists of floats in seconds from the start of the recording
+        """
+        smoothed, stats = self._smoothed_envelope(smooth_window)
+        onsets, offsets = segments_above_threshold(
+            smoothed, self.sample_rate, threshold_factor, min_duration_ms, stats=stats
+        )
+        return [self.start_time + t for t in onsets], [self.start_time + t for t in offsets]
+
+
+def _read_slice(audio_path, start_time, duration):
+    """Read the first channel of [start_time, start_time + duration) from an audio file."""
+    with sf.SoundFile(audio_path) as f:
+        sample_rate = f.samplerate
+        start_frame = int(start_time * sample_rate)
+        if start_frame >= f.frames:
+            raise ValueError("No audio data in the selected time range")
+        f.seek(start_frame)
+        audio_data = f.read(int(duration * sample_rate), always_2d=True)[:, 0]
+
+    if len(audio_data) == 0:
+        raise ValueError("No audio data in the selected time range")
+    return audio_data, sample_rate
+
+
+def _render_spectrogram_png(audio_data):
+    """Render a slice's spectrogram as PNG bytes, with the parameters of the recording HDF5 spectrograms.
+
+    The STFT is computed with numpy rather than librosa: it matches
+    librosa.stft(center=True, pad_mode="constant") but avoids librosa's
+    first-call JIT warm-up, which would stall the first preview of a worker.
+    """
+    from PIL import Image
+    from scipy.signal import get_window
+
+    from ..colormaps import get_colormap_array
+    from ..task_modules.spectrogram.hdf5_generation_chunked import DB_AMIN, HOP_LENGTH, N_FFT
+
+    padded = np.pad(audio_data.astype(np.float32), N_FFT // 2)
+    if len(padded) < N_FFT:
+        padded = np.pad(padded, (0, N_FFT - len(padded)))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, N_FFT)[::HOP_LENGTH]
+    magnitude = np.abs(np.fft.rfft(frames * get_window("hann", N_FFT, fftbins=True), axis=1)).T
+    spectrogram = 20 * np.log10(np.maximum(magnitude, DB_AMIN))
+
+    spec_min = spectrogram.min()
+    spec_max = spectrogram.max()
+    spec_range = spec_max - spec_min if spec_max > spec_min else 1
+
+    normalized = ((spectrogram - spec_min) / spec_range * 255).clip(0, 255).astype(np.uint8)
+    img = Image.fromarray(get_colormap_array("roseus")[np.flipud(normalized)])
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def get_segmentation_preview(
+    cache_key, audio_path, start_time, duration, algorithm_type="threshold", low_freq=None, high_freq=None
+):
+    """
+    Return the analysed slice for a preview, computing it only on a cache miss.
+
+    Args:
+        cache_key: Identifies the audio file (e.g. the recording ID); the slice,
+            filter band and algorithm type are added to it
+        audio_path: Path to the audio file
+        start_time: Start of the slice in seconds
+        duration: Length of the slice in seconds (at most PREVIEW_MAX_DURATION)
+        algorithm_type: Segmentation algorithm type ("threshold" or "energy")
+        low_freq: High-pass filter frequency in Hz (optional)
+        high_freq: Low-pass filter frequency in Hz (optional)
+
+    Returns:
+        SegmentationPreview
+
+    Raises:
+        ValueError: If the slice is out of range or contains no audio
+    """
+    duration = min(duration, PREVIEW_MAX_DURATION)
+    key = (cache_key, audio_path, start_time, duration, algorithm_type, low_freq, high_freq)
+
+    with _preview_cache_lock:
+        preview = _preview_cache.get(key)
+        if preview is not None:
+            _preview_cache.move_to_end(key)
+            return preview
+
+    # Analyse outside the lock so concurrent previews of other slices don't wait
+    audio_data, sample_rate = _read_slice(audio_path, start_time, duration)
+    preview = SegmentationPreview(audio_data, sample_rate, start_time, algorithm_type, low_freq, high_freq)
+
+    with _preview_cache_lock:
+        _preview_cache[key] = preview
+        _preview_cache.move_to_end(key)
+        while len(_preview_cache) > PREVIEW_CACHE_SIZE:
+            _preview_cache.popitem(last=False)
+    return preview
+
+
+def clear_segmentation_preview_cache():
+    """Drop all cached preview slices."""
+    with _preview_cache_lock:
+        _preview_cache.clear()
@@ -0,0 +1,216 @@
+"""
+Rendering of per-task spectrogram images and audio snippets.
+
+Both renders are cached on disk under MEDIA_ROOT/audio_cache so that the
+annotation views and the background prefetch warmer share the same files.
+"""
+
+import io
+import logging
+import os
+
+import numpy as np
+from django.conf import settings
+
+from .audio_processing import get_audio_bit, normal_hwin, overview_hwin
+from .file_utils import appropriate_file
+
+logger = logging.getLogger(__name__)
+
+# Playback slowdown factor applied to task audio snippets
+SNIPPET_SLOWDOWN = 5
+
+
+def get_task_recording(task):
+    """Return the Recording backing a task's batch WAV file, or None."""
+    from ...models.recording import Recording
+
+    if not task.batch or not task.batch.wav_file:
+        return None
+    return Recording.all_objects.filter(wav_file=task.batch.wav_file.name).first()
+
+
+def task_audio_snippet_path(task, channel=0, overview=False):
+    """Return the cache path of a task's audio snippet."""
+    import hashlib
+
+    wav_path = task.batch.wav_file.path
+    file_args = {
+        "call": "0",
+        "channel": str(channel),
+        "hash": hashlib.md5(wav_path.encode()).hexdigest(),
+        "overview": "True" if overview else "False",
+        "onset": str(task.onset),
+        "offset": str(task.offset),
+        "loudness": "1.0",
+    }
+    return appropriate_file(wav_path, file_args)
+
+
+def render_task_audio_snippet(task, channel=0, overview=False):
+    """Render a task's slowed-down audio snippet to the cache if it is not there yet.
+
+    Args:
+        task: Task model instance with a batch WAV file
+        channel: Audio channel to extract (falls back to channel 0)
+        overview: Use the overview window instead of the detail window
+
+    Returns:
+        str: Path of the cached WAV snippet
+
+    Raises:
+        ValueError: If no audio could be extracted
+    """
+    import soundfile as sf
+
+    cache_path = task_audio_snippet_path(task, channel, overview)
+    if os.path.exists(cache_path) and os.path.getsize(cache_path) > 0:
+        return cache_path
+
+    hwin = overview_hwin if overview else normal_hwin
+    extra_params = {"onset": str(task.onset), "offset": str(task.offset)}
+    audio_data, sample_rate, _ = get_audio_bit(task.batch.wav_file.path, 0, hwin(), extra_params)
+
+    if audio_data is None or len(audio_data) == 0:
+        raise ValueError("Failed to extract audio data")
+
+    # Extract the specific channel
+    if len(audio_data.shape) > 1 and channel < audio_data.shape[1]:
+        audio_data = audio_data[:, channel]
+    elif len(audio_data.shape) > 1:
+        audio_data = audio_data[:, 0]
+
+    # Ensure 1D
+    if len(audio_data.shape) > 1:
+        audio_data = audio_data.flatten()
+
+    # Apply slowdown
+    sample_rate_out = sample_rate // SNIPPET_SLOWDOWN
+    audio_data = np.repeat(audio_data, SNIPPET_SLOWDOWN).astype("float32")
+
+    # Ensure proper range
+    if np.isnan(audio_data).any() or np.isinf(audio_data).any():
+        audio_data = np.nan_to_num(audio_data)
+
+    max_val = np.max(np.abs(audio_data))
+    if max_val > 0:
+        audio_data = audio_data / max_val
+
+    # Write to a temp name first so concurrent readers never see a partial file
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    sf.write(tmp_path, audio_data, sample_rate_out, format="WAV")
+    os.replace(tmp_path, cache_path)
+    return cache_path
+
+
+def task_spectrogram_path(task, recording, overview=False, colormap_name="roseus"):
+    """Return the cache path of a task's spectrogram PNG.
+
+    The key includes the HDF5 filename and the species padding, so regenerating
+    the spectrogram or changing the species windows invalidates the cached image.
+    """
+    hwin = overview_hwin(task.species) if overview else normal_hwin(task.species)
+    h5_path = os.path.join(settings.MEDIA_ROOT, "spectrograms", "recordings", recording.spectrogram_file)
+    file_args = {
+        "task": str(task.id),
+        "onset": str(task.onset),
+        "offset": str(task.offset),
+        "overview": "1" if overview else "0",
+        "hwin": f"{hwin[0]}-{hwin[1]}",
+        "colormap": colormap_name,
+        "contrast": "minmax",
+    }
+    return appropriate_file(h5_path, file_args)
+
+
+def render_task_spectrogram_png(task, recording, overview=False, colormap_name="roseus"):
+    """Render a task's spectrogram window from the recording HDF5 file as PNG bytes.
+
+    The result is cached on disk; subsequent calls return the cached bytes.
+
+    Args:
+        task: Task model instance
+        recording: Recording whose HDF5 spectrogram covers the task
+        overview: Use the overview window instead of the detail window
+        colormap_name: Name of the colormap to apply
+
+    Returns:
+        bytes: PNG image data
+    """
+    import h5py
+    from PIL import Image
+
+    from ..colormaps import get_colormap_array
+
+    cache_path = task_spectrogram_path(task, recording, overview, colormap_name)
+    if os.path.exists(cache_path) and os.path.getsize(cache_path) > 0:
+        with open(cache_path, "rb") as f:
+            return f.read()
+
+    hwin = overview_hwin(task.species) if overview else normal_hwin(task.species)
+    start_time = task.onset - (hwin[0] / 1000)
+    end_time = task.offset + (hwin[1] / 1000)
+
+    h5_path = os.path.join(settings.MEDIA_ROOT, "spectrograms", "recordings", recording.spectrogram_file)
+
+    with h5py.File(h5_path, "r") as f:
+        sample_rate = float(f.attrs["sample_rate"])
+        n_fft = int(f.attrs.get("n_fft", 512))
+        hop_length = int(f.attrs.get("hop_length", n_fft // 4))
+        duration = float(f.attrs["duration"])
+        n_frames = int(f.attrs["n_frames"])
+        n_freq_bins = int(f.attrs["n_freq_bins"])
+
+        # Calculate frames per second
+        time_per_frame = hop_length / sample_rate
+
+        # Clamp times to valid recording boundaries
+        clamped_start_time = max(0, start_time)
+        clamped_end_time = min(duration, end_time)
+
+        start_frame = int((clamped_start_time / duration) * n_frames)
+        end_frame = int((clamped_end_time / duration) * n_frames)
+
+        # Extract actual data from recording
+        actual_data = f["spectrogram"][:, start_frame:end_frame]
+
+        # Pad with silence (-80 dB) if window extends beyond recording
+        pad_start = int((clamped_start_time - start_time) / time_per_frame) if start_time < 0 else 0
+        pad_end = int((end_time - clamped_end_time) / time_per_frame) if end_time > duration else 0
+
+        if pad_start > 0 or pad_end > 0:
+            # Calculate total frames based on actual data size + padding to avoid rounding errors
+            total_frames = pad_start + actual_data.shape[1] + pad_end
+            spectrogram_data = np.full((n_freq_bins, total_frames), -80, dtype=np.float16)
+            spectrogram_data[:, pad_start : pad_start + actual_data.shape[1]] = actual_data
+        else:
+            spectrogram_data = actual_data
+
+    spectrogram_float = spectrogram_data.astype(np.float32)
+
+    spec_min = spectrogram_float.min()
+    spec_max = spectrogram_float.max()
+    spec_range = spec_max - spec_min if spec_max > spec_min else 1
+
+    # Vectorized colormap application (replaces slow pixel-by-pixel loop)
+    normalized = ((spectrogram_float - spec_min) / spec_range * 255).clip(0, 255).astype(np.uint8)
+    flipped = np.flipud(normalized)
+    colormap_array = get_colormap_array(colormap_name)
+    colored = colormap_array[flipped]
+    img = Image.fromarray(colored)
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    png_data = buf.getvalue()
+    buf.close()
+
+    try:
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(png_data)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache spectrogram for task {task.id}: {e}")
+
+    return png_data
@@ -2,6 +2,158 @@
 Base utilities for BattyCoda audio processing tasks.
 """
 
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Open SoundFile handles kept per process for extract_audio_segment
+AUDIO_HANDLE_CACHE_SIZE = 8
+
+_handle_cache = OrderedDict()
+_handle_cache_lock = threading.Lock()
+_handle_cache_pid = None
+
+
+class _CachedHandle:
+    """An open SoundFile in the handle cache, with a lock held while it is read."""
+
+    def __init__(self, identity, sound_file):
+        self.identity = identity
+        self.sound_file = sound_file
+        self.lock = threading.Lock()
+
+    def close(self):
+        # Waits for a read in progress on another thread
+        with self.lock:
+            self.sound_file.close()
+
+
+def _file_identity(wav_path):
+    try:
+        stat = os.stat(wav_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _checkout(wav_path):
+    """
+    Return the cached handle of wav_path, opening it if needed.
+
+    The cache lock is only held for the lookup. Handles of files that were
+    replaced or deleted, and the least recently used handles beyond
+    AUDIO_HANDLE_CACHE_SIZE, are closed so their disk space can be freed.
+    """
+    import soundfile as sf
+
+    global _handle_cache_pid
+
+    identity = _file_identity(wav_path)
+    if identity is None:
+        raise FileNotFoundError(f"Audio file not found: {wav_path}")
+
+    stale = []
+    with _handle_cache_lock:
+        # Handles inherited from a parent process share its file offsets
+        if _handle_cache_pid != os.getpid():
+            _handle_cache.clear()
+            _handle_cache_pid = os.getpid()
+
+        for path, cached in list(_handle_cache.items()):
+            if _file_identity(path) != cached.identity:
+                stale.append(_handle_cache.pop(path))
+
+        entry = _handle_cache.pop(wav_path, None)
+        if entry is None:
+            entry = _CachedHandle(identity, sf.SoundFile(wav_path))
+        _handle_cache[wav_path] = entry
+
+        while len(_handle_cache) > AUDIO_HANDLE_CACHE_SIZE:
+            stale.append(_handle_cache.popitem(last=False)[1])
+
+    for cached in stale:
+        cached.close()
+    return entry
+
+
+def _discard(wav_path, entry):
+    with _handle_cache_lock:
+        if _handle_cache.get(wav_path) is entry:
+            del _handle_cache[wav_path]
+
+
+@contextmanager
+def _cached_sound_file(wav_path):
+    """
+    Yield an open SoundFile for wav_path from the per-process LRU of handles.
+
+    A cached handle is used by one thread at a time, since seek and read share
+    its position. A thread that finds it busy (or just closed) reads through a
+    handle of its own instead of waiting.
+    """
+    import soundfile as sf
+
+    entry = _checkout(wav_path)
+    if not entry.lock.acquire(blocking=False):
+        with sf.SoundFile(wav_path) as sound_file:
+            yield sound_file
+        return
+
+    try:
+        if entry.sound_file.closed:
+            with sf.SoundFile(wav_path) as sound_file:
+                yield sound_file
+            return
+
+        try:
+            yield entry.sound_file
+        except Exception:
+            # Do not reuse a handle left in an unknown state
+            _discard(wav_path, entry)
+            entry.sound_file.close()
+            raise
+    finally:
+        entry.lock.release()
+
+
+def read_window(sound_file, onset, offset=None):
+    """
+    Read one window from an open SoundFile.
+
+    Parts of the window outside the file are padded with zeros.
+
+    Args:
+        sound_file: Open soundfile.SoundFile
+        onset: Start time in seconds (can be negative, will be zero-padded)
+        offset: End time in seconds, or None to read until the end of the file
+
+    Returns:
+        numpy array of shape (samples, channels), float32
+    """
+    import numpy as np
+
+    sample_rate = sound_file.samplerate
+    req_start = int(onset * sample_rate)
+    req_end = sound_file.frames if offset is None else int(offset * sample_rate)
+    req_samples = max(0, req_end - req_start)
+
+    valid_start = max(0, req_start)
+    valid_end = min(sound_file.frames, req_end)
+
+    if valid_end <= valid_start:
+        return np.zeros((req_samples, sound_file.channels), dtype=np.float32)
+
+    sound_file.seek(valid_start)
+    valid = sound_file.read(valid_end - valid_start, dtype="float32", always_2d=True)
+    if valid_start == req_start and valid.shape[0] == req_samples:
+        return valid
+
+    window = np.zeros((req_samples, valid.shape[1]), dtype=np.float32)
+    insert_pos = valid_start - req_start
+    window[insert_pos : insert_pos + valid.shape[0]] = valid
+    return window
+
 
 def extract_audio_segment(wav_path, onset, offset=None):
     """
@@ -9,6 +161,10 @@ def extract_audio_segment(wav_path, onset, offset=None):
     Uses efficient seek operation to read only the needed segment without loading the entire file.
     Handles out-of-bounds requests by padding with zeros.
 
+    The file is read through a small per-process cache of open handles, so
+    repeated calls on the same file do not parse its header again. Use
+    extract_audio_segments to read many windows of one file.
+
     Args:
         wav_path: Path to the WAV file
         onset: Start time in seconds (can be negative, will be zero-padded)
@@ -18,69 +174,29 @@ def extract_audio_segment(wav_path, onset, offset=None):
     Returns:
         tuple: (audio_data, sample_rate)
     """
-    try:
-        import numpy as np
-        import soundfile as sf
-
-        # Get file info without reading all data
-        info = sf.info(wav_path)
-        sample_rate = info.samplerate
-        duration = info.duration
-        n_channels = info.channels
-
-        # Brief log of file details
-
-        # Handle case where offset is None (read to the end)
-        if offset is None:
-            offset = duration
-
-        # Calculate sample positions
-        req_start_sample = int(onset * sample_rate)
-        req_end_sample = int(offset * sample_rate)
-        req_num_samples = req_end_sample - req_start_sample
-
-        # Calculate valid sample range (within file bounds)
-        valid_start_sample = max(0, req_start_sample)
-        valid_end_sample = min(int(duration * sample_rate), req_end_sample)
-
-        # Check if padding is needed
-        needs_padding = valid_start_sample > req_start_sample or valid_end_sample < req_end_sample
-
-        if needs_padding:
-            # Handle padding for out-of-bounds requests
-            valid_num_samples = valid_end_sample - valid_start_sample
-
-            if valid_num_samples <= 0:
-                # Entire request is outside file bounds - return zeros
-                segment = np.zeros((req_num_samples, n_channels), dtype=np.float32)
-
-            else:
-                # Read valid portion and add padding
-                with sf.SoundFile(wav_path) as f:
-                    f.seek(valid_start_sample)
-                    valid_segment = f.read(valid_num_samples, dtype="float32")
-
-                # Handle mono audio consistently
-                if len(valid_segment.shape) == 1:
-                    valid_segment = valid_segment.reshape(-1, 1)
-
-                # Create padded segment
-                segment = np.zeros((req_num_samples, valid_segment.shape[1]), dtype=np.float32)
-
-                # Insert valid data at the correct position
-                insert_pos = max(0, -req_start_sample)
-                segment[insert_pos : insert_pos + valid_segment.shape[0]] = valid_segment
-
-        else:
-            # No padding needed, just read the segment efficiently
-            with sf.SoundFile(wav_path) as f:
-                f.seek(valid_start_sample)
-                segment = f.read(valid_end_sample - valid_start_sample, dtype="float32")
-
-            # Handle mono audio consistently
-            if len(segment.shape) == 1 and segment.size > 0:
-                segment = segment.reshape(-1, 1)
-
-        return segment, sample_rate
-    except Exception:
-        raise
+    with _cached_sound_file(wav_path) as sound_file:
+        return read_window(sound_file, onset, offset), sound_file.samplerate
+
+
+def extract_audio_segments(wav_path, windows):
+    """
+    Extract many segments of audio from one WAV file.
+
+    The file is opened once and the windows are read in onset order, so the
+    file is read in a single forward pass.
+
+    Args:
+        wav_path: Path to the WAV file
+        windows: List of (onset, offset) tuples in seconds, as for extract_audio_segment
+
+    Returns:
+        tuple: (list of audio_data in the order of windows, sample_rate)
+    """
+    import soundfile as sf
+
+    segments = [None] * len(windows)
+    with sf.SoundFile(wav_path) as sound_file:
+        for index in sorted(range(len(windows)), key=lambda i: windows[i][0]):
+            onset, offset = windows[index]
+            segments[index] = read_window(sound_file, onset, offset)
+        return segments, sound_file.samplerate
@@ -0,0 +1,258 @@
+"""
+Batch upload ingestion tasks for BattyCoda.
+
+Turns an uploaded ZIP of WAV files (plus an optional ZIP of pickle segmentation
+files) into recordings in the background. WAV members are streamed out of the
+archive one at a time and ingested by a small bounded pool of threads, each
+with its own archive handles and database connection.
+"""
+
+import logging
+import os
+import queue
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from celery import shared_task
+from django.conf import settings
+
+from ...utils_modules.cleanup import safe_cleanup_dir, safe_remove_file
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between progress writes to the job row
+PROGRESS_UPDATE_INTERVAL = 2.0
+
+
+def _ingest_member(job, wav_zip, pickle_zip, pickle_members, index, member_name, work_dir):
+    """Create the recording(s) for one WAV member of the archive.
+
+    Never raises: failures are logged and reported in the returned counts so
+    that one bad file does not abort the whole batch.
+
+    Returns:
+        dict with success_count, error_count, segmented_count and split_count
+    """
+    from ...views_batch_upload.file_processing import (
+        create_recording_from_wav,
+        create_segmentation_from_pickle,
+        process_wav_with_splitting,
+    )
+    from ...views_batch_upload.zip_extraction import stream_member_to_file
+
+    counts = {"success_count": 0, "error_count": 0, "segmented_count": 0, "split_count": 0}
+    wav_path = None
+
+    try:
+        # Give every member its own directory so equal basenames in different folders don't collide
+        member_dir = os.path.join(work_dir, str(index))
+        wav_path = stream_member_to_file(wav_zip, member_name, member_dir)
+
+        if job.split_long_files:
+            count, was_split = process_wav_with_splitting(wav_path, job.metadata, job.created_by, job.group)
+            if was_split:
+                counts["success_count"] = count
+                counts["split_count"] = 1
+                return counts
+
+        # Normal processing (file <= 60s or splitting disabled/failed)
+        recording = create_recording_from_wav(wav_path, job.metadata, job.created_by, job.group)
+        counts["success_count"] = 1
+
+        pickle_filename = f"{os.path.basename(member_name)}.pickle"
+        pickle_member = pickle_members.get(pickle_filename)
+        if pickle_zip and pickle_member:
+            try:
+                with pickle_zip.open(pickle_member) as pickle_file:
+                    if create_segmentation_from_pickle(recording, pickle_file, job.created_by) > 0:
+                        counts["segmented_count"] = 1
+            except Exception as e:
+                logger.error(f"Batch upload {job.id}: error processing pickle file {pickle_filename}: {e}")
+
+    except Exception as e:
+        logger.error(f"Batch upload {job.id}: failed to ingest {member_name}: {e}")
+        counts["error_count"] = 1
+    finally:
+        if wav_path:
+            safe_remove_file(wav_path, "batch upload WAV file")
+            safe_cleanup_dir(os.path.dirname(wav_path), "batch upload member directory")
+
+    return counts
+
+
+def _ingest_worker(job, pending, results, pickle_members, work_dir, close_connection=True):
+    """Pull members off the pending queue until it is empty, pushing their counts onto results."""
+    from django.db import connection
+
+    wav_zip = zipfile.ZipFile(job.wav_zip_path, "r")
+    pickle_zip = zipfile.ZipFile(job.pickle_zip_path, "r") if pickle_members else None
+    try:
+        while True:
+            try:
+                index, member_name = pending.get_nowait()
+            except queue.Empty:
+                return
+            results.put(_ingest_member(job, wav_zip, pickle_zip, pickle_members, index, member_name, work_dir))
+    finally:
+        wav_zip.close()
+        if pickle_zip:
+            pickle_zip.close()
+        if close_connection:
+            # Worker threads own their connection; release it instead of leaving it for GC
+            connection.close()
+
+
+def _drain(pending):
+    """Empty the queue of pending members, so the workers stop after their current file."""
+    while True:
+        try:
+            pending.get_nowait()
+        except queue.Empty:
+            return
+
+
+def _read_pickle_members(job):
+    """Index the pickle ZIP by basename, or return {} when there is none or it is unreadable."""
+    from ...views_batch_upload.zip_extraction import list_pickle_members
+
+    if not job.pickle_zip_path:
+        return {}
+    try:
+        with zipfile.ZipFile(job.pickle_zip_path, "r") as pickle_zip:
+            return list_pickle_members(pickle_zip)
+    except Exception as e:
+        # Continue with WAV files even if the pickle archive is unusable
+        logger.warning(f"Batch upload {job.id}: could not read pickle ZIP: {e}")
+        return {}
+
+
+def _notify(job):
+    """Send the uploader a notification summarising the finished job."""
+    from django.urls import reverse
+
+    from ...models.notification import UserNotification
+
+    if job.status == "completed":
+        message = f"Created {job.success_count} recordings from '{job.name}'."
+        if job.split_count:
+            message += f" {job.split_count} files were split into 1-minute chunks."
+        if job.segmented_count:
+            message += f" {job.segmented_count} recordings were segmented from pickle files."
+        if job.error_count:
+            message += f" {job.error_count} files failed."
+        title, icon = "Batch Upload Complete", "s7-check"
+    else:
+        message = f"Batch upload '{job.name}' failed: {job.error_message}"
+        title, icon = "Batch Upload Failed", "s7-close"
+
+    UserNotification.add_notification(
+        user=job.created_by,
+        title=title,
+        message=message,
+        notification_type="info",
+        icon=icon,
+        link=reverse("battycoda_app:recording_list"),
+    )
+
+
+@shared_task(bind=True, name="battycoda_app.audio.task_modules.batch_upload_tasks.process_batch_upload_job")
+def process_batch_upload_job(self, job_id):
+    """
+    Ingest the archives of a BatchUploadJob into recordings.
+
+    Args:
+        job_id: ID of the BatchUploadJob model
+
+    Returns:
+        dict: Final counts of the job
+    """
+    from ...models.batch_upload import BatchUploadJob
+    from ...views_batch_upload.zip_extraction import list_wav_members
+
+    job = BatchUploadJob.objects.select_related("created_by", "group", "species", "project").get(id=job_id)
+    if job.status != "pending":
+        return {"status": "skipped", "message": f"Job is {job.status}"}
+
+    job.mark_started(self.request.id)
+    upload_dir = os.path.dirname(job.wav_zip_path)
+    work_dir = os.path.join(upload_dir, "members")
+    pending = queue.Queue()
+    futures = []
+
+    try:
+        with zipfile.ZipFile(job.wav_zip_path, "r") as wav_zip:
+            wav_members = list_wav_members(wav_zip)
+        pickle_members = _read_pickle_members(job)
+
+        job.total_files = len(wav_members)
+        job.save_counts()
+
+        for index, member_name in enumerate(wav_members):
+            pending.put((index, member_name))
+        results = queue.Queue()
+
+        workers = max(1, min(settings.BATCH_UPLOAD_WORKERS, len(wav_members)))
+        if workers == 1:
+            # Ingest in this thread; also keeps tests inside their transaction
+            _ingest_worker(job, pending, results, pickle_members, work_dir, close_connection=False)
+        else:
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"batch-upload-{job.id}")
+            futures = [
+                executor.submit(_ingest_worker, job, pending, results, pickle_members, work_dir) for _ in range(workers)
+            ]
+            executor.shutdown(wait=False)
+
+        last_update = time.monotonic()
+        while job.processed_files < job.total_files:
+            try:
+                counts = results.get(timeout=1)
+            except queue.Empty:
+                if all(future.done() for future in futures):
+                    break  # Workers exited early (e.g. cancelled); don't wait forever
+                continue
+
+            job.processed_files += 1
+            for key, value in counts.items():
+                setattr(job, key, getattr(job, key) + value)
+
+            now = time.monotonic()
+            if now - last_update >= PROGRESS_UPDATE_INTERVAL:
+                last_update = now
+                job.save_counts()
+                job.refresh_from_db(fields=["status"])
+                if job.status == "cancelled":
+                    _drain(pending)
+
+        for future in futures:
+            future.result()
+
+        job.save_counts()
+        job.refresh_from_db(fields=["status"])
+        if job.status != "cancelled":
+            job.mark_completed()
+            _notify(job)
+
+    except Exception as e:
+        logger.error(f"Batch upload {job.id} failed: {e}")
+        # Let running workers finish before their work directory and archives are removed
+        _drain(pending)
+        wait(futures)
+        job.mark_failed(str(e))
+        _notify(job)
+    finally:
+        safe_cleanup_dir(work_dir, "batch upload work directory")
+        safe_remove_file(job.wav_zip_path, "batch upload WAV ZIP")
+        safe_remove_file(job.pickle_zip_path, "batch upload pickle ZIP")
+        try:
+            os.rmdir(upload_dir)
+        except OSError:
+            pass
+
+    return {
+        "status": job.status,
+        "success_count": job.success_count,
+        "error_count": job.error_count,
+        "segmented_count": job.segmented_count,
+        "split_count": job.split_count,
+    }
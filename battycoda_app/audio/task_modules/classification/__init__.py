@@ -1,14 +1,17 @@
 """Classification tasks package."""
 
 from .dummy_classifier import run_dummy_classifier
+from .multi_recording import run_multi_recording_classification
 from .r_server_client import process_classification_batch
-from .result_processing import combine_features_files, save_batch_results
+from .result_processing import FeaturesFileCombiner, combine_features_files, save_batch_results
 from .run_classification import run_call_classification
 
 __all__ = [
     "run_call_classification",
+    "run_multi_recording_classification",
     "run_dummy_classifier",
     "process_classification_batch",
     "combine_features_files",
+    "FeaturesFileCombiner",
     "save_batch_results",
 ]
@@ -0,0 +1,246 @@
+"""
+Multi-recording classification task for BattyCoda.
+
+Classifies the segments of many ClassificationRuns (one per segmentation) as one
+job. The R server is checked and the model located once, the segments of all
+runs are sent in large batches that span recordings, and the results of each
+batch are saved back to the run their segment belongs to. A run is completed as
+soon as its last segment is classified.
+"""
+
+import logging
+import os
+from itertools import groupby, islice
+
+from celery import shared_task
+
+from ....utils_modules.cleanup import safe_cleanup_dir, safe_remove_file
+from ....utils_modules.path_utils import get_local_tmp
+from ..classification_utils import (
+    check_r_server_connection,
+    get_call_types,
+    get_segments,
+    heartbeat_classification_runs,
+    update_classification_run_status,
+)
+from .dummy_classifier import run_dummy_classifier
+from .r_server_client import classify_segment_files, write_segment_files
+from .result_processing import FeaturesFileCombiner, save_batch_results
+from .run_classification import _get_default_classifier, _get_model_path
+
+logger = logging.getLogger(__name__)
+
+# Segments sent to the R server per request, across recordings
+MULTI_RECORDING_BATCH_SIZE = 200
+
+# Seconds to wait for the R server to classify one batch
+MULTI_RECORDING_REQUEST_TIMEOUT = 300
+
+
+class _RunState:
+    """Progress of one run within a multi-recording job."""
+
+    def __init__(self, run, segments, calls):
+        self.run = run
+        self.recording = run.segmentation.recording
+        self.segments = segments
+        self.calls = calls
+        self.total = segments.count()
+        self.done = 0
+        self.failed = False
+        self.features = FeaturesFileCombiner(run)
+
+    def fail(self, message):
+        self.failed = True
+        update_classification_run_status(self.run, "failed", message)
+
+
+def _segment_stream(states):
+    """Yield (state, segment) for the segments of every run, one recording after the other."""
+    for state in states:
+        for segment in state.segments.order_by("onset").iterator():
+            if state.failed:
+                break
+            yield state, segment
+
+
+def _batches(stream, size):
+    while batch := list(islice(stream, size)):
+        yield batch
+
+
+@shared_task(
+    bind=True, name="battycoda_app.audio.task_modules.classification.multi_recording.run_multi_recording_classification"
+)
+def run_multi_recording_classification(self, classification_run_ids):
+    """
+    Classify the segments of several ClassificationRuns that share a classifier as one job.
+
+    Args:
+        classification_run_ids: IDs of the ClassificationRuns
+
+    Returns:
+        dict: Result with the IDs of the completed and failed runs
+    """
+    from battycoda_app.models.classification import ClassificationRun, Classifier
+
+    runs = list(
+        ClassificationRun.objects.filter(id__in=classification_run_ids)
+        .select_related("segmentation__recording__species", "classifier")
+        .order_by("segmentation__recording_id", "id")
+    )
+    if not runs:
+        return {"status": "error", "message": "No classification runs found"}
+
+    classifier = runs[0].classifier or _get_default_classifier(Classifier)
+    if classifier and (classifier.name == "Dummy Classifier" or not classifier.service_url):
+        for run in runs:
+            run_dummy_classifier(run.id)
+        return {"status": "success", "message": f"Processed {len(runs)} runs with dummy classifier"}
+
+    states = []
+    try:
+        for run in runs:
+            update_classification_run_status(run, "in_progress", progress=0)
+
+        error = None
+        if not classifier:
+            error = "No classifier specified and default classifier not found"
+        else:
+            _, error = check_r_server_connection(classifier.service_url)
+        if error:
+            for run in runs:
+                update_classification_run_status(run, "failed", error)
+            return {"status": "error", "message": error}
+
+        model_path_for_r_server = _get_model_path(classifier)
+        endpoint = f"{classifier.service_url}{classifier.endpoint}"
+
+        calls_by_species = {}
+        for run in runs:
+            recording = run.segmentation.recording
+            if not recording.wav_file or not os.path.exists(recording.wav_file.path):
+                update_classification_run_status(run, "failed", f"WAV file not found for recording {recording.id}")
+                continue
+
+            segments, seg_error = get_segments(recording, run.segmentation)
+            if not segments:
+                update_classification_run_status(run, "failed", seg_error)
+                continue
+
+            if recording.species_id not in calls_by_species:
+                calls_by_species[recording.species_id] = get_call_types(recording.species)
+            calls, call_error = calls_by_species[recording.species_id]
+            if not calls:
+                update_classification_run_status(run, "failed", call_error)
+                continue
+
+            states.append(_RunState(run, segments, calls))
+
+        total_segments = 0
+        stream = _segment_stream(states)
+        for batch_index, batch in enumerate(_batches(stream, MULTI_RECORDING_BATCH_SIZE)):
+            batch = [(state, segment) for state, segment in batch if not state.failed]
+            if batch:
+                _process_batch(batch_index, batch, [run.id for run in runs], endpoint, model_path_for_r_server)
+                total_segments += len(batch)
+
+        # Runs whose segments changed while they were classified
+        for state in states:
+            if not state.failed and state.run.status != "completed":
+                _finish_run(state)
+
+    except Exception as e:
+        logger.exception("Multi-recording classification failed")
+        for run in runs:
+            if run.status not in ("completed", "failed"):
+                update_classification_run_status(run, "failed", str(e))
+        return {"status": "error", "message": str(e)}
+
+    completed = [state.run.id for state in states if state.run.status == "completed"]
+    failed = [run.id for run in runs if run.status == "failed"]
+
+    return {
+        "status": "success" if completed or not failed else "error",
+        "message": (
+            f"Successfully processed {total_segments} segments of {len(completed)} runs "
+            f"using classifier: {classifier.name}"
+        ),
+        "completed_run_ids": completed,
+        "failed_run_ids": failed,
+    }
+
+
+def _process_batch(batch_index, batch, run_ids, endpoint, model_path_for_r_server):
+    """
+    Classify one batch of (state, segment) pairs and save the results to their runs.
+
+    A batch the R server fails on fails the runs with segments in it; the job
+    goes on with the other runs. Every batch heartbeats the job's runs, so
+    they keep their scheduler slot.
+    """
+    import pandas as pd
+
+    heartbeat_classification_runs(run_ids)
+
+    shared_tmp_dir = get_local_tmp()
+    batch_name = f"batch_{batch_index}_multi_{run_ids[0]}"
+    batch_dir = os.path.join(shared_tmp_dir, batch_name)
+    os.makedirs(batch_dir, exist_ok=True)
+
+    batch_states = list(dict.fromkeys(state for state, _ in batch))
+
+    try:
+        # The batch's segments come one recording after the other; each recording is read in one pass
+        segment_maps = {}
+        for state, items in groupby(batch, key=lambda item: item[0]):
+            segment_maps[state] = write_segment_files(batch_dir, state.recording, [segment for _, segment in items])
+
+        segment_map = {filename: meta for state_map in segment_maps.values() for filename, meta in state_map.items()}
+        batch_results, _, features_file = classify_segment_files(
+            batch_index,
+            batch_name,
+            batch_dir,
+            segment_map,
+            endpoint,
+            model_path_for_r_server,
+            timeout=MULTI_RECORDING_REQUEST_TIMEOUT,
+        )
+    except Exception as e:
+        logger.error(f"Multi-recording batch {batch_index + 1} failed: {str(e)}")
+        for state in batch_states:
+            state.fail(str(e))
+        return
+    finally:
+        safe_cleanup_dir(batch_dir, f"classification batch {batch_index}")
+
+    # Fan the results out to the runs of their segments
+    state_of_segment = {segment.id: state for state, segment in batch}
+    for state in batch_states:
+        results = [result for result in batch_results if state_of_segment.get(result[0]) is state]
+        save_batch_results(results, state.run, state.segments, state.calls)
+
+    if features_file:
+        try:
+            features = pd.read_csv(features_file)
+            for state in batch_states:
+                state.features.add_rows(features, segment_maps[state])
+        except (IOError, ValueError) as features_error:
+            logger.warning(f"Could not read features file {features_file}: {features_error}")
+        finally:
+            safe_remove_file(features_file, "batch features file")
+
+    for state in batch_states:
+        state.done += len(segment_maps[state])
+        if state.done < state.total:
+            update_classification_run_status(state.run, "in_progress", progress=100 * state.done / state.total)
+        else:
+            _finish_run(state)
+
+
+def _finish_run(state):
+    features_path = state.features.finish()
+    if features_path:
+        state.run.features_file = features_path
+        state.run.save(update_fields=["features_file"])
+    update_classification_run_status(state.run, "completed", progress=100)
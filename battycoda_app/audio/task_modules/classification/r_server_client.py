@@ -12,7 +12,7 @@ import soundfile as sf
 
 from ....utils_modules.cleanup import safe_cleanup_dir
 from ....utils_modules.path_utils import get_local_tmp, get_r_server_path
-from ..base import extract_audio_segment
+from ..base import extract_audio_segments
 
 logger = logging.getLogger(__name__)
 
@@ -51,92 +51,136 @@ def process_classification_batch(
     shared_tmp_dir = get_local_tmp()
     os.makedirs(shared_tmp_dir, exist_ok=True)
 
-    batch_dir_name = f"batch_{batch_index}_{classification_run.id}"
-    batch_dir = os.path.join(shared_tmp_dir, batch_dir_name)
+    batch_name = f"batch_{batch_index}_{classification_run.id}"
+    batch_dir = os.path.join(shared_tmp_dir, batch_name)
     os.makedirs(batch_dir, exist_ok=True)
 
     try:
-        segment_map = {}
+        segment_map = write_segment_files(batch_dir, recording, batch_segments)
+        return classify_segment_files(
+            batch_index, batch_name, batch_dir, segment_map, endpoint, model_path_for_r_server
+        )
 
-        for segment in batch_segments:
-            segment_data, sample_rate = extract_audio_segment(recording.wav_file.path, segment.onset, segment.offset)
+    finally:
+        safe_cleanup_dir(batch_dir, f"classification batch {batch_index}")
 
-            segment_filename = f"segment_{segment.id}.wav"
-            segment_path = os.path.join(batch_dir, segment_filename)
 
-            sf.write(segment_path, segment_data, samplerate=sample_rate)
+def write_segment_files(batch_dir, recording, segments):
+    """
+    Write the audio of a recording's segments to WAV files for the R server.
 
-            task_id = None
-            if hasattr(segment, "task") and segment.task:
-                task_id = segment.task.id
+    Args:
+        batch_dir: Directory to write the files to
+        recording: Recording instance the segments belong to
+        segments: Segment objects to write
 
-            segment_metadata = {
-                "segment_id": segment.id,
-                "task_id": task_id,
-                "start_time": segment.onset,
-                "end_time": segment.offset,
-                "recording_name": recording.name,
-                "wav_filename": os.path.basename(recording.wav_file.name) if recording.wav_file else "unknown.wav",
-            }
-            segment_map[segment_filename] = segment_metadata
+    Returns:
+        Dict mapping the written filenames to segment metadata
+    """
+    segment_map = {}
+    wav_filename = os.path.basename(recording.wav_file.name) if recording.wav_file else "unknown.wav"
+
+    segments = list(segments)
+    segment_audio, sample_rate = extract_audio_segments(
+        recording.wav_file.path, [(segment.onset, segment.offset) for segment in segments]
+    )
+
+    for segment, segment_data in zip(segments, segment_audio, strict=True):
+        segment_filename = f"segment_{segment.id}.wav"
+        segment_path = os.path.join(batch_dir, segment_filename)
+
+        sf.write(segment_path, segment_data, samplerate=sample_rate)
+
+        task_id = None
+        if hasattr(segment, "task") and segment.task:
+            task_id = segment.task.id
+
+        segment_metadata = {
+            "segment_id": segment.id,
+            "task_id": task_id,
+            "start_time": segment.onset,
+            "end_time": segment.offset,
+            "recording_name": recording.name,
+            "wav_filename": wav_filename,
+        }
+        segment_map[segment_filename] = segment_metadata
 
-        r_server_path = get_r_server_path(batch_dir)
+    return segment_map
 
-        features_filename = f"batch_{batch_index}_{classification_run.id}_features.csv"
-        features_path_local = os.path.join(shared_tmp_dir, features_filename)
-        features_path_r_server = get_r_server_path(features_path_local)
 
-        params = {
-            "wav_folder": r_server_path,
-            "model_path": model_path_for_r_server,
-            "export_features_path": features_path_r_server,
-        }
+def classify_segment_files(
+    batch_index, batch_name, batch_dir, segment_map, endpoint, model_path_for_r_server, timeout=60
+):
+    """
+    Classify a directory of segment WAV files on the R server.
 
-        logger.debug(f"Calling classifier service for batch {batch_index + 1} at {endpoint}")
+    Args:
+        batch_index: Index of the batch, for messages
+        batch_name: Unique name of the batch, used for its features file
+        batch_dir: Directory holding the segment files
+        segment_map: Dict mapping filenames to segment metadata
+        endpoint: Full endpoint URL for classification
+        model_path_for_r_server: Path to model file accessible by R server
+        timeout: Seconds to wait for the R server
+
+    Returns:
+        Tuple of (batch_results, segment_map, features_file), as process_classification_batch
+    """
+    shared_tmp_dir = get_local_tmp()
+    r_server_path = get_r_server_path(batch_dir)
 
-        response = requests.post(endpoint, data=params, timeout=60)
+    features_filename = f"{batch_name}_features.csv"
+    features_path_local = os.path.join(shared_tmp_dir, features_filename)
+    features_path_r_server = get_r_server_path(features_path_local)
 
-        if response.status_code != 200:
-            raise RuntimeError(
-                f"Classifier service error for batch {batch_index + 1}: Status {response.status_code} - {response.text}"
-            )
+    params = {
+        "wav_folder": r_server_path,
+        "model_path": model_path_for_r_server,
+        "export_features_path": features_path_r_server,
+    }
 
-        prediction_data = response.json()
+    logger.debug(f"Calling classifier service for batch {batch_index + 1} at {endpoint}")
 
-        status_value = prediction_data.get("status")
-        is_success = status_value == "success" or (
-            isinstance(status_value, list) and len(status_value) > 0 and status_value[0] == "success"
+    response = requests.post(endpoint, data=params, timeout=timeout)
+
+    if response.status_code != 200:
+        raise RuntimeError(
+            f"Classifier service error for batch {batch_index + 1}: Status {response.status_code} - {response.text}"
         )
 
-        if not is_success:
-            raise ValueError(
-                f"Classifier returned error for batch {batch_index + 1}: {prediction_data.get('message', 'Unknown error')}"
-            )
+    prediction_data = response.json()
 
-        file_results = prediction_data.get("file_results", {})
+    status_value = prediction_data.get("status")
+    is_success = status_value == "success" or (
+        isinstance(status_value, list) and len(status_value) > 0 and status_value[0] == "success"
+    )
 
-        batch_results = []
-        for filename, result_data in file_results.items():
-            segment_metadata = segment_map.get(filename)
-            if segment_metadata:
-                segment_id = segment_metadata["segment_id"]
-                processed_data = {}
-                for key, value in result_data.items():
-                    if isinstance(value, list) and len(value) > 0:
-                        processed_data[key] = value[0]
-                    else:
-                        processed_data[key] = value
+    if not is_success:
+        raise ValueError(
+            f"Classifier returned error for batch {batch_index + 1}: {prediction_data.get('message', 'Unknown error')}"
+        )
 
-                if "class_probabilities" in result_data:
-                    prob_data = result_data["class_probabilities"]
-                    if isinstance(prob_data, list) and len(prob_data) > 0:
-                        processed_data["class_probabilities"] = prob_data[0]
+    file_results = prediction_data.get("file_results", {})
 
-                batch_results.append((segment_id, processed_data, segment_metadata))
+    batch_results = []
+    for filename, result_data in file_results.items():
+        segment_metadata = segment_map.get(filename)
+        if segment_metadata:
+            segment_id = segment_metadata["segment_id"]
+            processed_data = {}
+            for key, value in result_data.items():
+                if isinstance(value, list) and len(value) > 0:
+                    processed_data[key] = value[0]
+                else:
+                    processed_data[key] = value
 
-        features_file = features_path_local if os.path.exists(features_path_local) else None
+            if "class_probabilities" in result_data:
+                prob_data = result_data["class_probabilities"]
+                if isinstance(prob_data, list) and len(prob_data) > 0:
+                    processed_data["class_probabilities"] = prob_data[0]
 
-        return batch_results, segment_map, features_file
+            batch_results.append((segment_id, processed_data, segment_metadata))
 
-    finally:
-        safe_cleanup_dir(batch_dir, f"classification batch {batch_index}")
+    features_file = features_path_local if os.path.exists(features_path_local) else None
+
+    return batch_results, segment_map, features_file
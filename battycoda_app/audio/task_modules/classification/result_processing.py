@@ -15,6 +15,166 @@ from ....utils_modules.path_utils import get_local_tmp
 logger = logging.getLogger(__name__)
 
 
+# Segment metadata columns added to the classifier's feature columns
+ENHANCED_FEATURE_COLUMNS = [
+    "task_id",
+    "call_start_time",
+    "call_end_time",
+    "call_duration",
+    "recording_name",
+    "original_wav_file",
+]
+
+
+def segment_metadata_frame(segment_metadata):
+    """
+    Build the metadata columns of the features export as a DataFrame keyed by ``sound.files``.
+
+    Args:
+        segment_metadata: Dict mapping segment filenames to segment metadata
+    """
+    import pandas as pd
+
+    metadata = pd.DataFrame.from_records(
+        [
+            (
+                sound_file,
+                meta["task_id"],
+                meta["start_time"],
+                meta["end_time"],
+                meta["recording_name"],
+                meta["wav_filename"],
+            )
+            for sound_file, meta in segment_metadata.items()
+        ],
+        columns=["sound.files", "task_id", "call_start_time", "call_end_time", "recording_name", "original_wav_file"],
+    )
+    metadata.insert(4, "call_duration", metadata["call_end_time"] - metadata["call_start_time"])
+    return metadata
+
+
+def enhance_features(features, metadata):
+    """
+    Add segment metadata columns to a batch of classifier features.
+
+    The metadata is merged on ``sound.files``; rows without metadata get empty
+    times and "Unknown" names. The new columns are inserted after ``selec``
+    (or ``sound.files``).
+
+    Args:
+        features: DataFrame of features with a ``sound.files`` column
+        metadata: DataFrame from segment_metadata_frame()
+
+    Returns:
+        DataFrame with the enhanced columns
+
+    Raises:
+        KeyError: If features has no ``sound.files`` column
+    """
+    enhanced = features.merge(metadata, on="sound.files", how="left", validate="many_to_one")
+    enhanced[["recording_name", "original_wav_file"]] = enhanced[["recording_name", "original_wav_file"]].fillna(
+        "Unknown"
+    )
+
+    original_cols = features.columns.tolist()
+    insert_index = 2
+    if "selec" in original_cols:
+        insert_index = original_cols.index("selec") + 1
+    elif "sound.files" in original_cols:
+        insert_index = original_cols.index("sound.files") + 1
+
+    return enhanced[original_cols[:insert_index] + ENHANCED_FEATURE_COLUMNS + original_cols[insert_index:]]
+
+
+def _load_batch_features(features_file):
+    """Read a batch features CSV and remove it; returns None if it cannot be read."""
+    import pandas as pd
+
+    try:
+        return pd.read_csv(features_file)
+    except (IOError, ValueError) as features_error:
+        logger.warning(f"Could not read features file {features_file}: {features_error}")
+        return None
+    finally:
+        safe_remove_file(features_file, "batch features file")
+
+
+class FeaturesFileCombiner:
+    """
+    Builds the combined features export of a classification run one batch at a time.
+
+    Each batch features file is enhanced with its segment metadata, appended to
+    the combined CSV and removed as soon as its batch completes, so memory use
+    does not grow with the run and nothing is left to do when the run finishes.
+    The first batch written fixes the columns of the export.
+    """
+
+    def __init__(self, classification_run):
+        features_export_filename = f"classification_run_{classification_run.id}_features.csv"
+        self.path = os.path.join(get_local_tmp(), features_export_filename)
+        self.columns = None
+
+    def add(self, features_file, segment_metadata):
+        """Append one batch features file to the combined export and remove it.
+
+        Args:
+            features_file: Path to the batch features CSV
+            segment_metadata: Dict mapping the batch's segment filenames to segment metadata
+        """
+        features = _load_batch_features(features_file)
+        if features is not None:
+            self.add_frame(features, segment_metadata_frame(segment_metadata))
+
+    def add_rows(self, features, segment_metadata):
+        """Append the rows of an already loaded features file that belong to the given segments.
+
+        Used when one batch features file covers the segments of several runs.
+
+        Args:
+            features: DataFrame of a batch features file
+            segment_metadata: Dict mapping this run's segment filenames to segment metadata
+        """
+        try:
+            rows = features[features["sound.files"].isin(list(segment_metadata))]
+        except KeyError as features_error:
+            logger.warning(f"Could not add features rows to {self.path}: {features_error}")
+            return
+        if not rows.empty:
+            self.add_frame(rows, segment_metadata_frame(segment_metadata))
+
+    def add_frame(self, features, metadata):
+        """Enhance a loaded features DataFrame with segment metadata and append it to the export.
+
+        Args:
+            features: DataFrame of a features file
+            metadata: Segment metadata frame from segment_metadata_frame, which may
+                cover more segments than the features
+        """
+        try:
+            self._write(enhance_features(features, metadata))
+        except (IOError, ValueError, KeyError) as features_error:
+            logger.warning(f"Could not add features to {self.path}: {features_error}")
+
+    def _write(self, enhanced):
+        if self.columns is None:
+            self.columns = enhanced.columns.tolist()
+            enhanced.to_csv(self.path, index=False)
+        else:
+            enhanced.reindex(columns=self.columns).to_csv(self.path, mode="a", header=False, index=False)
+
+    def finish(self):
+        """
+        Return the path to the combined features file.
+
+        Returns:
+            Path to combined features file, or None if no batch was written
+        """
+        if self.columns is None:
+            return None
+        logger.info(f"Enhanced features exported: {self.path}")
+        return self.path
+
+
 def combine_features_files(all_features_files, all_segment_metadata, classification_run):
     """
     Combine all batch features files into a single enhanced export.
@@ -30,85 +190,13 @@ def combine_features_files(all_features_files, all_segment_metadata, classificat
     if not all_features_files:
         return None
 
-    try:
-        import pandas as pd
-
-        shared_tmp_dir = get_local_tmp()
-        features_export_filename = f"classification_run_{classification_run.id}_features.csv"
-        combined_features_path = os.path.join(shared_tmp_dir, features_export_filename)
-
-        all_features_data = []
-        for features_file in all_features_files:
-            try:
-                df = pd.read_csv(features_file)
-                all_features_data.append(df)
-            except (IOError, ValueError) as read_error:
-                logger.warning(f"Could not read features file {features_file}: {read_error}")
-
-        if all_features_data:
-            combined_features = pd.concat(all_features_data, ignore_index=True)
-
-            enhanced_columns = []
-            for _index, row in combined_features.iterrows():
-                sound_file = row["sound.files"]
-                if sound_file in all_segment_metadata:
-                    metadata = all_segment_metadata[sound_file]
-                    enhanced_columns.append(
-                        {
-                            "task_id": metadata["task_id"],
-                            "call_start_time": metadata["start_time"],
-                            "call_end_time": metadata["end_time"],
-                            "call_duration": metadata["end_time"] - metadata["start_time"],
-                            "recording_name": metadata["recording_name"],
-                            "original_wav_file": metadata["wav_filename"],
-                        }
-                    )
-                else:
-                    enhanced_columns.append(
-                        {
-                            "task_id": None,
-                            "call_start_time": None,
-                            "call_end_time": None,
-                            "call_duration": None,
-                            "recording_name": "Unknown",
-                            "original_wav_file": "Unknown",
-                        }
-                    )
-
-            enhanced_df = pd.DataFrame(enhanced_columns)
-
-            original_cols = combined_features.columns.tolist()
-
-            insert_index = 2
-            if "selec" in original_cols:
-                insert_index = original_cols.index("selec") + 1
-            elif "sound.files" in original_cols:
-                insert_index = original_cols.index("sound.files") + 1
-
-            new_cols = [
-                "task_id",
-                "call_start_time",
-                "call_end_time",
-                "call_duration",
-                "recording_name",
-                "original_wav_file",
-            ]
-            final_cols = original_cols[:insert_index] + new_cols + original_cols[insert_index:]
-
-            final_features = pd.concat([combined_features, enhanced_df], axis=1)
-            final_features = final_features[final_cols]
-
-            final_features.to_csv(combined_features_path, index=False)
-            logger.info(f"Enhanced features exported: {combined_features_path}")
-
-        for features_file in all_features_files:
-            safe_remove_file(features_file, "batch features file")
-
-        return combined_features_path
-
-    except (IOError, ValueError, KeyError) as features_error:
-        logger.warning(f"Error combining features files: {features_error}")
-        return None
+    combiner = FeaturesFileCombiner(classification_run)
+    metadata = segment_metadata_frame(all_segment_metadata)
+    for features_file in all_features_files:
+        features = _load_batch_features(features_file)
+        if features is not None:
+            combiner.add_frame(features, metadata)
+    return combiner.finish()
 
 
 def save_batch_results(batch_results, classification_run, segments, calls):
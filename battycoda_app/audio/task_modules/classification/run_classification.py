@@ -15,11 +15,12 @@ from ..classification_utils import (
     check_r_server_connection,
     get_call_types,
     get_segments,
+    heartbeat_classification_runs,
     update_classification_run_status,
 )
 from .dummy_classifier import run_dummy_classifier
 from .r_server_client import process_classification_batch
-from .result_processing import combine_features_files, save_batch_results
+from .result_processing import FeaturesFileCombiner, save_batch_results
 
 logger = logging.getLogger(__name__)
 
@@ -128,8 +129,7 @@ def _process_all_batches(classification_run, classifier, recording, segments, ca
     total_segments = segments.count()
     segment_list = list(segments)
 
-    all_features_files = []
-    all_segment_metadata = {}
+    features_combiner = FeaturesFileCombiner(classification_run)
     total_saved = 0
 
     model_path_for_r_server = _get_model_path(classifier)
@@ -145,6 +145,9 @@ def _process_all_batches(classification_run, classifier, recording, segments, ca
 
         batch_segments = segment_list[start_idx:end_idx]
 
+        # Keep the run's scheduler slot however long classification takes
+        heartbeat_classification_runs([classification_run.id])
+
         batch_results, segment_map, features_file = process_classification_batch(
             batch_index,
             batch_segments,
@@ -157,10 +160,9 @@ def _process_all_batches(classification_run, classifier, recording, segments, ca
             start_idx,
         )
 
-        all_segment_metadata.update(segment_map)
-
+        # Merge this batch's features into the combined export right away
         if features_file:
-            all_features_files.append(features_file)
+            features_combiner.add(features_file, segment_map)
 
         # Save batch results immediately to avoid memory buildup
         saved_count = save_batch_results(batch_results, classification_run, segments, calls)
@@ -171,7 +173,7 @@ def _process_all_batches(classification_run, classifier, recording, segments, ca
         update_classification_run_status(classification_run, status="in_progress", progress=batch_progress)
         logger.debug(f"Batch {batch_index + 1}/{num_batches} complete: {total_saved}/{total_segments} results saved")
 
-    combined_features_path = combine_features_files(all_features_files, all_segment_metadata, classification_run)
+    combined_features_path = features_combiner.finish()
 
     if combined_features_path and os.path.exists(combined_features_path):
         classification_run.features_file = combined_features_path
@@ -8,6 +8,8 @@ import logging
 
 import requests
 
+from ...utils_modules.progress_reporter import ProgressReporter
+
 logger = logging.getLogger(__name__)
 
 # Centralized configuration
@@ -27,22 +29,34 @@ class RServerTimeout(Exception):
 
 
 def update_classification_run_status(classification_run, status, message=None, progress=None):
-    """Update a classification run's status and related fields."""
-    update_fields = []
-    if status:
-        classification_run.status = status
-        update_fields.append("status")
-    if message:
-        classification_run.error_message = message
-        update_fields.append("error_message")
-    if progress is not None:
-        classification_run.progress = progress
-        update_fields.append("progress")
-    classification_run.save(update_fields=update_fields)
+    """
+    Update a classification run's (or training job's) status and related fields.
+
+    Progress updates are throttled by the run's ProgressReporter; status changes
+    and messages that come with them are written immediately.
+    """
+    reporter = ProgressReporter.for_job(classification_run, message_field="error_message")
+    reporter.update(progress=progress, status=status, message=message)
 
     return classification_run
 
 
+def heartbeat_classification_runs(run_ids):
+    """
+    Record that the worker classifying these runs is still alive.
+
+    The queue processor frees the slot of runs not heard from for
+    CLASSIFICATION_SLOT_TIMEOUT, so a long classification job heartbeats its
+    unfinished runs as it goes.
+    """
+    from django.utils import timezone
+
+    from ...models.classification import ClassificationRun
+    from .queue_processor import ACTIVE_STATUSES
+
+    ClassificationRun.objects.filter(id__in=run_ids, status__in=ACTIVE_STATUSES).update(heartbeat_at=timezone.now())
+
+
 def check_r_server_connection(service_url=R_SERVER_URL):
     """Check if the R server is available."""
     try:
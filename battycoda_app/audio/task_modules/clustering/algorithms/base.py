@@ -9,6 +9,7 @@ from sklearn.metrics import silhouette_score
 from sklearn.preprocessing import StandardScaler
 
 from .....models.clustering import ClusteringRun
+from .....utils_modules.progress_reporter import ProgressReporter
 from ..feature_extraction import get_project_segments_features, get_segments_features
 from ..results import store_clustering_results
 
@@ -182,13 +183,8 @@ class BaseClusteringRunner:
         return len(unique_labels)
 
     def _update_progress(self, progress, status=None, message=None):
-        """Update clustering run progress with optional message."""
-        self.clustering_run.progress = progress
-        if status:
-            self.clustering_run.status = status
-        if message:
-            self.clustering_run.progress_message = message
-        self.clustering_run.save()
+        """Update clustering run progress with optional message (database writes are throttled)."""
+        ProgressReporter.for_job(self.clustering_run).update(progress=progress, status=status, message=message)
 
     def _handle_error(self, error):
         """Handle clustering errors."""
@@ -1,78 +1,264 @@
 """
-Queue processor for managing sequential classification runs.
+Queue processor for classification runs.
 
-This module handles the database-based queue system to prevent
-classification runs from running concurrently and causing resource conflicts.
+Runs are queued in the database and dispatched by a slot-based scheduler: each
+classifier backend (an R server, or the built-in dummy classifier) runs at
+most a configured number of runs at once (settings.CLASSIFICATION_SLOTS), so
+runs don't overload a backend, while runs on different backends, or a
+backend's free slots, don't wait for each other.
+
+Runs sharing a job_group (e.g. all recordings of a species classified at once)
+are scheduled as one unit: they take a single slot and are classified together
+by run_multi_recording_classification.
 """
 
 import logging
+from collections import Counter, defaultdict, deque
+from datetime import timedelta
 
 from celery import shared_task
-from django.db import transaction
+from celery.signals import task_postrun
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, F
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+# Tasks that run a ClassificationRun; when one finishes, the next queued run is started
+CLASSIFICATION_TASK_NAMES = {
+    "battycoda_app.audio.task_modules.classification.run_classification.run_call_classification",
+    "battycoda_app.audio.task_modules.classification.dummy_classifier.run_dummy_classifier",
+    "battycoda_app.audio.task_modules.classification.multi_recording.run_multi_recording_classification",
+}
+
+# Statuses of runs that hold a slot of their backend
+ACTIVE_STATUSES = ("pending", "in_progress")
+
+# Backend of the dummy classifier, and of classifiers without an R server
+DUMMY_BACKEND = "dummy"
+
+# Postgres advisory lock held while scheduling, so two schedulers can't fill the same slot
+SCHEDULER_LOCK_ID = 0x62617463  # "batc"
+
+# Window over which get_queue_status averages the wait of started runs
+RECENT_WAIT_WINDOW = timedelta(hours=1)
+
+
+def classifier_backend(name, service_url):
+    """Return the backend a classifier's runs are executed on, as named in settings.CLASSIFICATION_SLOTS."""
+    # Same rule run_call_classification uses to hand a run to the dummy classifier
+    if name == "Dummy Classifier" or not service_url:
+        return DUMMY_BACKEND
+    return service_url
+
+
+def backend_slots(backend):
+    """Return how many runs a backend may run at once."""
+    return settings.CLASSIFICATION_SLOTS.get(backend, settings.CLASSIFICATION_SLOTS_DEFAULT)
+
+
+def _run_rows(queryset):
+    """Return the scheduling fields of runs, with the backend each run is executed on."""
+    rows = list(
+        queryset.values(
+            "id",
+            "group_id",
+            "job_group",
+            "created_at",
+            "classifier_id",
+            "classifier__name",
+            "classifier__service_url",
+        )
+    )
+
+    default_backend = None
+    if any(row["classifier_id"] is None for row in rows):
+        # Runs without a classifier use the default one (see run_call_classification)
+        from ...models.classification import Classifier
+        from .classification.run_classification import _get_default_classifier
+
+        default = _get_default_classifier(Classifier)
+        default_backend = classifier_backend(default.name, default.service_url) if default else DUMMY_BACKEND
+
+    for row in rows:
+        if row["classifier_id"] is None:
+            row["backend"] = default_backend
+        else:
+            row["backend"] = classifier_backend(row["classifier__name"], row["classifier__service_url"])
+        # The runs of a job group are scheduled together, as one unit
+        row["unit"] = row["job_group"] or row["id"]
+    return rows
+
+
+def _slot_holders(queryset):
+    """
+    Filter runs down to those holding a slot.
+
+    Runs not heard from (by heartbeat, or else since dispatch) for
+    CLASSIFICATION_SLOT_TIMEOUT are presumed dead.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.CLASSIFICATION_SLOT_TIMEOUT)
+    return queryset.alias(last_seen=Coalesce("heartbeat_at", "started_at")).filter(
+        status__in=ACTIVE_STATUSES, last_seen__gte=cutoff
+    )
+
+
+def _pick_runs(queued, active):
+    """
+    Choose the queued runs to start now.
+
+    Each backend gets as many units (single runs or job groups) as it has free
+    slots. Groups take turns for them: the next unit comes from the group with
+    the fewest units active or just picked, oldest first, so one group's large
+    batch doesn't hold up the runs of everyone else.
+
+    Args:
+        queued: Rows of the queued runs, oldest first
+        active: Rows of the runs holding a slot
+
+    Returns:
+        list: Lists of the IDs of the runs of each unit to start
+    """
+    active_units = {(row["backend"], row["group_id"], row["unit"]) for row in active}
+    busy = Counter(backend for backend, _, _ in active_units)
+    group_load = Counter(group_id for _, group_id, _ in active_units)
+
+    # backend -> group -> unit -> run IDs, units in the order of their oldest run
+    waiting = defaultdict(lambda: defaultdict(dict))
+    created = {}
+    for row in queued:
+        waiting[row["backend"]][row["group_id"]].setdefault(row["unit"], []).append(row["id"])
+        created.setdefault(row["unit"], row["created_at"])
+
+    picked = []
+    for backend, groups in waiting.items():
+        groups = {group_id: deque(units.items()) for group_id, units in groups.items()}
+        free = backend_slots(backend) - busy[backend]
+        while free > 0 and groups:
+            group_id = min(groups, key=lambda g: (group_load[g], created[groups[g][0][0]]))
+            picked.append(groups[group_id].popleft()[1])
+            if not groups[group_id]:
+                del groups[group_id]
+            group_load[group_id] += 1
+            free -= 1
+    return picked
+
+
+def _dispatch(runs):
+    """Send a unit of runs to the task for their classifier."""
+    if len(runs) > 1 or runs[0].job_group:
+        from .classification.multi_recording import run_multi_recording_classification
+
+        return run_multi_recording_classification.delay([run.id for run in runs])
+
+    run = runs[0]
+    if run.classifier and run.classifier.name == "Dummy Classifier":
+        # Use the dummy classifier task directly
+        from .classification.dummy_classifier import run_dummy_classifier
+
+        return run_dummy_classifier.delay(run.id)
+
+    # For other classifiers, use the standard task
+    from .classification.run_classification import run_call_classification
+
+    return run_call_classification.delay(run.id)
+
 
 @shared_task(bind=True, name="battycoda_app.audio.task_modules.queue_processor.process_classification_queue")
 def process_classification_queue(self):
     """
-    Process the classification queue by picking up queued ClassificationRuns
-    and processing them one at a time.
+    Start as many queued ClassificationRuns as their backends have free slots.
 
-    This task should be run periodically (e.g., every 30 seconds) to
-    ensure queued classification runs are processed.
+    It runs whenever a run is queued or a classification task finishes (see
+    start_next_classification_run) and periodically from celery beat, which
+    picks up runs that were missed.
     """
     from ...models.classification import ClassificationRun
 
     try:
-        # Get the next queued run to process
         with transaction.atomic():
-            # Use select_for_update to prevent race conditions
-            queued_run = (
-                ClassificationRun.objects.select_for_update(skip_locked=True)
-                .filter(status="queued")
-                .order_by("created_at")
-                .first()
-            )
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [SCHEDULER_LOCK_ID])
 
-            if not queued_run:
+            queued = _run_rows(ClassificationRun.objects.filter(status="queued").order_by("created_at", "id"))
+            if not queued:
                 # No queued runs to process
                 return {"status": "success", "message": "No queued runs found"}
 
-            # Mark as pending before processing
-            queued_run.status = "pending"
-            queued_run.save(update_fields=["status"])
+            picked = _pick_runs(queued, _run_rows(_slot_holders(ClassificationRun.objects)))
+            if not picked:
+                return {"status": "success", "message": f"All slots busy, {len(queued)} runs waiting"}
 
-        # Now process this run outside the transaction
-        logger.info(f"Processing queued classification run: {queued_run.id} - {queued_run.name}")
+            # Lock the picked runs; one cancelled or deleted meanwhile is skipped
+            locked = {
+                run.id: run
+                for run in ClassificationRun.objects.select_for_update(skip_locked=True, of=("self",))
+                .select_related("classifier")
+                .filter(id__in=[run_id for unit in picked for run_id in unit], status="queued")
+            }
+            units = [[locked[run_id] for run_id in unit if run_id in locked] for unit in picked]
+            units = [unit for unit in units if unit]
 
-        try:
-            # Choose the appropriate task based on classifier
-            if queued_run.classifier and queued_run.classifier.name == "Dummy Classifier":
-                # Use the dummy classifier task directly
-                from .classification.dummy_classifier import run_dummy_classifier
+            # Mark as pending before processing, so the runs hold their slots
+            started_at = timezone.now()
+            for run in (run for unit in units for run in unit):
+                run.status = "pending"
+                run.started_at = started_at
+                run.save(update_fields=["status", "started_at"])
 
-                result = run_dummy_classifier.delay(queued_run.id)
-            else:
-                # For other classifiers, use the standard task
-                from .classification.run_classification import run_call_classification
+        # Now dispatch the runs outside the transaction
+        started = []
+        task_ids = []
+        for unit in units:
+            run_ids = ", ".join(str(run.id) for run in unit)
+            logger.info(f"Processing queued classification run(s): {run_ids} - {unit[0].name}")
+            try:
+                result = _dispatch(unit)
+            except Exception as task_error:
+                # Failed to start the task - mark the runs as failed
+                for run in unit:
+                    run.status = "failed"
+                    run.error_message = f"Failed to start classification task: {str(task_error)}"
+                    run.save(update_fields=["status", "error_message"])
+                logger.error(f"Error starting task for run(s) {run_ids}: {str(task_error)}")
+                continue
+            started.append(run_ids)
+            task_ids.append(result.id)
 
-                result = run_call_classification.delay(queued_run.id)
+        if units and not started:
+            return {"status": "error", "message": "Failed to start classification tasks"}
 
-            return {"status": "success", "message": f"Started processing run {queued_run.id}", "task_id": result.id}
-        except Exception as task_error:
-            # Failed to start the task - mark the run as failed
-            queued_run.status = "failed"
-            queued_run.error_message = f"Failed to start classification task: {str(task_error)}"
-            queued_run.save(update_fields=["status", "error_message"])
-            logger.error(f"Error starting task for run {queued_run.id}: {str(task_error)}")
-            raise
+        return {
+            "status": "success",
+            "message": f"Started processing run(s) {', '.join(started)}" if started else "No runs started",
+            "task_ids": task_ids,
+        }
 
     except Exception as e:
         logger.error(f"Error in queue processor: {str(e)}")
         return {"status": "error", "message": str(e)}
 
 
+def kick_classification_queue():
+    """Ask for the classification queue to be processed, e.g. after queueing runs."""
+    try:
+        process_classification_queue.delay()
+    except Exception as e:
+        # The beat poll will start the next run instead
+        logger.warning(f"Could not hand off to the classification queue: {str(e)}")
+
+
+@task_postrun.connect
+def start_next_classification_run(sender=None, **kwargs):
+    """Process the classification queue as soon as a classification task finishes, succeeded or not."""
+    if sender is None or sender.name not in CLASSIFICATION_TASK_NAMES:
+        return
+
+    kick_classification_queue()
+
+
 @shared_task(bind=True, name="battycoda_app.audio.task_modules.queue_processor.queue_classification_run")
 def queue_classification_run(self, classification_run_id):
     """
@@ -93,6 +279,9 @@ def queue_classification_run(self, classification_run_id):
 
         logger.info(f"Queued classification run: {run.id} - {run.name}")
 
+        # Start it right away if its backend has a free slot
+        transaction.on_commit(kick_classification_queue)
+
         return {"status": "success", "message": f"Run {run.id} queued for processing"}
 
     except ClassificationRun.DoesNotExist:
@@ -110,7 +299,10 @@ def get_queue_status(self):
     """
     Get the current status of the classification queue.
 
-    Returns information about queued, pending, and running classification runs.
+    Returns the number of queued, pending and running classification runs, the
+    slots and queue depth of each classifier backend, how long the oldest
+    queued run has waited, and the average wait of the runs started in the
+    last hour (in seconds).
     """
     from ...models.classification import ClassificationRun
 
@@ -119,6 +311,32 @@ def get_queue_status(self):
         pending_count = ClassificationRun.objects.filter(status="pending").count()
         in_progress_count = ClassificationRun.objects.filter(status="in_progress").count()
 
+        now = timezone.now()
+        queued = _run_rows(ClassificationRun.objects.filter(status="queued"))
+        active = _run_rows(_slot_holders(ClassificationRun.objects))
+
+        backends = {}
+        for row in active + queued:
+            backends.setdefault(
+                row["backend"],
+                {"slots": backend_slots(row["backend"]), "active": 0, "queued": 0, "oldest_wait_seconds": None},
+            )
+        # A job group holds one slot however many runs it has, as in _pick_runs
+        active_units = defaultdict(set)
+        for row in active:
+            active_units[row["backend"]].add(row["unit"])
+        for backend, units in active_units.items():
+            backends[backend]["active"] = len(units)
+        for row in queued:
+            stats = backends[row["backend"]]
+            stats["queued"] += 1
+            wait = (now - row["created_at"]).total_seconds()
+            stats["oldest_wait_seconds"] = max(stats["oldest_wait_seconds"] or 0, wait)
+
+        recent_wait = ClassificationRun.objects.filter(started_at__gte=now - RECENT_WAIT_WINDOW).aggregate(
+            wait=Avg(F("started_at") - F("created_at"))
+        )["wait"]
+
         return {
             "status": "success",
             "queue_stats": {
@@ -126,6 +344,9 @@ def get_queue_status(self):
                 "pending": pending_count,
                 "in_progress": in_progress_count,
                 "total_waiting": queued_count + pending_count,
+                "oldest_wait_seconds": max((b["oldest_wait_seconds"] or 0 for b in backends.values()), default=0),
+                "recent_wait_seconds": recent_wait.total_seconds() if recent_wait is not None else None,
+                "backends": backends,
             },
         }
 
@@ -10,6 +10,8 @@ from celery import shared_task
 from django.conf import settings
 from django.db import DatabaseError
 
+from ....utils_modules.progress_reporter import ProgressReporter
+
 logger = logging.getLogger(__name__)
 
 
@@ -58,14 +60,13 @@ def generate_hdf5_spectrogram(recording_id, celery_task_id=None):
     except DatabaseError as e:
         logger.warning(f"Could not fetch SpectrogramJob for recording {recording_id}: {e}")
 
+    reporter = ProgressReporter(job, message_field=None) if job else None
+
     def update_job_progress(progress, status=None):
-        """Helper function to update job progress"""
-        if job:
+        """Report job progress; the chunk loop calls this often, so database writes are throttled"""
+        if reporter:
             try:
-                job.progress = progress
-                if status:
-                    job.status = status
-                job.save()
+                reporter.update(progress=int(progress), status=status)
             except DatabaseError as e:
                 logger.debug(f"Could not update job progress: {e}")
 
@@ -91,7 +92,7 @@ def generate_hdf5_spectrogram(recording_id, celery_task_id=None):
             update_job_progress(100, "completed")
             if job:
                 job.output_file_path = output_path
-                job.save()
+                job.save(update_fields=["output_file_path", "updated_at"])
             # Mark recording as ready
             recording.processing_status = "ready"
             recording.save(update_fields=["processing_status"])
@@ -107,7 +108,7 @@ def generate_hdf5_spectrogram(recording_id, celery_task_id=None):
         update_job_progress(100, "completed")
         if job:
             job.output_file_path = output_path
-            job.save()
+            job.save(update_fields=["output_file_path", "updated_at"])
 
         # Mark recording as ready
         recording.processing_status = "ready"
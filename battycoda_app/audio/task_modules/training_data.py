@@ -0,0 +1,176 @@
+"""
+Training data builder for classifier training.
+
+Writes one WAV snippet per labeled task into the folder the R server trains
+from. Tasks are grouped by their source WAV file; each file is opened once and
+its windows are read in a single pass in onset order. Files are exported by a
+small pool of threads (settings.TRAINING_DATA_WORKERS).
+
+Every snippet is also kept in a cache keyed by its source file and window, so
+retraining only extracts the tasks that are new or whose window or audio
+changed. Cached snippets are hard-linked into the training folder; the label is
+only part of the linked filename, so relabelled tasks reuse their snippet too.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import soundfile as sf
+from django.conf import settings
+
+from ...utils_modules.path_utils import get_local_tmp
+from .base import read_window
+
+logger = logging.getLogger(__name__)
+
+# Directory in the tmp dir holding cached snippets (pruned by cleanup_stale_classifier_tmp)
+SNIPPET_CACHE_DIRNAME = "snippet_cache"
+
+# Cached snippets not used for this many days are removed
+SNIPPET_CACHE_MAX_AGE_DAYS = 14
+
+
+def get_snippet_cache_dir():
+    """Return the directory holding cached training snippets."""
+    return os.path.join(get_local_tmp(), SNIPPET_CACHE_DIRNAME)
+
+
+def snippet_key(wav_path, stat, onset, offset):
+    """
+    Return the cache key of one training window of a WAV file.
+
+    The key covers the file's size and modification time, so the snippets (and
+    cached features) of a replaced recording are retired.
+
+    Args:
+        wav_path: Path to the WAV file
+        stat: os.stat result of the file
+        onset: Window start in seconds
+        offset: Window end in seconds
+    """
+    identity = f"{os.path.realpath(wav_path)}:{stat.st_size}:{stat.st_mtime_ns}:{onset!r}:{offset!r}"
+    return hashlib.sha1(identity.encode()).hexdigest()
+
+
+def _place(cached_path, output_path):
+    """Put a cached snippet into the training folder, by hard link where possible."""
+    try:
+        os.link(cached_path, output_path)
+    except OSError:
+        shutil.copyfile(cached_path, output_path)
+
+
+def _export_file(wav_path, windows, output_dir, cache_dir):
+    """
+    Export the snippets of one source file.
+
+    Args:
+        wav_path: Path to the source WAV file
+        windows: (output_filename, onset, offset) tuples
+        output_dir: Training folder
+        cache_dir: Snippet cache directory
+
+    Returns:
+        tuple: (snippets written, snippets taken from the cache)
+    """
+    try:
+        stat = os.stat(wav_path)
+    except OSError:
+        logger.warning(f"WAV file path does not exist: {wav_path}")
+        return 0, 0
+
+    written = 0
+    reused = 0
+    to_extract = []
+    for output_filename, onset, offset in windows:
+        cached_path = os.path.join(cache_dir, f"{snippet_key(wav_path, stat, onset, offset)}.wav")
+        try:
+            os.utime(cached_path)
+            _place(cached_path, os.path.join(output_dir, output_filename))
+            written += 1
+            reused += 1
+        except FileNotFoundError:
+            to_extract.append((onset, offset, output_filename, cached_path))
+
+    if not to_extract:
+        return written, reused
+
+    # One forward pass over the file
+    to_extract.sort(key=lambda window: (window[0], window[1]))
+    with sf.SoundFile(wav_path) as sound_file:
+        for onset, offset, output_filename, cached_path in to_extract:
+            try:
+                data = read_window(sound_file, onset, offset)
+                if len(data) == 0:
+                    logger.warning(f"No audio data extracted for {output_filename} from {wav_path}")
+                    continue
+
+                # Write under a temporary name so a concurrent job never links a partial snippet
+                partial_path = f"{cached_path}.{os.getpid()}.{threading.get_ident()}.part"
+                sf.write(partial_path, data, samplerate=sound_file.samplerate, format="WAV")
+                os.replace(partial_path, cached_path)
+                _place(cached_path, os.path.join(output_dir, output_filename))
+                written += 1
+            except Exception as e:
+                logger.warning(f"Error extracting {output_filename} from {wav_path}: {str(e)}")
+
+    return written, reused
+
+
+def build_training_data(samples, output_dir, on_progress=None):
+    """
+    Write the training snippets of labeled tasks into a folder.
+
+    Snippets are named "<n>_<label>.wav", n counting from 1 in the order of
+    samples, as the R server expects.
+
+    Args:
+        samples: Iterable of (wav_path, onset, offset, label) tuples
+        output_dir: Folder to write the snippets to
+        on_progress: Optional callable(done, total), called as source files complete
+
+    Returns:
+        int: Number of snippets written
+    """
+    cache_dir = get_snippet_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    os.makedirs(output_dir, exist_ok=True)
+
+    by_file = defaultdict(list)
+    total = 0
+    for number, (wav_path, onset, offset, label) in enumerate(samples, start=1):
+        by_file[wav_path].append((f"{number}_{label}.wav", onset, offset))
+        total += 1
+
+    written = 0
+    reused = 0
+    done = 0
+
+    def file_done(wav_path, counts):
+        nonlocal written, reused, done
+        written += counts[0]
+        reused += counts[1]
+        done += len(by_file[wav_path])
+        if on_progress:
+            on_progress(done, total)
+
+    workers = max(1, min(settings.TRAINING_DATA_WORKERS, len(by_file)))
+    if workers == 1:
+        for wav_path, windows in by_file.items():
+            file_done(wav_path, _export_file(wav_path, windows, output_dir, cache_dir))
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="training-data") as executor:
+            futures = {
+                executor.submit(_export_file, wav_path, windows, output_dir, cache_dir): wav_path
+                for wav_path, windows in by_file.items()
+            }
+            for future in as_completed(futures):
+                file_done(futures[future], future.result())
+
+    logger.info(f"Training data: {written} of {total} snippets from {len(by_file)} files ({reused} reused from cache)")
+    return written
@@ -0,0 +1,179 @@
+"""
+Feature cache for incremental classifier training.
+
+Extracting the acoustic features of every training snippet is most of the time
+the R server spends on a training run. After each run the features of the tasks
+it extracted are kept in TrainingFeatures, so the next training over the same
+tasks only sends the snippets of new or changed tasks to be extracted; the
+cached features of the others are passed to the R server as a CSV it trains on
+as well.
+
+Features are cached per task and shared by every classifier trained on it,
+rather than tracking which tasks each classifier has already seen. A task's
+features are reused while its window and source file are unchanged (the same
+key as the snippet cache). Its label is taken from the task on every
+training, so relabelled tasks keep their features.
+"""
+
+import logging
+import os
+
+from .training_data import build_training_data, snippet_key
+
+logger = logging.getLogger(__name__)
+
+# Bump when the R server's feature extraction changes, to retire cached features
+FEATURES_VERSION = 1
+
+# Files in the training folder; the R server only reads WAV files as snippets
+CACHED_FEATURES_FILENAME = "cached_features.csv"
+EXPORTED_FEATURES_FILENAME = "extracted_features.csv"
+
+# Columns of the feature CSVs that are not features
+ID_COLUMNS = ("sound.files", "selec")
+
+
+def _clean(value):
+    # Plain Python values for the JSONField; JSON has no NaN, so missing features are stored as null
+    if hasattr(value, "item"):
+        value = value.item()
+    return None if value != value else value
+
+
+class IncrementalTrainingSet:
+    """
+    The training data of one training job, split into cached features and new snippets.
+
+    Args:
+        samples: Iterable of (task_id, wav_path, onset, offset, label) tuples
+        data_folder: Folder the R server trains from
+    """
+
+    def __init__(self, samples, data_folder):
+        from ...models.classification import TrainingFeatures
+
+        self.data_folder = data_folder
+        self.features_path = os.path.join(data_folder, CACHED_FEATURES_FILENAME)
+        self.export_path = os.path.join(data_folder, EXPORTED_FEATURES_FILENAME)
+
+        samples = list(samples)
+        stats = {}
+        signatures = {}
+        for task_id, wav_path, onset, offset, _ in samples:
+            if wav_path not in stats:
+                try:
+                    stats[wav_path] = os.stat(wav_path)
+                except OSError:
+                    stats[wav_path] = None
+            if stats[wav_path] is not None:
+                signatures[task_id] = f"{FEATURES_VERSION}:{snippet_key(wav_path, stats[wav_path], onset, offset)}"
+
+        cached = {
+            task_id: features
+            for task_id, signature, features in TrainingFeatures.objects.filter(
+                task_id__in=list(signatures)
+            ).values_list("task_id", "signature", "features")
+            if signatures.get(task_id) == signature
+        }
+
+        self.cached_rows = []
+        self.new_samples = []
+        for task_id, wav_path, onset, offset, label in samples:
+            if task_id in cached:
+                self.cached_rows.append((task_id, label, cached[task_id]))
+            else:
+                self.new_samples.append((task_id, signatures.get(task_id), (wav_path, onset, offset, label)))
+
+        self.written = 0
+
+    @property
+    def sample_count(self):
+        """Number of samples the model is trained on: cached rows plus snippets written."""
+        return len(self.cached_rows) + self.written
+
+    def build(self, on_progress=None):
+        """
+        Write the snippets of new tasks and the CSV of cached features to the training folder.
+
+        Args:
+            on_progress: Optional callable(done, total), as for build_training_data
+
+        Returns:
+            int: Number of samples in the training set
+        """
+        import pandas as pd
+
+        self.written = build_training_data([sample for _, _, sample in self.new_samples], self.data_folder, on_progress)
+
+        if self.cached_rows:
+            rows = [
+                {"sound.files": f"cached_{task_id}.wav", "selec": label, **features}
+                for task_id, label, features in self.cached_rows
+            ]
+            pd.DataFrame(rows).to_csv(self.features_path, index=False)
+
+        logger.info(
+            f"Incremental training set: {len(self.cached_rows)} cached, {self.written} extracted "
+            f"of {len(self.new_samples)} new samples"
+        )
+        return self.sample_count
+
+    def train_params(self):
+        """Parameters telling the R server where to read cached and write new features."""
+        from ...utils_modules.path_utils import get_r_server_path
+
+        params = {}
+        if self.cached_rows:
+            params["features_path"] = get_r_server_path(self.features_path)
+        if self.written:
+            params["export_features_path"] = get_r_server_path(self.export_path)
+        return params
+
+    def store_new_features(self, training_job):
+        """
+        Cache the features the R server extracted from the new snippets.
+
+        Failing to cache features never fails the training job; the tasks are
+        extracted again next time.
+
+        Returns:
+            int: Number of tasks whose features were stored
+        """
+        import pandas as pd
+
+        from ...models.classification import TrainingFeatures
+
+        if not self.written or not os.path.exists(self.export_path):
+            return 0
+
+        try:
+            exported = pd.read_csv(self.export_path)
+            feature_columns = [column for column in exported.columns if column not in ID_COLUMNS]
+
+            entries = {}
+            for row in exported.itertuples(index=False, name=None):
+                values = dict(zip(exported.columns, row, strict=True))
+                # Snippets are named "<n>_<label>.wav", n counting from 1 over the new samples
+                number = int(str(values["sound.files"]).split("_", 1)[0])
+                task_id, signature, _ = self.new_samples[number - 1]
+                if signature is None:
+                    continue
+                entries[task_id] = TrainingFeatures(
+                    task_id=task_id,
+                    signature=signature,
+                    features={column: _clean(values[column]) for column in feature_columns},
+                    training_job=training_job,
+                )
+
+            TrainingFeatures.objects.bulk_create(
+                entries.values(),
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=["task"],
+                update_fields=["signature", "features", "training_job", "updated_at"],
+            )
+        except Exception as e:
+            logger.warning(f"Could not cache training features from {self.export_path}: {str(e)}")
+            return 0
+
+        return len(entries)
@@ -7,12 +7,11 @@ This module contains Celery tasks for training custom classifiers.
 import logging
 import os
 
-import soundfile as sf
 from celery import shared_task
 
 from ...utils_modules.path_utils import get_local_tmp, get_r_server_path
-from .base import extract_audio_segment
 from .classification_utils import RServerTimeout, update_classification_run_status
+from .training_features import IncrementalTrainingSet
 from .training_utils import (
     build_model_path,
     check_r_server_and_update_status,
@@ -65,11 +64,13 @@ def train_classifier(self, training_job_id):
         temp_dir = os.path.join(get_local_tmp(), f"training_{os.path.basename(model_path).split('.')[0]}")
         os.makedirs(temp_dir, exist_ok=True)
 
-        file_counter = _extract_segments_from_tasks(tasks, task_batch, temp_dir, training_job, total_tasks)
+        training_set = _extract_segments_from_tasks(tasks, task_batch, temp_dir, training_job, total_tasks)
 
-        update_classification_run_status(training_job, "in_progress", progress=55)
+        update_classification_run_status(
+            training_job, "in_progress", message=_training_set_message(training_set), progress=55
+        )
 
-        if file_counter <= 1:
+        if training_set.sample_count == 0:
             error_msg = "Failed to extract any valid audio segments for training."
             update_classification_run_status(training_job, "failed", error_msg)
             cleanup_temp_dir(temp_dir)
@@ -98,10 +99,11 @@ def train_classifier(self, training_job_id):
             species=task_batch.species,
             source_task_batch=task_batch,
             name_suffix=task_batch.name,
-            sample_count=file_counter - 1,
-            extra_params=knn_extra_params(training_job, file_counter - 1),
+            sample_count=training_set.sample_count,
+            extra_params=_train_params(training_job, training_set),
         )
 
+        training_set.store_new_features(training_job)
         cleanup_temp_dir(temp_dir)
         return result
 
@@ -117,46 +119,50 @@ def train_classifier(self, training_job_id):
 
 def _extract_segments_from_tasks(tasks, task_batch, temp_dir, training_job, total_tasks):
     """Extract audio segments from labeled tasks and save to temp directory."""
-    file_counter = 1
+    if not task_batch.wav_file:
+        logger.warning(f"Task batch {task_batch.id} has no wav_file")
+        return IncrementalTrainingSet([], temp_dir)
 
-    for i, task in enumerate(tasks):
-        if i % 5 == 0:
-            progress = 10.0 + (40.0 * (i / total_tasks))
-            update_classification_run_status(training_job, "in_progress", progress=min(50.0, progress))
+    wav_file_path = task_batch.wav_file.path
+    samples = [
+        (task_id, wav_file_path, onset, offset, label)
+        for task_id, onset, offset, label in tasks.values_list("id", "onset", "offset", "label")
+        if label
+    ]
+    return _build_training_folder(samples, temp_dir, training_job, total_tasks)
 
-        if not task.label:
-            continue
 
-        try:
-            if not task_batch.wav_file:
-                logger.warning(f"Task batch {task_batch.id} has no wav_file")
-                continue
+def _build_training_folder(samples, temp_dir, training_job, total_tasks):
+    """Write the training data and report extraction progress (10-50%).
 
-            wav_file_path = task_batch.wav_file.path
-            if not os.path.exists(wav_file_path):
-                logger.warning(f"WAV file path does not exist: {wav_file_path}")
-                continue
+    Tasks whose features are cached from an earlier training are not extracted
+    again (see training_features).
 
-            logger.debug(f"Extracting segment for task {task.id}: {task.onset} to {task.offset}")
+    Returns the IncrementalTrainingSet written to temp_dir.
+    """
 
-            segment_data, sample_rate = extract_audio_segment(wav_file_path, task.onset, task.offset)
+    def on_progress(done, total):
+        update_classification_run_status(training_job, "in_progress", progress=10.0 + 40.0 * done / total_tasks)
 
-            if segment_data is None or len(segment_data) == 0:
-                logger.warning(f"No audio data extracted for task {task.id}")
-                continue
+    training_set = IncrementalTrainingSet(samples, temp_dir)
+    training_set.build(on_progress=on_progress)
+    return training_set
 
-            output_filename = f"{file_counter}_{task.label}.wav"
-            output_path = os.path.join(temp_dir, output_filename)
-            sf.write(output_path, segment_data, samplerate=sample_rate)
 
-            logger.debug(f"Saved segment {file_counter} with label '{task.label}'")
-            file_counter += 1
+def _training_set_message(training_set):
+    if not training_set.cached_rows:
+        return f"Extracted {training_set.written} audio segments"
+    return (
+        f"Reusing features of {len(training_set.cached_rows)} tasks, "
+        f"extracted {training_set.written} new audio segments"
+    )
 
-        except Exception as e:
-            logger.warning(f"Error extracting segment for task {task.id}: {str(e)}")
-            continue
 
-    return file_counter
+def _train_params(training_job, training_set):
+    """Extra R training params: fixed k for KNN and the cached/exported feature files."""
+    params = knn_extra_params(training_job, training_set.sample_count)
+    params.update(training_set.train_params())
+    return params
 
 
 @shared_task(bind=True, name="battycoda_app.audio.task_modules.training_tasks.train_classifier_from_folder")
@@ -301,11 +307,13 @@ def train_classifier_from_species(self, training_job_id, species_id):
         temp_dir = os.path.join(get_local_tmp(), f"training_{os.path.basename(model_path).split('.')[0]}")
         os.makedirs(temp_dir, exist_ok=True)
 
-        file_counter = _extract_segments_across_batches(tasks, temp_dir, training_job, total_tasks)
+        training_set = _extract_segments_across_batches(tasks, temp_dir, training_job, total_tasks)
 
-        update_classification_run_status(training_job, "in_progress", progress=55)
+        update_classification_run_status(
+            training_job, "in_progress", message=_training_set_message(training_set), progress=55
+        )
 
-        if file_counter <= 1:
+        if training_set.sample_count == 0:
             error_msg = "Failed to extract any valid audio segments for training."
             update_classification_run_status(training_job, "failed", error_msg)
             cleanup_temp_dir(temp_dir)
@@ -334,10 +342,11 @@ def train_classifier_from_species(self, training_job_id, species_id):
             species=species,
             source_task_batch=None,
             name_suffix=species.name,
-            sample_count=file_counter - 1,
-            extra_params=knn_extra_params(training_job, file_counter - 1),
+            sample_count=training_set.sample_count,
+            extra_params=_train_params(training_job, training_set),
         )
 
+        training_set.store_new_features(training_job)
         cleanup_temp_dir(temp_dir)
         return result
 
@@ -379,44 +388,17 @@ def _stratified_sample(tasks_qs, max_samples):
 
 def _extract_segments_across_batches(tasks, temp_dir, training_job, total_tasks):
     """Extract audio segments from labeled tasks spanning multiple batches."""
-    file_counter = 1
-
-    for i, task in enumerate(tasks):
-        if i % 5 == 0:
-            progress = 10.0 + (40.0 * (i / total_tasks))
-            update_classification_run_status(training_job, "in_progress", progress=min(50.0, progress))
-
+    samples = []
+    for task in tasks:
         if not task.label:
             continue
-
-        try:
-            batch = task.batch
-            if not batch or not batch.wav_file:
-                logger.warning(f"Task {task.id} has no batch or batch has no wav_file")
-                continue
-
-            wav_file_path = batch.wav_file.path
-            if not os.path.exists(wav_file_path):
-                logger.warning(f"WAV file path does not exist: {wav_file_path}")
-                continue
-
-            segment_data, sample_rate = extract_audio_segment(wav_file_path, task.onset, task.offset)
-
-            if segment_data is None or len(segment_data) == 0:
-                logger.warning(f"No audio data extracted for task {task.id}")
-                continue
-
-            output_filename = f"{file_counter}_{task.label}.wav"
-            output_path = os.path.join(temp_dir, output_filename)
-            sf.write(output_path, segment_data, samplerate=sample_rate)
-
-            file_counter += 1
-
-        except Exception as e:
-            logger.warning(f"Error extracting segment for task {task.id}: {str(e)}")
+        batch = task.batch
+        if not batch or not batch.wav_file:
+            logger.warning(f"Task {task.id} has no batch or batch has no wav_file")
             continue
+        samples.append((task.id, batch.wav_file.path, task.onset, task.offset, task.label))
 
-    return file_counter
+    return _build_training_folder(samples, temp_dir, training_job, total_tasks)
 
 
 def _handle_training_error(training_job_id, exception, context):
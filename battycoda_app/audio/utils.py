@@ -10,7 +10,13 @@ to maintain backward compatibility with existing code.
 from .modules.audio_processing import get_audio_bit, normal_hwin, overview_hwin
 
 # Re-export functions from specialized modules
-from .modules.file_utils import appropriate_file, get_audio_duration, process_pickle_file, split_audio_file
+from .modules.file_utils import (
+    appropriate_file,
+    audio_fingerprint,
+    get_audio_duration,
+    process_pickle_file,
+    split_audio_file,
+)
 from .modules.visualization import auto_segment_audio, energy_based_segment_audio, get_spectrogram_ticks
 
 # Export all functions with their original names
@@ -18,6 +24,7 @@ __all__ = [
     "appropriate_file",
     "process_pickle_file",
     "get_audio_duration",
+    "audio_fingerprint",
     "split_audio_file",
     "get_audio_bit",
     "normal_hwin",
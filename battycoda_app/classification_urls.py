@@ -36,6 +36,7 @@ from .views_classification.runs_details import (
     classification_run_status_view,
     download_features_file_view,
     download_segments_zip_view,
+    export_classification_results_view,
 )
 from .views_classification.task_creation.batch_creation import (
     create_task_batch_from_classification_run,
@@ -61,6 +62,11 @@ urlpatterns = [
     path(
         "classification/runs/<int:run_id>/download-segments/", download_segments_zip_view, name="download_segments_zip"
     ),
+    path(
+        "classification/runs/<int:run_id>/export/",
+        export_classification_results_view,
+        name="export_classification_results",
+    ),
     path(
         "classification/runs/<int:run_id>/apply/",
         apply_classification_results_view,
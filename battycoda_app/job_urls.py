@@ -8,9 +8,11 @@ from django.urls import path
 
 from .views_jobs.ajax import cancel_job_view, job_status_api_view
 from .views_jobs.dashboard import jobs_dashboard_view
+from .views_jobs.events import job_events_view
 
 urlpatterns = [
     path("jobs/", jobs_dashboard_view, name="jobs_dashboard"),
     path("jobs/api/status/", job_status_api_view, name="job_status_api"),
+    path("jobs/api/events/", job_events_view, name="job_events"),
     path("jobs/cancel/<str:job_type>/<int:job_id>/", cancel_job_view, name="cancel_job"),
 ]
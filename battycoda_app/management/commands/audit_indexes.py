@@ -1,12 +1,20 @@
-"""Management command to audit database indexes for ForeignKey fields."""
+"""Management command to audit database indexes for ForeignKey fields and report slow queries."""
+
+import re
 
 from django.apps import apps
 from django.core.management.base import BaseCommand
-from django.db import connection
+from django.db import DatabaseError, connection
+
+# Leading column of a CREATE INDEX definition, e.g. 'USING btree (group_id, created_at)' -> 'group_id'
+LEADING_COLUMN_RE = re.compile(r"USING \w+ \(\s*\"?(\w+)\"?")
 
 
 class Command(BaseCommand):
-    help = "Check that all ForeignKey fields have corresponding database indexes"
+    help = (
+        "Check that all ForeignKey fields have corresponding database indexes, and report "
+        "slow-query candidates from pg_stat_statements when that extension is available"
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -14,20 +22,39 @@ class Command(BaseCommand):
             action="store_true",
             help="Create missing indexes (use CREATE INDEX CONCURRENTLY)",
         )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Number of slow-query candidates to report (default: 10)",
+        )
+        parser.add_argument(
+            "--min-mean-ms",
+            type=float,
+            default=50.0,
+            help="Only report statements slower than this on average, in milliseconds (default: 50)",
+        )
 
     def handle(self, *args, **options):
-        fix = options["fix"]
-
-        # Get all indexes in the database
+        self.audit_foreign_keys(options["fix"])
+        self.stdout.write("")
+        self.report_slow_queries(options["top"], options["min_mean_ms"])
+
+    def audit_foreign_keys(self, fix):
+        """Report (and optionally create) missing indexes on ForeignKey columns."""
+        # Get the leading column of every index in the database; a composite index
+        # that starts with a ForeignKey column serves lookups on it as well
         with connection.cursor() as cursor:
             cursor.execute("""
                 SELECT tablename, indexdef
                 FROM pg_indexes
                 WHERE schemaname = 'public'
             """)
-            existing_indexes = {}
+            indexed_columns = {}
             for table, indexdef in cursor.fetchall():
-                existing_indexes.setdefault(table, []).append(indexdef)
+                match = LEADING_COLUMN_RE.search(indexdef)
+                if match:
+                    indexed_columns.setdefault(table, set()).add(match.group(1))
 
         missing = []
 
@@ -48,11 +75,7 @@ class Command(BaseCommand):
                     continue
 
                 column = field.column
-                table_indexes = existing_indexes.get(table, [])
-
-                has_index = any(f"({column})" in idx or f"( {column} )" in idx for idx in table_indexes)
-
-                if not has_index:
+                if column not in indexed_columns.get(table, set()):
                     missing.append((table, column, field.name, model.__name__))
 
         if not missing:
@@ -77,3 +100,45 @@ class Command(BaseCommand):
 
         if not fix:
             self.stdout.write("\nRun with --fix to create missing indexes.")
+
+    def report_slow_queries(self, top, min_mean_ms):
+        """List the statements on app tables with the highest total time from pg_stat_statements."""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'")
+            if cursor.fetchone() is None:
+                self.stdout.write("pg_stat_statements is not installed; skipping the slow-query report.")
+                return
+
+        app_tables = [model._meta.db_table for model in apps.get_app_config("battycoda_app").get_models()]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT calls, mean_exec_time, total_exec_time, rows, query
+                    FROM pg_stat_statements
+                    WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+                      AND mean_exec_time >= %s
+                      AND query ~ %s
+                    ORDER BY total_exec_time DESC
+                    LIMIT %s
+                    """,
+                    [min_mean_ms, "|".join(re.escape(table) for table in app_tables), top],
+                )
+                rows = cursor.fetchall()
+        except DatabaseError as e:
+            # The extension exists but is not loaded through shared_preload_libraries, or access is denied
+            self.stdout.write(self.style.WARNING(f"Could not read pg_stat_statements: {e}"))
+            return
+
+        if not rows:
+            self.stdout.write(self.style.SUCCESS(f"No statements on app tables average over {min_mean_ms:g} ms."))
+            return
+
+        self.stdout.write(self.style.WARNING(f"Slow-query candidates (mean >= {min_mean_ms:g} ms, by total time):"))
+        for calls, mean_ms, total_ms, row_count, query in rows:
+            query = " ".join(query.split())
+            if len(query) > 300:
+                query = query[:297] + "..."
+            self.stdout.write(f"  calls={calls} mean={mean_ms:.1f}ms total={total_ms / 1000:.1f}s rows={row_count}")
+            self.stdout.write(f"    {query}")
+        self.stdout.write("\nRun EXPLAIN (ANALYZE, BUFFERS) on these statements to see which indexes they are missing.")
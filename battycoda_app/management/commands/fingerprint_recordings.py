@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from battycoda_app.models import Recording
+from battycoda_app.utils_modules.recording_utils import fingerprint_recording
+
+
+class Command(BaseCommand):
+    help = "Compute the content fingerprints used for duplicate detection for recordings that don't have one yet"
+
+    def handle(self, *args, **options):
+        recordings = Recording.objects.filter(content_hash="", file_ready=True).order_by("id")
+        total = recordings.count()
+        self.stdout.write(f"Fingerprinting {total} recordings...")
+
+        fingerprinted = 0
+        for recording in recordings.iterator(chunk_size=100):
+            if fingerprint_recording(recording):
+                fingerprinted += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Fingerprinted {fingerprinted} of {total} recordings"))
+        if fingerprinted < total:
+            self.stdout.write(self.style.WARNING(f"{total - fingerprinted} recordings could not be read"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from battycoda_app.models.task_stats import rebuild_task_rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard's per-project task counters and per-day annotation counts from the task table"
+
+    def handle(self, *args, **options):
+        self.stdout.write("Rebuilding task rollups...")
+        counter_rows, day_rows = rebuild_task_rollups()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {counter_rows} project task counters and {day_rows} daily annotation counts")
+        )
@@ -9,6 +9,8 @@ from django.urls import reverse
 from django.urls.exceptions import NoReverseMatch
 from django.utils import timezone
 
+from ..models.user import UserProfile
+
 
 class AuthenticationMiddleware:
     """
@@ -78,9 +80,14 @@ class AuthenticationMiddleware:
 
             return HttpResponseRedirect(login_url)
 
+        # Load the profile with its group once per request; views and templates read
+        # request.user.profile (and profile.group) many times
+        profile = UserProfile.objects.select_related("group").filter(user=request.user).first()
+        if profile:
+            request.user.profile = profile
+
         # Update last activity for authenticated users (throttled to avoid too many DB writes)
-        if hasattr(request.user, "profile"):
-            profile = request.user.profile
+        if profile:
             now = timezone.now()
 
             # Only update if more than 5 minutes have passed since last update
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('battycoda_app', '0002_userprofile_spectrogram_colormap'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchUploadJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Display name for the batch upload job', max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='pending', max_length=20)),
+                ('celery_task_id', models.CharField(blank=True, default='', help_text='Celery task ID for tracking the background job', max_length=255)),
+                ('progress', models.IntegerField(default=0, help_text='Progress percentage (0-100)')),
+                ('wav_zip_path', models.CharField(help_text='Path to the uploaded ZIP of WAV files', max_length=512)),
+                ('pickle_zip_path', models.CharField(blank=True, default='', help_text='Path to the uploaded ZIP of pickle segmentation files', max_length=512)),
+                ('recorded_date', models.DateField(blank=True, null=True)),
+                ('location', models.CharField(blank=True, default='', max_length=255)),
+                ('equipment', models.CharField(blank=True, default='', max_length=255)),
+                ('environmental_conditions', models.TextField(blank=True, default='')),
+                ('split_long_files', models.BooleanField(default=False, help_text='Split files longer than 60s into chunks')),
+                ('total_files', models.IntegerField(default=0, help_text='Number of WAV files in the archive')),
+                ('processed_files', models.IntegerField(default=0, help_text='Number of WAV files handled so far')),
+                ('success_count', models.IntegerField(default=0, help_text='Number of recordings created')),
+                ('error_count', models.IntegerField(default=0, help_text='Number of WAV files that failed')),
+                ('segmented_count', models.IntegerField(default=0, help_text='Number of recordings segmented from pickle files')),
+                ('split_count', models.IntegerField(default=0, help_text='Number of WAV files split into chunks')),
+                ('error_message', models.TextField(blank=True, default='', help_text='Error message if the job failed')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batch_upload_jobs', to=settings.AUTH_USER_MODEL)),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batch_upload_jobs', to='battycoda_app.group')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batch_upload_jobs', to='battycoda_app.project')),
+                ('species', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batch_upload_jobs', to='battycoda_app.species')),
+            ],
+            options={
+                'verbose_name': 'Batch Upload Job',
+                'verbose_name_plural': 'Batch Upload Jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+
+
+def backfill_task_rollups(apps, schema_editor):
+    """Fill the rollup tables from the existing tasks."""
+    Task = apps.get_model('battycoda_app', 'Task')
+    DailyAnnotationCount = apps.get_model('battycoda_app', 'DailyAnnotationCount')
+    ProjectTaskCounter = apps.get_model('battycoda_app', 'ProjectTaskCounter')
+
+    ProjectTaskCounter.objects.bulk_create(
+        ProjectTaskCounter(
+            project_id=row['project_id'],
+            group_id=row['group_id'],
+            created_by_id=row['created_by_id'],
+            total_count=row['total'],
+            done_count=row['done'],
+        )
+        for row in Task.objects.values('project_id', 'group_id', 'created_by_id').annotate(
+            total=Count('id'), done=Count('id', filter=Q(is_done=True))
+        )
+    )
+
+    DailyAnnotationCount.objects.bulk_create(
+        DailyAnnotationCount(
+            user_id=row['annotated_by_id'], group_id=row['group_id'], day=row['day'], count=row['total']
+        )
+        for row in Task.objects.filter(is_done=True, annotated_by__isnull=False, annotated_at__isnull=False)
+        .annotate(day=TruncDate('annotated_at'))
+        .values('annotated_by_id', 'group_id', 'day')
+        .annotate(total=Count('id'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('battycoda_app', '0003_batchuploadjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyAnnotationCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text='Day the annotations were completed on')),
+                ('count', models.IntegerField(default=0, help_text='Number of tasks completed on this day')),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='daily_annotation_counts', to='battycoda_app.group')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_annotation_counts', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['group', 'day'], name='daily_annotation_group_day')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'group', 'day'), name='unique_daily_annotation_count', nulls_distinct=False)],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProjectTaskCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_count', models.IntegerField(default=0, help_text='Number of tasks')),
+                ('done_count', models.IntegerField(default=0, help_text='Number of completed tasks')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='project_task_counters', to=settings.AUTH_USER_MODEL)),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='project_task_counters', to='battycoda_app.group')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_counters', to='battycoda_app.project')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('project', 'group', 'created_by'), name='unique_project_task_counter', nulls_distinct=False)],
+            },
+        ),
+        migrations.RunPython(backfill_task_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('battycoda_app', '0004_task_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BatchExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text='Display name for the export job', max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('in_progress', 'In Progress'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='pending', max_length=20)),
+                ('celery_task_id', models.CharField(blank=True, default='', help_text='Celery task ID for tracking the background job', max_length=255)),
+                ('progress', models.IntegerField(default=0, help_text='Progress percentage (0-100)')),
+                ('batch_ids', models.JSONField(default=list, help_text='IDs of the task batches to export')),
+                ('file_path', models.CharField(blank=True, default='', help_text='Path to the finished archive', max_length=512)),
+                ('file_size', models.BigIntegerField(default=0, help_text='Size of the finished archive in bytes')),
+                ('error_message', models.TextField(blank=True, default='', help_text='Error message if the job failed')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='batch_export_jobs', to=settings.AUTH_USER_MODEL)),
+                ('group', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='batch_export_jobs', to='battycoda_app.group')),
+                ('project', models.ForeignKey(blank=True, help_text='Project filter the export was requested with', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='batch_export_jobs', to='battycoda_app.project')),
+            ],
+            options={
+                'verbose_name': 'Batch Export Job',
+                'verbose_name_plural': 'Batch Export Jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:41
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The task table is large in production; build the indexes without blocking writes
+    atomic = False
+
+    dependencies = [
+        ('battycoda_app', '0005_batchexportjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_done', False)), fields=['group', 'created_at'], name='task_open_group_created_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_done', False)), fields=['batch', 'created_at'], name='task_open_batch_created_idx'),
+        ),
+    ]
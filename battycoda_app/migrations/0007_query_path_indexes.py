@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:44
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # These tables are large in production; build the indexes without blocking writes
+    atomic = False
+
+    dependencies = [
+        ('battycoda_app', '0006_task_open_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='callprobability',
+            index=models.Index(fields=['classification_result', '-probability'], name='callprob_result_top_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='classificationresult',
+            index=models.Index(fields=['classification_run', 'segment'], name='result_run_segment_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='segment',
+            index=models.Index(fields=['segmentation', 'onset'], name='segment_segmentation_onset_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['batch', 'is_done'], name='task_batch_done_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_done', True)), fields=['annotated_by', 'group', 'annotated_at'], name='task_annotated_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:48
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The recording table is large in production; build the indexes without blocking uploads
+    atomic = False
+
+    dependencies = [
+        ('battycoda_app', '0007_query_path_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recording',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 of the audio format and all sample data', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='recording',
+            name='quick_hash',
+            field=models.CharField(blank=True, default='', help_text='SHA-256 of the audio format, length and first and last samples, for a fast duplicate check', max_length=64),
+        ),
+        AddIndexConcurrently(
+            model_name='recording',
+            index=models.Index(fields=['group', 'quick_hash'], name='recording_group_quick_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='recording',
+            index=models.Index(fields=['group', 'content_hash'], name='recording_group_content_idx'),
+        ),
+    ]
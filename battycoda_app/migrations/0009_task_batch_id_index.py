@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:54
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The task table is large in production; build the index without blocking writes
+    atomic = False
+
+    dependencies = [
+        ('battycoda_app', '0008_recording_fingerprints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='task',
+            index=models.Index(fields=['batch', 'id'], name='task_batch_id_idx'),
+        ),
+    ]
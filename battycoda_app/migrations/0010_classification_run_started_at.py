@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('battycoda_app', '0009_task_batch_id_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classificationrun',
+            name='started_at',
+            field=models.DateTimeField(blank=True, help_text='When the queue processor dispatched the run to a worker', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='classificationrun',
+            index=models.Index(condition=models.Q(('status__in', ['queued', 'pending', 'in_progress'])), fields=['status', 'created_at'], name='classrun_active_status_idx'),
+        ),
+    ]
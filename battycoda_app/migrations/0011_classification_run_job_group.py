@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('battycoda_app', '0010_classification_run_started_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classificationrun',
+            name='job_group',
+            field=models.UUIDField(blank=True, help_text='Runs sharing a job group are classified together by one task', null=True),
+        ),
+    ]
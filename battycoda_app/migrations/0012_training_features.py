@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 05:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('battycoda_app', '0011_classification_run_job_group'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingFeatures',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('signature', models.CharField(help_text='Feature version, source file and window the features were extracted from', max_length=64)),
+                ('features', models.JSONField(help_text='Feature name to value, as extracted by the R server')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='training_features', to='battycoda_app.task')),
+                ('training_job', models.ForeignKey(blank=True, help_text='The training job that extracted these features', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='extracted_features', to='battycoda_app.classifiertrainingjob')),
+            ],
+        ),
+    ]
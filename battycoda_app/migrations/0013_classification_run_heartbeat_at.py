@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('battycoda_app', '0012_training_features'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='classificationrun',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='When the worker classifying the run last reported it was alive', null=True),
+        ),
+    ]
@@ -17,13 +17,23 @@ via migration 0014_auto_20250716_1838.py to prevent duplicate email addresses.
 All code that queries users by email should handle the uniqueness properly.
 """
 
-from .classification import CallProbability, ClassificationResult, ClassificationRun, Classifier, ClassifierTrainingJob
+from .batch_export import BatchExportJob
+from .batch_upload import BatchUploadJob
+from .classification import (
+    CallProbability,
+    ClassificationResult,
+    ClassificationRun,
+    Classifier,
+    ClassifierTrainingJob,
+    TrainingFeatures,
+)
 from .notification import UserNotification as Notification
 from .organization import Call, Project, Species
 from .recording import Recording
 from .segmentation import Segment, Segmentation, SegmentationAlgorithm
 from .spectrogram import SpectrogramJob
 from .task import Task, TaskBatch
+from .task_stats import DailyAnnotationCount, ProjectTaskCounter
 from .tus_upload import TusUpload
 
 # Import all models for Django model registration
@@ -0,0 +1,98 @@
+"""
+Batch export job models for BattyCoda.
+"""
+
+import os
+
+from django.contrib.auth.models import User
+from django.db import models
+
+from .organization import Project
+from .user import Group
+
+
+class BatchExportJob(models.Model):
+    """Tracks the background export of completed task batches to a ZIP archive.
+
+    The batches to export are fixed when the job is queued. A Celery task writes
+    the archive under BATCH_EXPORT_DIR and notifies the user with a download link.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("in_progress", "In Progress"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+        ("cancelled", "Cancelled"),
+    ]
+
+    name = models.CharField(max_length=255, help_text="Display name for the export job")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    celery_task_id = models.CharField(
+        max_length=255, blank=True, default="", help_text="Celery task ID for tracking the background job"
+    )
+    progress = models.IntegerField(default=0, help_text="Progress percentage (0-100)")
+
+    batch_ids = models.JSONField(default=list, help_text="IDs of the task batches to export")
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.SET_NULL,
+        related_name="batch_export_jobs",
+        null=True,
+        blank=True,
+        help_text="Project filter the export was requested with",
+    )
+
+    file_path = models.CharField(max_length=512, blank=True, default="", help_text="Path to the finished archive")
+    file_size = models.BigIntegerField(default=0, help_text="Size of the finished archive in bytes")
+    error_message = models.TextField(blank=True, default="", help_text="Error message if the job failed")
+
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="batch_export_jobs")
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="batch_export_jobs", null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Batch Export Job"
+        verbose_name_plural = "Batch Export Jobs"
+
+    def __str__(self):
+        return f"Batch export: {self.name} ({self.status})"
+
+    @property
+    def is_active(self):
+        """Check if the job is still active (pending or in progress)"""
+        return self.status in ["pending", "in_progress"]
+
+    @property
+    def filename(self):
+        """Download filename of the archive"""
+        return os.path.basename(self.file_path)
+
+    def mark_started(self, celery_task_id=None):
+        """Mark the job as started"""
+        self.status = "in_progress"
+        if celery_task_id:
+            self.celery_task_id = celery_task_id
+        self.save(update_fields=["status", "celery_task_id", "updated_at"])
+
+    def mark_completed(self, file_path, file_size):
+        """Mark the job as completed"""
+        self.status = "completed"
+        self.progress = 100
+        self.file_path = file_path
+        self.file_size = file_size
+        self.save(update_fields=["status", "progress", "file_path", "file_size", "updated_at"])
+
+    def mark_failed(self, error_message=None):
+        """Mark the job as failed"""
+        self.status = "failed"
+        if error_message:
+            self.error_message = error_message
+        self.save(update_fields=["status", "error_message", "updated_at"])
+
+    def update_progress(self, progress):
+        """Update the progress percentage"""
+        self.progress = progress
+        self.save(update_fields=["progress", "updated_at"])
@@ -0,0 +1,124 @@
+"""
+Batch upload ingestion job models for BattyCoda.
+"""
+
+from django.contrib.auth.models import User
+from django.db import models
+
+from .organization import Project, Species
+from .user import Group
+
+
+class BatchUploadJob(models.Model):
+    """Tracks the background ingestion of a batch upload ZIP archive.
+
+    The uploaded archives are stored under BATCH_UPLOAD_DIR and processed by a
+    Celery task, which creates one Recording per WAV member (or per chunk when
+    long files are split) and updates the counters below as it goes.
+    """
+
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("in_progress", "In Progress"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+        ("cancelled", "Cancelled"),
+    ]
+
+    name = models.CharField(max_length=255, help_text="Display name for the batch upload job")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    celery_task_id = models.CharField(
+        max_length=255, blank=True, default="", help_text="Celery task ID for tracking the background job"
+    )
+    progress = models.IntegerField(default=0, help_text="Progress percentage (0-100)")
+
+    # Uploaded archives, kept on disk until the job finishes
+    wav_zip_path = models.CharField(max_length=512, help_text="Path to the uploaded ZIP of WAV files")
+    pickle_zip_path = models.CharField(
+        max_length=512, blank=True, default="", help_text="Path to the uploaded ZIP of pickle segmentation files"
+    )
+
+    # Metadata applied to every created recording
+    species = models.ForeignKey(Species, on_delete=models.CASCADE, related_name="batch_upload_jobs")
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="batch_upload_jobs")
+    recorded_date = models.DateField(blank=True, null=True)
+    location = models.CharField(max_length=255, blank=True, default="")
+    equipment = models.CharField(max_length=255, blank=True, default="")
+    environmental_conditions = models.TextField(blank=True, default="")
+    split_long_files = models.BooleanField(default=False, help_text="Split files longer than 60s into chunks")
+
+    # Counters
+    total_files = models.IntegerField(default=0, help_text="Number of WAV files in the archive")
+    processed_files = models.IntegerField(default=0, help_text="Number of WAV files handled so far")
+    success_count = models.IntegerField(default=0, help_text="Number of recordings created")
+    error_count = models.IntegerField(default=0, help_text="Number of WAV files that failed")
+    segmented_count = models.IntegerField(default=0, help_text="Number of recordings segmented from pickle files")
+    split_count = models.IntegerField(default=0, help_text="Number of WAV files split into chunks")
+    error_message = models.TextField(blank=True, default="", help_text="Error message if the job failed")
+
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="batch_upload_jobs")
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="batch_upload_jobs")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        verbose_name = "Batch Upload Job"
+        verbose_name_plural = "Batch Upload Jobs"
+
+    def __str__(self):
+        return f"Batch upload: {self.name} ({self.status})"
+
+    @property
+    def is_active(self):
+        """Check if the job is still active (pending or in progress)"""
+        return self.status in ["pending", "in_progress"]
+
+    @property
+    def metadata(self):
+        """Recording metadata in the form expected by the batch upload file processing helpers"""
+        return {
+            "species": self.species,
+            "project": self.project,
+            "recorded_date": self.recorded_date,
+            "location": self.location,
+            "equipment": self.equipment,
+            "environmental_conditions": self.environmental_conditions,
+        }
+
+    def mark_started(self, celery_task_id=None):
+        """Mark the job as started"""
+        self.status = "in_progress"
+        if celery_task_id:
+            self.celery_task_id = celery_task_id
+        self.save(update_fields=["status", "celery_task_id", "updated_at"])
+
+    def mark_completed(self):
+        """Mark the job as completed"""
+        self.status = "completed"
+        self.progress = 100
+        self.save(update_fields=["status", "progress", "updated_at"])
+
+    def mark_failed(self, error_message=None):
+        """Mark the job as failed"""
+        self.status = "failed"
+        if error_message:
+            self.error_message = error_message
+        self.save(update_fields=["status", "error_message", "updated_at"])
+
+    def save_counts(self):
+        """Persist the counters and derive progress from processed/total files"""
+        if self.total_files:
+            self.progress = int(self.processed_files * 100 / self.total_files)
+        self.save(
+            update_fields=[
+                "total_files",
+                "processed_files",
+                "success_count",
+                "error_count",
+                "segmented_count",
+                "split_count",
+                "progress",
+                "updated_at",
+            ]
+        )
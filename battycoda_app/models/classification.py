@@ -154,9 +154,26 @@ class ClassificationRun(models.Model):
     features_file = models.CharField(
         max_length=512, blank=True, default="", help_text="Path to the exported features CSV file"
     )
+    started_at = models.DateTimeField(
+        null=True, blank=True, help_text="When the queue processor dispatched the run to a worker"
+    )
+    heartbeat_at = models.DateTimeField(
+        null=True, blank=True, help_text="When the worker classifying the run last reported it was alive"
+    )
+    job_group = models.UUIDField(
+        null=True, blank=True, help_text="Runs sharing a job group are classified together by one task"
+    )
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Queued and running runs, scanned by the queue processor
+            models.Index(
+                fields=["status", "created_at"],
+                condition=models.Q(status__in=["queued", "pending", "in_progress"]),
+                name="classrun_active_status_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.segmentation.recording.name}"
@@ -173,6 +190,10 @@ class ClassificationResult(models.Model):
 
     class Meta:
         ordering = ["segment__onset"]
+        indexes = [
+            # Results of a run joined to their segments
+            models.Index(fields=["classification_run", "segment"], name="result_run_segment_idx"),
+        ]
 
     def __str__(self):
         return f"Classification for {self.segment}"
@@ -189,6 +210,10 @@ class CallProbability(models.Model):
 
     class Meta:
         ordering = ["-probability"]
+        indexes = [
+            # Top call of a result (ORDER BY probability DESC LIMIT 1)
+            models.Index(fields=["classification_result", "-probability"], name="callprob_result_top_idx"),
+        ]
 
     def __str__(self):
         return f"{self.call.short_name}: {self.probability:.2f}"
@@ -245,3 +270,30 @@ class ClassifierTrainingJob(models.Model):
         if self.task_batch:
             return f"{self.name} - {self.task_batch.name}"
         return self.name
+
+
+class TrainingFeatures(models.Model):
+    """Acoustic features of a labeled task, kept so retraining only extracts new or changed tasks."""
+
+    task = models.OneToOneField(
+        "battycoda_app.Task",
+        on_delete=models.CASCADE,
+        related_name="training_features",
+    )
+    signature = models.CharField(
+        max_length=64,
+        help_text="Feature version, source file and window the features were extracted from",
+    )
+    features = models.JSONField(help_text="Feature name to value, as extracted by the R server")
+    training_job = models.ForeignKey(
+        ClassifierTrainingJob,
+        on_delete=models.SET_NULL,
+        related_name="extracted_features",
+        null=True,
+        blank=True,
+        help_text="The training job that extracted these features",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Training features for task {self.task_id}"
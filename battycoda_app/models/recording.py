@@ -49,6 +49,15 @@ class Recording(models.Model):
         default="processing",
         help_text="Processing status: 'processing' while spectrogram is being generated, 'ready' when complete",
     )
+    quick_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="SHA-256 of the audio format, length and first and last samples, for a fast duplicate check",
+    )
+    content_hash = models.CharField(
+        max_length=64, blank=True, default="", help_text="SHA-256 of the audio format and all sample data"
+    )
 
     # Recording metadata
     recorded_date = models.DateField(blank=True, null=True, help_text="Date when the recording was made")
@@ -87,6 +96,11 @@ class Recording(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Recording"
         verbose_name_plural = "Recordings"
+        indexes = [
+            # Duplicate detection within a group: quick first pass on upload, grouping by full hash
+            models.Index(fields=["group", "quick_hash"], name="recording_group_quick_idx"),
+            models.Index(fields=["group", "content_hash"], name="recording_group_content_idx"),
+        ]
 
     def __str__(self):
         return self.name
@@ -155,6 +155,10 @@ class Segment(models.Model):
 
     class Meta:
         ordering = ["onset"]
+        indexes = [
+            # Segments of a segmentation in time order, optionally within a time window
+            models.Index(fields=["segmentation", "onset"], name="segment_segmentation_onset_idx"),
+        ]
 
     def __str__(self):
         return f"{self.recording.name} ({self.onset:.2f}s - {self.offset:.2f}s)"
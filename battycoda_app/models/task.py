@@ -1,9 +1,13 @@
 """Task models for BattyCoda application."""
 
+from datetime import timedelta
+
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 
 from .organization import Project, Species
+from .task_stats import apply_task_change, task_rollup_state
 from .user import Group
 
 # Task lock timeout in minutes
@@ -114,6 +118,25 @@ class Task(models.Model):
 
     class Meta:
         ordering = ["created_at"]
+        indexes = [
+            # Partial indexes over open tasks only, used to find the next task to annotate
+            models.Index(
+                fields=["group", "created_at"], condition=models.Q(is_done=False), name="task_open_group_created_idx"
+            ),
+            models.Index(
+                fields=["batch", "created_at"], condition=models.Q(is_done=False), name="task_open_batch_created_idx"
+            ),
+            # Total and completed task counts per batch
+            models.Index(fields=["batch", "is_done"], name="task_batch_done_idx"),
+            # Keyset pages of a batch's tasks on the review page
+            models.Index(fields=["batch", "id"], name="task_batch_id_idx"),
+            # A user's recent annotations on the dashboard
+            models.Index(
+                fields=["annotated_by", "group", "annotated_at"],
+                condition=models.Q(is_done=True),
+                name="task_annotated_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.wav_file_name} ({self.onset:.2f}s - {self.offset:.2f}s)"
@@ -127,7 +150,76 @@ class Task(models.Model):
         if self.is_done and self.status != "done":
             self.status = "done"
 
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            if self._state.adding:
+                previous = None
+            else:
+                # Read the stored row so the dashboard rollups see the actual transition
+                previous = (
+                    Task.objects.filter(pk=self.pk)
+                    .values_list(
+                        "project_id", "group_id", "created_by_id", "is_done", "annotated_by_id", "annotated_at"
+                    )
+                    .first()
+                )
+                if previous:
+                    previous = (*previous[:5], timezone.localdate(previous[5]) if previous[5] else None)
+
+            super().save(*args, **kwargs)
+            apply_task_change(previous, task_rollup_state(self))
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            apply_task_change(task_rollup_state(self), None)
+            return super().delete(*args, **kwargs)
+
+    @classmethod
+    def available_to(cls, user):
+        """Get undone tasks the user can work on: unclaimed, claimed by them, or with a stale claim."""
+        stale_time = timezone.now() - timedelta(minutes=TASK_LOCK_TIMEOUT_MINUTES)
+        tasks = cls.objects.filter(is_done=False).filter(
+            models.Q(status="pending")
+            | models.Q(in_progress_by=user)
+            | models.Q(in_progress_since__lt=stale_time)
+            | models.Q(in_progress_by__isnull=True)
+        )
+        profile = user.profile
+        if profile.group:
+            return tasks.filter(group=profile.group)
+        return tasks.filter(created_by=user)
+
+    @classmethod
+    def claim_next(cls, tasks, user):
+        """
+        Atomically claim the oldest task of a queryset for a user.
+
+        The task row is locked with SELECT ... FOR UPDATE SKIP LOCKED and marked
+        in progress before the lock is released, so concurrent annotators each
+        get a different task instead of waiting on (or sharing) the same one.
+
+        Args:
+            tasks: Queryset of tasks the user may take, usually narrowed from available_to()
+            user: User claiming the task
+
+        Returns:
+            The claimed Task, or None if no task is available
+        """
+        with transaction.atomic():
+            task = tasks.order_by("created_at", "id").select_for_update(skip_locked=True, of=("self",)).first()
+            if task is None:
+                return None
+
+            # update() leaves the dashboard rollups alone, which a claim does not affect
+            now = timezone.now()
+            cls.objects.filter(pk=task.pk).update(
+                status="in_progress", in_progress_by=user, in_progress_since=now, updated_at=now
+            )
+
+        task.status = "in_progress"
+        task.in_progress_by = user
+        task.in_progress_since = now
+        task.updated_at = now
+        return task
 
     def get_sample_rate(self):
         """Get sample rate by walking the relationship chain to the recording.
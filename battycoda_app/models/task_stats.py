@@ -0,0 +1,211 @@
+"""
+Task rollup models for BattyCoda application.
+
+The dashboard used to count tasks on every page load. These tables hold the
+same numbers pre-aggregated and are kept up to date incrementally whenever a
+task is created, completed, relabeled or deleted (see the helpers below).
+"""
+
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.db import models, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .organization import Project
+from .user import Group
+
+
+class DailyAnnotationCount(models.Model):
+    """Number of tasks a user completed on a given day, per group."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_annotation_counts")
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name="daily_annotation_counts", null=True, blank=True
+    )
+    day = models.DateField(help_text="Day the annotations were completed on")
+    count = models.IntegerField(default=0, help_text="Number of tasks completed on this day")
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "group", "day"], name="unique_daily_annotation_count", nulls_distinct=False
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["group", "day"], name="daily_annotation_group_day"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.day}: {self.count}"
+
+    @classmethod
+    def adjust(cls, user_id, group_id, day, delta):
+        """Add delta to the count for (user, group, day), creating the row if needed."""
+        row, created = cls.objects.get_or_create(user_id=user_id, group_id=group_id, day=day, defaults={"count": delta})
+        if not created:
+            cls.objects.filter(pk=row.pk).update(count=F("count") + delta)
+
+
+class ProjectTaskCounter(models.Model):
+    """Number of tasks and completed tasks in a project, per group and task creator."""
+
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="task_counters")
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name="project_task_counters", null=True, blank=True
+    )
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name="project_task_counters")
+    total_count = models.IntegerField(default=0, help_text="Number of tasks")
+    done_count = models.IntegerField(default=0, help_text="Number of completed tasks")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "group", "created_by"], name="unique_project_task_counter", nulls_distinct=False
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.project.name}: {self.done_count}/{self.total_count}"
+
+    @classmethod
+    def adjust(cls, project_id, group_id, created_by_id, total_delta, done_delta):
+        """Add the deltas to the counters for (project, group, creator), creating the row if needed."""
+        row, created = cls.objects.get_or_create(
+            project_id=project_id,
+            group_id=group_id,
+            created_by_id=created_by_id,
+            defaults={"total_count": total_delta, "done_count": done_delta},
+        )
+        if not created:
+            cls.objects.filter(pk=row.pk).update(
+                total_count=F("total_count") + total_delta, done_count=F("done_count") + done_delta
+            )
+
+
+def task_rollup_state(task):
+    """Return the fields of a task that the rollups depend on, as a tuple.
+
+    Layout: (project_id, group_id, created_by_id, is_done, annotated_by_id, annotated day)
+    """
+    day = timezone.localdate(task.annotated_at) if task.annotated_at else None
+    return (task.project_id, task.group_id, task.created_by_id, task.is_done, task.annotated_by_id, day)
+
+
+def _annotation_key(state):
+    """Return the (user, group, day) key a task state counts towards, or None if it is not a completed annotation."""
+    _, group_id, _, is_done, annotated_by_id, day = state
+    if is_done and annotated_by_id and day:
+        return (annotated_by_id, group_id, day)
+    return None
+
+
+def apply_task_change(previous, current):
+    """Update the rollups for a single task going from one state to another.
+
+    Args:
+        previous: task_rollup_state() before the save, or None for a new task
+        current: task_rollup_state() after the save, or None for a deleted task
+    """
+    if previous == current:
+        return
+
+    with transaction.atomic():
+        # Project counters
+        if previous and current and previous[:3] == current[:3]:
+            if previous[3] != current[3]:
+                ProjectTaskCounter.adjust(*current[:3], 0, 1 if current[3] else -1)
+        else:
+            if previous:
+                ProjectTaskCounter.adjust(*previous[:3], -1, -1 if previous[3] else 0)
+            if current:
+                ProjectTaskCounter.adjust(*current[:3], 1, 1 if current[3] else 0)
+
+        # Daily annotation counts
+        previous_key = _annotation_key(previous) if previous else None
+        current_key = _annotation_key(current) if current else None
+        if previous_key != current_key:
+            if previous_key:
+                DailyAnnotationCount.adjust(*previous_key, -1)
+            if current_key:
+                DailyAnnotationCount.adjust(*current_key, 1)
+
+
+def record_created_tasks(tasks):
+    """Add tasks inserted with bulk_create (which bypasses Task.save) to the rollups."""
+    project_counts = Counter()
+    annotation_counts = Counter()
+    for task in tasks:
+        state = task_rollup_state(task)
+        project_counts[(state[:3], state[3])] += 1
+        annotation_key = _annotation_key(state)
+        if annotation_key:
+            annotation_counts[annotation_key] += 1
+
+    with transaction.atomic():
+        for (project_key, is_done), count in project_counts.items():
+            ProjectTaskCounter.adjust(*project_key, count, count if is_done else 0)
+        for annotation_key, count in annotation_counts.items():
+            DailyAnnotationCount.adjust(*annotation_key, count)
+
+
+def forget_tasks(queryset):
+    """Remove the tasks of a queryset from the rollups, ahead of deleting them in bulk.
+
+    Call this inside the same transaction as the delete.
+    """
+    project_rows = queryset.values("project_id", "group_id", "created_by_id").annotate(
+        total=Count("id"), done=Count("id", filter=Q(is_done=True))
+    )
+    for row in project_rows:
+        ProjectTaskCounter.adjust(row["project_id"], row["group_id"], row["created_by_id"], -row["total"], -row["done"])
+
+    annotation_rows = (
+        queryset.filter(is_done=True, annotated_by__isnull=False, annotated_at__isnull=False)
+        .annotate(day=TruncDate("annotated_at"))
+        .values("annotated_by_id", "group_id", "day")
+        .annotate(total=Count("id"))
+    )
+    for row in annotation_rows:
+        DailyAnnotationCount.adjust(row["annotated_by_id"], row["group_id"], row["day"], -row["total"])
+
+
+def rebuild_task_rollups():
+    """Recompute both rollup tables from the task table.
+
+    Returns:
+        tuple: (number of project counter rows, number of daily annotation rows)
+    """
+    from .task import Task
+
+    with transaction.atomic():
+        ProjectTaskCounter.objects.all().delete()
+        DailyAnnotationCount.objects.all().delete()
+
+        counters = ProjectTaskCounter.objects.bulk_create(
+            ProjectTaskCounter(
+                project_id=row["project_id"],
+                group_id=row["group_id"],
+                created_by_id=row["created_by_id"],
+                total_count=row["total"],
+                done_count=row["done"],
+            )
+            for row in Task.objects.values("project_id", "group_id", "created_by_id").annotate(
+                total=Count("id"), done=Count("id", filter=Q(is_done=True))
+            )
+        )
+
+        days = DailyAnnotationCount.objects.bulk_create(
+            DailyAnnotationCount(
+                user_id=row["annotated_by_id"], group_id=row["group_id"], day=row["day"], count=row["total"]
+            )
+            for row in Task.objects.filter(is_done=True, annotated_by__isnull=False, annotated_at__isnull=False)
+            .annotate(day=TruncDate("annotated_at"))
+            .values("annotated_by_id", "group_id", "day")
+            .annotate(total=Count("id"))
+        )
+
+    return len(counters), len(days)
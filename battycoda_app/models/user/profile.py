@@ -6,7 +6,8 @@ from django.contrib.auth.models import User
 from django.db import models
 from django.utils import timezone
 
-from .group import Group, GroupMembership
+from ...utils_modules.lookup_cache import is_group_admin
+from .group import Group
 
 
 class UserProfile(models.Model):
@@ -90,7 +91,12 @@ class UserProfile(models.Model):
         target_group = group or self.group
         if not target_group:
             return False
-        return GroupMembership.objects.filter(user=self.user, group=target_group, is_admin=True).exists()
+
+        # Memoized on the instance, which lives for one request (see AuthenticationMiddleware)
+        memo = self.__dict__.setdefault("_group_admin_memo", {})
+        if target_group.id not in memo:
+            memo[target_group.id] = is_group_admin(self.user_id, target_group.id)
+        return memo[target_group.id]
 
     @property
     def is_current_group_admin(self):
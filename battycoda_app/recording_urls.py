@@ -43,6 +43,11 @@ urlpatterns = [
         name="remove_duplicate_recordings",
     ),
     path("recordings/batch-upload/", views_batch_upload.batch_upload_recordings_view, name="batch_upload_recordings"),
+    path(
+        "recordings/batch-upload/<int:job_id>/status/",
+        views_batch_upload.batch_upload_status_view,
+        name="batch_upload_status",
+    ),
     path(
         "recordings/<int:recording_id>/waveform-data/",
         views_audio_streaming.get_audio_waveform_data,
@@ -12,6 +12,7 @@ from .views_segmentation.segment_crud import (
     delete_segment_view,
     edit_segment_view,
 )
+from .views_segmentation.segment_data import export_segmentation_view, segmentation_segments_data_view
 from .views_segmentation.segment_management import (
     create_segmentation_view,
     delete_segmentation_view,
@@ -21,7 +22,7 @@ from .views_segmentation.segment_management import (
 from .views_segmentation.segmentation_batches import batch_segmentation_view, segmentation_jobs_status_view
 from .views_segmentation.segmentation_execution import auto_segment_recording_view
 from .views_segmentation.segmentation_import import upload_pickle_segments_view
-from .views_segmentation.segmentation_preview import create_preview_recording_view
+from .views_segmentation.segmentation_preview import segmentation_preview_spectrogram_view, segmentation_preview_view
 from .views_segmentation.segmentation_selection import select_recording_for_segmentation_view
 from .views_segmentation.segmentation_settings import activate_segmentation_view
 from .views_segmentation.segmentation_status import auto_segment_status_view
@@ -67,9 +68,14 @@ urlpatterns = [
         name="auto_segment_status",
     ),
     path(
-        "recordings/<int:recording_id>/create-preview/",
-        create_preview_recording_view,
-        name="create_preview_recording",
+        "recordings/<int:recording_id>/segmentation-preview/",
+        segmentation_preview_view,
+        name="segmentation_preview",
+    ),
+    path(
+        "recordings/<int:recording_id>/segmentation-preview/spectrogram/",
+        segmentation_preview_spectrogram_view,
+        name="segmentation_preview_spectrogram",
     ),
     path(
         "recordings/<int:recording_id>/upload-pickle/",
@@ -88,6 +94,16 @@ urlpatterns = [
         activate_segmentation_view,
         name="activate_segmentation",
     ),
+    path(
+        "segmentations/<int:segmentation_id>/segments/data/",
+        segmentation_segments_data_view,
+        name="segmentation_segments_data",
+    ),
+    path(
+        "segmentations/<int:segmentation_id>/export/",
+        export_segmentation_view,
+        name="export_segmentation",
+    ),
     path("segmentations/<int:segmentation_id>/segments/add/", add_segment_view, name="add_segment"),
     path("segmentations/<int:segmentation_id>/segments/<int:segment_id>/edit/", edit_segment_view, name="edit_segment"),
     path(
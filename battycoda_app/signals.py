@@ -1,18 +1,27 @@
 from django.db import transaction
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
 from .audio.task_modules.spectrogram.hdf5_generation import generate_recording_spectrogram
 from .models import (
+    BatchExportJob,
+    BatchUploadJob,
+    Call,
     ClassificationRun,
+    Classifier,
     ClassifierTrainingJob,
+    ClusteringAlgorithm,
+    ClusteringRun,
+    GroupMembership,
     Notification,
     Recording,
     Segmentation,
     SpectrogramJob,
 )
 from .tasks import calculate_audio_duration
+from .utils_modules import lookup_cache
+from .utils_modules.progress_bus import publish_job
 
 
 @receiver(post_save, sender=Recording)
@@ -142,3 +151,53 @@ def training_job_status_changed(sender, instance, **kwargs):
     elif instance.status == "failed":
         # Create failure notification
         Notification.add_training_notification(user=instance.created_by, training_job=instance, success=False)
+
+
+@receiver(post_save, sender=Segmentation)
+@receiver(post_save, sender=ClassificationRun)
+@receiver(post_save, sender=ClassifierTrainingJob)
+@receiver(post_save, sender=ClusteringRun)
+@receiver(post_save, sender=SpectrogramJob)
+@receiver(post_save, sender=BatchUploadJob)
+@receiver(post_save, sender=BatchExportJob)
+def publish_job_progress_event(sender, instance, **kwargs):
+    """
+    Signal handler to publish job status and progress to the progress bus once the save is committed
+    """
+    transaction.on_commit(lambda: publish_job(instance))
+
+
+@receiver(post_save, sender=GroupMembership)
+@receiver(post_delete, sender=GroupMembership)
+def invalidate_group_admin_lookups(sender, **kwargs):
+    """
+    Signal handler to drop cached group admin checks when a membership changes
+    """
+    lookup_cache.invalidate_lookups(lookup_cache.GROUP_ADMINS)
+
+
+@receiver(post_save, sender=Call)
+@receiver(post_delete, sender=Call)
+def invalidate_species_call_lookups(sender, **kwargs):
+    """
+    Signal handler to drop cached species call types when a call type changes
+    """
+    lookup_cache.invalidate_lookups(lookup_cache.SPECIES_CALLS)
+
+
+@receiver(post_save, sender=Classifier)
+@receiver(post_delete, sender=Classifier)
+def invalidate_classifier_lookups(sender, **kwargs):
+    """
+    Signal handler to drop cached classifier lists when a classifier changes
+    """
+    lookup_cache.invalidate_lookups(lookup_cache.CLASSIFIERS)
+
+
+@receiver(post_save, sender=ClusteringAlgorithm)
+@receiver(post_delete, sender=ClusteringAlgorithm)
+def invalidate_clustering_algorithm_lookups(sender, **kwargs):
+    """
+    Signal handler to drop cached clustering algorithm lists when an algorithm changes
+    """
+    lookup_cache.invalidate_lookups(lookup_cache.CLUSTERING_ALGORITHMS)
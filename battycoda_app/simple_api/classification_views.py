@@ -2,19 +2,21 @@
 Classification API views for the core classification workflow.
 """
 
-from django.db.models import OuterRef, Q, Subquery
+from django.db.models import Count, OuterRef, Q, Subquery
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
 from ..models.classification import CallProbability, ClassificationResult, ClassificationRun, Classifier
 from .auth import api_key_required
+from .listing import conditional_json_response, paginate_by_cursor
 
 
-def _get_result_summary(run):
-    """Get call type counts for a completed classification run."""
-    if run.status != "completed":
-        return {}
+def _get_result_summaries(runs):
+    """Get call type counts for every completed classification run in runs, in a single query."""
+    summaries = {run.id: {} for run in runs if run.status == "completed"}
+    if not summaries:
+        return summaries
 
     # Subquery to get the top probability call for each result
     top_prob = (
@@ -23,20 +25,19 @@ def _get_result_summary(run):
         .values("call__short_name")[:1]
     )
 
-    # Get all results with their top call type
-    results_with_top = (
-        ClassificationResult.objects.filter(classification_run=run)
+    # Count results per run and top call type
+    call_counts = (
+        ClassificationResult.objects.filter(classification_run_id__in=summaries)
         .annotate(top_call_name=Subquery(top_prob))
-        .values_list("top_call_name", flat=True)
+        .values("classification_run_id", "top_call_name")
+        .annotate(count=Count("id"))
+        .order_by("classification_run_id", "top_call_name")
     )
+    for row in call_counts:
+        if row["top_call_name"]:  # Skip None values
+            summaries[row["classification_run_id"]][row["top_call_name"]] = row["count"]
 
-    # Count occurrences
-    call_counts = {}
-    for call_name in results_with_top:
-        if call_name:  # Skip None values
-            call_counts[call_name] = call_counts.get(call_name, 0) + 1
-
-    return call_counts
+    return summaries
 
 
 @require_http_methods(["GET"])
@@ -61,7 +62,7 @@ def simple_classifiers_list(request):
         )
 
     classifiers_data = []
-    for classifier in classifiers:
+    for classifier in classifiers.select_related("species"):
         classifiers_data.append(
             {
                 "id": classifier.id,
@@ -73,7 +74,9 @@ def simple_classifiers_list(request):
             }
         )
 
-    return JsonResponse({"success": True, "classifiers": classifiers_data, "count": len(classifiers_data)})
+    return conditional_json_response(
+        request, {"success": True, "classifiers": classifiers_data, "count": len(classifiers_data)}
+    )
 
 
 @csrf_exempt
@@ -209,6 +212,19 @@ def simple_classification_runs_list(request):
         except (ValueError, TypeError):
             return JsonResponse({"success": False, "error": "Invalid project_id format"}, status=400)
 
+    runs = runs.select_related(
+        "classifier",
+        "created_by",
+        "segmentation__recording__project",
+        "segmentation__recording__species",
+    )
+    try:
+        runs, pagination = paginate_by_cursor(request, runs)
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Invalid cursor"}, status=400)
+
+    result_summaries = _get_result_summaries(runs)
+
     runs_data = []
     for run in runs:
         runs_data.append(
@@ -238,8 +254,11 @@ def simple_classification_runs_list(request):
                 "created_at": run.created_at.isoformat(),
                 "created_by": run.created_by.username,
                 "error_message": run.error_message,
-                "result_summary": _get_result_summary(run),
+                "result_summary": result_summaries.get(run.id, {}),
             }
         )
 
-    return JsonResponse({"success": True, "classification_runs": runs_data, "count": len(runs_data)})
+    return conditional_json_response(
+        request,
+        {"success": True, "classification_runs": runs_data, "count": len(runs_data), "pagination": pagination},
+    )
@@ -2,13 +2,14 @@
 Data listing API views for species, projects, recordings.
 """
 
-from django.db.models import Count, Q
+from django.db.models import Count, OuterRef, Q, Subquery
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 
 from ..models import Project, Recording
 from ..models.organization import Species
 from .auth import api_key_required
+from .listing import conditional_json_response, paginate_by_cursor
 
 
 @require_http_methods(["GET"])
@@ -30,7 +31,7 @@ def simple_species_list(request):
     for s in species:
         species_data.append({"id": s.id, "name": s.name, "description": s.description})
 
-    return JsonResponse({"success": True, "species": species_data, "count": len(species_data)})
+    return conditional_json_response(request, {"success": True, "species": species_data, "count": len(species_data)})
 
 
 @require_http_methods(["GET"])
@@ -45,27 +46,33 @@ def simple_projects_list(request):
     else:
         projects = Project.objects.filter(created_by=user)
 
+    # Primary species (most common species in the project's recordings) and counts, in one query
+    primary_species = (
+        Recording.objects.filter(project=OuterRef("pk"))
+        .values("species")
+        .annotate(count=Count("id"))
+        .order_by("-count", "species")
+    )
+    projects = projects.annotate(
+        recording_count=Count("recordings", filter=Q(recordings__hidden=False)),
+        primary_species_id=Subquery(primary_species.values("species")[:1]),
+        primary_species_name=Subquery(primary_species.values("species__name")[:1]),
+    )
+
     projects_data = []
     for p in projects:
-        # Get the primary species for this project (most common species in recordings)
-        species_counts = (
-            p.recordings.values("species__id", "species__name").annotate(count=Count("id")).order_by("-count")
-        )
-
-        primary_species = species_counts.first()
-
         projects_data.append(
             {
                 "id": p.id,
                 "name": p.name,
                 "description": p.description,
-                "species_name": primary_species["species__name"] if primary_species else "No recordings",
-                "species_id": primary_species["species__id"] if primary_species else None,
-                "recording_count": p.recordings.count(),
+                "species_name": p.primary_species_name or "No recordings",
+                "species_id": p.primary_species_id,
+                "recording_count": p.recording_count,
             }
         )
 
-    return JsonResponse({"success": True, "projects": projects_data, "count": len(projects_data)})
+    return conditional_json_response(request, {"success": True, "projects": projects_data, "count": len(projects_data)})
 
 
 @require_http_methods(["GET"])
@@ -89,11 +96,14 @@ def simple_recordings_list(request):
         except (ValueError, TypeError):
             return JsonResponse({"success": False, "error": "Invalid project_id format"}, status=400)
 
+    recordings = recordings.select_related("species", "project").annotate(segmentation_count=Count("segmentations"))
+    try:
+        recordings, pagination = paginate_by_cursor(request, recordings)
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Invalid cursor"}, status=400)
+
     recordings_data = []
     for r in recordings:
-        # Check if recording has any segmentations
-        has_segmentation = r.segmentations.exists()
-
         recordings_data.append(
             {
                 "id": r.id,
@@ -106,9 +116,12 @@ def simple_recordings_list(request):
                 "project_name": r.project.name if r.project else "",
                 "project_id": r.project.id if r.project else None,
                 "created_at": r.created_at.isoformat(),
-                "has_segmentation": has_segmentation,
-                "segmentation_count": r.segmentations.count(),
+                "has_segmentation": r.segmentation_count > 0,
+                "segmentation_count": r.segmentation_count,
             }
         )
 
-    return JsonResponse({"success": True, "recordings": recordings_data, "count": len(recordings_data)})
+    return conditional_json_response(
+        request,
+        {"success": True, "recordings": recordings_data, "count": len(recordings_data), "pagination": pagination},
+    )
@@ -0,0 +1,112 @@
+"""
+Columnar export API views.
+
+Task batches, segmentations, classification results and cluster assignments
+are downloaded as Parquet (default) or Arrow IPC files, selected with the
+``format`` parameter, which R (arrow) and Python (pandas/polars) read directly.
+"""
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from ..models import Segmentation
+from ..models.classification import ClassificationRun
+from ..models.clustering import ClusteringRun
+from ..utils_modules.columnar_export import (
+    classification_results_table,
+    cluster_assignments_table,
+    columnar_export_response,
+    parse_columnar_format,
+    segmentation_table,
+    task_batch_table,
+)
+from ..views_clustering.permissions import has_clustering_permission
+from .auth import api_key_required
+from .task_views import get_task_batch_for_user
+
+
+def _not_found(kind, object_id):
+    return JsonResponse(
+        {"success": False, "error": f"{kind} with ID {object_id} not found or not accessible"}, status=404
+    )
+
+
+def _export(request, table, base_name):
+    """Return the columnar export response, or a 400 for an unsupported format."""
+    try:
+        export_format = parse_columnar_format(request.GET.get("format"))
+    except ValueError as e:
+        return JsonResponse({"success": False, "error": str(e)}, status=400)
+    return columnar_export_response(export_format, table, base_name)
+
+
+@require_http_methods(["GET"])
+@api_key_required
+def simple_export_task_batch(request, batch_id):
+    """Export the tasks of a batch"""
+    batch, error_response = get_task_batch_for_user(batch_id, request.api_user)
+    if error_response:
+        return error_response
+
+    return _export(request, task_batch_table(batch), f"taskbatch_{batch.id}")
+
+
+@require_http_methods(["GET"])
+@api_key_required
+def simple_export_segmentation(request, segmentation_id):
+    """Export the segments of a segmentation"""
+    user = request.api_user
+
+    try:
+        segmentation = Segmentation.objects.select_related("recording").get(id=segmentation_id)
+    except Segmentation.DoesNotExist:
+        return _not_found("Segmentation", segmentation_id)
+
+    recording = segmentation.recording
+    user_group = user.profile.group
+    if recording.created_by != user and (not user_group or recording.group != user_group):
+        return _not_found("Segmentation", segmentation_id)
+
+    return _export(request, segmentation_table(segmentation), f"segments_{segmentation.id}")
+
+
+@require_http_methods(["GET"])
+@api_key_required
+def simple_export_classification_results(request, run_id):
+    """Export the results of a completed classification run with their full probability vectors"""
+    user = request.api_user
+    user_group = user.profile.group
+
+    runs = ClassificationRun.objects.select_related("segmentation__recording")
+    runs = runs.filter(group=user_group) if user_group else runs.filter(created_by=user)
+    try:
+        run = runs.get(id=run_id)
+    except ClassificationRun.DoesNotExist:
+        return _not_found("Classification run", run_id)
+
+    if run.status != "completed":
+        return JsonResponse(
+            {"success": False, "error": "Classification run must be completed before exporting results"}, status=400
+        )
+
+    return _export(request, classification_results_table(run), f"classification_{run.id}")
+
+
+@require_http_methods(["GET"])
+@api_key_required
+def simple_export_cluster_assignments(request, run_id):
+    """Export the segment-to-cluster assignments of a completed clustering run"""
+    try:
+        clustering_run = ClusteringRun.objects.get(id=run_id)
+    except ClusteringRun.DoesNotExist:
+        return _not_found("Clustering run", run_id)
+
+    if not has_clustering_permission(request.api_user, clustering_run):
+        return _not_found("Clustering run", run_id)
+
+    if clustering_run.status != "completed":
+        return JsonResponse(
+            {"success": False, "error": "Clustering run must be completed before exporting assignments"}, status=400
+        )
+
+    return _export(request, cluster_assignments_table(clustering_run), f"clusters_{clustering_run.id}")
@@ -0,0 +1,105 @@
+"""
+Pagination and conditional GET helpers for Simple API list endpoints.
+
+List endpoints return their rows newest first. Clients can page through them
+with an opaque cursor (keyset pagination on created_at and id, so deep pages
+cost the same as the first one), and every list response carries an ETag and,
+where known, a Last-Modified header so unchanged lists revalidate with a 304.
+"""
+
+import base64
+import hashlib
+
+from django.db.models import Q
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date
+
+from ..utils_modules.validation import get_int_param
+
+# Largest page a client can ask for
+MAX_PAGE_LIMIT = 1000
+
+
+def encode_cursor(obj):
+    """Build the opaque cursor pointing just past obj in a newest-first list."""
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return the (created_at, pk) pair encoded in a cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        created_at = parse_datetime(created_at)
+        pk = int(pk)
+    except (ValueError, UnicodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if created_at is None:
+        raise ValueError("Invalid cursor")
+    return created_at, pk
+
+
+def paginate_by_cursor(request, queryset):
+    """Return one page of a queryset ordered newest first, plus pagination metadata.
+
+    Pagination is opt-in: without a ``limit`` or ``cursor`` parameter the whole
+    list is returned, as older API clients expect.
+
+    Args:
+        request: Django request with optional ``limit`` and ``cursor`` GET parameters
+        queryset: Queryset of a model with a created_at field
+
+    Returns:
+        tuple: (list of objects, pagination dict with limit, next_cursor and has_next)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    queryset = queryset.order_by("-created_at", "-pk")
+
+    cursor = request.GET.get("cursor")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+
+    if "limit" not in request.GET and not cursor:
+        return list(queryset), {"limit": None, "next_cursor": None, "has_next": False}
+
+    limit = get_int_param(request, "limit", default=100, min_val=1, max_val=MAX_PAGE_LIMIT)
+    items = list(queryset[: limit + 1])
+    has_next = len(items) > limit
+    items = items[:limit]
+
+    return items, {
+        "limit": limit,
+        "next_cursor": encode_cursor(items[-1]) if has_next else None,
+        "has_next": has_next,
+    }
+
+
+def conditional_json_response(request, data, last_modified=None):
+    """Return data as JSON, or a 304 if the client already has this exact response.
+
+    Args:
+        request: Django request, checked for If-None-Match / If-Modified-Since
+        data: JSON-serializable response payload
+        last_modified: Optional aware datetime of the newest change in the list. Clients that
+            send If-None-Match are matched on the ETag alone, so this only serves clients
+            that revalidate by date
+    """
+    response = JsonResponse(data)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+
+    # Private per-user data that must be revalidated, but can be served from cache on a 304
+    response["Cache-Control"] = "private, no-cache"
+    response["ETag"] = f'"{hashlib.md5(response.content).hexdigest()}"'
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+
+    return get_conditional_response(request, etag=response["ETag"], last_modified=timestamp, response=response)
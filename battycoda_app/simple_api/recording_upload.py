@@ -8,17 +8,18 @@ import os
 import tempfile
 from datetime import datetime
 
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import transaction
 from django.db.models import Q
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
+from ..audio.modules.file_utils import create_recording_from_file
 from ..audio.utils import get_audio_duration, process_pickle_file, split_audio_file
 from ..models import Project, Recording, Segment, Segmentation
 from ..models.organization import Species
 from ..utils_modules.cleanup import safe_cleanup_dir, safe_remove_file
+from ..utils_modules.recording_utils import find_duplicate_recording
 from ..utils_modules.validation import safe_int
 from .auth import api_key_required
 
@@ -70,34 +71,43 @@ def _parse_recorded_date(date_string):
         return None, JsonResponse({"success": False, "error": "Invalid date format. Use YYYY-MM-DD"}, status=400)
 
 
-def _create_split_recordings(chunk_paths, name, description, location, parsed_date, species, project, user):
+def _duplicate_response(recording):
+    """Return the 409 response for an upload whose audio is already stored as recording."""
+    return JsonResponse(
+        {
+            "success": False,
+            "error": f'This audio has already been uploaded as recording "{recording.name}"',
+            "duplicate_of": {"id": recording.id, "name": recording.name},
+        },
+        status=409,
+    )
+
+
+def _create_split_recordings(
+    chunk_paths, fingerprints, name, description, location, parsed_date, species, project, user
+):
     """
     Create multiple recordings from audio chunks.
     Returns list of created Recording objects.
     """
     recordings_created = []
 
-    for i, chunk_path in enumerate(chunk_paths):
-        with open(chunk_path, "rb") as chunk_file:
-            chunk_name = f"{name} (Part {i + 1}/{len(chunk_paths)})"
-            chunk_django_file = SimpleUploadedFile(
-                os.path.basename(chunk_path), chunk_file.read(), content_type="audio/wav"
-            )
-
-            with transaction.atomic():
-                recording = Recording.objects.create(
-                    name=chunk_name,
-                    description=description,
-                    wav_file=chunk_django_file,
-                    location=location,
-                    recorded_date=parsed_date,
-                    species=species,
-                    project=project,
-                    group=user.profile.group,
-                    created_by=user,
-                    file_ready=True,
-                )
-                recordings_created.append(recording)
+    for i, (chunk_path, fingerprint) in enumerate(zip(chunk_paths, fingerprints, strict=True)):
+        chunk_name = f"{name} (Part {i + 1}/{len(chunk_paths)})"
+        # Move the chunk into storage instead of reading it into memory
+        recording = create_recording_from_file(
+            chunk_path,
+            name=chunk_name,
+            description=description,
+            location=location,
+            recorded_date=parsed_date,
+            species=species,
+            project=project,
+            group=user.profile.group,
+            created_by=user,
+            **fingerprint,
+        )
+        recordings_created.append(recording)
 
     # Clean up chunk files
     for chunk_path in chunk_paths:
@@ -223,8 +233,25 @@ def upload_recording(request):
             # If duration > 60 seconds, split into 1-minute chunks
             if duration > 60:
                 chunk_paths = split_audio_file(temp_file_path, chunk_duration_seconds=60)
+
+                # Reject a re-upload before any recording (and its spectrogram job) is created
+                checks = [find_duplicate_recording(path, user.profile.group, user) for path in chunk_paths]
+                if all(duplicate for duplicate, _ in checks):
+                    for chunk_path in chunk_paths:
+                        safe_remove_file(chunk_path, "audio chunk file")
+                        safe_cleanup_dir(os.path.dirname(chunk_path), "chunk directory")
+                    return _duplicate_response(checks[0][0])
+
                 recordings_created = _create_split_recordings(
-                    chunk_paths, name, description, location, parsed_date, species, project, user
+                    chunk_paths,
+                    [fingerprint for _, fingerprint in checks],
+                    name,
+                    description,
+                    location,
+                    parsed_date,
+                    species,
+                    project,
+                    user,
                 )
 
                 return JsonResponse(
@@ -241,6 +268,10 @@ def upload_recording(request):
                 )
 
             # File is ≤ 60 seconds, create single recording
+            duplicate, fingerprint = find_duplicate_recording(temp_file_path, user.profile.group, user)
+            if duplicate:
+                return _duplicate_response(duplicate)
+
             wav_file.seek(0)
 
             with transaction.atomic():
@@ -255,6 +286,7 @@ def upload_recording(request):
                     group=user.profile.group,
                     created_by=user,
                     file_ready=True,
+                    **fingerprint,
                 )
 
             # Process pickle file if provided
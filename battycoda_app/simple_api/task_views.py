@@ -2,16 +2,17 @@
 Task management API views for task batches and annotation.
 """
 
-from django.db import transaction
-from django.db.models import Q
+from django.db.models import Count, Max, Q
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 
-from ..models import Task, TaskBatch
-from ..models.classification import CallProbability, ClassificationResult, ClassificationRun
+from ..models import TaskBatch
+from ..models.classification import ClassificationRun
 from ..utils_modules.validation import get_int_param
+from ..views_classification.task_creation.helpers import create_task_batch_helper
 from .auth import api_key_required
+from .listing import conditional_json_response, paginate_by_cursor
 
 # --- Helper functions to reduce duplication ---
 
@@ -48,6 +49,15 @@ def get_task_batches_queryset(user):
         return TaskBatch.objects.filter(created_by=user)
 
 
+def with_task_counts(batches):
+    """Annotate a TaskBatch queryset with total_tasks, completed_tasks and last_task_update."""
+    return batches.select_related("species", "project", "created_by").annotate(
+        total_tasks=Count("tasks"),
+        completed_tasks=Count("tasks", filter=Q(tasks__is_done=True)),
+        last_task_update=Max("tasks__updated_at"),
+    )
+
+
 def serialize_task_batch(batch, include_progress=True):
     """Convert a TaskBatch to a dict for JSON response."""
     data = {
@@ -63,8 +73,12 @@ def serialize_task_batch(batch, include_progress=True):
     }
 
     if include_progress:
-        total_tasks = batch.tasks.count()
-        completed_tasks = batch.tasks.filter(is_done=True).count()
+        # Use the counts annotated by with_task_counts() when present
+        if hasattr(batch, "total_tasks"):
+            total_tasks, completed_tasks = batch.total_tasks, batch.completed_tasks
+        else:
+            total_tasks = batch.tasks.count()
+            completed_tasks = batch.tasks.filter(is_done=True).count()
         data["total_tasks"] = total_tasks
         data["completed_tasks"] = completed_tasks
         data["progress_percentage"] = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
@@ -137,69 +151,16 @@ def simple_create_task_batch(request, run_id):
         except ValueError as e:
             return JsonResponse({"success": False, "error": f"Invalid confidence threshold: {str(e)}"}, status=400)
 
-    # Create task batch using transaction
-    recording = run.segmentation.recording
-
-    with transaction.atomic():
-        # Create the task batch
-        task_batch = TaskBatch.objects.create(
-            name=name,
-            description=description,
-            created_by=user,
-            wav_file_name=recording.wav_file.name if recording.wav_file else "",
-            wav_file=recording.wav_file,
-            species=recording.species,
-            project=recording.project,
-            group=user_group,
-            classification_run=run,
-        )
-
-        # Get all classification results from this run
-        results = ClassificationResult.objects.filter(classification_run=run)
-
-        tasks_created = 0
-        for result in results:
-            segment = result.segment
-
-            # Skip segments that already have tasks
-            if hasattr(segment, "task") and segment.task:
-                continue
-
-            # Get the highest probability call type
-            top_probability = (
-                CallProbability.objects.filter(classification_result=result)
-                .select_related("call")
-                .order_by("-probability")
-                .first()
-            )
-
-            # Skip if confidence threshold is set and this result's confidence is too high
-            if max_confidence is not None and top_probability and top_probability.probability > max_confidence:
-                continue
-
-            # Skip if call object is missing (broken foreign key)
-            if top_probability and not top_probability.call:
-                continue
-
-            # Create a task for this segment
-            predicted_call = top_probability.call.short_name if top_probability else None
-            confidence = top_probability.probability if top_probability else 0.0
-
-            Task.objects.create(
-                wav_file_name=task_batch.wav_file_name,
-                onset=segment.onset,
-                offset=segment.offset,
-                species=task_batch.species,
-                project=task_batch.project,
-                batch=task_batch,
-                classification_result=predicted_call,
-                confidence=confidence,
-                created_by=user,
-                group=user_group,
-                source_segment=segment,
-            )
-
-            tasks_created += 1
+    # Create the batch and its tasks in a few set-based queries
+    task_batch, tasks_created, _ = create_task_batch_helper(
+        run=run,
+        batch_name=name,
+        description=description,
+        created_by=user,
+        group=user_group,
+        max_confidence=max_confidence,
+        keep_empty=True,
+    )
 
     return JsonResponse(
         {
@@ -232,8 +193,23 @@ def simple_task_batches_list(request):
         except (ValueError, TypeError):
             return JsonResponse({"success": False, "error": "Invalid project_id format"}, status=400)
 
+    try:
+        batches, pagination = paginate_by_cursor(request, with_task_counts(batches))
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Invalid cursor"}, status=400)
+
+    # Newest batch or task edit on the page; deletions are only caught by the ETag
+    last_modified = max(
+        (timestamp for batch in batches for timestamp in (batch.created_at, batch.last_task_update) if timestamp),
+        default=None,
+    )
+
     batches_data = [serialize_task_batch(batch) for batch in batches]
-    return JsonResponse({"success": True, "task_batches": batches_data, "count": len(batches_data)})
+    return conditional_json_response(
+        request,
+        {"success": True, "task_batches": batches_data, "count": len(batches_data), "pagination": pagination},
+        last_modified=last_modified,
+    )
 
 
 @require_http_methods(["GET"])
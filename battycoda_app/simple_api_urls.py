@@ -11,6 +11,12 @@ from .simple_api.classification_views import (
     simple_start_classification,
 )
 from .simple_api.data_views import simple_projects_list, simple_recordings_list, simple_species_list
+from .simple_api.export_views import (
+    simple_export_classification_results,
+    simple_export_cluster_assignments,
+    simple_export_segmentation,
+    simple_export_task_batch,
+)
 from .simple_api.pickle_upload import upload_pickle_segmentation
 from .simple_api.recording_upload import upload_recording
 from .simple_api.segmentation_views import simple_segmentation_algorithms, simple_start_segmentation
@@ -39,6 +45,15 @@ urlpatterns = [
     path("classification-runs/<int:run_id>/create-task-batch/", simple_create_task_batch, name="create_task_batch"),
     path("task-batches/", simple_task_batches_list, name="task_batches_list"),
     path("task-batches/<int:batch_id>/tasks/", simple_task_batch_tasks, name="task_batch_tasks"),
+    # Columnar (Parquet/Arrow) export endpoints
+    path("task-batches/<int:batch_id>/export/", simple_export_task_batch, name="export_task_batch"),
+    path("segmentations/<int:segmentation_id>/export/", simple_export_segmentation, name="export_segmentation"),
+    path(
+        "classification-runs/<int:run_id>/export/",
+        simple_export_classification_results,
+        name="export_classification_results",
+    ),
+    path("clustering-runs/<int:run_id>/export/", simple_export_cluster_assignments, name="export_cluster_assignments"),
     # User info and API key management
     path("user/", simple_user_info, name="user_info"),
     path("generate-key/", simple_generate_api_key, name="generate_api_key"),
@@ -8,7 +8,7 @@ and task annotation.
 from django.urls import path
 
 from . import views_task_annotation, views_task_batch, views_task_listing, views_task_navigation
-from .views_batch_export import export_completed_batches
+from .views_batch_export import download_batch_export_view, export_completed_batches, queue_completed_batches_export
 from .views_task_batch_management import delete_task_batch_view
 
 urlpatterns = [
@@ -18,11 +18,23 @@ urlpatterns = [
     path("tasks/batches/<int:batch_id>/", views_task_batch.task_batch_detail_view, name="task_batch_detail"),
     path("tasks/batches/<int:batch_id>/export/", views_task_batch.export_task_batch_view, name="export_task_batch"),
     path("tasks/batches/<int:batch_id>/review/", views_task_batch.task_batch_review_view, name="task_batch_review"),
+    path(
+        "tasks/batches/<int:batch_id>/review/tasks/",
+        views_task_batch.task_batch_review_tasks_view,
+        name="task_batch_review_tasks",
+    ),
     path("tasks/batches/<int:batch_id>/delete/", delete_task_batch_view, name="delete_task_batch"),
     path("tasks/batches/export-completed/", export_completed_batches, name="export_completed_batches"),
+    path(
+        "tasks/batches/export-completed/background/",
+        queue_completed_batches_export,
+        name="queue_completed_batches_export",
+    ),
+    path("tasks/batches/exports/<int:job_id>/download/", download_batch_export_view, name="download_batch_export"),
     path("tasks/batches/check-name/", views_task_batch.check_taskbatch_name, name="check_taskbatch_name"),
     path("tasks/relabel-ajax/", views_task_batch.relabel_task_ajax, name="relabel_task_ajax"),
     path("tasks/next/", views_task_navigation.get_next_task_view, name="get_next_task"),
+    path("tasks/prefetch/", views_task_navigation.prefetch_tasks_view, name="prefetch_tasks"),
     path("tasks/last/", views_task_navigation.get_last_task_view, name="get_last_task"),
     path("tasks/last/<int:current_task_id>/", views_task_navigation.get_last_task_view, name="get_last_task_from"),
     path(
@@ -55,9 +55,9 @@ def calculate_audio_duration(self, recording_id, retry_count=0):
             )
             raise self.retry(countdown=retry_delay, kwargs={"retry_count": retry_count + 1})
 
-        # Skip if both duration and sample rate are already set
-        if recording.duration and recording.sample_rate:
-            logger.info(f"Recording {recording_id} already has duration and sample rate set")
+        # Skip if duration, sample rate and content fingerprint are already set
+        if recording.duration and recording.sample_rate and recording.content_hash:
+            logger.info(f"Recording {recording_id} already has duration, sample rate and fingerprint set")
             return True
 
         # Always set file_ready to True to ensure processing continues
@@ -115,6 +115,13 @@ def calculate_audio_duration(self, recording_id, retry_count=0):
                 logger.warning(f"Error saving audio info: {str(save_error)}, will retry")
                 raise self.retry(countdown=retry_delay, kwargs={"retry_count": retry_count + 1})
 
+        # Fingerprint the audio for duplicate detection; a file soundfile can read but
+        # not hash is left without one rather than retried
+        if not recording.content_hash:
+            from .utils_modules.recording_utils import fingerprint_recording
+
+            fingerprint_recording(recording)
+
         return True
 
     except Retry:
@@ -293,12 +300,14 @@ def cleanup_stale_classifier_tmp(max_age_hours=6):
     Per-batch classification cleans up its own temp dir, but a hard-killed worker
     (OOM, etc.) can leave `batch_*` dirs, `batch_*_features.csv` files, and
     `training_*` dirs behind. Anything older than max_age_hours is well past any
-    active run and safe to remove.
+    active run and safe to remove. Cached training snippets are removed once
+    they haven't been used for SNIPPET_CACHE_MAX_AGE_DAYS.
     """
     import glob
     import os
     import time
 
+    from .audio.task_modules.training_data import SNIPPET_CACHE_MAX_AGE_DAYS, get_snippet_cache_dir
     from .utils_modules.cleanup import safe_cleanup_dir, safe_remove_file
     from .utils_modules.path_utils import get_local_tmp
 
@@ -322,6 +331,18 @@ def cleanup_stale_classifier_tmp(max_age_hours=6):
             elif safe_remove_file(path, "stale classifier temp file"):
                 cleaned += 1
 
+    snippet_cutoff = time.time() - SNIPPET_CACHE_MAX_AGE_DAYS * 86400
+    snippet_cache_dir = get_snippet_cache_dir()
+    if os.path.isdir(snippet_cache_dir):
+        for entry in os.scandir(snippet_cache_dir):
+            try:
+                if entry.stat().st_mtime >= snippet_cutoff:
+                    continue
+            except OSError:
+                continue
+            if safe_remove_file(entry.path, "stale training snippet"):
+                cleaned += 1
+
     if cleaned:
         logger.info(f"Cleaned up {cleaned} stale classifier temp artifact(s)")
     return {"cleaned": cleaned}
@@ -332,19 +353,18 @@ def remove_duplicate_recordings_task(self, group_id, user_id):
     """
     Background task to remove duplicate recordings from a group.
 
-    Keeps the most recent recording in each duplicate group (by name + duration)
-    and deletes the older duplicates.
+    Keeps the most recent recording in each group of recordings with identical
+    audio content (by content fingerprint) and deletes the older duplicates.
 
     Args:
         group_id: ID of the group to process
         user_id: ID of the user who initiated the removal (for notifications)
     """
     from django.contrib.auth import get_user_model
-    from django.db.models import Count
 
-    from .models.recording import Recording
     from .models.task import Task
     from .models.organization import Group
+    from .utils_modules.recording_utils import get_duplicate_recording_groups
 
     User = get_user_model()
 
@@ -357,14 +377,8 @@ def remove_duplicate_recordings_task(self, group_id, user_id):
 
     logger.info(f"Starting duplicate recording removal for group {group.name} (requested by {user.username})")
 
-    # Find duplicate groups
-    duplicate_groups = (
-        Recording.objects.filter(group=group)
-        .exclude(duration__isnull=True)
-        .values("name", "duration")
-        .annotate(count=Count("id"))
-        .filter(count__gt=1)
-    )
+    # Find duplicate groups, most recent recording first in each
+    duplicate_groups = get_duplicate_recording_groups(group)
 
     removed_count = 0
     segments_removed = 0
@@ -372,18 +386,13 @@ def remove_duplicate_recordings_task(self, group_id, user_id):
     total_groups = 0
     errors = []
 
-    for dup_group in duplicate_groups:
+    for recordings_in_group in duplicate_groups:
         total_groups += 1
 
-        recordings_in_group = Recording.objects.filter(
-            group=group, name=dup_group["name"], duration=dup_group["duration"]
-        ).order_by("-created_at")
-
         # Keep the most recent, delete the rest
-        for recording in list(recordings_in_group)[1:]:
+        for recording in recordings_in_group[1:]:
             try:
-                segment_count = recording.segments.count()
-                segments_removed += segment_count
+                segments_removed += recording.segment_count
 
                 task_count = Task.objects.filter(source_segment__recording=recording).count()
                 tasks_removed += task_count
@@ -545,3 +554,130 @@ def create_task_batches_for_species_task(species_id, user_id, group_id, batch_pr
         "total_filtered": total_filtered,
         "errors": errors,
     }
+
+
+@shared_task(ignore_result=True)
+def warm_task_renders(task_ids, colormap_name="roseus"):
+    """Pre-render spectrograms and audio snippets for tasks an annotator is about to open.
+
+    Renders are written to the on-disk caches read by task_spectrogram_view and
+    task_audio_snippet_view, so switching to a prefetched task needs no decoding.
+    Failures are logged and skipped; the views render on demand as before.
+    """
+    from .audio.modules.task_renders import get_task_recording, render_task_audio_snippet, render_task_spectrogram_png
+    from .models.task import Task
+
+    tasks = Task.objects.filter(id__in=task_ids).select_related("batch", "species")
+    warmed = 0
+
+    for task in tasks:
+        if not task.batch or not task.batch.wav_file:
+            continue
+        try:
+            recording = get_task_recording(task)
+            if recording and recording.processing_status == "ready" and recording.spectrogram_file:
+                render_task_spectrogram_png(task, recording, overview=False, colormap_name=colormap_name)
+                render_task_spectrogram_png(task, recording, overview=True, colormap_name=colormap_name)
+            render_task_audio_snippet(task, channel=0, overview=False)
+            warmed += 1
+        except Exception as e:
+            logger.warning(f"Could not warm renders for task {task.id}: {e}")
+
+    logger.debug(f"Warmed renders for {warmed}/{len(task_ids)} task(s)")
+    return {"warmed": warmed}
+
+
+@shared_task(bind=True)
+def export_completed_batches_task(self, job_id):
+    """Write the archive of a BatchExportJob to BATCH_EXPORT_DIR and notify the user with a download link."""
+    import os
+    import secrets
+    from datetime import datetime
+
+    from django.db.models import Count
+    from django.urls import reverse
+
+    from .models.batch_export import BatchExportJob
+    from .models.notification import UserNotification
+    from .models.task import TaskBatch
+    from .utils_modules.cleanup import safe_cleanup_dir
+    from .utils_modules.progress_reporter import ProgressReporter
+    from .utils_modules.task_export_utils import write_batches_zip
+
+    job = BatchExportJob.objects.select_related("created_by").get(id=job_id)
+    if job.status != "pending":
+        return {"status": "skipped", "message": f"Job is {job.status}"}
+
+    job.mark_started(self.request.id)
+
+    # An unguessable directory per job, since MEDIA_ROOT may be served directly
+    export_dir = os.path.join(settings.BATCH_EXPORT_DIR, f"{job.id}_{secrets.token_hex(8)}")
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    zip_path = os.path.join(export_dir, f"completed_batches_{timestamp}.zip")
+
+    try:
+        batches = list(
+            TaskBatch.objects.filter(id__in=job.batch_ids)
+            .select_related("species", "project", "created_by")
+            .annotate(task_count=Count("tasks"))
+            .order_by("id")
+        )
+
+        os.makedirs(export_dir, exist_ok=True)
+        reporter = ProgressReporter(job, message_field=None)
+        with open(zip_path, "wb") as f:
+            for written in write_batches_zip(batches, f):
+                if batches:
+                    reporter.update(progress=int(written * 100 / len(batches)))
+
+        job.mark_completed(zip_path, os.path.getsize(zip_path))
+        UserNotification.add_notification(
+            user=job.created_by,
+            title="Batch Export Ready",
+            message=f"Your export of {len(batches)} completed batches is ready to download.",
+            notification_type="info",
+            icon="s7-check",
+            link=reverse("battycoda_app:download_batch_export", args=[job.id]),
+        )
+    except Exception as e:
+        logger.error(f"Batch export {job.id} failed: {e}")
+        safe_cleanup_dir(export_dir, "failed batch export directory")
+        job.mark_failed(str(e))
+        UserNotification.add_notification(
+            user=job.created_by,
+            title="Batch Export Failed",
+            message=f"Exporting completed batches failed: {e}",
+            notification_type="info",
+            icon="s7-close",
+            link=reverse("battycoda_app:task_batch_list"),
+        )
+
+    return {"status": job.status, "file_path": job.file_path}
+
+
+@shared_task
+def cleanup_expired_batch_exports():
+    """Remove batch export archives older than BATCH_EXPORT_EXPIRY_HOURS."""
+    import os
+    from datetime import timedelta
+
+    from django.utils import timezone
+
+    from .models.batch_export import BatchExportJob
+    from .utils_modules.cleanup import safe_cleanup_dir
+
+    expiry_hours = getattr(settings, "BATCH_EXPORT_EXPIRY_HOURS", 72)
+    cutoff = timezone.now() - timedelta(hours=expiry_hours)
+
+    expired = BatchExportJob.objects.filter(created_at__lt=cutoff).exclude(status__in=["pending", "in_progress"])
+    count = expired.count()
+
+    for job in expired:
+        if job.file_path:
+            safe_cleanup_dir(os.path.dirname(job.file_path), f"expired batch export {job.id}")
+
+    expired.delete()
+
+    if count:
+        logger.info(f"Cleaned up {count} expired batch export(s)")
+    return {"cleaned": count}
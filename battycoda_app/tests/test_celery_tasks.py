@@ -54,8 +54,8 @@ class CalculateAudioDurationTaskTests(CeleryTaskTestCase):
             group=self.group,
         )
 
-    def test_skips_recording_with_duration_and_sample_rate_set(self):
-        """Test that task returns early if duration and sample_rate are already set."""
+    def test_skips_recording_with_duration_sample_rate_and_fingerprint_set(self):
+        """Test that task returns early if duration, sample_rate and content_hash are already set."""
         from battycoda_app.tasks import calculate_audio_duration
 
         recording = Recording.all_objects.create(
@@ -66,6 +66,7 @@ class CalculateAudioDurationTaskTests(CeleryTaskTestCase):
             created_by=self.user,
             duration=10.0,
             sample_rate=44100,
+            content_hash="a" * 64,
         )
 
         result = calculate_audio_duration(recording.id)
@@ -228,6 +229,108 @@ class QueueProcessorTaskTests(CeleryTaskTestCase):
         self.assertEqual(result["status"], "success")
         mock_dummy_classifier.delay.assert_called_once_with(run.id)
 
+    def _queue_dummy_runs(self, count, group=None):
+        classifier, _ = Classifier.objects.get_or_create(
+            name="Dummy Classifier", defaults={"response_format": "highest_only"}
+        )
+        return [
+            ClassificationRun.objects.create(
+                name=f"Run {i}",
+                segmentation=self.segmentation,
+                status="queued",
+                created_by=self.user,
+                group=group or self.group,
+                classifier=classifier,
+            )
+            for i in range(count)
+        ]
+
+    @override_settings(CLASSIFICATION_SLOTS={"dummy": 2})
+    @patch("battycoda_app.audio.task_modules.classification.dummy_classifier.run_dummy_classifier")
+    def test_process_classification_queue_fills_free_slots(self, mock_dummy_classifier):
+        """Test queue processor starts as many runs as the backend has slots."""
+        from battycoda_app.audio.task_modules.queue_processor import process_classification_queue
+
+        mock_dummy_classifier.delay.return_value = MagicMock(id="test-task-id")
+        first, second, third = self._queue_dummy_runs(3)
+
+        result = process_classification_queue()
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual([c.args for c in mock_dummy_classifier.delay.call_args_list], [(first.id,), (second.id,)])
+        first.refresh_from_db()
+        third.refresh_from_db()
+        self.assertEqual(first.status, "pending")
+        self.assertIsNotNone(first.started_at)
+        self.assertEqual(third.status, "queued")
+
+        # Both slots are taken until a run finishes
+        result = process_classification_queue()
+        self.assertIn("All slots busy", result["message"])
+
+        ClassificationRun.objects.filter(id=first.id).update(status="completed")
+        process_classification_queue()
+        third.refresh_from_db()
+        self.assertEqual(third.status, "pending")
+
+    @override_settings(CLASSIFICATION_SLOTS={"dummy": 1}, CLASSIFICATION_SLOT_TIMEOUT=60)
+    @patch("battycoda_app.audio.task_modules.classification.dummy_classifier.run_dummy_classifier")
+    def test_process_classification_queue_ignores_stale_runs(self, mock_dummy_classifier):
+        """Test a run dispatched longer ago than the slot timeout no longer holds its slot."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from battycoda_app.audio.task_modules.queue_processor import process_classification_queue
+
+        mock_dummy_classifier.delay.return_value = MagicMock(id="test-task-id")
+        stale, queued = self._queue_dummy_runs(2)
+        ClassificationRun.objects.filter(id=stale.id).update(
+            status="in_progress", started_at=timezone.now() - timedelta(minutes=5)
+        )
+
+        process_classification_queue()
+
+        mock_dummy_classifier.delay.assert_called_once_with(queued.id)
+
+    @override_settings(CLASSIFICATION_SLOTS={"dummy": 2})
+    @patch("battycoda_app.audio.task_modules.classification.dummy_classifier.run_dummy_classifier")
+    def test_process_classification_queue_takes_turns_across_groups(self, mock_dummy_classifier):
+        """Test a group's backlog doesn't hold up the runs of another group."""
+        from battycoda_app.audio.task_modules.queue_processor import process_classification_queue
+
+        mock_dummy_classifier.delay.return_value = MagicMock(id="test-task-id")
+        busy_group_runs = self._queue_dummy_runs(3)
+        other_group = Group.objects.create(name="Other Group", description="Another group")
+        (other_run,) = self._queue_dummy_runs(1, group=other_group)
+
+        process_classification_queue()
+
+        started = {c.args[0] for c in mock_dummy_classifier.delay.call_args_list}
+        self.assertEqual(started, {busy_group_runs[0].id, other_run.id})
+
+    @override_settings(CLASSIFICATION_SLOTS={"dummy": 1})
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.run_multi_recording_classification")
+    def test_process_classification_queue_starts_job_group_as_one_unit(self, mock_multi):
+        """Test the runs of a job group take one slot and are dispatched to one task."""
+        import uuid
+
+        from battycoda_app.audio.task_modules.queue_processor import process_classification_queue
+
+        mock_multi.delay.return_value = MagicMock(id="test-task-id")
+        job_runs = self._queue_dummy_runs(3)
+        ClassificationRun.objects.filter(id__in=[run.id for run in job_runs]).update(job_group=uuid.uuid4())
+        (single_run,) = self._queue_dummy_runs(1)
+
+        process_classification_queue()
+
+        mock_multi.delay.assert_called_once_with([run.id for run in job_runs])
+        self.assertEqual(
+            ClassificationRun.objects.filter(id__in=[run.id for run in job_runs], status="pending").count(), 3
+        )
+        single_run.refresh_from_db()
+        self.assertEqual(single_run.status, "queued")
+
     def test_queue_classification_run_sets_status_to_queued(self):
         """Test that queue_classification_run sets the status to queued."""
         from battycoda_app.audio.task_modules.queue_processor import (
@@ -309,6 +412,82 @@ class QueueProcessorTaskTests(CeleryTaskTestCase):
         self.assertEqual(result["queue_stats"]["in_progress"], 1)
         self.assertEqual(result["queue_stats"]["total_waiting"], 3)
 
+    @override_settings(CLASSIFICATION_SLOTS={"dummy": 3})
+    def test_get_queue_status_reports_backend_slots(self):
+        """Test that get_queue_status reports queue depth and wait per backend."""
+        from django.utils import timezone
+
+        from battycoda_app.audio.task_modules.queue_processor import get_queue_status
+
+        running, _, _ = self._queue_dummy_runs(3)
+        ClassificationRun.objects.filter(id=running.id).update(status="in_progress", started_at=timezone.now())
+
+        stats = get_queue_status()["queue_stats"]
+
+        self.assertEqual(stats["backends"]["dummy"]["slots"], 3)
+        self.assertEqual(stats["backends"]["dummy"]["active"], 1)
+        self.assertEqual(stats["backends"]["dummy"]["queued"], 2)
+        self.assertGreaterEqual(stats["oldest_wait_seconds"], 0)
+        self.assertIsNotNone(stats["recent_wait_seconds"])
+
+    @override_settings(CLASSIFICATION_SLOTS={"dummy": 3})
+    def test_get_queue_status_counts_a_running_job_group_as_one_slot(self):
+        """Test that the runs of a running job group are reported as one active slot."""
+        import uuid
+
+        from django.utils import timezone
+
+        from battycoda_app.audio.task_modules.queue_processor import get_queue_status
+
+        job_runs = self._queue_dummy_runs(3)
+        ClassificationRun.objects.filter(id__in=[run.id for run in job_runs]).update(
+            status="in_progress", started_at=timezone.now(), job_group=uuid.uuid4()
+        )
+        (single_run,) = self._queue_dummy_runs(1)
+        ClassificationRun.objects.filter(id=single_run.id).update(status="pending", started_at=timezone.now())
+
+        stats = get_queue_status()["queue_stats"]
+
+        self.assertEqual(stats["backends"]["dummy"]["active"], 2)
+        self.assertEqual(stats["in_progress"], 3)
+
+    @patch("battycoda_app.audio.task_modules.queue_processor.process_classification_queue")
+    def test_finished_classification_starts_next_run(self, mock_process_queue):
+        """Test that the queue is processed as soon as a classification task finishes."""
+        from battycoda_app.audio.task_modules.classification.dummy_classifier import run_dummy_classifier
+        from battycoda_app.audio.task_modules.queue_processor import start_next_classification_run
+        from battycoda_app.tasks import check_disk_usage
+
+        start_next_classification_run(sender=check_disk_usage)
+        mock_process_queue.delay.assert_not_called()
+
+        start_next_classification_run(sender=run_dummy_classifier)
+        mock_process_queue.delay.assert_called_once_with()
+
+
+class TaskRoutingTests(CeleryTaskTestCase):
+    """Tests for the routing of tasks to their worker queues."""
+
+    def test_tasks_are_routed_by_workload(self):
+        from config.celery import app
+
+        expected_queues = {
+            "battycoda_app.audio.task_modules.spectrogram.hdf5_generation.generate_recording_spectrogram": "spectrogram",
+            "battycoda_app.audio.task_modules.segmentation_tasks.auto_segment_recording_task": "cpu-heavy",
+            "battycoda_app.audio.task_modules.clustering_tasks.run_clustering": "cpu-heavy",
+            "battycoda_app.audio.task_modules.classification.run_classification.run_call_classification": "r-server",
+            "battycoda_app.audio.task_modules.training_tasks.train_classifier": "r-server",
+            "battycoda_app.tasks.cleanup_stale_tus_uploads": "maintenance",
+            "battycoda_app.tasks.remove_duplicate_recordings_task": "maintenance",
+            "battycoda_app.tasks.calculate_audio_duration": "cpu-heavy",
+            "battycoda_app.tasks.create_task_batches_for_species_task": "cpu-heavy",
+            "battycoda_app.tasks.export_completed_batches_task": "cpu-heavy",
+            "battycoda_app.audio.task_modules.queue_processor.process_classification_queue": "io",
+        }
+        for task_name, queue in expected_queues.items():
+            with self.subTest(task=task_name):
+                self.assertEqual(app.amqp.router.route({}, task_name)["queue"].name, queue)
+
 
 class SegmentationTaskTests(CeleryTaskTestCase):
     """Tests for the segmentation tasks."""
@@ -278,12 +278,68 @@ class ResultProcessingTests(ClassificationTestCase):
             self.assertIn("call_start_time", df.columns)
             self.assertIn("recording_name", df.columns)
 
+    @patch("battycoda_app.audio.task_modules.classification.result_processing.get_local_tmp")
+    def test_features_file_combiner_appends_batches(self, mock_get_tmp):
+        """Test that each batch is merged with its metadata and appended as it is added."""
+        import pandas as pd
+
+        from battycoda_app.audio.task_modules.classification.result_processing import FeaturesFileCombiner
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mock_get_tmp.return_value = tmp_dir
+            classifier = Classifier.objects.create(name="Test Classifier", service_url="http://localhost:8001")
+            classification_run = ClassificationRun.objects.create(
+                name="Test Run",
+                segmentation=self.segmentation,
+                classifier=classifier,
+                status="in_progress",
+                created_by=self.user,
+                group=self.group,
+            )
+
+            def batch_file(name, rows):
+                path = os.path.join(tmp_dir, name)
+                with open(path, "w") as f:
+                    f.write("sound.files,selec,feature1\n")
+                    f.writelines(f"{sound_file},1,{value}\n" for sound_file, value in rows)
+                return path
+
+            def metadata(sound_file, start_time, end_time):
+                return {
+                    sound_file: {
+                        "segment_id": 1,
+                        "task_id": None,
+                        "start_time": start_time,
+                        "end_time": end_time,
+                        "recording_name": "Test Recording",
+                        "wav_filename": "test.wav",
+                    }
+                }
+
+            combiner = FeaturesFileCombiner(classification_run)
+            self.assertIsNone(combiner.finish())
+
+            first = batch_file("batch_0.csv", [("segment_1.wav", 0.5)])
+            combiner.add(first, metadata("segment_1.wav", 0.1, 0.3))
+            self.assertFalse(os.path.exists(first))
+            self.assertEqual(len(pd.read_csv(combiner.path)), 1)
+
+            second = batch_file("batch_1.csv", [("segment_2.wav", 0.7), ("segment_9.wav", 0.9)])
+            combiner.add(second, metadata("segment_2.wav", 0.5, 0.8))
+
+            df = pd.read_csv(combiner.finish())
+            self.assertEqual(df.columns.tolist()[:4], ["sound.files", "selec", "task_id", "call_start_time"])
+            self.assertEqual(df["sound.files"].tolist(), ["segment_1.wav", "segment_2.wav", "segment_9.wav"])
+            self.assertAlmostEqual(df["call_duration"][1], 0.3)
+            self.assertEqual(df["recording_name"].tolist(), ["Test Recording", "Test Recording", "Unknown"])
+            self.assertTrue(pd.isna(df["call_start_time"][2]))
+
 
 class RServerClientTests(ClassificationTestCase):
     """Tests for r_server_client module."""
 
     @patch("battycoda_app.audio.task_modules.classification.r_server_client.requests.post")
-    @patch("battycoda_app.audio.task_modules.classification.r_server_client.extract_audio_segment")
+    @patch("battycoda_app.audio.task_modules.classification.r_server_client.extract_audio_segments")
     @patch("battycoda_app.audio.task_modules.classification.r_server_client.sf.write")
     @patch("battycoda_app.audio.task_modules.classification.r_server_client.get_local_tmp")
     @patch("battycoda_app.audio.task_modules.classification.r_server_client.get_r_server_path")
@@ -296,7 +352,8 @@ class RServerClientTests(ClassificationTestCase):
         with tempfile.TemporaryDirectory() as tmp_dir:
             mock_get_tmp.return_value = tmp_dir
             mock_r_path.side_effect = lambda x: x  # Return path unchanged
-            mock_extract.return_value = ([0.1, 0.2, 0.3], 44100)  # Fake audio data
+            # Fake audio data
+            mock_extract.side_effect = lambda path, windows: ([[0.1, 0.2, 0.3]] * len(windows), 44100)
 
             # Mock R server response
             mock_response = MagicMock()
@@ -345,7 +402,7 @@ class RServerClientTests(ClassificationTestCase):
             self.assertIn(f"segment_{self.segment1.id}.wav", segment_map)
 
     @patch("battycoda_app.audio.task_modules.classification.r_server_client.requests.post")
-    @patch("battycoda_app.audio.task_modules.classification.r_server_client.extract_audio_segment")
+    @patch("battycoda_app.audio.task_modules.classification.r_server_client.extract_audio_segments")
     @patch("battycoda_app.audio.task_modules.classification.r_server_client.sf.write")
     @patch("battycoda_app.audio.task_modules.classification.r_server_client.get_local_tmp")
     @patch("battycoda_app.audio.task_modules.classification.r_server_client.get_r_server_path")
@@ -358,7 +415,7 @@ class RServerClientTests(ClassificationTestCase):
         with tempfile.TemporaryDirectory() as tmp_dir:
             mock_get_tmp.return_value = tmp_dir
             mock_r_path.side_effect = lambda x: x
-            mock_extract.return_value = ([0.1, 0.2, 0.3], 44100)
+            mock_extract.side_effect = lambda path, windows: ([[0.1, 0.2, 0.3]] * len(windows), 44100)
 
             # Mock R server error response
             mock_response = MagicMock()
@@ -512,6 +569,49 @@ class RunClassificationTests(ClassificationTestCase):
         self.assertEqual(result["status"], "error")
         self.assertIn("R server not responding", result["message"])
 
+    @patch("battycoda_app.audio.task_modules.classification.run_classification.process_classification_batch")
+    def test_batches_keep_the_scheduler_slot_of_a_long_run(self, mock_batch):
+        """Test that each batch heartbeats the run, so a run classifying past the slot timeout keeps its slot."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from battycoda_app.audio.task_modules.classification.run_classification import _process_all_batches
+        from battycoda_app.audio.task_modules.queue_processor import _slot_holders
+
+        classifier = Classifier.objects.create(name="Test Classifier", response_format="highest_only")
+        dispatched_at = timezone.now() - timedelta(hours=7)
+        classification_run = ClassificationRun.objects.create(
+            name="Test Run",
+            segmentation=self.segmentation,
+            classifier=classifier,
+            status="in_progress",
+            started_at=dispatched_at,
+            created_by=self.user,
+            group=self.group,
+        )
+        runs = ClassificationRun.objects.filter(id=classification_run.id)
+        holders_during_batch = []
+
+        def classify(*args, **kwargs):
+            holders_during_batch.append(_slot_holders(runs).count())
+            return [], {}, None
+
+        mock_batch.side_effect = classify
+        _process_all_batches(
+            classification_run,
+            classifier,
+            self.recording,
+            Segment.objects.filter(segmentation=self.segmentation),
+            Call.objects.filter(species=self.species),
+            "http://localhost:8001",
+            "/predict/knn",
+        )
+
+        self.assertEqual(holders_during_batch, [1])
+        classification_run.refresh_from_db()
+        self.assertEqual(classification_run.started_at, dispatched_at)
+
     def test_get_default_classifier_returns_none_when_not_found(self):
         """Test that _get_default_classifier returns None when no defaults exist."""
         from battycoda_app.audio.task_modules.classification.run_classification import _get_default_classifier
@@ -560,6 +660,439 @@ class RunClassificationTests(ClassificationTestCase):
         self.assertEqual(result.id, r_direct.id)
 
 
+class MultiRecordingClassificationTests(ClassificationTestCase):
+    """Tests for the multi-recording classification task."""
+
+    def setUp(self):
+        super().setUp()
+        self.recording2 = Recording.all_objects.create(
+            name="Second Recording",
+            species=self.species,
+            project=self.project,
+            group=self.group,
+            created_by=self.user,
+        )
+        Recording.all_objects.filter(id=self.recording.id).update(wav_file="recordings/first.wav")
+        Recording.all_objects.filter(id=self.recording2.id).update(wav_file="recordings/second.wav")
+        self.segmentation2 = Segmentation.objects.create(
+            recording=self.recording2,
+            name="Second Segmentation",
+            created_by=self.user,
+            algorithm=self.algorithm,
+            status="completed",
+        )
+        self.segment3 = Segment.objects.create(
+            segmentation=self.segmentation2,
+            recording=self.recording2,
+            onset=0.2,
+            offset=0.4,
+            created_by=self.user,
+        )
+        self.classifier = Classifier.objects.create(
+            name="Test Classifier",
+            service_url="http://localhost:8001",
+            endpoint="/predict/knn",
+        )
+        self.runs = [
+            ClassificationRun.objects.create(
+                name=f"Test Run {segmentation.id}",
+                segmentation=segmentation,
+                classifier=self.classifier,
+                status="pending",
+                created_by=self.user,
+                group=self.group,
+            )
+            for segmentation in (self.segmentation, self.segmentation2)
+        ]
+
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.check_r_server_connection")
+    @patch("battycoda_app.audio.task_modules.classification.r_server_client.requests.post")
+    @patch("battycoda_app.audio.task_modules.classification.r_server_client.extract_audio_segments")
+    @patch("battycoda_app.audio.task_modules.classification.r_server_client.sf.write")
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.get_local_tmp")
+    @patch("battycoda_app.audio.task_modules.classification.r_server_client.get_local_tmp")
+    @patch("battycoda_app.audio.task_modules.classification.r_server_client.get_r_server_path")
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.os.path.exists")
+    def test_classifies_recordings_in_one_batch(
+        self, mock_exists, mock_r_path, mock_get_tmp, mock_multi_tmp, mock_sf_write, mock_extract, mock_post, mock_ping
+    ):
+        """Test that the segments of several runs are sent together and saved to their own runs."""
+        from battycoda_app.audio.task_modules.classification.multi_recording import (
+            run_multi_recording_classification,
+        )
+        from battycoda_app.models.classification import ClassificationResult
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mock_get_tmp.return_value = tmp_dir
+            mock_multi_tmp.return_value = tmp_dir
+            mock_exists.return_value = True
+            mock_r_path.side_effect = lambda x: x
+            mock_extract.side_effect = lambda path, windows: ([[0.1, 0.2, 0.3]] * len(windows), 44100)
+            mock_ping.return_value = (True, None)
+
+            mock_response = MagicMock()
+            mock_response.status_code = 200
+            mock_response.json.return_value = {
+                "status": "success",
+                "file_results": {
+                    f"segment_{segment.id}.wav": {"class_probabilities": {"call_a": [80.0], "call_b": [20.0]}}
+                    for segment in (self.segment1, self.segment2, self.segment3)
+                },
+            }
+            mock_post.return_value = mock_response
+
+            result = run_multi_recording_classification([run.id for run in self.runs])
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(sorted(result["completed_run_ids"]), sorted(run.id for run in self.runs))
+        mock_ping.assert_called_once()
+        mock_post.assert_called_once()
+
+        first, second = self.runs
+        self.assertEqual(ClassificationResult.objects.filter(classification_run=first).count(), 2)
+        self.assertEqual(
+            list(ClassificationResult.objects.filter(classification_run=second).values_list("segment_id", flat=True)),
+            [self.segment3.id],
+        )
+        first.refresh_from_db()
+        self.assertEqual(first.status, "completed")
+
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.check_r_server_connection")
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.classify_segment_files")
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.write_segment_files")
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.get_local_tmp")
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.os.path.exists")
+    def test_batches_keep_the_scheduler_slot_of_a_long_job(
+        self, mock_exists, mock_get_tmp, mock_write, mock_classify, mock_ping
+    ):
+        """Test that each batch heartbeats the runs, so a job running past the slot timeout keeps its slot."""
+        from datetime import timedelta
+
+        from django.utils import timezone
+
+        from battycoda_app.audio.task_modules.classification.multi_recording import (
+            run_multi_recording_classification,
+        )
+        from battycoda_app.audio.task_modules.queue_processor import _slot_holders
+
+        run_ids = [run.id for run in self.runs]
+        dispatched_at = timezone.now() - timedelta(hours=7)
+        ClassificationRun.objects.filter(id__in=run_ids).update(started_at=dispatched_at)
+        holders_during_batch = []
+
+        def classify(*args, **kwargs):
+            holders_during_batch.append(_slot_holders(ClassificationRun.objects.filter(id__in=run_ids)).count())
+            return [], None, None
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            mock_get_tmp.return_value = tmp_dir
+            mock_exists.return_value = True
+            mock_ping.return_value = (True, None)
+            mock_write.return_value = {}
+            mock_classify.side_effect = classify
+
+            run_multi_recording_classification(run_ids)
+
+        self.assertEqual(holders_during_batch, [2])
+        # started_at stays the dispatch time, which the queue's wait statistics rely on
+        for run in ClassificationRun.objects.filter(id__in=run_ids):
+            self.assertEqual(run.started_at, dispatched_at)
+
+    @patch("battycoda_app.audio.task_modules.classification.multi_recording.check_r_server_connection")
+    def test_fails_every_run_when_r_server_is_down(self, mock_ping):
+        """Test that all runs fail when the R server is unavailable."""
+        from battycoda_app.audio.task_modules.classification.multi_recording import (
+            run_multi_recording_classification,
+        )
+
+        mock_ping.return_value = (False, "Cannot connect to classifier service")
+
+        result = run_multi_recording_classification([run.id for run in self.runs])
+
+        self.assertEqual(result["status"], "error")
+        for run in self.runs:
+            run.refresh_from_db()
+            self.assertEqual(run.status, "failed")
+
+
+class TrainingDataBuilderTests(BattycodaTestCase):
+    """Tests for the classifier training data builder."""
+
+    def setUp(self):
+        import numpy as np
+        import soundfile as sf
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch("battycoda_app.audio.task_modules.training_data.get_local_tmp", return_value=self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        rng = np.random.default_rng(0)
+        self.wav_paths = []
+        for name in ("first.wav", "second.wav"):
+            path = os.path.join(self.tmp.name, name)
+            sf.write(path, rng.uniform(-0.5, 0.5, 8000).astype("float32"), samplerate=8000)
+            self.wav_paths.append(path)
+
+    @override_settings(TRAINING_DATA_WORKERS=2)
+    def test_snippets_match_extract_audio_segment(self):
+        """Test that snippets hold the same audio as extract_audio_segment, padding included."""
+        import soundfile as sf
+
+        from battycoda_app.audio.task_modules.base import extract_audio_segment
+        from battycoda_app.audio.task_modules.training_data import build_training_data
+
+        first, second = self.wav_paths
+        samples = [(first, 0.5, 0.6, "b"), (second, 0.1, 0.2, "a"), (first, 0.95, 1.05, "a"), (first, 0.1, 0.3, "a")]
+        output_dir = os.path.join(self.tmp.name, "training_1")
+
+        written = build_training_data(samples, output_dir)
+
+        self.assertEqual(written, 4)
+        self.assertEqual(sorted(os.listdir(output_dir)), ["1_b.wav", "2_a.wav", "3_a.wav", "4_a.wav"])
+        for number, (wav_path, onset, offset, label) in enumerate(samples, start=1):
+            expected, _ = extract_audio_segment(wav_path, onset, offset)
+            snippet, sample_rate = sf.read(os.path.join(output_dir, f"{number}_{label}.wav"), dtype="float32")
+            self.assertEqual(sample_rate, 8000)
+            self.assertEqual(len(snippet), len(expected))
+            self.assertTrue(abs(snippet - expected[:, 0]).max() < 1e-4)
+
+    def test_reuses_cached_snippets_after_relabel(self):
+        """Test that retraining reuses extracted snippets, even for relabelled tasks."""
+        from battycoda_app.audio.task_modules.training_data import build_training_data
+
+        first, _ = self.wav_paths
+        build_training_data([(first, 0.1, 0.2, "a"), (first, 0.3, 0.4, "b")], os.path.join(self.tmp.name, "t1"))
+
+        output_dir = os.path.join(self.tmp.name, "t2")
+        with patch("battycoda_app.audio.task_modules.training_data.read_window") as mock_read:
+            written = build_training_data([(first, 0.1, 0.2, "b"), (first, 0.3, 0.4, "b")], output_dir)
+
+        mock_read.assert_not_called()
+        self.assertEqual(written, 2)
+        self.assertEqual(sorted(os.listdir(output_dir)), ["1_b.wav", "2_b.wav"])
+
+    def test_skips_missing_wav_files(self):
+        """Test that tasks of a missing WAV file are skipped."""
+        from battycoda_app.audio.task_modules.training_data import build_training_data
+
+        written = build_training_data(
+            [(os.path.join(self.tmp.name, "missing.wav"), 0.1, 0.2, "a"), (self.wav_paths[0], 0.1, 0.2, "a")],
+            os.path.join(self.tmp.name, "t3"),
+        )
+
+        self.assertEqual(written, 1)
+
+
+class IncrementalTrainingSetTests(ClassificationTestCase):
+    """Tests for reusing cached task features across classifier trainings."""
+
+    def setUp(self):
+        super().setUp()
+        import numpy as np
+        import soundfile as sf
+
+        from battycoda_app.models import Task
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch("battycoda_app.audio.task_modules.training_data.get_local_tmp", return_value=self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.wav_path = os.path.join(self.tmp.name, "source.wav")
+        sf.write(self.wav_path, np.zeros(8000, dtype="float32"), samplerate=8000)
+        self.tasks = [
+            Task.objects.create(
+                wav_file_name="source.wav",
+                onset=0.1 * i,
+                offset=0.1 * i + 0.05,
+                species=self.species,
+                project=self.project,
+                created_by=self.user,
+                group=self.group,
+                label=label,
+            )
+            for i, label in enumerate(["a", "b", "a"])
+        ]
+
+    def _samples(self, tasks):
+        return [(task.id, self.wav_path, task.onset, task.offset, task.label) for task in tasks]
+
+    def _train(self, training_set, data_folder):
+        """Build the training set and export features for its snippets as the R server does."""
+        import pandas as pd
+
+        training_set.build()
+        snippets = sorted(name for name in os.listdir(data_folder) if name.endswith(".wav"))
+        pd.DataFrame(
+            [
+                {"sound.files": name, "selec": name[:-4].split("_", 1)[1], "duration": 0.05, "meanfreq": float("nan")}
+                for name in snippets
+            ]
+        ).to_csv(training_set.export_path, index=False)
+        return training_set.store_new_features(None)
+
+    def test_retraining_extracts_only_new_tasks(self):
+        """Test that a second training reuses cached features and extracts only the new task."""
+        import pandas as pd
+
+        from battycoda_app.audio.task_modules.training_features import IncrementalTrainingSet
+
+        first_folder = os.path.join(self.tmp.name, "training_1")
+        stored = self._train(IncrementalTrainingSet(self._samples(self.tasks[:2]), first_folder), first_folder)
+        self.assertEqual(stored, 2)
+
+        self.tasks[0].label = "c"
+        self.tasks[0].save()
+        second_folder = os.path.join(self.tmp.name, "training_2")
+        training_set = IncrementalTrainingSet(self._samples(self.tasks), second_folder)
+        training_set.build()
+
+        self.assertEqual(training_set.sample_count, 3)
+        self.assertEqual([name for name in os.listdir(second_folder) if name.endswith(".wav")], ["1_a.wav"])
+        cached = pd.read_csv(training_set.features_path)
+        self.assertEqual(list(cached["selec"]), ["c", "b"])
+        self.assertEqual(list(cached["duration"]), [0.05, 0.05])
+        self.assertTrue(cached["meanfreq"].isna().all())
+        self.assertEqual(set(training_set.train_params()), {"features_path", "export_features_path"})
+
+    def test_changed_window_is_extracted_again(self):
+        """Test that a task whose window changed is not served from the feature cache."""
+        from battycoda_app.audio.task_modules.training_features import IncrementalTrainingSet
+        from battycoda_app.models import TrainingFeatures
+
+        first_folder = os.path.join(self.tmp.name, "training_1")
+        self._train(IncrementalTrainingSet(self._samples(self.tasks), first_folder), first_folder)
+
+        self.tasks[1].offset += 0.01
+        self.tasks[1].save()
+        second_folder = os.path.join(self.tmp.name, "training_2")
+        training_set = IncrementalTrainingSet(self._samples(self.tasks), second_folder)
+        self._train(training_set, second_folder)
+
+        self.assertEqual(len(training_set.cached_rows), 2)
+        self.assertEqual(training_set.written, 1)
+        self.assertEqual(TrainingFeatures.objects.filter(task__in=self.tasks).count(), 3)
+        self.assertFalse(
+            IncrementalTrainingSet(self._samples(self.tasks), os.path.join(self.tmp.name, "t3")).new_samples
+        )
+
+    def test_training_from_cached_features_only(self):
+        """Test that a relabel-only retrain writes no snippets and sends only the cached features."""
+        import shutil
+
+        import pandas as pd
+
+        from battycoda_app.audio.task_modules.training_features import IncrementalTrainingSet
+        from battycoda_app.audio.task_modules.training_tasks import train_classifier
+        from battycoda_app.models import ClassifierTrainingJob, TaskBatch
+
+        media_root = os.path.join(self.tmp.name, "media")
+        os.makedirs(os.path.join(media_root, "task_batches"))
+        self.wav_path = shutil.copy(self.wav_path, os.path.join(media_root, "task_batches", "source.wav"))
+        batch = TaskBatch.objects.create(
+            name="Batch",
+            created_by=self.user,
+            wav_file_name="source.wav",
+            wav_file="task_batches/source.wav",
+            species=self.species,
+            project=self.project,
+            group=self.group,
+        )
+        for task in self.tasks:
+            task.batch = batch
+            task.is_done = True
+            task.save()
+
+        first_folder = os.path.join(self.tmp.name, "training_1")
+        self._train(IncrementalTrainingSet(self._samples(self.tasks), first_folder), first_folder)
+        self.tasks[0].label = "b"
+        self.tasks[0].save()
+
+        job = ClassifierTrainingJob.objects.create(
+            name="Retrain",
+            created_by=self.user,
+            group=self.group,
+            task_batch=batch,
+            parameters={"algorithm_type": "knn"},
+        )
+        sent = {}
+
+        def send_training_request(algorithm_type, train_params):
+            sent.update(train_params)
+            sent["wav_files"] = [name for name in os.listdir(train_params["data_folder"]) if name.endswith(".wav")]
+            sent["cached"] = pd.read_csv(train_params["features_path"])
+            return True, {"status": "success", "accuracy": 90.0, "classes": ["a", "b"]}
+
+        with (
+            override_settings(MEDIA_ROOT=media_root),
+            patch("battycoda_app.audio.task_modules.training_tasks.get_local_tmp", return_value=self.tmp.name),
+            patch(
+                "battycoda_app.audio.task_modules.training_tasks.check_r_server_and_update_status",
+                return_value=(True, None),
+            ),
+            patch(
+                "battycoda_app.audio.task_modules.training_utils.send_training_request",
+                side_effect=send_training_request,
+            ),
+        ):
+            result = train_classifier(job.id)
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(sent["wav_files"], [])
+        self.assertNotIn("export_features_path", sent)
+        self.assertEqual(sorted(sent["cached"]["selec"]), ["a", "b", "b"])
+        self.assertEqual(sent["k"], 3)
+        job.refresh_from_db()
+        self.assertEqual(job.status, "completed")
+        self.assertIn("3 samples", job.classifier.description)
+
+
+class SegmentsZipDownloadTests(ClassificationTestCase):
+    """Tests for downloading a classification run's segments as a ZIP file."""
+
+    def test_unreadable_segment_is_skipped(self):
+        """Test that a segment that cannot be read is left out instead of failing the download."""
+        import io
+        import shutil
+        import zipfile
+
+        import numpy as np
+        import soundfile as sf
+        from django.urls import reverse
+
+        from battycoda_app.audio.task_modules.base import read_window
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, True)
+        os.makedirs(os.path.join(media_root, "recordings"))
+        sf.write(os.path.join(media_root, "recordings", "rec.wav"), np.zeros(8000, dtype="float32"), 8000)
+        self.recording.wav_file = "recordings/rec.wav"
+        self.recording.save()
+        run = ClassificationRun.objects.create(
+            name="Run", segmentation=self.segmentation, status="completed", created_by=self.user, group=self.group
+        )
+
+        def flaky_read_window(sound_file, onset, offset=None):
+            if onset == self.segment1.onset:
+                raise RuntimeError("unreadable")
+            return read_window(sound_file, onset, offset)
+
+        self.client.force_login(self.user)
+        with (
+            override_settings(MEDIA_ROOT=media_root),
+            patch("battycoda_app.views_classification.runs_details.read_window", side_effect=flaky_read_window),
+        ):
+            response = self.client.get(reverse("battycoda_app:download_segments_zip", args=[run.id]))
+
+        self.assertEqual(response.status_code, 200)
+        names = zipfile.ZipFile(io.BytesIO(response.content)).namelist()
+        self.assertEqual(len(names), 1)
+        self.assertTrue(names[0].startswith(f"segment_{self.segment2.id}_"))
+
+
 class ClassificationUtilsTests(ClassificationTestCase):
     """Tests for classification utility functions."""
 
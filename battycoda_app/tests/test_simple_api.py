@@ -10,7 +10,7 @@ from django.contrib.auth.models import User
 from django.test import Client
 from django.urls import reverse
 
-from battycoda_app.models import Group, Project
+from battycoda_app.models import Group, Project, Recording, Task, TaskBatch
 from battycoda_app.models.organization import Species
 from battycoda_app.models.user import UserProfile
 from battycoda_app.tests.test_base import BattycodaTestCase
@@ -151,6 +151,29 @@ class ProjectsListTests(SimpleAPITestCase):
             self.assertIn("description", project)
             self.assertIn("recording_count", project)
 
+    def test_projects_list_primary_species_and_count(self):
+        """Should report the most common species and the visible recording count."""
+        for species, hidden in [
+            (self.group_species, False),
+            (self.group_species, False),
+            (self.system_species, False),
+            (self.system_species, True),
+        ]:
+            Recording.objects.create(
+                name="Recording",
+                project=self.project,
+                species=species,
+                group=self.group,
+                created_by=self.user,
+                hidden=hidden,
+            )
+
+        data = self.client.get(self.get_api_url("projects_list")).json()
+        project = data["projects"][0]
+        self.assertEqual(project["species_id"], self.group_species.id)
+        self.assertEqual(project["species_name"], "Test Species")
+        self.assertEqual(project["recording_count"], 3)
+
 
 class RecordingsListTests(SimpleAPITestCase):
     """Tests for the recordings list endpoint."""
@@ -185,6 +208,48 @@ class RecordingsListTests(SimpleAPITestCase):
         self.assertFalse(data["success"])
         self.assertIn("error", data)
 
+    def test_recordings_list_pagination_and_segmentation_counts(self):
+        """Should page recordings and report segmentation counts."""
+        from battycoda_app.models import Segmentation
+
+        recordings = [
+            Recording.objects.create(
+                name=f"Recording {i}",
+                project=self.project,
+                species=self.group_species,
+                group=self.group,
+                created_by=self.user,
+            )
+            for i in range(3)
+        ]
+        Segmentation.objects.create(recording=recordings[0], name="Manual", created_by=self.user)
+
+        data = self.client.get(self.get_api_url("recordings_list") + "&limit=2").json()
+        self.assertEqual([r["name"] for r in data["recordings"]], ["Recording 2", "Recording 1"])
+        self.assertTrue(data["pagination"]["has_next"])
+
+        cursor = data["pagination"]["next_cursor"]
+        data = self.client.get(self.get_api_url("recordings_list") + f"&limit=2&cursor={cursor}").json()
+        self.assertEqual([r["name"] for r in data["recordings"]], ["Recording 0"])
+        self.assertFalse(data["pagination"]["has_next"])
+        self.assertTrue(data["recordings"][0]["has_segmentation"])
+        self.assertEqual(data["recordings"][0]["segmentation_count"], 1)
+
+    def test_recordings_list_without_limit_returns_everything(self):
+        """Should return the whole list when no pagination parameters are given."""
+        for i in range(3):
+            Recording.objects.create(
+                name=f"Recording {i}",
+                project=self.project,
+                species=self.group_species,
+                group=self.group,
+                created_by=self.user,
+            )
+
+        data = self.client.get(self.get_api_url("recordings_list")).json()
+        self.assertEqual(data["count"], 3)
+        self.assertIsNone(data["pagination"]["next_cursor"])
+
 
 class UserInfoTests(SimpleAPITestCase):
     """Tests for the user info endpoint."""
@@ -294,6 +359,330 @@ class TaskBatchesListTests(SimpleAPITestCase):
         data = response.json()
         self.assertFalse(data["success"])
 
+    def _create_batch(self, name, done, pending):
+        batch = TaskBatch.objects.create(
+            name=name,
+            project=self.project,
+            species=self.group_species,
+            created_by=self.user,
+            group=self.group,
+        )
+        for i in range(done + pending):
+            Task.objects.create(
+                project=self.project,
+                species=self.group_species,
+                batch=batch,
+                created_by=self.user,
+                group=self.group,
+                onset=float(i),
+                offset=float(i + 1),
+                is_done=i < done,
+            )
+        return batch
+
+    def test_task_batches_list_progress_counts(self):
+        """Should report task counts for every batch."""
+        self._create_batch("Half done", done=1, pending=1)
+        self._create_batch("Untouched", done=0, pending=3)
+
+        response = self.client.get(self.get_api_url("task_batches_list"))
+        batches = {batch["name"]: batch for batch in response.json()["task_batches"]}
+
+        self.assertEqual(batches["Half done"]["total_tasks"], 2)
+        self.assertEqual(batches["Half done"]["completed_tasks"], 1)
+        self.assertEqual(batches["Half done"]["progress_percentage"], 50)
+        self.assertEqual(batches["Untouched"]["total_tasks"], 3)
+        self.assertEqual(batches["Untouched"]["completed_tasks"], 0)
+
+    def test_task_batches_list_cursor_pagination(self):
+        """Should page through batches newest first with next_cursor."""
+        for i in range(5):
+            self._create_batch(f"Batch {i}", done=0, pending=1)
+
+        names = []
+        url = self.get_api_url("task_batches_list") + "&limit=2"
+        while url:
+            data = self.client.get(url).json()
+            self.assertLessEqual(data["count"], 2)
+            names.extend(batch["name"] for batch in data["task_batches"])
+            cursor = data["pagination"]["next_cursor"]
+            url = self.get_api_url("task_batches_list") + f"&limit=2&cursor={cursor}" if cursor else None
+
+        self.assertEqual(names, [f"Batch {i}" for i in reversed(range(5))])
+
+    def test_task_batches_list_invalid_cursor(self):
+        """Should return error for a malformed cursor."""
+        response = self.client.get(self.get_api_url("task_batches_list") + "&cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+
+    def test_task_batches_list_conditional_get(self):
+        """Should answer 304 to a matching ETag and a fresh response once tasks change."""
+        batch = self._create_batch("Batch", done=0, pending=1)
+        url = self.get_api_url("task_batches_list")
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        task = batch.tasks.get()
+        task.is_done = True
+        task.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["task_batches"][0]["completed_tasks"], 1)
+
+
+class CreateTaskBatchTests(SimpleAPITestCase):
+    """Tests for creating task batches from classification runs."""
+
+    def setUp(self):
+        super().setUp()
+        from battycoda_app.models import (
+            Call,
+            CallProbability,
+            ClassificationResult,
+            ClassificationRun,
+            Segment,
+            Segmentation,
+        )
+
+        echo = Call.objects.create(species=self.group_species, short_name="echo", long_name="Echolocation")
+        social = Call.objects.create(species=self.group_species, short_name="social", long_name="Social")
+
+        recording = Recording.objects.create(
+            name="Recording", project=self.project, species=self.group_species, group=self.group, created_by=self.user
+        )
+        segmentation = Segmentation.objects.create(recording=recording, name="Manual", created_by=self.user)
+        self.run = ClassificationRun.objects.create(
+            name="Run", segmentation=segmentation, created_by=self.user, group=self.group, status="completed"
+        )
+
+        # (onset, echo probability, social probability)
+        self.segments = []
+        for onset, echo_probability, social_probability in [(0.0, 0.6, 0.4), (1.0, 0.1, 0.9), (2.0, 0.3, 0.7)]:
+            segment = Segment.objects.create(
+                recording=recording, segmentation=segmentation, onset=onset, offset=onset + 0.5, created_by=self.user
+            )
+            result = ClassificationResult.objects.create(classification_run=self.run, segment=segment)
+            CallProbability.objects.create(classification_result=result, call=echo, probability=echo_probability)
+            CallProbability.objects.create(classification_result=result, call=social, probability=social_probability)
+            self.segments.append(segment)
+
+        # The last segment already has a task and must not get another one
+        Task.objects.create(
+            project=self.project,
+            species=self.group_species,
+            created_by=self.user,
+            group=self.group,
+            onset=2.0,
+            offset=2.5,
+            source_segment=self.segments[2],
+        )
+
+    def _create(self, **data):
+        url = reverse("battycoda_app:simple_api:create_task_batch", kwargs={"run_id": self.run.id})
+        return self.client.post(url, {"api_key": self.api_key, "name": "Review", **data})
+
+    def test_create_task_batch_uses_top_call_and_skips_existing_tasks(self):
+        """Should create one task per segment without a task, labelled with its top call."""
+        response = self._create()
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["task_batch"]["total_tasks"], 2)
+
+        tasks = Task.objects.filter(batch_id=data["task_batch"]["id"]).order_by("onset")
+        self.assertEqual(
+            [(task.source_segment_id, task.classification_result, task.confidence) for task in tasks],
+            [(self.segments[0].id, "echo", 0.6), (self.segments[1].id, "social", 0.9)],
+        )
+
+    def test_create_task_batch_confidence_threshold(self):
+        """Should leave out results more confident than the threshold."""
+        data = self._create(confidence_threshold="0.8").json()
+        self.assertEqual(data["task_batch"]["total_tasks"], 1)
+        self.assertEqual(Task.objects.get(batch_id=data["task_batch"]["id"]).source_segment_id, self.segments[0].id)
+
+
+class ColumnarExportTests(SimpleAPITestCase):
+    """Tests for the Parquet/Arrow export endpoints."""
+
+    def setUp(self):
+        super().setUp()
+        from battycoda_app.models import (
+            Call,
+            CallProbability,
+            ClassificationResult,
+            ClassificationRun,
+            Segment,
+            Segmentation,
+        )
+
+        echo = Call.objects.create(species=self.group_species, short_name="echo", long_name="Echolocation")
+        social = Call.objects.create(species=self.group_species, short_name="social", long_name="Social")
+
+        recording = Recording.objects.create(
+            name="Recording", project=self.project, species=self.group_species, group=self.group, created_by=self.user
+        )
+        self.segmentation = Segmentation.objects.create(recording=recording, name="Manual", created_by=self.user)
+        self.run = ClassificationRun.objects.create(
+            name="Run", segmentation=self.segmentation, created_by=self.user, group=self.group, status="completed"
+        )
+
+        for onset, echo_probability, social_probability in [(1.0, 0.1, 0.9), (0.0, 0.6, 0.4)]:
+            segment = Segment.objects.create(
+                recording=recording,
+                segmentation=self.segmentation,
+                onset=onset,
+                offset=onset + 0.5,
+                created_by=self.user,
+            )
+            result = ClassificationResult.objects.create(classification_run=self.run, segment=segment)
+            CallProbability.objects.create(classification_result=result, call=echo, probability=echo_probability)
+            CallProbability.objects.create(classification_result=result, call=social, probability=social_probability)
+
+        # A call type added after the run has no probabilities
+        Call.objects.create(species=self.group_species, short_name="buzz", long_name="Feeding buzz")
+
+    def _read_parquet(self, response):
+        import io
+
+        import pyarrow.parquet as pq
+
+        self.assertEqual(response.status_code, 200)
+        return pq.read_table(io.BytesIO(b"".join(response.streaming_content))).to_pydict()
+
+    def test_export_classification_results_with_probability_vectors(self):
+        """Should export one row per result, ordered by onset, with a column per call type."""
+        response = self.client.get(self.get_api_url("export_classification_results", run_id=self.run.id))
+        self.assertEqual(response["Content-Type"], "application/vnd.apache.parquet")
+
+        table = self._read_parquet(response)
+        self.assertEqual(table["onset"], [0.0, 1.0])
+        self.assertEqual(table["top_call"], ["echo", "social"])
+        self.assertEqual(table["top_probability"], [0.6, 0.9])
+        self.assertEqual(table["prob_echo"], [0.6, 0.1])
+        self.assertEqual(table["prob_social"], [0.4, 0.9])
+        self.assertEqual(table["prob_buzz"], [None, None])
+
+    def test_export_classification_results_as_arrow(self):
+        """Should write an Arrow IPC file when format=arrow."""
+        import io
+
+        import pyarrow as pa
+
+        url = self.get_api_url("export_classification_results", run_id=self.run.id) + "&format=arrow"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Disposition"].endswith('.arrow"'))
+
+        table = pa.ipc.open_file(io.BytesIO(b"".join(response.streaming_content))).read_all()
+        self.assertEqual(table.num_rows, 2)
+
+    def test_export_rejects_unknown_format(self):
+        """Should return 400 for an unsupported format."""
+        url = self.get_api_url("export_classification_results", run_id=self.run.id) + "&format=xlsx"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["success"])
+
+    def test_export_classification_results_requires_completed_run(self):
+        """Should refuse to export a run that is still in progress."""
+        self.run.status = "in_progress"
+        self.run.save()
+        response = self.client.get(self.get_api_url("export_classification_results", run_id=self.run.id))
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_segmentation(self):
+        """Should export the segments ordered by onset."""
+        response = self.client.get(self.get_api_url("export_segmentation", segmentation_id=self.segmentation.id))
+        table = self._read_parquet(response)
+        self.assertEqual(table["onset"], [0.0, 1.0])
+        self.assertEqual(table["duration"], [0.5, 0.5])
+
+    def test_export_task_batch(self):
+        """Should export the tasks of a batch, including empty batches."""
+        batch = TaskBatch.objects.create(
+            name="Batch", created_by=self.user, group=self.group, species=self.group_species, project=self.project
+        )
+        empty = self._read_parquet(self.client.get(self.get_api_url("export_task_batch", batch_id=batch.id)))
+        self.assertEqual(empty["task_id"], [])
+
+        task = Task.objects.create(
+            batch=batch,
+            project=self.project,
+            species=self.group_species,
+            created_by=self.user,
+            group=self.group,
+            onset=1.0,
+            offset=1.25,
+            label="echo",
+        )
+        table = self._read_parquet(self.client.get(self.get_api_url("export_task_batch", batch_id=batch.id)))
+        self.assertEqual(table["task_id"], [task.id])
+        self.assertEqual(table["duration"], [0.25])
+        self.assertEqual(table["species"], ["Test Species"])
+        self.assertEqual(table["annotated_by"], [None])
+
+    def test_export_cluster_assignments_not_found(self):
+        """Should return 404 for a clustering run that does not exist."""
+        response = self.client.get(self.get_api_url("export_cluster_assignments", run_id=99999))
+        self.assertEqual(response.status_code, 404)
+
+
+class UploadRecordingDuplicateTests(SimpleAPITestCase):
+    """Tests for rejecting uploads of audio that is already stored."""
+
+    def _wav_file(self, name, seed=0):
+        import io
+
+        import numpy as np
+        import soundfile as sf
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        buffer = io.BytesIO()
+        sf.write(buffer, np.random.default_rng(seed).uniform(-0.5, 0.5, 8000), 8000, format="WAV", subtype="PCM_16")
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type="audio/wav")
+
+    def _upload(self, name, wav_file):
+        return self.client.post(
+            self.get_api_url("upload_recording"),
+            {"name": name, "species_id": self.group_species.id, "project_id": self.project.id, "wav_file": wav_file},
+        )
+
+    def test_renamed_copy_is_rejected(self):
+        first = self._upload("Original", self._wav_file("original.wav"))
+        self.assertEqual(first.status_code, 200)
+        original = Recording.objects.get(id=first.json()["recording"]["id"])
+        self.assertEqual(len(original.quick_hash), 64)
+
+        # Storage is mocked in tests, so store the full hash calculate_audio_duration would compute
+        import tempfile
+
+        from battycoda_app.audio.utils import audio_fingerprint
+
+        with tempfile.NamedTemporaryFile(suffix=".wav") as temp_file:
+            temp_file.write(self._wav_file("original.wav").read())
+            temp_file.flush()
+            quick_hash, original.content_hash = audio_fingerprint(temp_file.name)
+        self.assertEqual(quick_hash, original.quick_hash)
+        original.save(update_fields=["content_hash"])
+
+        response = self._upload("Renamed", self._wav_file("renamed.wav"))
+        self.assertEqual(response.status_code, 409)
+        data = response.json()
+        self.assertFalse(data["success"])
+        self.assertEqual(data["duplicate_of"]["id"], original.id)
+        self.assertEqual(Recording.objects.filter(created_by=self.user).count(), 1)
+
+    def test_different_audio_is_accepted(self):
+        self.assertEqual(self._upload("First", self._wav_file("first.wav", seed=0)).status_code, 200)
+        self.assertEqual(self._upload("Second", self._wav_file("second.wav", seed=1)).status_code, 200)
+        self.assertEqual(Recording.objects.filter(created_by=self.user).count(), 2)
+
 
 class TaskBatchTasksTests(SimpleAPITestCase):
     """Tests for the task batch tasks endpoint."""
@@ -276,6 +276,74 @@ class TusPatchTest(BattycodaTestCase):
         # TusUpload record cleaned up
         self.assertFalse(TusUpload.objects.filter(upload_id=self.upload_id).exists())
 
+    def test_patch_complete_moves_temp_file_into_recordings(self):
+        """The finished temp file should be moved into MEDIA_ROOT/recordings/ byte-for-byte."""
+        self.client.login(username="testuser", password="password123")
+        url = reverse("battycoda_app:tus_upload_chunk", kwargs={"upload_id": self.upload_id})
+
+        chunk = bytes(range(100))
+        response = self.client.patch(
+            url,
+            data=chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET="0",
+        )
+        self.assertEqual(response.status_code, 204)
+
+        rec = Recording.objects.get(created_by=self.user)
+        self.assertTrue(rec.wav_file.name.startswith("recordings/"))
+        self.assertTrue(rec.file_ready)
+        with open(rec.wav_file.path, "rb") as f:
+            self.assertEqual(f.read(), chunk)
+        self.assertFalse(os.path.exists(self.temp_path))
+        os.remove(rec.wav_file.path)
+
+    def test_patch_complete_rejects_duplicate_audio(self):
+        """A finished upload whose audio is already stored in the group creates no recording."""
+        import io
+
+        import numpy as np
+        import soundfile as sf
+
+        from battycoda_app.audio.utils import audio_fingerprint
+
+        buffer = io.BytesIO()
+        sf.write(buffer, np.random.default_rng(0).uniform(-0.5, 0.5, 8000), 8000, format="WAV", subtype="PCM_16")
+        audio = buffer.getvalue()
+        with open(self.temp_path, "wb") as f:
+            f.write(audio)
+        quick_hash, content_hash = audio_fingerprint(self.temp_path)
+        with open(self.temp_path, "wb") as f:
+            pass  # empty again for the upload
+        existing = Recording.objects.create(
+            name="Already uploaded",
+            species=self.species,
+            project=self.project,
+            group=self.group,
+            created_by=self.user,
+            quick_hash=quick_hash,
+            content_hash=content_hash,
+        )
+        self.tus_upload.upload_length = len(audio)
+        self.tus_upload.save(update_fields=["upload_length"])
+
+        self.client.login(username="testuser", password="password123")
+        url = reverse("battycoda_app:tus_upload_chunk", kwargs={"upload_id": self.upload_id})
+        response = self.client.patch(
+            url,
+            data=audio,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET="0",
+        )
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(response.json()["recording_id"], existing.id)
+        self.assertEqual(response["X-Recording-Id"], str(existing.id))
+        self.assertIn("X-Error", response)
+
+        self.assertEqual(Recording.objects.filter(created_by=self.user).count(), 1)
+        self.assertFalse(TusUpload.objects.filter(upload_id=self.upload_id).exists())
+        self.assertFalse(os.path.exists(self.temp_path))
+
 
 class TusDeleteTest(BattycodaTestCase):
     def setUp(self):
@@ -1,15 +1,40 @@
 import io
+import os
 import pickle
+import tempfile
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+import soundfile as sf
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
+from battycoda_app.audio.colormaps import get_colormap, get_colormap_array
 from battycoda_app.audio.modules.file_utils import (
+    AudioFingerprintError,
+    audio_fingerprint,
+    create_recording_from_file,
+    move_file_to_media,
+    read_pcm_wav_layout,
     safe_pickle_load,
     safe_pickle_loads,
+    split_audio_file,
+)
+from battycoda_app.audio.modules.segmentation import auto_segment_audio, energy_based_segment_audio
+from battycoda_app.audio.modules.segmentation_preview import (
+    PREVIEW_CACHE_SIZE,
+    clear_segmentation_preview_cache,
+    get_segmentation_preview,
+)
+from battycoda_app.models import BatchExportJob, Call, Classifier, Group, GroupMembership, Project, Species, UserProfile
+from battycoda_app.utils_modules.lookup_cache import get_available_classifiers, get_species_calls
+from battycoda_app.utils_modules.progress_reporter import (
+    PROGRESS_WRITE_INTERVAL,
+    ProgressReporter,
+    apply_live_progress,
 )
-from battycoda_app.models import Group
 from battycoda_app.utils_modules.species_utils import import_default_species
 
 
@@ -141,3 +166,484 @@ class RestrictedUnpicklerTest(TestCase):
         file_obj = io.BytesIO(pickled)
         result = safe_pickle_load(file_obj)
         self.assertEqual(result, data)
+
+
+class MoveFileToMediaTest(TestCase):
+    """Tests for moving finished uploads into media storage."""
+
+    def _make_source(self, content):
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_moves_file_and_removes_source(self):
+        src = self._make_source(b"RIFF" + b"\x01" * 64)
+        name = move_file_to_media(src, "recordings/", "moved test.wav")
+        dest = os.path.join(settings.MEDIA_ROOT, name)
+        self.addCleanup(os.remove, dest)
+
+        self.assertTrue(name.startswith("recordings/"))
+        self.assertFalse(os.path.exists(src))
+        with open(dest, "rb") as f:
+            self.assertEqual(f.read(), b"RIFF" + b"\x01" * 64)
+
+    def test_existing_name_is_not_overwritten(self):
+        first = move_file_to_media(self._make_source(b"first"), "recordings/", "same_name.wav")
+        second = move_file_to_media(self._make_source(b"second"), "recordings/", "same_name.wav")
+        self.addCleanup(os.remove, os.path.join(settings.MEDIA_ROOT, first))
+        self.addCleanup(os.remove, os.path.join(settings.MEDIA_ROOT, second))
+
+        self.assertNotEqual(first, second)
+        with open(os.path.join(settings.MEDIA_ROOT, first), "rb") as f:
+            self.assertEqual(f.read(), b"first")
+
+    def test_falls_back_to_streaming_copy(self):
+        src = self._make_source(b"copied")
+        with patch("battycoda_app.audio.modules.file_utils.os.link", side_effect=OSError("cross-device link")):
+            name = move_file_to_media(src, "recordings/")
+        dest = os.path.join(settings.MEDIA_ROOT, name)
+        self.addCleanup(os.remove, dest)
+
+        self.assertFalse(os.path.exists(src))
+        with open(dest, "rb") as f:
+            self.assertEqual(f.read(), b"copied")
+
+
+class CreateRecordingFromFileTest(TestCase):
+    """Tests for creating recordings from finished files on disk."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+        self.group = Group.objects.create(name="Test Group", description="A test group")
+        self.species = Species.objects.create(name="Test Species", group=self.group, created_by=self.user)
+        self.project = Project.objects.create(name="Test Project", group=self.group, created_by=self.user)
+
+    def _make_source(self):
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        with os.fdopen(fd, "wb") as f:
+            f.write(b"RIFF" + b"\x01" * 64)
+        return path
+
+    def _fields(self):
+        return {
+            "name": "Moved",
+            "species": self.species,
+            "project": self.project,
+            "group": self.group,
+            "created_by": self.user,
+        }
+
+    def test_creates_ready_recording(self):
+        src = self._make_source()
+        recording = create_recording_from_file(src, "moved.wav", **self._fields())
+        self.addCleanup(os.remove, recording.wav_file.path)
+
+        self.assertTrue(recording.file_ready)
+        self.assertTrue(recording.wav_file.name.startswith("recordings/"))
+        self.assertFalse(os.path.exists(src))
+        self.assertTrue(os.path.exists(recording.wav_file.path))
+
+    def test_removes_moved_file_when_recording_fails(self):
+        src = self._make_source()
+        moved = []
+
+        def move(*args, **kwargs):
+            moved.append(move_file_to_media(*args, **kwargs))
+            return moved[-1]
+
+        with (
+            patch("battycoda_app.audio.modules.file_utils.move_file_to_media", side_effect=move),
+            patch("battycoda_app.models.recording.Recording.save", side_effect=ValueError("database down")),
+        ):
+            with self.assertRaises(ValueError):
+                create_recording_from_file(src, "orphan.wav", **self._fields())
+
+        self.assertEqual(len(moved), 1)
+        self.assertFalse(os.path.exists(os.path.join(settings.MEDIA_ROOT, moved[0])))
+
+
+class SplitAudioFileTest(TestCase):
+    """Tests for streaming splitting of long recordings into chunks."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.rng = np.random.default_rng(0)
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write_wav(self, subtype, frames=150037, channels=2, samplerate=1000):
+        path = os.path.join(self.temp_dir, f"rec_{subtype}.wav")
+        sf.write(path, self.rng.uniform(-0.9, 0.9, (frames, channels)), samplerate, subtype=subtype)
+        return path
+
+    def _assert_lossless_split(self, path, subtype, **kwargs):
+        original, _ = sf.read(path, dtype="float64")
+        chunk_paths = split_audio_file(path, chunk_duration_seconds=60, **kwargs)
+        self.addCleanup(lambda: [os.remove(p) for p in chunk_paths])
+
+        chunks = [sf.read(p, dtype="float64")[0] for p in chunk_paths]
+        self.assertEqual([len(c) for c in chunks], [60000, 60000, 30037])
+        self.assertEqual({sf.info(p).subtype for p in chunk_paths}, {subtype})
+        np.testing.assert_array_equal(np.concatenate(chunks), original)
+
+    def test_pcm_wav_byte_copy_is_lossless(self):
+        path = self._write_wav("PCM_24")
+        self.assertIsNotNone(read_pcm_wav_layout(path))
+        self._assert_lossless_split(path, "PCM_24")
+
+    def test_streaming_split_keeps_subtype(self):
+        self._assert_lossless_split(self._write_wav("PCM_16"), "PCM_16", byte_copy=False)
+
+    def test_float_wav_uses_streaming_split(self):
+        path = self._write_wav("FLOAT")
+        self.assertIsNone(read_pcm_wav_layout(path))
+        self._assert_lossless_split(path, "FLOAT")
+
+
+class ExtractAudioSegmentTest(TestCase):
+    """Tests for reading audio windows through cached and bulk file handles."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "rec.wav")
+        self.audio = np.random.default_rng(0).uniform(-0.5, 0.5, 1000).astype("float32")
+        sf.write(self.path, self.audio, 1000, subtype="FLOAT")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_pads_windows_outside_the_file(self):
+        from battycoda_app.audio.task_modules.base import extract_audio_segment
+
+        segment, sample_rate = extract_audio_segment(self.path, -0.01, 0.02)
+
+        self.assertEqual(sample_rate, 1000)
+        self.assertEqual(segment.shape, (30, 1))
+        np.testing.assert_array_equal(segment[:10, 0], 0)
+        np.testing.assert_array_equal(segment[10:, 0], self.audio[:20])
+
+        segment, _ = extract_audio_segment(self.path, 0.99, None)
+        np.testing.assert_array_equal(segment[:, 0], self.audio[990:])
+
+    def test_reuses_handle_until_file_changes(self):
+        from battycoda_app.audio.task_modules import base
+
+        with patch.object(base, "_handle_cache", base.OrderedDict()):
+            with patch("soundfile.SoundFile", wraps=sf.SoundFile) as mock_open:
+                base.extract_audio_segment(self.path, 0.1, 0.2)
+                base.extract_audio_segment(self.path, 0.3, 0.4)
+                self.assertEqual(mock_open.call_count, 1)
+
+                sf.write(self.path, np.zeros(2000, dtype="float32"), 1000, subtype="FLOAT")
+                mock_open.reset_mock()
+                segment, _ = base.extract_audio_segment(self.path, 1.5, 1.6)
+                self.assertEqual(mock_open.call_count, 1)
+                np.testing.assert_array_equal(segment, 0)
+
+    def test_busy_handle_does_not_block_other_reads(self):
+        from battycoda_app.audio.task_modules import base
+
+        other_path = os.path.join(self.temp_dir, "other.wav")
+        sf.write(other_path, self.audio[::-1].copy(), 1000, subtype="FLOAT")
+
+        with patch.object(base, "_handle_cache", base.OrderedDict()):
+            base.extract_audio_segment(self.path, 0.1, 0.2)
+            busy = base._handle_cache[self.path]
+            # Another thread is in the middle of reading the cached handle
+            with busy.lock:
+                segment, _ = base.extract_audio_segment(self.path, 0.1, 0.2)
+                other, _ = base.extract_audio_segment(other_path, 0.0, 0.01)
+
+            np.testing.assert_array_equal(segment[:, 0], self.audio[100:200])
+            np.testing.assert_array_equal(other[:, 0], self.audio[::-1][:10])
+            self.assertFalse(busy.sound_file.closed)
+
+    def test_closes_handles_of_deleted_files(self):
+        from battycoda_app.audio.task_modules import base
+
+        other_path = os.path.join(self.temp_dir, "other.wav")
+        sf.write(other_path, self.audio, 1000, subtype="FLOAT")
+
+        with patch.object(base, "_handle_cache", base.OrderedDict()):
+            base.extract_audio_segment(other_path, 0.1, 0.2)
+            deleted = base._handle_cache[other_path]
+            os.remove(other_path)
+
+            base.extract_audio_segment(self.path, 0.1, 0.2)
+
+            self.assertTrue(deleted.sound_file.closed)
+            self.assertEqual(list(base._handle_cache), [self.path])
+
+    def test_bulk_extraction_matches_single_calls(self):
+        from battycoda_app.audio.task_modules.base import extract_audio_segment, extract_audio_segments
+
+        windows = [(0.5, 0.6), (0.1, 0.15), (0.95, 1.05), (-0.02, 0.01)]
+
+        segments, sample_rate = extract_audio_segments(self.path, windows)
+
+        self.assertEqual(sample_rate, 1000)
+        for (onset, offset), segment in zip(windows, segments, strict=True):
+            np.testing.assert_array_equal(segment, extract_audio_segment(self.path, onset, offset)[0])
+
+
+class AudioFingerprintTest(TestCase):
+    """Tests for the content fingerprints used to detect duplicate recordings."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.samples = np.random.default_rng(0).uniform(-0.9, 0.9, (200000, 2))
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write_wav(self, name, samples, subtype="PCM_16"):
+        path = os.path.join(self.temp_dir, name)
+        sf.write(path, samples, 8000, subtype=subtype)
+        return path
+
+    def test_renamed_copy_has_same_fingerprint(self):
+        original = self._write_wav("original.wav", self.samples)
+        renamed = self._write_wav("renamed.wav", self.samples)
+
+        self.assertEqual(audio_fingerprint(original), audio_fingerprint(renamed))
+
+    def test_quick_hash_only_covers_the_ends(self):
+        edited = self.samples.copy()
+        edited[100000] = 0.0
+        original = self._write_wav("original.wav", self.samples)
+        changed = self._write_wav("changed.wav", edited)
+
+        quick, content = audio_fingerprint(original)
+        changed_quick, changed_content = audio_fingerprint(changed)
+        self.assertEqual(quick, changed_quick)
+        self.assertNotEqual(content, changed_content)
+        self.assertEqual(audio_fingerprint(original, full=False), (quick, None))
+
+    def test_non_pcm_files_are_decoded(self):
+        path = self._write_wav("float.wav", self.samples, subtype="FLOAT")
+        self.assertIsNone(read_pcm_wav_layout(path))
+
+        quick, content = audio_fingerprint(path)
+        self.assertEqual(len(quick), 64)
+        copy = self._write_wav("copy.wav", self.samples, subtype="FLOAT")
+        self.assertEqual(audio_fingerprint(copy), (quick, content))
+        self.assertNotEqual(content, audio_fingerprint(self._write_wav("pcm.wav", self.samples))[1])
+
+    def test_unreadable_file_raises(self):
+        path = os.path.join(self.temp_dir, "not_audio.wav")
+        with open(path, "wb") as f:
+            f.write(b"\x00" * 100)
+
+        with self.assertRaises(AudioFingerprintError):
+            audio_fingerprint(path)
+
+
+class SegmentationPreviewTest(TestCase):
+    """Tests for the in-memory segmentation preview engine."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        clear_segmentation_preview_cache()
+        self.addCleanup(clear_segmentation_preview_cache)
+
+        # One second of quiet noise with three 50 kHz calls of increasing loudness
+        sample_rate = 250000
+        rng = np.random.default_rng(0)
+        samples = rng.normal(0, 0.01, sample_rate)
+        t = np.arange(int(0.01 * sample_rate)) / sample_rate
+        for start, amplitude in ((0.2, 0.2), (0.5, 0.4), (0.8, 0.8)):
+            i = int(start * sample_rate)
+            samples[i : i + len(t)] += amplitude * np.sin(2 * np.pi * 50000 * t)
+        self.path = os.path.join(self.temp_dir, "calls.wav")
+        sf.write(self.path, samples, sample_rate, subtype="FLOAT")
+
+    def tearDown(self):
+        import shutil
+
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_matches_full_segmentation(self):
+        for algorithm_type, segment_audio in (
+            ("threshold", auto_segment_audio),
+            ("energy", energy_based_segment_audio),
+        ):
+            preview = get_segmentation_preview(1, self.path, 0.0, 1.0, algorithm_type, 20000, 80000)
+            for threshold_factor in (0.5, 2.0):
+                expected = segment_audio(
+                    self.path,
+                    min_duration_ms=2,
+                    smooth_window=50,
+                    threshold_factor=threshold_factor,
+                    low_freq=20000,
+                    high_freq=80000,
+                )
+                self.assertEqual(preview.segment(threshold_factor, 2, 50), expected)
+
+    def test_slice_times_are_relative_to_the_recording(self):
+        preview = get_segmentation_preview(1, self.path, 0.4, 0.5, "threshold", 20000, 80000)
+        onsets, offsets = preview.segment(2.0, 2, 50)
+
+        self.assertEqual(len(onsets), 2)
+        self.assertAlmostEqual(onsets[0], 0.5, places=2)
+        self.assertAlmostEqual(offsets[1], 0.81, places=2)
+        self.assertTrue(preview.spectrogram_png.startswith(b"\x89PNG"))
+
+    def test_slider_changes_reuse_the_analysed_slice(self):
+        preview = get_segmentation_preview(1, self.path, 0.0, 1.0, "threshold", 20000, 80000)
+        with patch("battycoda_app.audio.modules.segmentation_preview._read_slice") as mock_read:
+            self.assertIs(get_segmentation_preview(1, self.path, 0.0, 1.0, "threshold", 20000, 80000), preview)
+        mock_read.assert_not_called()
+
+        self.assertGreater(len(preview.segment(0.5, 2, 50)[0]), len(preview.segment(4.0, 2, 50)[0]))
+        self.assertIsNot(get_segmentation_preview(1, self.path, 0.0, 1.0, "threshold", 30000, 80000), preview)
+
+    def test_cache_is_bounded(self):
+        first = get_segmentation_preview(1, self.path, 0.0, 0.1)
+        for i in range(PREVIEW_CACHE_SIZE):
+            get_segmentation_preview(1, self.path, 0.1 * (i + 1), 0.1)
+
+        self.assertIsNot(get_segmentation_preview(1, self.path, 0.0, 0.1), first)
+
+    def test_slice_past_the_end_raises(self):
+        with self.assertRaises(ValueError):
+            get_segmentation_preview(1, self.path, 5.0, 1.0)
+
+
+class ProgressReporterTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+        self.job = BatchExportJob.objects.create(name="export", created_by=user, status="in_progress")
+        self.reporter = ProgressReporter(self.job, message_field=None)
+
+        publish_patch = patch("battycoda_app.utils_modules.progress_reporter.publish_job")
+        self.publish_job = publish_patch.start()
+        self.addCleanup(publish_patch.stop)
+
+    def stored_progress(self):
+        return BatchExportJob.objects.get(id=self.job.id).progress
+
+    def test_frequent_updates_are_cached_not_written(self):
+        for progress in range(1, 20):
+            self.assertFalse(self.reporter.update(progress=progress))
+
+        self.assertEqual(self.stored_progress(), 0)
+        self.assertEqual(self.job.progress, 19)
+        self.publish_job.assert_called_with(self.job)
+
+        # Status views see the cached progress
+        job = apply_live_progress(BatchExportJob.objects.get(id=self.job.id))
+        self.assertEqual(job.progress, 19)
+
+    def test_update_written_after_interval_and_delta(self):
+        self.reporter._written_at -= PROGRESS_WRITE_INTERVAL
+        self.assertFalse(self.reporter.update(progress=2))
+        self.assertTrue(self.reporter.update(progress=10))
+        self.assertEqual(self.stored_progress(), 10)
+
+        # The throttle starts over after a write
+        self.assertFalse(self.reporter.update(progress=30))
+        self.assertEqual(self.stored_progress(), 10)
+
+    def test_status_changes_are_written_immediately(self):
+        self.reporter.update(progress=40)
+        self.assertTrue(self.reporter.update(progress=100, status="completed"))
+
+        job = BatchExportJob.objects.get(id=self.job.id)
+        self.assertEqual((job.status, job.progress), ("completed", 100))
+        self.assertEqual(apply_live_progress(job).progress, 100)
+
+    def test_cached_progress_ignored_after_status_change(self):
+        self.reporter.update(progress=40)
+        BatchExportJob.objects.filter(id=self.job.id).update(status="cancelled")
+
+        job = apply_live_progress(BatchExportJob.objects.get(id=self.job.id))
+        self.assertEqual(job.progress, 0)
+
+    def test_flush_writes_held_back_progress(self):
+        self.reporter.update(progress=3)
+        self.assertTrue(self.reporter.flush())
+        self.assertEqual(self.stored_progress(), 3)
+
+
+class LookupCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+        self.group = Group.objects.create(name="Test Group", description="Test group")
+        self.species = Species.objects.create(name="Lookup Species", group=self.group, created_by=self.user)
+
+    def test_group_admin_check_is_cached_and_invalidated(self):
+        self.assertFalse(UserProfile.objects.get(user=self.user).is_admin_of_group(self.group))
+
+        profile = UserProfile.objects.get(user=self.user)
+        with self.assertNumQueries(0):
+            self.assertFalse(profile.is_admin_of_group(self.group))
+
+        GroupMembership.objects.create(user=self.user, group=self.group, is_admin=True)
+        self.assertTrue(UserProfile.objects.get(user=self.user).is_admin_of_group(self.group))
+
+    def test_species_calls_are_cached_and_invalidated(self):
+        Call.objects.create(species=self.species, short_name="FM", long_name="Frequency modulated")
+        self.assertEqual(get_species_calls(self.species.id), [("FM", "Frequency modulated")])
+
+        with self.assertNumQueries(0):
+            get_species_calls(self.species.id)
+
+        call = Call.objects.create(species=self.species, short_name="CF")
+        self.assertEqual([c[0] for c in get_species_calls(self.species.id)], ["CF", "FM"])
+        call.delete()
+        self.assertEqual([c[0] for c in get_species_calls(self.species.id)], ["FM"])
+
+    def test_available_classifiers_are_cached_and_invalidated(self):
+        other_group = Group.objects.create(name="Other Group", description="Other group")
+        own = Classifier.objects.create(
+            name="Own", response_format="full_probability", species=self.species, group=self.group
+        )
+        other = Classifier.objects.create(name="Other", response_format="full_probability", group=other_group)
+
+        classifiers = get_available_classifiers(self.group.id, self.species.id)
+        self.assertIn(own, classifiers)
+        self.assertNotIn(other, classifiers)
+        with self.assertNumQueries(0):
+            get_available_classifiers(self.group.id, self.species.id)
+
+        own.is_active = False
+        own.save()
+        self.assertNotIn(own, get_available_classifiers(self.group.id, self.species.id))
+
+    def test_colormap_array(self):
+        array = get_colormap_array("roseus")
+
+        self.assertIs(get_colormap_array("roseus"), array)
+        self.assertEqual(array.shape, (len(get_colormap("roseus")), 3))
+        self.assertFalse(array.flags.writeable)
+        self.assertIs(get_colormap_array("no-such-colormap"), array)
+
+
+class AuditIndexesCommandTest(TestCase):
+    def test_composite_indexes_cover_their_leading_foreign_key(self):
+        from django.core.management import call_command
+        from django.db import connection
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = 'battycoda_app_task' AND indexname LIKE 'task_%%idx'"
+            )
+            index_names = {row[0] for row in cursor.fetchall()}
+        self.assertTrue({"task_open_group_created_idx", "task_annotated_idx"} <= index_names)
+
+        output = io.StringIO()
+        call_command("audit_indexes", stdout=output)
+        report = output.getvalue()
+        self.assertIn("All ForeignKey fields have database indexes.", report)
+        # The slow-query section is either skipped or reported, never an error
+        self.assertRegex(report, "pg_stat_statements|Slow-query candidates|No statements on app tables")
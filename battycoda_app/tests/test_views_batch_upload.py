@@ -1,17 +1,34 @@
 """Tests for batch upload views"""
 
 import io
+import os
+import pickle
+import tempfile
+import time
 import zipfile
+from unittest.mock import patch
 
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import Client
+from django.test import Client, override_settings
 from django.urls import reverse
 
-from battycoda_app.models import Group, GroupMembership, UserProfile
+from battycoda_app.audio.task_modules.batch_upload_tasks import process_batch_upload_job
+from battycoda_app.models import (
+    BatchUploadJob,
+    Group,
+    GroupMembership,
+    Notification,
+    Recording,
+    Segment,
+    Segmentation,
+    UserProfile,
+)
 from battycoda_app.models.organization import Project, Species
 from battycoda_app.tests.test_base import BattycodaTestCase
 from battycoda_app.tests.test_views_recording import create_mock_wav_file
+from battycoda_app.utils_modules.cleanup import safe_cleanup_dir, safe_remove_file
 
 AJAX_HEADERS = {"HTTP_X_REQUESTED_WITH": "XMLHttpRequest"}
 
@@ -85,18 +102,160 @@ class BatchUploadViewTest(BattycodaTestCase):
         self.assertFalse(data["success"])
         self.assertIn("Failed to extract", data["error"])
 
-    def test_ajax_post_success_returns_json_with_redirect(self):
-        """A successful AJAX batch upload should return counts and a redirect URL"""
-        response = self.client.post(
-            self.url, self.form_data(wav_zip=create_wav_zip(("one.wav", "two.wav"))), **AJAX_HEADERS
-        )
+    def test_ajax_post_success_queues_job_with_redirect(self):
+        """A successful AJAX batch upload should queue a job and return its status URL and a redirect URL"""
+        with patch("battycoda_app.views_batch_upload.views.process_batch_upload_job.delay") as mock_delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post(
+                    self.url, self.form_data(wav_zip=create_wav_zip(("one.wav", "two.wav"))), **AJAX_HEADERS
+                )
         self.assertEqual(response.status_code, 200)
         data = response.json()
         self.assertTrue(data["success"])
-        self.assertEqual(data["recordings_created"], 2)
+        self.assertEqual(data["total_files"], 2)
         self.assertEqual(data["redirect_url"], reverse("battycoda_app:recording_list"))
+        self.assertEqual(
+            data["status_url"], reverse("battycoda_app:batch_upload_status", kwargs={"job_id": data["job_id"]})
+        )
+
+        job = BatchUploadJob.objects.get(id=data["job_id"])
+        self.assertEqual(job.status, "pending")
+        self.assertEqual(job.created_by, self.user)
+        self.assertTrue(os.path.exists(job.wav_zip_path))
+        mock_delay.assert_called_once_with(job.id)
+        safe_cleanup_dir(os.path.dirname(job.wav_zip_path))
+
+    def test_ajax_post_zip_without_wavs_returns_json_error(self):
+        """A ZIP without any WAV members should be rejected before a job is queued"""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            zf.writestr("notes.txt", "no audio here")
+        empty_zip = SimpleUploadedFile("empty.zip", buffer.getvalue(), content_type="application/zip")
+        response = self.client.post(self.url, self.form_data(wav_zip=empty_zip), **AJAX_HEADERS)
+        data = response.json()
+        self.assertFalse(data["success"])
+        self.assertIn("does not contain any WAV files", data["error"])
+        self.assertFalse(BatchUploadJob.objects.exists())
 
     def test_non_ajax_post_success_still_redirects(self):
         """A successful non-AJAX batch upload should keep the redirect behavior"""
         response = self.client.post(self.url, self.form_data(wav_zip=create_wav_zip()))
         self.assertRedirects(response, reverse("battycoda_app:recording_list"))
+        safe_cleanup_dir(os.path.dirname(BatchUploadJob.objects.get().wav_zip_path))
+
+    def test_status_view_permission(self):
+        """Only the uploader or their group can read a batch upload job's status"""
+        job = BatchUploadJob.objects.create(
+            name="recordings.zip",
+            wav_zip_path="/nonexistent/wav.zip",
+            species=self.species,
+            project=self.project,
+            total_files=3,
+            processed_files=1,
+            created_by=self.user,
+            group=self.group,
+        )
+        status_url = reverse("battycoda_app:batch_upload_status", kwargs={"job_id": job.id})
+
+        data = self.client.get(status_url).json()
+        self.assertEqual(data["status"], "pending")
+        self.assertEqual(data["processed_files"], 1)
+
+        User.objects.create_user(username="outsider", email="o@example.com", password="password123")
+        self.client.login(username="outsider", password="password123")
+        self.assertEqual(self.client.get(status_url).status_code, 403)
+
+
+@override_settings(BATCH_UPLOAD_WORKERS=1)
+class BatchUploadJobTaskTest(BattycodaTestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+        self.group = Group.objects.create(name="Test Group", description="A test group")
+        self.species = Species.objects.create(name="Test Species", group=self.group, created_by=self.user)
+        self.project = Project.objects.create(name="Test Project", group=self.group, created_by=self.user)
+
+        self.upload_dir = tempfile.mkdtemp(dir=settings.BATCH_UPLOAD_DIR)
+        self.addCleanup(safe_cleanup_dir, self.upload_dir)
+
+    def _write_zip(self, name, members):
+        path = os.path.join(self.upload_dir, name)
+        with zipfile.ZipFile(path, "w") as zf:
+            for member_name, content in members.items():
+                zf.writestr(member_name, content)
+        return path
+
+    def _run_job(self, wav_members, pickle_members=None):
+        job = BatchUploadJob.objects.create(
+            name="recordings.zip",
+            wav_zip_path=self._write_zip("wav.zip", wav_members),
+            pickle_zip_path=self._write_zip("pickle.zip", pickle_members) if pickle_members else "",
+            species=self.species,
+            project=self.project,
+            created_by=self.user,
+            group=self.group,
+        )
+        process_batch_upload_job.apply(args=[job.id])
+        job.refresh_from_db()
+        for recording in Recording.objects.filter(created_by=self.user):
+            self.addCleanup(safe_remove_file, recording.wav_file.path)
+        return job
+
+    def test_job_creates_recordings_and_bulk_segments(self):
+        """The job should stream each WAV into a recording and bulk-insert segments from matching pickles"""
+        wav_bytes = create_mock_wav_file().read()
+        pickle_bytes = pickle.dumps({"onsets": [0.1, 0.5, 0.9], "offsets": [0.2, 0.6, 1.0]})
+        job = self._run_job(
+            {"one.wav": wav_bytes, "nested/two.wav": wav_bytes, "__MACOSX/._one.wav": b"junk"},
+            {"one.wav.pickle": pickle_bytes},
+        )
+
+        self.assertEqual(job.status, "completed")
+        self.assertEqual((job.total_files, job.processed_files), (2, 2))
+        self.assertEqual((job.success_count, job.error_count, job.segmented_count), (2, 0, 1))
+        self.assertEqual(job.progress, 100)
+
+        self.assertEqual(set(Recording.objects.values_list("name", flat=True)), {"one", "two"})
+        segmentation = Segmentation.objects.get(recording__name="one")
+        self.assertEqual(segmentation.segments_created, 3)
+        self.assertFalse(segmentation.manually_edited)
+        self.assertEqual(Segment.objects.filter(segmentation=segmentation).count(), 3)
+
+        # Archives and working files are removed once the job finishes
+        self.assertFalse(os.path.exists(job.wav_zip_path))
+        self.assertFalse(os.path.exists(job.pickle_zip_path))
+        self.assertTrue(Notification.objects.filter(user=self.user, title="Batch Upload Complete").exists())
+
+    def test_job_counts_unreadable_archive_as_failure(self):
+        """A job whose archive cannot be opened should be marked failed and notify the user"""
+        job = BatchUploadJob.objects.create(
+            name="broken.zip",
+            wav_zip_path=os.path.join(self.upload_dir, "missing.zip"),
+            species=self.species,
+            project=self.project,
+            created_by=self.user,
+            group=self.group,
+        )
+        process_batch_upload_job.apply(args=[job.id])
+        job.refresh_from_db()
+
+        self.assertEqual(job.status, "failed")
+        self.assertTrue(Notification.objects.filter(user=self.user, title="Batch Upload Failed").exists())
+
+    @override_settings(BATCH_UPLOAD_WORKERS=2)
+    def test_failed_job_waits_for_workers_before_cleanup(self):
+        """A job failing while workers run should let them finish before removing the archives"""
+        wav_bytes = create_mock_wav_file().read()
+        archive_seen = []
+
+        def worker(job, pending, results, pickle_members, work_dir):
+            # An unknown count makes the job fail while this worker is still reading
+            results.put({"unknown_count": 1})
+            time.sleep(0.2)
+            archive_seen.append(os.path.exists(job.wav_zip_path))
+
+        with patch("battycoda_app.audio.task_modules.batch_upload_tasks._ingest_worker", side_effect=worker):
+            job = self._run_job({"one.wav": wav_bytes, "two.wav": wav_bytes})
+
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(archive_seen, [True, True])
+        self.assertFalse(os.path.exists(job.wav_zip_path))
@@ -421,6 +421,32 @@ class ClusterMappingViewTest(BattycodaTestCase):
         response = self.client.get(self.mapping_url)
         self.assertEqual(response.status_code, 302)
 
+    def test_export_clusters_as_arrow(self):
+        """Cluster assignments can be exported as an Arrow file"""
+        import io
+
+        import pyarrow as pa
+
+        from battycoda_app.models import Segment
+        from battycoda_app.models.clustering import SegmentCluster
+
+        cluster = Cluster.objects.create(clustering_run=self.clustering_run, cluster_id=3, label="Buzz")
+        segment = Segment.objects.create(
+            recording=self.recording, segmentation=self.segmentation, onset=0.5, offset=0.75, created_by=self.user
+        )
+        SegmentCluster.objects.create(segment=segment, cluster=cluster, confidence=0.8, distance_to_center=1.5)
+
+        self.client.login(username="testuser", password="password123")
+        url = reverse("battycoda_app:export_clusters", args=[self.clustering_run.id]) + "?format=arrow"
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+        table = pa.ipc.open_file(io.BytesIO(b"".join(response.streaming_content))).read_all().to_pydict()
+        self.assertEqual(table["segment_id"], [segment.id])
+        self.assertEqual(table["recording_name"], ["Test Recording"])
+        self.assertEqual(table["cluster_id"], [3])
+        self.assertEqual(table["cluster_label"], ["Buzz"])
+
 
 class ClusteringAPIViewTest(BattycodaTestCase):
     def setUp(self):
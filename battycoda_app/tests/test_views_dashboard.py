@@ -1,16 +1,28 @@
 """Tests for dashboard views"""
 
+import asyncio
+import json
 from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from django.contrib.auth.models import User
 from django.test import Client
 from django.urls import reverse
 from django.utils import timezone
+from redis.exceptions import ConnectionError as RedisConnectionError
 
-from battycoda_app.models import Group, GroupMembership, UserProfile
+from battycoda_app.models import BatchUploadJob, Group, GroupMembership, UserProfile
 from battycoda_app.models.organization import Project, Species
 from battycoda_app.models.task import Task, TaskBatch
+from battycoda_app.models.task_stats import (
+    DailyAnnotationCount,
+    ProjectTaskCounter,
+    forget_tasks,
+    rebuild_task_rollups,
+    record_created_tasks,
+)
 from battycoda_app.tests.test_base import BattycodaTestCase
+from battycoda_app.utils_modules import progress_bus
 
 
 class DashboardViewsTest(BattycodaTestCase):
@@ -254,3 +266,267 @@ class DashboardStreakCalculationTest(BattycodaTestCase):
         response = self.client.get(self.index_url)
         my_stats = response.context["my_stats"]
         self.assertEqual(my_stats["streak"], 0)
+
+    def test_streak_counts_consecutive_days(self):
+        """Streak should count every consecutive day of activity up to today"""
+        self.client.login(username="testuser", password="password123")
+
+        for days_ago in (0, 1, 2, 4):
+            Task.objects.create(
+                project=self.project,
+                species=self.species,
+                batch=self.batch,
+                is_done=True,
+                annotated_by=self.user,
+                annotated_at=timezone.now() - timedelta(days=days_ago),
+                created_by=self.user,
+                group=self.group,
+                onset=0.0,
+                offset=1.0,
+            )
+
+        response = self.client.get(self.index_url)
+        self.assertEqual(response.context["my_stats"]["streak"], 3)
+        self.assertEqual(response.context["leaderboard"][0]["streak"], 3)
+
+
+class TaskRollupTest(BattycodaTestCase):
+    """Test that the dashboard rollup tables follow task changes"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+        self.other_user = User.objects.create_user(
+            username="otheruser", email="other@example.com", password="password123"
+        )
+        self.group = Group.objects.create(name="Test Group", description="A test group")
+        self.species = Species.objects.create(name="Test Species", group=self.group, created_by=self.user)
+        self.project = Project.objects.create(name="Test Project", group=self.group, created_by=self.user)
+        self.batch = TaskBatch.objects.create(
+            name="Test Batch", project=self.project, species=self.species, created_by=self.user, group=self.group
+        )
+
+    def _create_task(self, **kwargs):
+        return Task.objects.create(
+            project=self.project,
+            species=self.species,
+            batch=self.batch,
+            created_by=self.user,
+            group=self.group,
+            onset=0.0,
+            offset=1.0,
+            **kwargs,
+        )
+
+    def _counter(self):
+        counter = ProjectTaskCounter.objects.get(project=self.project, group=self.group, created_by=self.user)
+        return counter.total_count, counter.done_count
+
+    def _day_counts(self):
+        return {
+            (row.user_id, row.day): row.count
+            for row in DailyAnnotationCount.objects.filter(group=self.group, count__gt=0)
+        }
+
+    def test_marking_task_done_updates_rollups(self):
+        """Completing a task should bump the project done count and the annotator's day count"""
+        task = self._create_task()
+        self.assertEqual(self._counter(), (1, 0))
+        self.assertEqual(self._day_counts(), {})
+
+        task.is_done = True
+        task.annotated_by = self.user
+        task.annotated_at = timezone.now()
+        task.save()
+        task.save()  # Saving again without changes must not double count
+
+        self.assertEqual(self._counter(), (1, 1))
+        self.assertEqual(self._day_counts(), {(self.user.id, timezone.localdate()): 1})
+
+    def test_relabel_moves_annotation_to_new_user(self):
+        """Relabeling a done task should move the annotation to the new annotator and day"""
+        yesterday = timezone.now() - timedelta(days=1)
+        task = self._create_task(is_done=True, annotated_by=self.user, annotated_at=yesterday)
+
+        task.annotated_by = self.other_user
+        task.annotated_at = timezone.now()
+        task.save()
+
+        self.assertEqual(self._counter(), (1, 1))
+        self.assertEqual(self._day_counts(), {(self.other_user.id, timezone.localdate()): 1})
+
+    def test_deleting_tasks_updates_rollups(self):
+        """Deleting tasks one by one or through forget_tasks should remove them from the rollups"""
+        now = timezone.now()
+        task = self._create_task(is_done=True, annotated_by=self.user, annotated_at=now)
+        self._create_task(is_done=True, annotated_by=self.user, annotated_at=now)
+        self._create_task()
+
+        task.delete()
+        self.assertEqual(self._counter(), (2, 1))
+        self.assertEqual(self._day_counts(), {(self.user.id, timezone.localdate()): 1})
+
+        remaining = Task.objects.filter(batch=self.batch)
+        forget_tasks(remaining)
+        remaining.delete()
+        self.assertEqual(self._counter(), (0, 0))
+        self.assertEqual(self._day_counts(), {})
+
+    def test_bulk_created_tasks_and_rebuild(self):
+        """record_created_tasks should match what rebuild_task_rollups computes from scratch"""
+        tasks = [
+            Task(
+                project=self.project,
+                species=self.species,
+                batch=self.batch,
+                created_by=self.user,
+                group=self.group,
+                onset=float(i),
+                offset=float(i + 1),
+                is_done=i % 2 == 0,
+                annotated_by=self.user if i % 2 == 0 else None,
+                annotated_at=timezone.now() if i % 2 == 0 else None,
+            )
+            for i in range(5)
+        ]
+        Task.objects.bulk_create(tasks)
+        record_created_tasks(tasks)
+
+        counter, days = self._counter(), self._day_counts()
+        self.assertEqual(counter, (5, 3))
+        self.assertEqual(days, {(self.user.id, timezone.localdate()): 3})
+
+        rebuild_task_rollups()
+        self.assertEqual(self._counter(), counter)
+        self.assertEqual(self._day_counts(), days)
+
+
+class _WaitingPubSub:
+    """Async pub/sub stand-in whose get_message waits until a message is pushed."""
+
+    def __init__(self):
+        self.messages = asyncio.Queue()
+        self.closed = False
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        self.closed = True
+
+
+class JobEventsTest(BattycodaTestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+        self.other_user = User.objects.create_user(username="other", email="other@example.com", password="password123")
+        self.group = Group.objects.create(name="Test Group", description="A test group")
+        GroupMembership.objects.create(user=self.user, group=self.group, is_admin=False)
+        profile = UserProfile.objects.get(user=self.user)
+        profile.group = self.group
+        profile.save()
+
+        self.species = Species.objects.create(name="Test Species", group=self.group, created_by=self.user)
+        self.project = Project.objects.create(name="Test Project", group=self.group, created_by=self.user)
+
+        progress_bus._last_published.clear()
+        progress_bus._unavailable_until = 0.0
+        self.redis = MagicMock()
+        redis_patch = patch("battycoda_app.utils_modules.progress_bus.get_redis_client", return_value=self.redis)
+        redis_patch.start()
+        self.addCleanup(redis_patch.stop)
+
+    def _create_job(self, **kwargs):
+        return BatchUploadJob.objects.create(
+            name="upload",
+            wav_zip_path="/tmp/wavs.zip",
+            species=self.species,
+            project=self.project,
+            created_by=self.user,
+            group=self.group,
+            **kwargs,
+        )
+
+    def test_job_saves_publish_to_the_group_channel(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = self._create_job(status="in_progress", progress=10)
+
+        channel, payload = self.redis.publish.call_args[0]
+        self.assertEqual(channel, progress_bus.group_channel(self.group.id))
+        event = json.loads(payload)
+        self.assertEqual((event["type"], event["id"], event["progress"]), ("batch_upload", job.id, 10))
+        self.assertEqual(event["user_id"], self.user.id)
+
+    def test_progress_events_are_coalesced(self):
+        job = self._create_job(status="in_progress", progress=10)
+
+        self.assertTrue(progress_bus.publish_job(job))
+        job.progress = 20
+        self.assertFalse(progress_bus.publish_job(job))
+        job.status = "completed"
+        self.assertTrue(progress_bus.publish_job(job))
+        self.assertEqual(self.redis.publish.call_count, 2)
+
+    def test_publishing_backs_off_when_redis_is_down(self):
+        self.redis.publish.side_effect = RedisConnectionError("down")
+        self.assertFalse(progress_bus.publish_job_progress("clustering", 1, "in_progress", user_id=self.user.id))
+        self.assertFalse(progress_bus.publish_job_progress("clustering", 2, "in_progress", user_id=self.user.id))
+        self.assertEqual(self.redis.publish.call_count, 1)
+
+    def _message(self, **event):
+        return {"type": "message", "data": json.dumps(event).encode()}
+
+    def test_stream_forwards_visible_events(self):
+        pubsub = MagicMock()
+        pubsub.get_message.side_effect = [
+            self._message(type="clustering", id=1, status="in_progress", user_id=self.user.id),
+            self._message(type="clustering", id=2, status="in_progress", user_id=self.other_user.id),
+            self._message(type="training", id=3, status="in_progress", user_id=self.other_user.id),
+            None,
+            RedisConnectionError("closed"),
+        ]
+        self.client.login(username="testuser", password="password123")
+
+        with patch("battycoda_app.views_jobs.events.subscribe", return_value=pubsub) as mock_subscribe:
+            response = self.client.get(reverse("battycoda_app:job_events"), {"job": "training:3"})
+            body = b"".join(response.streaming_content).decode()
+
+        mock_subscribe.assert_called_once_with(self.user.id, self.group.id)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        events = [json.loads(line[len("data: ") :]) for line in body.splitlines() if line.startswith("data: ")]
+        self.assertEqual([(e["type"], e["id"]) for e in events], [("clustering", 1), ("training", 3)])
+        self.assertIn(": keep-alive", body)
+        pubsub.close.assert_called_once()
+
+    async def test_open_stream_does_not_block_other_requests(self):
+        """Test that an open ASGI stream waits on the event loop while other requests are served."""
+        pubsub = _WaitingPubSub()
+        await self.async_client.aforce_login(self.user)
+
+        with patch("battycoda_app.views_jobs.events.subscribe_async", AsyncMock(return_value=pubsub)):
+            response = await self.async_client.get(reverse("battycoda_app:job_events"))
+            stream = aiter(response.streaming_content)
+            self.assertIn(b"retry:", await anext(stream))
+            pending_event = asyncio.ensure_future(anext(stream))
+
+            for _ in range(3):
+                other = await asyncio.wait_for(
+                    self.async_client.get(reverse("battycoda_app:job_status_api")), timeout=5
+                )
+                self.assertEqual(other.status_code, 200)
+            self.assertFalse(pending_event.done())
+
+            await pubsub.messages.put(self._message(type="clustering", id=1, status="completed", user_id=self.user.id))
+            event = await asyncio.wait_for(pending_event, timeout=5)
+
+        self.assertIn(b'"clustering"', event)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+
+    def test_stream_unavailable_without_redis(self):
+        self.client.login(username="testuser", password="password123")
+        with patch("battycoda_app.views_jobs.events.subscribe", side_effect=RedisConnectionError("down")):
+            response = self.client.get(reverse("battycoda_app:job_events"))
+
+        self.assertEqual(response.status_code, 503)
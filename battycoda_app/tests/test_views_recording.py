@@ -128,6 +128,37 @@ class RecordingListViewTest(BattycodaTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context["selected_project_id"], self.project.id)
 
+    def test_duplicate_recordings_grouped_by_content(self):
+        """Renamed copies are found by content fingerprint, and recordings without one are ignored"""
+        self.client.login(username="testuser", password="password123")
+
+        def create(name, content_hash):
+            return Recording.objects.create(
+                name=name,
+                project=self.project,
+                species=self.species,
+                group=self.group,
+                created_by=self.user,
+                content_hash=content_hash,
+            )
+
+        older = create("Night 1", "a" * 64)
+        newer = create("Night 1 (copy)", "a" * 64)
+        create("Night 2", "b" * 64)
+        create("Not fingerprinted", "")
+        create("Not fingerprinted either", "")
+
+        response = self.client.get(self.recording_list_url)
+        self.assertTrue(response.context["has_duplicate_recordings"])
+
+        response = self.client.get(reverse("battycoda_app:detect_duplicate_recordings"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total_duplicate_count"], 1)
+        [duplicates] = response.context["duplicate_recordings"]
+        self.assertEqual(duplicates["count"], 2)
+        self.assertEqual(duplicates["name"], newer.name)
+        self.assertEqual([recording.id for recording in duplicates["recordings"]], [newer.id, older.id])
+
 
 class RecordingDetailViewTest(BattycodaTestCase):
     def setUp(self):
@@ -1,9 +1,16 @@
 """Tests for segmentation views"""
 
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import soundfile as sf
 from django.contrib.auth.models import User
-from django.test import Client
+from django.test import Client, override_settings
 from django.urls import reverse
 
+from battycoda_app.audio.modules.segmentation_preview import clear_segmentation_preview_cache
 from battycoda_app.models import Group, GroupMembership, Recording, Segmentation, UserProfile
 from battycoda_app.models.organization import Project, Species
 from battycoda_app.models.segmentation import Segment, SegmentationAlgorithm
@@ -151,6 +158,68 @@ class SegmentationDetailViewTest(BattycodaTestCase):
         response = self.client.get(self.segmentation_detail_url)
         self.assertEqual(response.status_code, 302)
 
+    def _create_segments(self, times):
+        for onset, offset in times:
+            Segment(
+                recording=self.recording,
+                segmentation=self.segmentation,
+                onset=onset,
+                offset=offset,
+                created_by=self.user,
+            ).save(manual_edit=False)
+
+    def test_segments_data_returns_columnar_arrays(self):
+        """Segments endpoint returns onset-ordered columns, filterable by time window"""
+        self._create_segments([(3.0, 3.5), (1.0, 1.5), (2.0, 2.5)])
+        self.client.login(username="testuser", password="password123")
+        url = reverse("battycoda_app:segmentation_segments_data", args=[self.segmentation.id])
+
+        data = self.client.get(url).json()
+        self.assertEqual(data["count"], 3)
+        self.assertEqual(data["onsets"], [1.0, 2.0, 3.0])
+        self.assertEqual(data["offsets"], [1.5, 2.5, 3.5])
+
+        window = self.client.get(url, {"start": 1.8, "end": 2.9}).json()
+        self.assertEqual(window["onsets"], [2.0])
+
+    def test_segments_data_binary_format(self):
+        import json
+        import struct
+
+        import numpy as np
+
+        self._create_segments([(1.0, 1.5), (2.0, 2.5)])
+        self.client.login(username="testuser", password="password123")
+        url = reverse("battycoda_app:segmentation_segments_data", args=[self.segmentation.id])
+
+        body = self.client.get(url, {"format": "binary"}).content
+        (meta_len,) = struct.unpack("<I", body[:4])
+        metadata = json.loads(body[4 : 4 + meta_len])
+        count = metadata["count"]
+        arrays = body[4 + meta_len :]
+        onsets = np.frombuffer(arrays[count * 8 : count * 16], dtype="<f8")
+        self.assertEqual(count, 2)
+        self.assertEqual(onsets.tolist(), [1.0, 2.0])
+
+    def test_segments_data_etag_revalidation(self):
+        """Unchanged segmentations return 304; any edit changes the ETag"""
+        self._create_segments([(1.0, 1.5)])
+        self.client.login(username="testuser", password="password123")
+        url = reverse("battycoda_app:segmentation_segments_data", args=[self.segmentation.id])
+
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        Segment.objects.filter(segmentation=self.segmentation).delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["count"], 0)
+
+    def test_segments_data_permission_denied(self):
+        self.client.login(username="testuser2", password="password123")
+        url = reverse("battycoda_app:segmentation_segments_data", args=[self.segmentation.id])
+        self.assertEqual(self.client.get(url).status_code, 403)
+
 
 class CreateSegmentationViewTest(BattycodaTestCase):
     def setUp(self):
@@ -344,3 +413,83 @@ class SegmentationBatchViewTest(BattycodaTestCase):
         """Unauthenticated users should be redirected"""
         response = self.client.get(self.batch_segmentation_url)
         self.assertEqual(response.status_code, 302)
+
+
+class SegmentationPreviewViewTest(BattycodaTestCase):
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username="testuser", email="test@example.com", password="password123")
+        self.group = Group.objects.create(name="Test Group", description="A test group")
+        GroupMembership.objects.create(user=self.user, group=self.group, is_admin=True)
+        profile = UserProfile.objects.get(user=self.user)
+        profile.group = self.group
+        profile.save()
+
+        self.species = Species.objects.create(name="Test Species", group=self.group, created_by=self.user)
+        self.project = Project.objects.create(name="Test Project", group=self.group, created_by=self.user)
+        self.algorithm = SegmentationAlgorithm.objects.create(name="Threshold", algorithm_type="threshold")
+
+        # One second of noise with a loud burst at 0.5s, stored under a temporary MEDIA_ROOT
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        clear_segmentation_preview_cache()
+        self.addCleanup(clear_segmentation_preview_cache)
+
+        samples = np.random.default_rng(0).normal(0, 0.01, 50000)
+        samples[25000:25500] += 0.8
+        os.makedirs(os.path.join(self.media_root, "recordings"))
+        sf.write(os.path.join(self.media_root, "recordings", "preview.wav"), samples, 50000)
+
+        self.recording = Recording.objects.create(
+            name="Test Recording",
+            project=self.project,
+            species=self.species,
+            group=self.group,
+            created_by=self.user,
+        )
+        Recording.objects.filter(id=self.recording.id).update(wav_file="recordings/preview.wav")
+
+        self.url = reverse("battycoda_app:segmentation_preview", kwargs={"recording_id": self.recording.id})
+        self.params = {
+            "algorithm": self.algorithm.id,
+            "start_time": "0.25",
+            "duration": "0.5",
+            "min_duration_ms": "1",
+            "smooth_window": "10",
+            "threshold_factor": "2",
+        }
+
+    def test_preview_returns_segments_without_creating_records(self):
+        self.client.login(username="testuser", password="password123")
+        recordings_before = Recording.all_objects.count()
+
+        response = self.client.post(self.url, self.params)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertEqual(len(data["onsets"]), 1)
+        self.assertAlmostEqual(data["onsets"][0], 0.5, places=2)
+        self.assertAlmostEqual(data["duration"], 0.5)
+        self.assertEqual(Recording.all_objects.count(), recordings_before)
+        self.assertFalse(Segmentation.objects.exists())
+
+        image = self.client.get(data["spectrogram_url"])
+        self.assertEqual(image.status_code, 200)
+        self.assertEqual(image["Content-Type"], "image/png")
+
+    def test_invalid_duration_is_rejected(self):
+        self.client.login(username="testuser", password="password123")
+        response = self.client.post(self.url, {**self.params, "duration": "60"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()["success"])
+
+    def test_preview_permission_denied(self):
+        User.objects.create_user(username="otheruser", email="other@example.com", password="password123")
+        self.client.login(username="otheruser", password="password123")
+
+        self.assertEqual(self.client.post(self.url, self.params).status_code, 403)
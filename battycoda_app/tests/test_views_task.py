@@ -189,6 +189,7 @@ class TaskViewsTest(BattycodaTestCase):
 
         with CaptureQueriesContext(connection) as ctx_small:
             response = self.client.get(export_url)
+            b"".join(response.streaming_content)
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "application/zip")
         baseline = len(ctx_small.captured_queries)
@@ -214,11 +215,242 @@ class TaskViewsTest(BattycodaTestCase):
 
         with CaptureQueriesContext(connection) as ctx_large:
             response = self.client.get(export_url)
+            b"".join(response.streaming_content)
         self.assertEqual(response.status_code, 200)
 
         # With select_related, adding 20 tasks must not add ~20 queries.
         self.assertEqual(len(ctx_large.captured_queries), baseline)
 
+    def _complete_batch(self):
+        Task.objects.filter(batch=self.batch).update(is_done=True, status="done", label="echo")
+
+    def _assert_export_archive(self, content):
+        import csv
+        import io
+        import zipfile
+
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIsNone(archive.testzip())
+            batch_csv = f"batch_{self.batch.id}_Test_Batch.csv"
+            self.assertEqual(sorted(archive.namelist()), sorted([batch_csv, "batch_summary.csv"]))
+
+            rows = list(csv.reader(io.StringIO(archive.read(batch_csv).decode())))
+            self.assertEqual(rows[0][0], "Task ID")
+            self.assertEqual([int(row[0]) for row in rows[1:]], [self.task.id, self.task2.id])
+            self.assertEqual({row[5] for row in rows[1:]}, {"echo"})
+
+            summary = list(csv.reader(io.StringIO(archive.read("batch_summary.csv").decode())))
+            self.assertEqual(summary[1][0], str(self.batch.id))
+            self.assertEqual(summary[1][5], "2")
+
+    def test_export_completed_batches_streams_valid_zip(self):
+        self.client.login(username="testuser", password="password123")
+        self._complete_batch()
+
+        response = self.client.get(reverse("battycoda_app:export_completed_batches"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self._assert_export_archive(b"".join(response.streaming_content))
+
+    def test_export_task_batch_as_parquet(self):
+        import io
+
+        import pyarrow.parquet as pq
+
+        self.client.login(username="testuser", password="password123")
+        self._complete_batch()
+
+        response = self.client.get(reverse("battycoda_app:export_task_batch", args=[self.batch.id]) + "?format=parquet")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/vnd.apache.parquet")
+
+        table = pq.read_table(io.BytesIO(b"".join(response.streaming_content)))
+        expected_ids = list(Task.objects.filter(batch=self.batch).order_by("id").values_list("id", flat=True))
+        self.assertEqual(table.column("task_id").to_pylist(), expected_ids)
+        self.assertEqual(set(table.column("label").to_pylist()), {"echo"})
+
+    def test_export_completed_batches_in_background(self):
+        import tempfile
+        from unittest.mock import patch
+
+        from django.test import override_settings
+
+        from battycoda_app.models import BatchExportJob, Notification
+        from battycoda_app.tasks import export_completed_batches_task
+
+        self.client.login(username="testuser", password="password123")
+        self._complete_batch()
+
+        with patch("battycoda_app.tasks.export_completed_batches_task.delay"):
+            response = self.client.post(reverse("battycoda_app:queue_completed_batches_export"))
+        self.assertEqual(response.status_code, 302)
+
+        job = BatchExportJob.objects.get(created_by=self.user)
+        self.assertEqual(job.batch_ids, [self.batch.id])
+
+        with tempfile.TemporaryDirectory() as export_dir, override_settings(BATCH_EXPORT_DIR=export_dir):
+            export_completed_batches_task.apply(args=[job.id])
+            job.refresh_from_db()
+            self.assertEqual(job.status, "completed")
+            self.assertEqual(job.progress, 100)
+
+            download_url = reverse("battycoda_app:download_batch_export", args=[job.id])
+            notification = Notification.objects.get(user=self.user, title="Batch Export Ready")
+            self.assertEqual(notification.link, download_url)
+
+            # Only the requester may download the archive
+            self.client.login(username="testuser2", password="password123")
+            self.assertEqual(self.client.get(download_url).status_code, 302)
+
+            self.client.login(username="testuser", password="password123")
+            response = self.client.get(download_url)
+            self.assertEqual(response.status_code, 200)
+            self._assert_export_archive(b"".join(response.streaming_content))
+
+    def test_prefetch_tasks_returns_next_tasks_with_render_urls(self):
+        self.client.login(username="testuser", password="password123")
+        url = reverse("battycoda_app:prefetch_tasks")
+
+        response = self.client.get(url, {"batch": self.batch.id, "count": 5, "exclude": str(self.task.id)})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data["success"])
+        self.assertFalse(data["warming"])
+        self.assertEqual([t["id"] for t in data["tasks"]], [self.task2.id])
+
+        entry = data["tasks"][0]
+        spectrogram_url = reverse("battycoda_app:task_spectrogram", args=[self.task2.id])
+        self.assertEqual(entry["spectrogram_urls"]["overview"], f"{spectrogram_url}?overview=1")
+        self.assertEqual(entry["annotate_url"], reverse("battycoda_app:annotate_task", args=[self.task2.id]))
+
+    def test_prefetch_tasks_skips_tasks_locked_by_others_and_warms(self):
+        from unittest.mock import patch
+
+        self.task.status = "in_progress"
+        self.task.in_progress_by = self.user2
+        self.task.in_progress_since = timezone.now()
+        self.task.save()
+
+        self.client.login(username="testuser", password="password123")
+        with patch("battycoda_app.tasks.warm_task_renders.delay") as mock_delay:
+            response = self.client.get(reverse("battycoda_app:prefetch_tasks"), {"warm": "1"})
+
+        data = response.json()
+        self.assertEqual([t["id"] for t in data["tasks"]], [self.task2.id])
+        self.assertTrue(data["warming"])
+        mock_delay.assert_called_once_with([self.task2.id], "roseus")
+
+    def test_next_task_from_batch_claims_task(self):
+        self.client.login(username="testuser", password="password123")
+        response = self.client.get(reverse("battycoda_app:annotate_batch", args=[self.batch.id]))
+        self.assertRedirects(
+            response, reverse("battycoda_app:annotate_task", args=[self.task.id]), fetch_redirect_response=False
+        )
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.status, "in_progress")
+        self.assertEqual(self.task.in_progress_by, self.user)
+        self.assertIsNotNone(self.task.in_progress_since)
+
+    def test_claim_next_gives_concurrent_annotators_different_tasks(self):
+        from datetime import timedelta
+
+        def group_member(username):
+            user = User.objects.get_or_create(username=username)[0]
+            user.profile.group = self.group
+            user.profile.save()
+            return user
+
+        annotator1, annotator2, annotator3 = group_member("testuser"), group_member("testuser2"), group_member("third")
+
+        first = Task.claim_next(Task.available_to(annotator1).filter(batch=self.batch), annotator1)
+        second = Task.claim_next(Task.available_to(annotator2).filter(batch=self.batch), annotator2)
+        self.assertEqual((first.id, second.id), (self.task.id, self.task2.id))
+
+        # Both tasks are claimed, so nothing is left for a third annotator until a claim goes stale
+        self.assertIsNone(Task.claim_next(Task.available_to(annotator3), annotator3))
+
+        Task.objects.filter(id=self.task.id).update(in_progress_since=timezone.now() - timedelta(hours=1))
+        self.assertEqual(Task.claim_next(Task.available_to(annotator3), annotator3).id, self.task.id)
+        self.assertEqual(Task.objects.get(id=self.task.id).in_progress_by, annotator3)
+
+    def test_prefetch_tasks_denies_foreign_batch(self):
+        self.client.login(username="testuser2", password="password123")
+        response = self.client.get(reverse("battycoda_app:prefetch_tasks"), {"batch": self.batch.id})
+        self.assertEqual(response.status_code, 403)
+
+    def _create_review_tasks(self):
+        """Label the two setUp tasks and add 5 classified tasks, for a batch of 7."""
+        self.task.label = "trill"
+        self.task.annotated_by = self.user
+        self.task.save()
+        self.task2.classification_result = "echo"
+        self.task2.label = "echo"
+        self.task2.save()
+        for i in range(5):
+            Task.objects.create(
+                wav_file_name="test.wav",
+                onset=10.0 + i,
+                offset=10.5 + i,
+                species=self.species,
+                project=self.project,
+                batch=self.batch,
+                created_by=self.user,
+                group=self.group,
+                classification_result="echo" if i % 2 == 0 else "",
+                confidence=0.9,
+            )
+
+    def test_batch_review_renders_first_page_with_label_counts(self):
+        from unittest.mock import patch
+
+        self._create_review_tasks()
+        self.client.login(username="testuser", password="password123")
+
+        with patch("battycoda_app.views_task_batch.REVIEW_PAGE_SIZE", 3):
+            response = self.client.get(reverse("battycoda_app:task_batch_review", args=[self.batch.id]))
+
+        self.assertEqual(response.status_code, 200)
+        cards = response.context["tasks_with_spectrograms"]
+        self.assertEqual([card["id"] for card in cards], sorted(Task.objects.values_list("id", flat=True))[:3])
+        self.assertEqual(cards[0]["display_label"], "trill")
+        self.assertEqual(cards[0]["annotated_by"], "testuser")
+        self.assertEqual(response.context["next_after"], cards[-1]["id"])
+        self.assertEqual(dict(response.context["call_type_options"]), {"all": 7, "echo": 4, "trill": 1})
+        self.assertEqual(response.context["selected_count"], 7)
+        self.assertContains(response, 'loading="lazy"')
+
+    def test_batch_review_tasks_endpoint_pages_by_keyset(self):
+        from unittest.mock import patch
+
+        self._create_review_tasks()
+        self.client.login(username="testuser", password="password123")
+        url = reverse("battycoda_app:task_batch_review_tasks", args=[self.batch.id])
+        echo_ids = list(
+            Task.objects.filter(batch=self.batch, classification_result="echo")
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+        seen = []
+        after = None
+        with patch("battycoda_app.views_task_batch.REVIEW_PAGE_SIZE", 3):
+            while True:
+                data = self.client.get(url, {"call_type": "echo", "after": after or ""}).json()
+                self.assertTrue(data["success"])
+                seen.extend(task["id"] for task in data["tasks"])
+                after = data["next_after"]
+                if after is None:
+                    break
+
+        self.assertEqual(seen, echo_ids)
+        self.assertEqual(len(seen), 4)
+
+    def test_batch_review_tasks_endpoint_denies_foreign_batch(self):
+        self.client.login(username="testuser2", password="password123")
+        response = self.client.get(reverse("battycoda_app:task_batch_review_tasks", args=[self.batch.id]))
+        self.assertEqual(response.status_code, 403)
+
 
 class SkipToNextBatchViewTest(BattycodaTestCase):
     """Tests for the skip_to_next_batch_view cycling behavior."""
@@ -0,0 +1,287 @@
+"""
+Parquet and Arrow exports of tasks, segments, classification results and cluster assignments.
+
+Each export is described by a schema and a stream of record batches. Rows are
+read from the database with chunked values_list() cursors and every chunk is
+converted to one Arrow record batch, so exports are streamed to the client
+while memory use stays flat regardless of the size of the table.
+"""
+
+from itertools import islice
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.db.models import F
+from django.http import StreamingHttpResponse
+
+from .task_export_utils import EXPORT_CHUNK_SIZE, StreamBuffer
+
+# Export format -> (content type, file extension)
+COLUMNAR_FORMATS = {
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.file", "arrow"),
+}
+
+TIMESTAMP = pa.timestamp("us", tz="UTC")
+
+# (column name, values_list lookup, Arrow type)
+TASK_COLUMNS = [
+    ("task_id", "id", pa.int64()),
+    ("onset", "onset", pa.float64()),
+    ("offset", "offset", pa.float64()),
+    ("duration", "duration", pa.float64()),
+    ("status", "status", pa.string()),
+    ("is_done", "is_done", pa.bool_()),
+    ("label", "label", pa.string()),
+    ("classification_result", "classification_result", pa.string()),
+    ("confidence", "confidence", pa.float64()),
+    ("notes", "notes", pa.string()),
+    ("wav_file", "wav_file_name", pa.string()),
+    ("species", "species__name", pa.string()),
+    ("project", "project__name", pa.string()),
+    ("created_by", "created_by__username", pa.string()),
+    ("annotated_by", "annotated_by__username", pa.string()),
+    ("created_at", "created_at", TIMESTAMP),
+    ("updated_at", "updated_at", TIMESTAMP),
+    ("annotated_at", "annotated_at", TIMESTAMP),
+]
+
+SEGMENT_COLUMNS = [
+    ("segment_id", "id", pa.int64()),
+    ("name", "name", pa.string()),
+    ("onset", "onset", pa.float64()),
+    ("offset", "offset", pa.float64()),
+    ("duration", "duration", pa.float64()),
+    ("notes", "notes", pa.string()),
+]
+
+CLASSIFICATION_RESULT_COLUMNS = [
+    ("result_id", "id", pa.int64()),
+    ("segment_id", "segment_id", pa.int64()),
+    ("onset", "segment__onset", pa.float64()),
+    ("offset", "segment__offset", pa.float64()),
+]
+
+CLUSTER_ASSIGNMENT_COLUMNS = [
+    ("segment_id", "segment_id", pa.int64()),
+    ("recording_id", "segment__segmentation__recording_id", pa.int64()),
+    ("recording_name", "segment__segmentation__recording__name", pa.string()),
+    ("onset", "segment__onset", pa.float64()),
+    ("offset", "segment__offset", pa.float64()),
+    ("cluster_id", "cluster__cluster_id", pa.int64()),
+    ("cluster_label", "cluster__label", pa.string()),
+    ("confidence", "confidence", pa.float64()),
+    ("distance_to_center", "distance_to_center", pa.float64()),
+]
+
+
+def parse_columnar_format(value):
+    """Return the export format named by value, defaulting to Parquet.
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    export_format = (value or "parquet").lower()
+    if export_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unsupported export format '{value}'. Use one of: {', '.join(COLUMNAR_FORMATS)}")
+    return export_format
+
+
+def _chunks(rows, chunk_size):
+    """Split an iterator of rows into lists of at most chunk_size rows."""
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _schema(columns):
+    return pa.schema([(name, arrow_type) for name, _, arrow_type in columns])
+
+
+def _record_batches(queryset, columns, chunk_size):
+    """Yield one record batch per chunk of values_list rows of queryset."""
+    schema = _schema(columns)
+    rows = queryset.values_list(*[lookup for _, lookup, _ in columns]).iterator(chunk_size=chunk_size)
+    for chunk in _chunks(rows, chunk_size):
+        arrays = [
+            pa.array(values, type=field.type) for values, field in zip(zip(*chunk, strict=True), schema, strict=True)
+        ]
+        yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def task_batch_table(batch, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Describe the columnar export of the tasks in a batch.
+
+    Returns:
+        tuple: (pyarrow.Schema, iterator of pyarrow.RecordBatch)
+    """
+    from ..models.task import Task
+
+    tasks = Task.objects.filter(batch=batch).annotate(duration=F("offset") - F("onset")).order_by("id")
+    return _schema(TASK_COLUMNS), _record_batches(tasks, TASK_COLUMNS, chunk_size)
+
+
+def segmentation_table(segmentation, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Describe the columnar export of the segments of a segmentation, ordered by onset.
+
+    Returns:
+        tuple: (pyarrow.Schema, iterator of pyarrow.RecordBatch)
+    """
+    from ..models.segmentation import Segment
+
+    segments = (
+        Segment.objects.filter(segmentation=segmentation)
+        .annotate(duration=F("offset") - F("onset"))
+        .order_by("onset", "id")
+    )
+    return _schema(SEGMENT_COLUMNS), _record_batches(segments, SEGMENT_COLUMNS, chunk_size)
+
+
+def cluster_assignments_table(clustering_run, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Describe the columnar export of the segment-to-cluster assignments of a clustering run.
+
+    Returns:
+        tuple: (pyarrow.Schema, iterator of pyarrow.RecordBatch)
+    """
+    from ..models.clustering import SegmentCluster
+
+    assignments = SegmentCluster.objects.filter(cluster__clustering_run=clustering_run).order_by("segment_id")
+    return _schema(CLUSTER_ASSIGNMENT_COLUMNS), _record_batches(assignments, CLUSTER_ASSIGNMENT_COLUMNS, chunk_size)
+
+
+def classification_results_table(run, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Describe the columnar export of a classification run with its full probability vectors.
+
+    Every call type of the recording's species gets a ``prob_<short_name>`` column;
+    probabilities missing for a result (call types added after the run) are null.
+    The top call and its probability are derived from the vector.
+
+    Returns:
+        tuple: (pyarrow.Schema, iterator of pyarrow.RecordBatch)
+    """
+    from ..models.classification import CallProbability, ClassificationResult
+    from ..models.organization import Call
+
+    calls = list(
+        Call.objects.filter(species=run.segmentation.recording.species)
+        .order_by("short_name")
+        .values_list("id", "short_name")
+    )
+    call_columns = {call_id: index for index, (call_id, _) in enumerate(calls)}
+    call_names = np.array([short_name for _, short_name in calls], dtype=object)
+
+    schema = pa.schema(
+        [(name, arrow_type) for name, _, arrow_type in CLASSIFICATION_RESULT_COLUMNS]
+        + [("top_call", pa.string()), ("top_probability", pa.float64())]
+        + [(f"prob_{short_name}", pa.float64()) for _, short_name in calls]
+    )
+
+    def batches():
+        results = (
+            ClassificationResult.objects.filter(classification_run=run)
+            .order_by("segment__onset", "id")
+            .values_list(*[lookup for _, lookup, _ in CLASSIFICATION_RESULT_COLUMNS])
+            .iterator(chunk_size=chunk_size)
+        )
+        for chunk in _chunks(results, chunk_size):
+            result_ids, segment_ids, onsets, offsets = zip(*chunk, strict=True)
+            rows = {result_id: row for row, result_id in enumerate(result_ids)}
+
+            # One query per chunk fills the probability matrix; NaN marks missing values
+            probabilities = np.full((len(chunk), len(calls)), np.nan)
+            probability_rows = CallProbability.objects.filter(classification_result_id__in=result_ids).values_list(
+                "classification_result_id", "call_id", "probability"
+            )
+            for result_id, call_id, probability in probability_rows:
+                column = call_columns.get(call_id)
+                if column is not None:
+                    probabilities[rows[result_id], column] = probability
+
+            top_calls = [None] * len(chunk)
+            top_probabilities = np.full(len(chunk), np.nan)
+            if calls:
+                has_any = ~np.isnan(probabilities).all(axis=1)
+                best = np.argmax(np.where(np.isnan(probabilities), -np.inf, probabilities), axis=1)
+                top_calls = np.where(has_any, call_names[best], None).tolist()
+                top_probabilities[has_any] = probabilities[has_any, best[has_any]]
+
+            arrays = [
+                pa.array(result_ids, type=pa.int64()),
+                pa.array(segment_ids, type=pa.int64()),
+                pa.array(onsets, type=pa.float64()),
+                pa.array(offsets, type=pa.float64()),
+                pa.array(top_calls, type=pa.string()),
+                pa.array(top_probabilities, type=pa.float64(), from_pandas=True),
+            ] + [
+                pa.array(probabilities[:, column], type=pa.float64(), from_pandas=True) for column in range(len(calls))
+            ]
+            yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    return schema, batches()
+
+
+def write_columnar(fileobj, export_format, schema, record_batches):
+    """
+    Write record batches to fileobj as a Parquet or Arrow IPC file.
+
+    This is a generator that yields after every record batch, like
+    write_batches_zip(), so callers can forward what has been written so far.
+    The file footer is written once the generator is exhausted.
+
+    Args:
+        fileobj: Binary file object to write to; it only needs write() and tell()
+        export_format: "parquet" or "arrow"
+        schema: pyarrow.Schema of the batches
+        record_batches: Iterable of pyarrow.RecordBatch
+    """
+    if export_format == "parquet":
+        writer = pq.ParquetWriter(fileobj, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(fileobj, schema)
+
+    with writer:
+        for record_batch in record_batches:
+            writer.write_batch(record_batch)
+            yield
+
+
+def stream_columnar(export_format, schema, record_batches):
+    """Yield the bytes of a Parquet or Arrow IPC file as it is written."""
+    buffer = StreamBuffer()
+    for _ in write_columnar(buffer, export_format, schema, record_batches):
+        data = buffer.drain()
+        if data:
+            yield data
+
+    data = buffer.drain()
+    if data:
+        yield data
+
+
+def columnar_export_filename(base_name, export_format):
+    """Return a download filename with the extension of export_format."""
+    safe_name = "".join(c if c.isalnum() or c in ["-", "_"] else "_" for c in base_name)
+    return f"{safe_name}.{COLUMNAR_FORMATS[export_format][1]}"
+
+
+def columnar_export_response(export_format, table, base_name):
+    """
+    Build a streaming download response for a columnar export.
+
+    Args:
+        export_format: "parquet" or "arrow"
+        table: (schema, record batches) pair as returned by the *_table() functions
+        base_name: Filename without extension
+    """
+    schema, record_batches = table
+    content_type, _ = COLUMNAR_FORMATS[export_format]
+    response = StreamingHttpResponse(stream_columnar(export_format, schema, record_batches), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{columnar_export_filename(base_name, export_format)}"'
+    return response
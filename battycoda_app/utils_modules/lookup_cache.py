@@ -0,0 +1,141 @@
+"""
+Cached lookups for data that views read on nearly every request but that rarely changes.
+
+Entries live in the shared cache (settings.CACHES) and are grouped in
+namespaces. Model save and delete signals (see signals.py) invalidate a whole
+namespace by giving it a new version, which retires every key in it without
+tracking what was cached under it. If the cache is unreachable, lookups fall
+back to querying the database.
+"""
+
+import logging
+import uuid
+
+from django.core.cache import cache
+from django.db import models, transaction
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+# Seconds a lookup stays cached when nothing invalidates it
+LOOKUP_CACHE_TIMEOUT = 600
+
+# Namespaces, with the models whose changes invalidate them (wired up in signals.py)
+GROUP_ADMINS = "group_admins"  # GroupMembership
+SPECIES_CALLS = "species_calls"  # Call
+CLASSIFIERS = "classifiers"  # Classifier
+CLUSTERING_ALGORITHMS = "clustering_algorithms"  # ClusteringAlgorithm
+
+
+def _version_key(namespace):
+    return f"lookup:{namespace}:version"
+
+
+def _namespace_version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), uuid.uuid4().hex, None)
+        version = cache.get(_version_key(namespace))
+    return version
+
+
+def cached_lookup(namespace, key, compute, timeout=LOOKUP_CACHE_TIMEOUT):
+    """
+    Return a cached lookup, computing and caching it on a miss.
+
+    Args:
+        namespace: Namespace of the lookup, invalidated as a whole
+        key: Key of the lookup within the namespace
+        compute: Function returning the value; must not return None
+        timeout: Seconds to keep the value
+
+    Returns:
+        The cached or computed value
+    """
+    try:
+        full_key = f"lookup:{namespace}:{_namespace_version(namespace)}:{key}"
+        value = cache.get(full_key)
+    except RedisError as e:
+        logger.warning(f"Lookup cache unavailable, querying {namespace} directly: {e}")
+        return compute()
+
+    if value is None:
+        value = compute()
+        try:
+            cache.set(full_key, value, timeout)
+        except RedisError as e:
+            logger.warning(f"Could not cache {namespace} lookup: {e}")
+    return value
+
+
+def _bump_version(namespace):
+    try:
+        cache.set(_version_key(namespace), uuid.uuid4().hex, None)
+    except RedisError as e:
+        logger.warning(f"Could not invalidate {namespace} lookups: {e}")
+
+
+def invalidate_lookups(namespace):
+    """
+    Drop every cached lookup of a namespace.
+
+    The namespace is invalidated right away and again once the current
+    transaction commits, since a concurrent request may re-cache the old rows
+    in between.
+    """
+    _bump_version(namespace)
+    transaction.on_commit(lambda: _bump_version(namespace))
+
+
+def is_group_admin(user_id, group_id):
+    """Return whether a user is an admin of a group."""
+    from ..models.user import GroupMembership
+
+    return cached_lookup(
+        GROUP_ADMINS,
+        f"{user_id}:{group_id}",
+        lambda: GroupMembership.objects.filter(user_id=user_id, group_id=group_id, is_admin=True).exists(),
+    )
+
+
+def get_species_calls(species_id):
+    """
+    Return the call types of a species.
+
+    Returns:
+        list: (short_name, long_name) tuples, ordered by short name
+    """
+    from ..models.organization import Call
+
+    return cached_lookup(
+        SPECIES_CALLS,
+        species_id,
+        lambda: list(Call.objects.filter(species_id=species_id).values_list("short_name", "long_name")),
+    )
+
+
+def get_available_classifiers(group_id, species_id):
+    """
+    Return the active classifiers usable for a species.
+
+    These are the classifiers of the group (if any) and the global ones, that
+    are either for the species or species-independent.
+
+    Returns:
+        list: Classifier instances, ordered by name
+    """
+    from ..models.classification import Classifier
+
+    def compute():
+        group_filter = models.Q(group__isnull=True)
+        if group_id:
+            group_filter |= models.Q(group_id=group_id)
+        return list(
+            Classifier.objects.filter(is_active=True)
+            .filter(group_filter)
+            .select_related("species")
+            .filter(models.Q(species_id=species_id) | models.Q(species__isnull=True))
+            .order_by("name")
+        )
+
+    return cached_lookup(CLASSIFIERS, f"{group_id}:{species_id}", compute)
@@ -0,0 +1,210 @@
+"""
+Progress bus for background jobs.
+
+Workers publish job progress to Redis pub/sub and the job events view streams
+it to the browser as Server-Sent Events, so pages showing a running job don't
+have to poll the status views. In production the stream is served by the ASGI
+application (subscribe_async), so open streams don't hold web server threads. Events are published to the channel of the
+job's group (or of its creator when it has no group).
+
+Publishing is best effort: if Redis is unreachable the event is dropped and
+pages fall back to polling the status views.
+"""
+
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "battycoda:progress"
+
+# Minimum time between two events for the same job with the same status;
+# status changes are always published
+PUBLISH_MIN_INTERVAL = 1.0
+
+# After a Redis connection error, publishing is skipped for this many seconds
+# so that a worker isn't slowed down on every progress update
+RETRY_AFTER_ERROR = 30.0
+
+# Job types, as used by the job status and cancel views, for each job model
+JOB_TYPES = {
+    "Segmentation": "segmentation",
+    "ClassificationRun": "classification",
+    "ClassifierTrainingJob": "training",
+    "ClusteringRun": "clustering",
+    "SpectrogramJob": "spectrogram",
+    "BatchUploadJob": "batch_upload",
+    "BatchExportJob": "batch_export",
+}
+
+# Statuses after which a job publishes no more events
+FINISHED_STATUSES = {"completed", "failed", "cancelled"}
+
+_client = None
+_client_lock = threading.Lock()
+_last_published = {}
+_unavailable_until = 0.0
+
+
+def get_redis_client():
+    """Return the shared Redis client for the progress bus."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import redis
+
+            _client = redis.Redis.from_url(
+                settings.PROGRESS_BUS_URL, socket_connect_timeout=2, socket_timeout=5, health_check_interval=30
+            )
+        return _client
+
+
+def user_channel(user_id):
+    return f"{CHANNEL_PREFIX}:user:{user_id}"
+
+
+def group_channel(group_id):
+    return f"{CHANNEL_PREFIX}:group:{group_id}"
+
+
+def _should_publish(key, status, progress, force):
+    """Coalesce events per job: drop updates that arrive within PUBLISH_MIN_INTERVAL of the last one."""
+    if status in FINISHED_STATUSES:
+        _last_published.pop(key, None)
+        return True
+
+    now = time.monotonic()
+    last = _last_published.get(key)
+    if not force and last is not None and last[1] == status and progress != 100:
+        if now - last[0] < PUBLISH_MIN_INTERVAL:
+            return False
+    _last_published[key] = (now, status)
+    return True
+
+
+def _publish(event):
+    """Send an event to the channel of its job's group, or of its creator."""
+    global _unavailable_until
+
+    if time.monotonic() < _unavailable_until:
+        return False
+
+    from redis.exceptions import RedisError
+
+    channel = group_channel(event["group_id"]) if event["group_id"] else user_channel(event["user_id"])
+    try:
+        get_redis_client().publish(channel, json.dumps(event))
+    except RedisError as e:
+        _unavailable_until = time.monotonic() + RETRY_AFTER_ERROR
+        logger.warning(f"Could not publish progress for {event['type']} {event['id']}: {e}")
+        return False
+    return True
+
+
+def publish_job_progress(
+    job_type, job_id, status, progress=None, message=None, name=None, user_id=None, group_id=None, force=False
+):
+    """
+    Publish a progress event for a job.
+
+    Args:
+        job_type: Job type ("segmentation", "classification", "training", ...)
+        job_id: ID of the job
+        status: Current job status
+        progress: Progress percentage (optional)
+        message: Progress message (optional)
+        name: Display name of the job (optional)
+        user_id: ID of the user who created the job
+        group_id: ID of the job's group (optional)
+        force: Publish even if an event for this job was published very recently
+
+    Returns:
+        bool: True if the event was published
+    """
+    if not _should_publish((job_type, job_id), status, progress, force):
+        return False
+
+    return _publish(
+        {
+            "type": job_type,
+            "id": job_id,
+            "status": status,
+            "progress": progress,
+            "message": message,
+            "name": name,
+            "user_id": user_id,
+            "group_id": group_id,
+        }
+    )
+
+
+def publish_job(job, force=False):
+    """Publish the current status and progress of a job model instance."""
+    job_type = JOB_TYPES[type(job).__name__]
+    if not _should_publish((job_type, job.id), job.status, job.progress, force):
+        return False
+
+    # Segmentations belong to the group of their recording
+    group_id = job.recording.group_id if job_type == "segmentation" else job.group_id
+
+    return _publish(
+        {
+            "type": job_type,
+            "id": job.id,
+            "status": job.status,
+            "progress": job.progress,
+            "message": getattr(job, "progress_message", None) or None,
+            "name": job.name,
+            "user_id": job.created_by_id,
+            "group_id": group_id,
+        }
+    )
+
+
+def subscribe(user_id, group_id=None):
+    """
+    Subscribe to the progress events visible to a user.
+
+    Returns:
+        redis.client.PubSub subscribed to the user's channel and, if given, the group's channel
+
+    Raises:
+        redis.exceptions.RedisError: If Redis is unreachable
+    """
+    pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+    channels = [user_channel(user_id)]
+    if group_id:
+        channels.append(group_channel(group_id))
+    pubsub.subscribe(*channels)
+    return pubsub
+
+
+async def subscribe_async(user_id, group_id=None):
+    """
+    Subscribe to the progress events visible to a user, for the async job events stream.
+
+    Each subscription has its own connection, closed with the returned PubSub's aclose().
+
+    Returns:
+        redis.asyncio.client.PubSub subscribed to the user's channel and, if given, the group's channel
+
+    Raises:
+        redis.exceptions.RedisError: If Redis is unreachable
+    """
+    import redis.asyncio
+
+    client = redis.asyncio.Redis.from_url(settings.PROGRESS_BUS_URL, socket_connect_timeout=2)
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    channels = [user_channel(user_id)]
+    if group_id:
+        channels.append(group_channel(group_id))
+    try:
+        await pubsub.subscribe(*channels)
+    except Exception:
+        await pubsub.aclose()
+        raise
+    return pubsub
@@ -0,0 +1,175 @@
+"""
+Throttled progress reporting for background jobs.
+
+Workers report progress far more often than anyone needs it stored: once per
+batch, per chunk or per segment. A ProgressReporter keeps every update in the
+cache and on the progress bus, but only writes a job's progress to the
+database when it has moved by PROGRESS_WRITE_DELTA points and at least
+PROGRESS_WRITE_INTERVAL seconds have passed (or PROGRESS_WRITE_MAX_INTERVAL
+seconds, whatever the change). Status changes are always written straight
+away, with update_fields so the worker never overwrites other columns.
+
+Status views call apply_live_progress() to show the cached progress of a job
+instead of the last value written to the database.
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+
+from .progress_bus import FINISHED_STATUSES, JOB_TYPES, publish_job
+
+logger = logging.getLogger(__name__)
+
+# Minimum time between two progress writes of a job, in seconds
+PROGRESS_WRITE_INTERVAL = 5.0
+
+# Minimum progress change, in percentage points, for a write
+PROGRESS_WRITE_DELTA = 5.0
+
+# After this many seconds any change is written, however small
+PROGRESS_WRITE_MAX_INTERVAL = 30.0
+
+# How long cached progress outlives the last update, in seconds
+PROGRESS_CACHE_TIMEOUT = 3600
+
+
+def progress_cache_key(job_type, job_id):
+    return f"job_progress:{job_type}:{job_id}"
+
+
+class ProgressReporter:
+    """
+    Report the progress of one job model instance.
+
+    The instance's status, progress and message fields are always kept up to
+    date; only the database writes are throttled.
+
+    Args:
+        job: Job model instance, as last read from or written to the database
+        message_field: Name of the field holding the progress message, or None
+    """
+
+    def __init__(self, job, message_field="progress_message"):
+        self.job = job
+        self.job_type = JOB_TYPES[type(job).__name__]
+        self.message_field = message_field
+        self._fields = ["status", "progress"] + ([message_field] if message_field else [])
+        self._written = self._snapshot()
+        self._written_at = time.monotonic()
+
+    @classmethod
+    def for_job(cls, job, message_field="progress_message"):
+        """Return the reporter attached to a job instance, creating it on first use."""
+        reporter = job.__dict__.get("_progress_reporter")
+        if reporter is None:
+            reporter = cls(job, message_field=message_field)
+            job.__dict__["_progress_reporter"] = reporter
+        return reporter
+
+    def _snapshot(self):
+        return {field: getattr(self.job, field) for field in self._fields}
+
+    def _should_write(self, changed, force):
+        if force or "status" in changed or self.job.status in FINISHED_STATUSES:
+            return True
+        if self.job.progress is not None and self.job.progress >= 100:
+            return True
+
+        elapsed = time.monotonic() - self._written_at
+        if elapsed < PROGRESS_WRITE_INTERVAL:
+            return False
+        progress_delta = abs((self.job.progress or 0) - (self._written["progress"] or 0))
+        return progress_delta >= PROGRESS_WRITE_DELTA or elapsed >= PROGRESS_WRITE_MAX_INTERVAL
+
+    def update(self, progress=None, status=None, message=None, force=False):
+        """
+        Report a job's progress.
+
+        Args:
+            progress: Progress percentage (optional)
+            status: New job status (optional); a change is written immediately
+            message: Progress message (optional)
+            force: Write to the database regardless of the throttle
+
+        Returns:
+            bool: True if the update was written to the database
+        """
+        if progress is not None:
+            self.job.progress = progress
+        if status:
+            self.job.status = status
+        if message and self.message_field:
+            setattr(self.job, self.message_field, message)
+
+        current = self._snapshot()
+        changed = [field for field in self._fields if current[field] != self._written[field]]
+        if not changed and not force:
+            return False
+
+        if not self._should_write(changed, force):
+            # Readers and the progress bus see every update; the database doesn't
+            self._cache(current)
+            publish_job(self.job)
+            return False
+
+        if hasattr(self.job, "updated_at"):
+            changed.append("updated_at")
+        self.job.save(update_fields=changed)
+        self._written = current
+        self._written_at = time.monotonic()
+        if self.job.status in FINISHED_STATUSES:
+            self._uncache()
+        else:
+            self._cache(current)
+        return True
+
+    def flush(self):
+        """Write any progress still held back by the throttle."""
+        return self.update(force=True)
+
+    def _cache(self, snapshot):
+        entry = {
+            "status": snapshot["status"],
+            "progress": snapshot["progress"],
+            "message": snapshot.get(self.message_field) if self.message_field else None,
+        }
+        try:
+            cache.set(progress_cache_key(self.job_type, self.job.pk), entry, PROGRESS_CACHE_TIMEOUT)
+        except Exception as e:
+            # Progress is best effort; a cache outage must not fail the job
+            logger.debug(f"Could not cache progress for {self.job_type} {self.job.pk}: {e}")
+
+    def _uncache(self):
+        try:
+            cache.delete(progress_cache_key(self.job_type, self.job.pk))
+        except Exception as e:
+            logger.debug(f"Could not clear cached progress for {self.job_type} {self.job.pk}: {e}")
+
+
+def apply_live_progress(*jobs):
+    """
+    Replace the stored progress of job instances with their cached, more recent progress.
+
+    Cached progress is ignored once a job's stored status differs from the
+    cached one, e.g. after the job was cancelled or finished.
+
+    Returns:
+        The first job, for convenience when a single job is passed
+    """
+    keys = {progress_cache_key(JOB_TYPES[type(job).__name__], job.pk): job for job in jobs}
+    try:
+        cached = cache.get_many(list(keys))
+    except Exception as e:
+        logger.debug(f"Could not read cached job progress: {e}")
+        cached = {}
+
+    for key, entry in cached.items():
+        job = keys[key]
+        if entry["status"] != job.status or job.status in FINISHED_STATUSES:
+            continue
+        job.progress = entry["progress"]
+        if entry["message"] and hasattr(job, "progress_message"):
+            job.progress_message = entry["message"]
+    return jobs[0] if jobs else None
@@ -2,9 +2,12 @@
 Utility functions for working with recordings.
 """
 
+import logging
+
 from django.db import transaction
 
 # Set up logging
+logger = logging.getLogger(__name__)
 
 
 def create_recording_from_batch(batch, onsets=None, offsets=None, pickle_file=None):
@@ -117,3 +120,131 @@ def _create_segments_for_recording(recording, onsets, offsets, user):
             segments_created += 1
 
     return segments_created
+
+
+def fingerprint_recording(recording, full=True):
+    """Compute and store the content fingerprints of a recording's audio file
+
+    Args:
+        recording: The Recording object to fingerprint
+        full: Also compute the full content hash (False stores only the quick hash)
+
+    Returns:
+        bool: True if the fingerprints were stored, False if the file could not be read
+    """
+    from battycoda_app.audio.modules.file_utils import AudioFingerprintError, audio_fingerprint
+
+    try:
+        quick_hash, content_hash = audio_fingerprint(recording.wav_file.path, full=full)
+    except (AudioFingerprintError, ValueError) as e:
+        logger.warning(f"Could not fingerprint recording {recording.id}: {e}")
+        return False
+
+    recording.quick_hash = quick_hash
+    update_fields = ["quick_hash"]
+    if content_hash:
+        recording.content_hash = content_hash
+        update_fields.append("content_hash")
+    recording.save(update_fields=update_fields)
+    return True
+
+
+def find_duplicate_recording(audio_file_path, group, user):
+    """Look for an existing recording with the same audio content as an uploaded file
+
+    The quick hash of the file is compared first, through an index; the full
+    content hash is only computed when a recording with the same quick hash
+    exists, so unique uploads cost two small reads. Recordings are compared
+    within the uploader's group, or among the user's own recordings without one.
+
+    Args:
+        audio_file_path: Path to the uploaded audio file
+        group: Group the recording will belong to (may be None)
+        user: User uploading the recording
+
+    Returns:
+        tuple: (duplicate, fingerprint) - the most recent matching Recording or None,
+               and a dict of the hashes computed so far, to store on the new recording.
+               Both are empty if the file cannot be read as audio.
+    """
+    from battycoda_app.audio.modules.file_utils import AudioFingerprintError, audio_fingerprint
+    from battycoda_app.models import Recording
+
+    try:
+        quick_hash, _ = audio_fingerprint(audio_file_path, full=False)
+    except AudioFingerprintError as e:
+        logger.debug(f"Skipping duplicate check for unreadable upload: {e}")
+        return None, {}
+
+    if group:
+        recordings = Recording.objects.filter(group=group)
+    else:
+        recordings = Recording.objects.filter(group__isnull=True, created_by=user)
+    candidates = list(recordings.filter(quick_hash=quick_hash).order_by("-created_at"))
+    if not candidates:
+        return None, {"quick_hash": quick_hash}
+
+    try:
+        _, content_hash = audio_fingerprint(audio_file_path)
+    except AudioFingerprintError as e:
+        logger.debug(f"Skipping duplicate check for unreadable upload: {e}")
+        return None, {"quick_hash": quick_hash}
+
+    for candidate in candidates:
+        # Candidates uploaded moments ago may not have their full hash computed yet
+        if not candidate.content_hash:
+            fingerprint_recording(candidate)
+        if candidate.content_hash == content_hash:
+            return candidate, {"quick_hash": quick_hash, "content_hash": content_hash}
+
+    return None, {"quick_hash": quick_hash, "content_hash": content_hash}
+
+
+def _duplicated_content_hashes(group):
+    """Query of the content hashes shared by more than one recording in a group"""
+    from django.db.models import Count
+
+    from battycoda_app.models import Recording
+
+    return (
+        Recording.objects.filter(group=group)
+        .exclude(content_hash="")
+        .values("content_hash")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values("content_hash")
+    )
+
+
+def has_duplicate_recordings(group):
+    """Check if any two recordings in a group have the same audio content"""
+    return _duplicated_content_hashes(group).exists()
+
+
+def get_duplicate_recording_groups(group):
+    """Find the recordings of a group that share their audio content with another recording
+
+    Recordings are matched by content fingerprint, so renamed copies are found too.
+    All duplicates are fetched in a single query, annotated with segment_count.
+
+    Args:
+        group: The Group to search
+
+    Returns:
+        list: Lists of Recording objects with identical audio, most recent first,
+              ordered by their most recent recording
+    """
+    from itertools import groupby
+
+    from django.db.models import Count
+
+    from battycoda_app.models import Recording
+
+    recordings = (
+        Recording.objects.filter(group=group, content_hash__in=_duplicated_content_hashes(group))
+        .annotate(segment_count=Count("segments"))
+        .order_by("content_hash", "-created_at")
+    )
+    duplicate_groups = [list(same) for _, same in groupby(recordings, key=lambda recording: recording.content_hash)]
+    duplicate_groups.sort(key=lambda same: same[0].created_at, reverse=True)
+    return duplicate_groups
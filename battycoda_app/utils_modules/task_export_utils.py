@@ -3,8 +3,67 @@ Utility functions for exporting task data.
 """
 
 import csv
+import io
+import zipfile
 from io import StringIO
 
+# Number of task rows fetched per database round trip when streaming exports
+EXPORT_CHUNK_SIZE = 2000
+
+TASK_CSV_HEADER = [
+    "Task ID",
+    "Onset (s)",
+    "Offset (s)",
+    "Duration (s)",
+    "Status",
+    "Label",
+    "Classification Result",
+    "Confidence",
+    "Notes",
+    "WAV File",
+    "Species",
+    "Project",
+    "Created By",
+    "Annotated By",
+    "Created At",
+    "Updated At",
+    "Annotated At",
+]
+
+BATCH_SUMMARY_CSV_HEADER = [
+    "Batch ID",
+    "Batch Name",
+    "WAV File",
+    "Species",
+    "Project",
+    "Tasks Count",
+    "Created By",
+    "Created At",
+]
+
+
+def task_csv_row(task):
+    """Return the CSV row for a task, matching TASK_CSV_HEADER."""
+    return [
+        task.id,
+        task.onset,
+        task.offset,
+        task.offset - task.onset,
+        task.status,
+        "" if task.status == "pending" else task.label if task.label else "",
+        task.classification_result if task.classification_result else "",
+        task.confidence if task.confidence is not None else "",
+        task.notes.replace("\n", " ").replace("\r", "") if task.notes else "",
+        task.wav_file_name,
+        task.species.name,
+        task.project.name,
+        task.created_by.username,
+        task.annotated_by.username if task.annotated_by else "",
+        task.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        task.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
+        task.annotated_at.strftime("%Y-%m-%d %H:%M:%S") if task.annotated_at else "",
+    ]
+
 
 def generate_tasks_csv(tasks):
     """
@@ -20,52 +79,119 @@ def generate_tasks_csv(tasks):
     output = StringIO()
     writer = csv.writer(output)
 
-    # Write header row
-    writer.writerow(
-        [
-            "Task ID",
-            "Onset (s)",
-            "Offset (s)",
-            "Duration (s)",
-            "Status",
-            "Label",
-            "Classification Result",
-            "Confidence",
-            "Notes",
-            "WAV File",
-            "Species",
-            "Project",
-            "Created By",
-            "Annotated By",
-            "Created At",
-            "Updated At",
-            "Annotated At",
-        ]
-    )
-
-    # Write data rows
+    writer.writerow(TASK_CSV_HEADER)
     for task in tasks:
-        writer.writerow(
-            [
-                task.id,
-                task.onset,
-                task.offset,
-                task.offset - task.onset,
-                task.status,
-                "" if task.status == "pending" else task.label if task.label else "",
-                task.classification_result if task.classification_result else "",
-                task.confidence if task.confidence is not None else "",
-                task.notes.replace("\n", " ").replace("\r", "") if task.notes else "",
-                task.wav_file_name,
-                task.species.name,
-                task.project.name,
-                task.created_by.username,
-                task.annotated_by.username if task.annotated_by else "",
-                task.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                task.updated_at.strftime("%Y-%m-%d %H:%M:%S"),
-                task.annotated_at.strftime("%Y-%m-%d %H:%M:%S") if task.annotated_at else "",
-            ]
-        )
+        writer.writerow(task_csv_row(task))
 
     # Return the CSV content
     return output.getvalue()
+
+
+def batch_summary_csv_row(batch):
+    """Return the summary CSV row for a batch annotated with task_count."""
+    return [
+        batch.id,
+        batch.name,
+        batch.wav_file_name,
+        batch.species.name,
+        batch.project.name,
+        batch.task_count,
+        batch.created_by.username,
+        batch.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+    ]
+
+
+def batch_csv_filename(batch):
+    """Return the name of a batch's CSV inside an export archive."""
+    # Clean batch name for filename
+    safe_name = "".join(c if c.isalnum() or c in ["-", "_"] else "_" for c in batch.name)
+    return f"batch_{batch.id}_{safe_name}.csv"
+
+
+class StreamBuffer(io.RawIOBase):
+    """Write-only, unseekable file object that collects output until it is drained.
+
+    zipfile writes data descriptors instead of seeking back when the target is
+    not seekable, and the Parquet/Arrow writers only ever append, so archives
+    and columnar exports can be sent to the client as they are built.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        """Return the number of bytes written so far."""
+        return self._position
+
+    def drain(self):
+        """Return everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def write_batches_zip(batches, fileobj, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Write a ZIP archive with one task CSV per batch plus a batch_summary.csv.
+
+    This is a generator: it yields after every chunk of task rows so callers
+    can forward what has been written so far (see StreamBuffer), or simply
+    exhaust it to write a file. Tasks are read with a server-side cursor, so
+    memory use does not grow with the size of the batches.
+
+    Args:
+        batches: List of TaskBatch objects annotated with task_count, with species,
+            project and created_by selected
+        fileobj: Binary file object to write the archive to
+        chunk_size: Number of task rows fetched and written per step
+
+    Yields:
+        int: Number of batches fully written so far
+    """
+    from ..models.task import Task
+
+    with zipfile.ZipFile(fileobj, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for index, batch in enumerate(batches):
+            # select_related avoids an N+1 query storm (species/project/created_by/annotated_by per row)
+            tasks = (
+                Task.objects.filter(batch=batch)
+                .select_related("species", "project", "created_by", "annotated_by")
+                .order_by("id")
+                .iterator(chunk_size=chunk_size)
+            )
+
+            with zipf.open(batch_csv_filename(batch), "w") as member:
+                text = io.TextIOWrapper(member, encoding="utf-8", newline="")
+                writer = csv.writer(text)
+                writer.writerow(TASK_CSV_HEADER)
+                for row_number, task in enumerate(tasks, 1):
+                    writer.writerow(task_csv_row(task))
+                    if row_number % chunk_size == 0:
+                        text.flush()
+                        yield index
+                text.flush()
+                text.detach()
+
+            yield index + 1
+
+        # Add a summary file with batch information
+        with zipf.open("batch_summary.csv", "w") as member:
+            text = io.TextIOWrapper(member, encoding="utf-8", newline="")
+            writer = csv.writer(text)
+            writer.writerow(BATCH_SUMMARY_CSV_HEADER)
+            for batch in batches:
+                writer.writerow(batch_summary_csv_row(batch))
+            text.flush()
+            text.detach()
+
+    yield len(batches)
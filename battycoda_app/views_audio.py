@@ -15,18 +15,9 @@ def task_spectrogram_view(request, task_id):
     Optional URL parameters:
     - overview: 1 for overview, 0 for detail (default: 0)
     """
-    import io
-    import os
-
-    import h5py
-    import numpy as np
-    from django.conf import settings
     from django.shortcuts import get_object_or_404
-    from PIL import Image
 
-    from .audio.colormaps import get_colormap
-    from .audio.modules.audio_processing import normal_hwin, overview_hwin
-    from .models.recording import Recording
+    from .audio.modules.task_renders import get_task_recording, render_task_spectrogram_png
     from .models.task import Task
 
     task = get_object_or_404(Task, id=task_id)
@@ -38,18 +29,12 @@ def task_spectrogram_view(request, task_id):
         return HttpResponse("Task has no associated audio file", status=404)
 
     is_overview = request.GET.get("overview", "0") == "1"
-    hwin = overview_hwin(task.species) if is_overview else normal_hwin(task.species)
-
-    start_time = task.onset - (hwin[0] / 1000)
-    end_time = task.offset + (hwin[1] / 1000)
-
-    # Will be clamped to recording duration later
 
     try:
         from .audio.task_modules.spectrogram.utils import ensure_hdf5_exists
 
         logger.info(f"Task {task_id}: Looking for recording with wav_file={task.batch.wav_file.name}")
-        recording = Recording.all_objects.filter(wav_file=task.batch.wav_file.name).first()
+        recording = get_task_recording(task)
 
         if not recording:
             logger.error(f"Task {task_id}: No recording found")
@@ -61,63 +46,13 @@ def task_spectrogram_view(request, task_id):
             logger.error(f"Task {task_id}: ensure_hdf5_exists failed: {error_response}")
             return error_response
 
-        logger.info(f"Task {task_id}: HDF5 exists, loading from {recording.spectrogram_file}")
-        h5_path = os.path.join(settings.MEDIA_ROOT, "spectrograms", "recordings", recording.spectrogram_file)
-
-        with h5py.File(h5_path, "r") as f:
-            sample_rate = float(f.attrs["sample_rate"])
-            n_fft = int(f.attrs.get("n_fft", 512))
-            hop_length = int(f.attrs.get("hop_length", n_fft // 4))
-            duration = float(f.attrs["duration"])
-            n_frames = int(f.attrs["n_frames"])
-            n_freq_bins = int(f.attrs["n_freq_bins"])
-
-            # Calculate frames per second
-            time_per_frame = hop_length / sample_rate
-
-            # Clamp times to valid recording boundaries
-            clamped_start_time = max(0, start_time)
-            clamped_end_time = min(duration, end_time)
-
-            start_frame = int((clamped_start_time / duration) * n_frames)
-            end_frame = int((clamped_end_time / duration) * n_frames)
-
-            # Extract actual data from recording
-            actual_data = f["spectrogram"][:, start_frame:end_frame]
-
-            # Pad with silence (-80 dB) if window extends beyond recording
-            pad_start = int((clamped_start_time - start_time) / time_per_frame) if start_time < 0 else 0
-            pad_end = int((end_time - clamped_end_time) / time_per_frame) if end_time > duration else 0
-
-            if pad_start > 0 or pad_end > 0:
-                # Calculate total frames based on actual data size + padding to avoid rounding errors
-                total_frames = pad_start + actual_data.shape[1] + pad_end
-                spectrogram_data = np.full((n_freq_bins, total_frames), -80, dtype=np.float16)
-                spectrogram_data[:, pad_start : pad_start + actual_data.shape[1]] = actual_data
-            else:
-                spectrogram_data = actual_data
-
-        spectrogram_float = spectrogram_data.astype(np.float32)
-
-        spec_min = spectrogram_float.min()
-        spec_max = spectrogram_float.max()
-        spec_range = spec_max - spec_min if spec_max > spec_min else 1
-
-        # Vectorized colormap application (replaces slow pixel-by-pixel loop)
-        normalized = ((spectrogram_float - spec_min) / spec_range * 255).clip(0, 255).astype(np.uint8)
-        flipped = np.flipud(normalized)
         colormap_name = getattr(request.user.profile, "spectrogram_colormap", "roseus")
-        colormap_array = np.array(get_colormap(colormap_name), dtype=np.uint8)
-        colored = colormap_array[flipped]
-        img = Image.fromarray(colored)
-
-        buf = io.BytesIO()
-        img.save(buf, format="PNG")
-        buf.seek(0)
-        png_data = buf.read()
-        buf.close()
+        png_data = render_task_spectrogram_png(task, recording, overview=is_overview, colormap_name=colormap_name)
 
-        return HttpResponse(png_data, content_type="image/png")
+        response = HttpResponse(png_data, content_type="image/png")
+        # Task windows never change, so let the browser reuse prefetched images
+        response["Cache-Control"] = "private, max-age=3600"
+        return response
 
     except Exception as e:
         logger.exception(f"Task {task_id}: Exception in task_spectrogram_view: {e}")
@@ -132,13 +67,9 @@ def task_audio_snippet_view(request, task_id):
     - channel: Audio channel (0 or 1), defaults to 0
     - overview: True/False for overview vs detail window, defaults to False
     """
-    import os
-
-    import numpy as np
     from django.shortcuts import get_object_or_404
 
-    from .audio.modules.audio_processing import get_audio_bit, normal_hwin, overview_hwin
-    from .audio.utils import appropriate_file
+    from .audio.modules.task_renders import render_task_audio_snippet
     from .models.task import Task
 
     # Get the task
@@ -148,77 +79,16 @@ def task_audio_snippet_view(request, task_id):
     if task.created_by != request.user and (not request.user.profile.group or task.group != request.user.profile.group):
         return HttpResponse("Permission denied", status=403)
 
-    # Get the wav file path
-    if task.batch and task.batch.wav_file:
-        wav_path = task.batch.wav_file.path
-    else:
+    if not task.batch or not task.batch.wav_file:
         return HttpResponse("Task has no associated audio file", status=404)
 
     # Get optional parameters with defaults
     channel = get_int_param(request, "channel", default=0, min_val=0)
     overview = request.GET.get("overview", "False") == "True"
 
-    # Determine window size
-    hwin = overview_hwin if overview else normal_hwin
-
-    # Build extra params for get_audio_bit
-    extra_params = {"onset": str(task.onset), "offset": str(task.offset)}
-
-    # Check cache first
-    import hashlib
-
-    file_hash = hashlib.md5(wav_path.encode()).hexdigest()
-    file_args = {
-        "call": "0",
-        "channel": str(channel),
-        "hash": file_hash,
-        "overview": "True" if overview else "False",
-        "onset": str(task.onset),
-        "offset": str(task.offset),
-        "loudness": "1.0",
-    }
-    cache_path = appropriate_file(wav_path, file_args)
-
-    # Return cached file if it exists
-    if os.path.exists(cache_path) and os.path.getsize(cache_path) > 0:
-        return FileResponse(open(cache_path, "rb"), content_type="audio/wav")
-
-    # Generate the audio snippet
+    # Serve from cache, generating the snippet first if needed
     try:
-        audio_data, sample_rate, _ = get_audio_bit(wav_path, 0, hwin(), extra_params)
-
-        if audio_data is None or len(audio_data) == 0:
-            return HttpResponse("Failed to extract audio data", status=500)
-
-        # Extract the specific channel
-        if len(audio_data.shape) > 1 and channel < audio_data.shape[1]:
-            audio_data = audio_data[:, channel]
-        elif len(audio_data.shape) > 1:
-            audio_data = audio_data[:, 0]
-
-        # Ensure 1D
-        if len(audio_data.shape) > 1:
-            audio_data = audio_data.flatten()
-
-        # Apply slowdown
-        slowdown = 5
-        sample_rate_out = sample_rate // slowdown
-        audio_data = np.repeat(audio_data, slowdown).astype("float32")
-
-        # Ensure proper range
-        if np.isnan(audio_data).any() or np.isinf(audio_data).any():
-            audio_data = np.nan_to_num(audio_data)
-
-        max_val = np.max(np.abs(audio_data))
-        if max_val > 0:
-            audio_data = audio_data / max_val
-
-        # Write to cache
-        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-        import soundfile as sf
-
-        sf.write(cache_path, audio_data, sample_rate_out)
-
+        cache_path = render_task_audio_snippet(task, channel=channel, overview=overview)
         return FileResponse(open(cache_path, "rb"), content_type="audio/wav")
 
     except Exception as e:
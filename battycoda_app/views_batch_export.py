@@ -1,146 +1,149 @@
 """Views for exporting batches in bulk."""
 
-import csv
 import os
-import tempfile
-import zipfile
 from datetime import datetime
-from io import StringIO
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.db.models import Count, Q
-from django.http import HttpResponse
-from django.shortcuts import redirect
+from django.http import FileResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.urls import reverse
+from django.views.decorators.http import require_POST
 
-from .models.task import Task, TaskBatch
-from .utils_modules.task_export_utils import generate_tasks_csv
+from .models.batch_export import BatchExportJob
+from .models.task import TaskBatch
+from .utils_modules.task_export_utils import StreamBuffer, write_batches_zip
 
 
-@login_required
-def export_completed_batches(request):
-    """Export all completed batches as a ZIP file containing CSV exports."""
+def get_completed_batches(user, project_id=None):
+    """
+    Get the completed batches (all tasks done) a user can export.
 
-    # Get user profile
-    profile = request.user.profile
+    Args:
+        user: User requesting the export
+        project_id: Optional project ID to restrict the export to
+
+    Returns:
+        List of TaskBatch objects annotated with task_count, ordered by ID
+    """
+    profile = user.profile
 
     # Determine which batches to include
-    if profile.group:
-        if profile.is_current_group_admin:
-            # Admin sees all batches in their group
-            batches = TaskBatch.objects.filter(group=profile.group)
-        else:
-            # Regular user only sees their own batches
-            batches = TaskBatch.objects.filter(created_by=request.user)
+    if profile.group and profile.is_current_group_admin:
+        # Admin sees all batches in their group
+        batches = TaskBatch.objects.filter(group=profile.group)
     else:
-        # Fallback to showing only user's batches if no group is assigned
-        batches = TaskBatch.objects.filter(created_by=request.user)
+        # Regular users (and users without a group) only see their own batches
+        batches = TaskBatch.objects.filter(created_by=user)
 
-    # Apply project filter if provided (same as task_batch_list_view)
-    project_id = request.GET.get("project")
     if project_id:
-        try:
-            project_id = int(project_id)
-            batches = batches.filter(project_id=project_id)
-        except (ValueError, TypeError):
-            pass  # Ignore invalid project IDs
-
-    # Filter for completed batches (all tasks in the batch are done).
-    # Annotate counts in a single query instead of two COUNTs per batch.
-    batches = batches.annotate(
-        task_count=Count("tasks"),
-        completed_count=Count("tasks", filter=Q(tasks__is_done=True)),
+        batches = batches.filter(project_id=project_id)
+
+    # Annotate counts in a single query instead of two COUNTs per batch
+    batches = (
+        batches.select_related("species", "project", "created_by")
+        .annotate(
+            task_count=Count("tasks"),
+            completed_count=Count("tasks", filter=Q(tasks__is_done=True)),
+        )
+        .order_by("id")
     )
-    completed_batches = [
-        batch for batch in batches if batch.task_count > 0 and batch.task_count == batch.completed_count
-    ]
+    return [batch for batch in batches if batch.task_count > 0 and batch.task_count == batch.completed_count]
+
+
+def _get_project_filter(request):
+    """Return the project ID from the request (same as task_batch_list_view), or None."""
+    project_id = request.GET.get("project") or request.POST.get("project")
+    try:
+        return int(project_id) if project_id else None
+    except (ValueError, TypeError):
+        return None  # Ignore invalid project IDs
+
+
+def _no_completed_batches(request, project_id):
+    if project_id:
+        messages.info(request, "No completed batches found to export for the selected project.")
+    else:
+        messages.info(request, "No completed batches found to export.")
+    return redirect("battycoda_app:task_batch_list")
+
+
+def _stream_batches_zip(batches):
+    """Yield the bytes of the export archive as it is written."""
+    buffer = StreamBuffer()
+    for _ in write_batches_zip(batches, buffer):
+        data = buffer.drain()
+        if data:
+            yield data
+
+
+@login_required
+def export_completed_batches(request):
+    """Export all completed batches as a ZIP file containing CSV exports.
+
+    The archive is streamed to the client while it is built, so neither the
+    CSVs nor the ZIP are held in memory.
+    """
+    project_id = _get_project_filter(request)
+    completed_batches = get_completed_batches(request.user, project_id)
 
     if not completed_batches:
-        if project_id:
-            messages.info(request, "No completed batches found to export for the selected project.")
-        else:
-            messages.info(request, "No completed batches found to export.")
-        return redirect("battycoda_app:task_batch_list")
+        return _no_completed_batches(request, project_id)
 
-    # Create a temporary directory to store CSV files
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Create a ZIP file
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        zip_filename = f"completed_batches_{timestamp}.zip"
-        zip_path = os.path.join(temp_dir, zip_filename)
-
-        # Build the ZIP file containing CSVs for each batch
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for batch in completed_batches:
-                # Get tasks for this batch. select_related avoids an N+1 query
-                # storm (species/project/created_by/annotated_by per row) that
-                # could make large exports exceed the gunicorn worker timeout.
-                tasks = (
-                    Task.objects.filter(batch=batch)
-                    .select_related("species", "project", "created_by", "annotated_by")
-                    .order_by("id")
-                )
-
-                # Generate CSV for this batch using the shared utility function
-                csv_content = generate_tasks_csv(tasks)
-
-                # Clean batch name for filename
-                safe_name = "".join(c if c.isalnum() or c in ["-", "_"] else "_" for c in batch.name)
-                filename = f"batch_{batch.id}_{safe_name}.csv"
-
-                # Add CSV to the ZIP file
-                zipf.writestr(filename, csv_content)
-
-            # Add a summary file with batch information
-            summary_content = generate_summary_csv(completed_batches)
-            zipf.writestr("batch_summary.csv", summary_content)
-
-        # Serve the ZIP file for download
-        with open(zip_path, "rb") as f:
-            response = HttpResponse(f.read(), content_type="application/zip")
-            response["Content-Disposition"] = f'attachment; filename="{zip_filename}"'
-            return response
-
-
-def generate_summary_csv(batches):
-    """Generate a summary CSV with information about all included batches."""
-    # Create CSV in memory
-    output = StringIO()
-    writer = csv.writer(output)
-
-    # Write header row
-    writer.writerow(
-        [
-            "Batch ID",
-            "Batch Name",
-            "WAV File",
-            "Species",
-            "Project",
-            "Tasks Count",
-            "Created By",
-            "Created At",
-        ]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    zip_filename = f"completed_batches_{timestamp}.zip"
+
+    response = StreamingHttpResponse(_stream_batches_zip(completed_batches), content_type="application/zip")
+    response["Content-Disposition"] = f'attachment; filename="{zip_filename}"'
+    return response
+
+
+@login_required
+@require_POST
+def queue_completed_batches_export(request):
+    """Queue a background job that exports all completed batches and notifies the user when it is ready."""
+    from .tasks import export_completed_batches_task
+
+    project_id = _get_project_filter(request)
+    completed_batches = get_completed_batches(request.user, project_id)
+
+    if not completed_batches:
+        return _no_completed_batches(request, project_id)
+
+    profile = request.user.profile
+    job = BatchExportJob.objects.create(
+        name=f"{len(completed_batches)} completed batches",
+        batch_ids=[batch.id for batch in completed_batches],
+        project_id=project_id,
+        created_by=request.user,
+        group=profile.group,
     )
+    transaction.on_commit(lambda: export_completed_batches_task.delay(job.id))
 
-    # Write a row for each batch
-    for batch in batches:
-        # task_count is annotated in export_completed_batches; fall back to a
-        # query if a non-annotated batch is ever passed in.
-        task_count = getattr(batch, "task_count", None)
-        if task_count is None:
-            task_count = Task.objects.filter(batch=batch).count()
-        writer.writerow(
-            [
-                batch.id,
-                batch.name,
-                batch.wav_file_name,
-                batch.species.name,
-                batch.project.name,
-                task_count,
-                batch.created_by.username,
-                batch.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            ]
-        )
+    messages.info(
+        request,
+        f"Exporting {len(completed_batches)} completed batches in the background. "
+        "You will receive a notification with a download link when the archive is ready.",
+    )
+    redirect_url = reverse("battycoda_app:task_batch_list")
+    if project_id:
+        redirect_url += f"?project={project_id}"
+    return redirect(redirect_url)
+
+
+@login_required
+def download_batch_export_view(request, job_id):
+    """Download the archive of a finished batch export job."""
+    job = get_object_or_404(BatchExportJob, id=job_id)
+
+    if job.created_by != request.user:
+        messages.error(request, "You don't have permission to download this export.")
+        return redirect("battycoda_app:task_batch_list")
+
+    if job.status != "completed" or not job.file_path or not os.path.exists(job.file_path):
+        messages.error(request, "This export is not available. It may still be running or may have expired.")
+        return redirect("battycoda_app:task_batch_list")
 
-    # Return the CSV content
-    return output.getvalue()
+    return FileResponse(open(job.file_path, "rb"), as_attachment=True, filename=job.filename)
@@ -4,9 +4,11 @@ Batch upload views package.
 Split from views_batch_upload.py into focused modules:
 - zip_extraction.py: ZIP archive handling
 - file_processing.py: WAV/recording/segmentation creation
-- views.py: Main view function
+- views.py: Upload view (queues a BatchUploadJob) and job status endpoint
+
+Ingestion itself runs in audio/task_modules/batch_upload_tasks.py.
 """
 
-from .views import batch_upload_recordings_view
+from .views import batch_upload_recordings_view, batch_upload_status_view
 
-__all__ = ["batch_upload_recordings_view"]
+__all__ = ["batch_upload_recordings_view", "batch_upload_status_view"]
@@ -5,15 +5,18 @@ File processing utilities for batch upload - handles WAV files and recordings cr
 import os
 from pathlib import Path
 
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import transaction
 
+from ..audio.modules.file_utils import create_recording_from_file
 from ..audio.utils import get_audio_duration, process_pickle_file, split_audio_file
-from ..models import Recording, Segment, Segmentation
-from ..utils_modules.cleanup import safe_remove_file
+from ..models import Segment, Segmentation
+from ..utils_modules.cleanup import safe_cleanup_dir, safe_remove_file
 
+# Batch size for bulk_create of segments from pickle files
+SEGMENT_BULK_CREATE_BATCH_SIZE = 1000
 
-def process_wav_with_splitting(wav_path, metadata, user, profile):
+
+def process_wav_with_splitting(wav_path, metadata, user, group):
     """
     Process a WAV file, splitting it into chunks if longer than 60 seconds.
 
@@ -22,7 +25,7 @@ def process_wav_with_splitting(wav_path, metadata, user, profile):
         metadata: Dict with keys: species, project, recorded_date, location,
                   equipment, environmental_conditions
         user: The Django user creating the recordings
-        profile: User's profile (for group)
+        group: Group to assign the recordings to
 
     Returns:
         Tuple of (recordings_created_count, was_split)
@@ -37,33 +40,15 @@ def process_wav_with_splitting(wav_path, metadata, user, profile):
             recordings_created = 0
 
             for i, chunk_path in enumerate(chunk_paths):
-                with open(chunk_path, "rb") as chunk_file_obj:
-                    chunk_file_name = os.path.basename(chunk_path)
-                    chunk_file = SimpleUploadedFile(chunk_file_name, chunk_file_obj.read(), content_type="audio/wav")
-
-                    with transaction.atomic():
-                        chunk_recording_name = f"{file_name} (Part {i + 1}/{len(chunk_paths)})"
-
-                        recording = Recording(
-                            name=chunk_recording_name,
-                            wav_file=chunk_file,
-                            recorded_date=metadata["recorded_date"],
-                            location=metadata["location"],
-                            equipment=metadata["equipment"],
-                            environmental_conditions=metadata["environmental_conditions"],
-                            species=metadata["species"],
-                            project=metadata["project"],
-                            group=profile.group,
-                            created_by=user,
-                        )
-                        recording.save()
-                        recording.file_ready = True
-                        recording.save(update_fields=["file_ready"])
-                        recordings_created += 1
+                chunk_recording_name = f"{file_name} (Part {i + 1}/{len(chunk_paths)})"
+                _create_recording(chunk_path, chunk_recording_name, metadata, user, group)
+                recordings_created += 1
 
             # Clean up chunk files
             for chunk_path in chunk_paths:
                 safe_remove_file(chunk_path, "audio chunk file")
+            if chunk_paths:
+                safe_cleanup_dir(os.path.dirname(chunk_paths[0]), "chunk directory")
 
             return recordings_created, True
 
@@ -74,7 +59,7 @@ def process_wav_with_splitting(wav_path, metadata, user, profile):
     return None, False
 
 
-def create_recording_from_wav(wav_path, metadata, user, profile):
+def create_recording_from_wav(wav_path, metadata, user, group):
     """
     Create a single recording from a WAV file.
 
@@ -83,59 +68,49 @@ def create_recording_from_wav(wav_path, metadata, user, profile):
         metadata: Dict with keys: species, project, recorded_date, location,
                   equipment, environmental_conditions
         user: The Django user creating the recording
-        profile: User's profile (for group)
+        group: Group to assign the recordings to
 
     Returns:
         The created Recording object
     """
-    wav_file_name = os.path.basename(wav_path)
-    file_name = Path(wav_file_name).stem
-
-    with open(wav_path, "rb") as wav_file_obj:
-        wav_file = SimpleUploadedFile(wav_file_name, wav_file_obj.read(), content_type="audio/wav")
-
-        with transaction.atomic():
-            recording = Recording(
-                name=file_name,
-                wav_file=wav_file,
-                recorded_date=metadata["recorded_date"],
-                location=metadata["location"],
-                equipment=metadata["equipment"],
-                environmental_conditions=metadata["environmental_conditions"],
-                species=metadata["species"],
-                project=metadata["project"],
-                group=profile.group,
-                created_by=user,
-            )
-            recording.save()
-            recording.file_ready = True
-            recording.save(update_fields=["file_ready"])
-
-    return recording
-
-
-def create_segmentation_from_pickle(recording, pickle_path, pickle_filename, user):
+    file_name = Path(os.path.basename(wav_path)).stem
+    return _create_recording(wav_path, file_name, metadata, user, group)
+
+
+def _create_recording(wav_path, name, metadata, user, group):
+    """Move a WAV file into recording storage and create a ready Recording for it."""
+    return create_recording_from_file(
+        wav_path,
+        name=name,
+        recorded_date=metadata["recorded_date"],
+        location=metadata["location"],
+        equipment=metadata["equipment"],
+        environmental_conditions=metadata["environmental_conditions"],
+        species=metadata["species"],
+        project=metadata["project"],
+        group=group,
+        created_by=user,
+    )
+
+
+def create_segmentation_from_pickle(recording, pickle_file, user):
     """
     Create a segmentation and segments from a pickle file.
 
+    Segments are inserted with bulk_create, so Segment.save() is bypassed and the
+    new segmentation is not marked as manually edited.
+
     Args:
         recording: The Recording object to attach segments to
-        pickle_path: Path to the pickle file
-        pickle_filename: Name of the pickle file
+        pickle_file: File-like object with the pickle data (e.g. an open ZIP member)
         user: The Django user creating the segmentation
 
     Returns:
         Number of segments created
     """
-    with open(pickle_path, "rb") as pickle_file_obj:
-        pickle_file = SimpleUploadedFile(
-            pickle_filename,
-            pickle_file_obj.read(),
-            content_type="application/octet-stream",
-        )
-
-        onsets, offsets = process_pickle_file(pickle_file)
+    onsets, offsets = process_pickle_file(pickle_file)
 
+    with transaction.atomic():
         segmentation = Segmentation.objects.create(
             recording=recording,
             name="Batch Upload",
@@ -146,20 +121,20 @@ def create_segmentation_from_pickle(recording, pickle_path, pickle_filename, use
             created_by=user,
         )
 
-        segments_created = 0
-        for i in range(len(onsets)):
-            segment = Segment(
+        segments = [
+            Segment(
                 recording=recording,
                 segmentation=segmentation,
                 name=f"Segment {i + 1}",
-                onset=onsets[i],
-                offset=offsets[i],
+                onset=onset,
+                offset=offset,
                 created_by=user,
             )
-            segment.save(manual_edit=False)
-            segments_created += 1
+            for i, (onset, offset) in enumerate(zip(onsets, offsets, strict=True))
+        ]
+        Segment.objects.bulk_create(segments, batch_size=SEGMENT_BULK_CREATE_BATCH_SIZE)
 
-        segmentation.segments_created = segments_created
-        segmentation.save()
+        segmentation.segments_created = len(segments)
+        segmentation.save(update_fields=["segments_created", "updated_at"])
 
-        return segments_created
+    return len(segments)
@@ -3,23 +3,23 @@ Views for handling batch uploads of recordings.
 """
 
 import os
-import tempfile
+import uuid
+import zipfile
 
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
 from django.http import JsonResponse
-from django.shortcuts import redirect, render
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 
+from ..audio.task_modules.batch_upload_tasks import process_batch_upload_job
 from ..forms import RecordingForm
+from ..models.batch_upload import BatchUploadJob
 from ..models.user import UserProfile
-from .file_processing import (
-    create_recording_from_wav,
-    create_segmentation_from_pickle,
-    process_wav_with_splitting,
-)
-from .zip_extraction import extract_pickle_files, extract_wav_files
+from ..utils_modules.cleanup import safe_cleanup_dir
+from .zip_extraction import list_wav_members
 
 
 @login_required
@@ -58,35 +58,37 @@ def batch_upload_recordings_view(request):
                 return redirect("battycoda_app:batch_upload_recordings")
 
             split_long_files = request.POST.get("split_long_files") == "on"
-            result = _process_batch_upload(wav_zip, pickle_zip, metadata, request.user, profile, split_long_files)
+            job, error_msg = _queue_batch_upload(wav_zip, pickle_zip, metadata, request.user, profile, split_long_files)
+
+            if error_msg:
+                if is_ajax:
+                    return JsonResponse({"success": False, "error": error_msg})
+                messages.error(request, error_msg)
+                return redirect("battycoda_app:batch_upload_recordings")
+
+            success_msg = (
+                f"Upload received. {job.total_files} recordings are being processed in the background; "
+                "you will get a notification when they are ready."
+            )
+            # Queue the message so it displays after the client-side redirect
+            messages.success(request, success_msg)
 
             if is_ajax:
-                if "error" in result:
-                    return JsonResponse({"success": False, "error": result["error"]})
-                if result["success_count"] == 0 and result["error_count"] > 0:
-                    return JsonResponse(
-                        {
-                            "success": False,
-                            "error": f"Failed to upload {result['error_count']} recordings. See logs for details.",
-                        }
-                    )
-                # Queue messages so they display after the client-side redirect
-                _show_result_messages(request, result)
                 return JsonResponse(
                     {
                         "success": True,
-                        "recordings_created": result["success_count"],
+                        "message": success_msg,
+                        "job_id": job.id,
+                        "total_files": job.total_files,
+                        "status_url": reverse("battycoda_app:batch_upload_status", kwargs={"job_id": job.id}),
                         "redirect_url": reverse("battycoda_app:recording_list"),
                     }
                 )
 
-            _show_result_messages(request, result)
             return redirect("battycoda_app:recording_list")
         else:
             if is_ajax:
-                error_msg = "; ".join(
-                    f"{field}: {error}" for field, errors in form.errors.items() for error in errors
-                )
+                error_msg = "; ".join(f"{field}: {error}" for field, errors in form.errors.items() for error in errors)
                 return JsonResponse({"success": False, "error": error_msg or "Invalid form submission"})
             for field, errors in form.errors.items():
                 for error in errors:
@@ -101,84 +103,84 @@ def batch_upload_recordings_view(request):
     )
 
 
-def _process_batch_upload(wav_zip, pickle_zip, metadata, user, profile, split_long_files):
+def _store_uploaded_zip(uploaded_file, upload_dir, name):
+    """Write an uploaded ZIP to the job's upload directory in chunks and return its path."""
+    path = os.path.join(upload_dir, name)
+    with open(path, "wb") as f:
+        for chunk in uploaded_file.chunks():
+            f.write(chunk)
+    return path
+
+
+def _queue_batch_upload(wav_zip, pickle_zip, metadata, user, profile, split_long_files):
     """
-    Process the batch upload of WAV and pickle files.
+    Store the uploaded archives on disk and queue a background ingestion job.
 
     Returns:
-        Dict with counts: success_count, error_count, segmented_count, split_count
+        Tuple of (job, error_message) - job is None when the archive is unusable
     """
-    result = {"success_count": 0, "error_count": 0, "segmented_count": 0, "split_count": 0}
-
-    with tempfile.TemporaryDirectory() as wav_temp_dir, tempfile.TemporaryDirectory() as pickle_temp_dir:
-        # Extract WAV files
-        try:
-            wav_files = extract_wav_files(wav_zip, wav_temp_dir)
-        except Exception as e:
-            return {"error": f"Failed to extract WAV ZIP file: {str(e)}"}
-
-        # Extract pickle files if provided
-        pickle_files_dict = {}
-        if pickle_zip:
-            try:
-                pickle_files_dict = extract_pickle_files(pickle_zip, pickle_temp_dir)
-            except Exception:
-                # Continue with WAV files even if pickle extraction fails
-                pass
-
-        # Process each WAV file
-        for wav_path in wav_files:
-            try:
-                _process_single_wav(wav_path, pickle_files_dict, metadata, user, profile, split_long_files, result)
-            except Exception:
-                result["error_count"] += 1
-                import traceback
-
-                traceback.print_exc()
-
-    return result
-
-
-def _process_single_wav(wav_path, pickle_files_dict, metadata, user, profile, split_long_files, result):
-    """Process a single WAV file, optionally splitting and adding segmentation."""
-    wav_file_name = os.path.basename(wav_path)
-
-    # Try splitting if enabled
-    if split_long_files:
-        count, was_split = process_wav_with_splitting(wav_path, metadata, user, profile)
-        if was_split:
-            result["success_count"] += count
-            result["split_count"] += 1
-            return
-
-    # Normal processing (file ≤ 60s or splitting disabled/failed)
-    recording = create_recording_from_wav(wav_path, metadata, user, profile)
-
-    # Check for matching pickle file
-    pickle_filename = f"{wav_file_name}.pickle"
-    pickle_path = pickle_files_dict.get(pickle_filename)
-
-    if pickle_path:
-        segments_created = create_segmentation_from_pickle(recording, pickle_path, pickle_filename, user)
-        if segments_created > 0:
-            result["segmented_count"] += 1
-
-    result["success_count"] += 1
-
-
-def _show_result_messages(request, result):
-    """Display appropriate success/error messages based on upload results."""
-    if "error" in result:
-        messages.error(request, result["error"])
-        return
-
-    if result["success_count"] > 0:
-        success_msg = f"Successfully uploaded {result['success_count']} recordings"
-        if result["split_count"] > 0:
-            success_msg += f" ({result['split_count']} files split into 1-minute chunks)"
-        if result["segmented_count"] > 0:
-            success_msg += f" with {result['segmented_count']} segmented automatically from pickle files"
-        messages.success(request, success_msg)
-
-    if result["error_count"] > 0:
-        messages.error(request, f"Failed to upload {result['error_count']} recordings. See logs for details.")
+    upload_dir = os.path.join(settings.BATCH_UPLOAD_DIR, f"job_{uuid.uuid4().hex}")
+    os.makedirs(upload_dir, exist_ok=True)
+
+    wav_zip_path = _store_uploaded_zip(wav_zip, upload_dir, "wav.zip")
+    pickle_zip_path = _store_uploaded_zip(pickle_zip, upload_dir, "pickle.zip") if pickle_zip else ""
+
+    # Validate the archive up front so the user gets immediate feedback on a bad upload
+    try:
+        with zipfile.ZipFile(wav_zip_path, "r") as zip_ref:
+            wav_count = len(list_wav_members(zip_ref))
+    except Exception as e:
+        safe_cleanup_dir(upload_dir, "batch upload directory")
+        return None, f"Failed to extract WAV ZIP file: {str(e)}"
+
+    if wav_count == 0:
+        safe_cleanup_dir(upload_dir, "batch upload directory")
+        return None, "The ZIP file does not contain any WAV files"
+
+    job = BatchUploadJob.objects.create(
+        name=wav_zip.name,
+        wav_zip_path=wav_zip_path,
+        pickle_zip_path=pickle_zip_path,
+        species=metadata["species"],
+        project=metadata["project"],
+        recorded_date=metadata["recorded_date"],
+        location=metadata["location"] or "",
+        equipment=metadata["equipment"] or "",
+        environmental_conditions=metadata["environmental_conditions"] or "",
+        split_long_files=split_long_files,
+        total_files=wav_count,
+        created_by=user,
+        group=profile.group,
+    )
+
+    # Queue once the job row is committed so the worker can find it
+    transaction.on_commit(lambda: process_batch_upload_job.delay(job.id))
+
+    return job, None
+
+
+@login_required
+def batch_upload_status_view(request, job_id):
+    """Return the progress and counts of a batch upload job as JSON."""
+    job = get_object_or_404(BatchUploadJob, id=job_id)
+
+    profile = request.user.profile
+    if job.created_by != request.user and (not profile.group or job.group != profile.group):
+        return JsonResponse({"success": False, "error": "Permission denied"}, status=403)
+
+    return JsonResponse(
+        {
+            "success": True,
+            "job_id": job.id,
+            "name": job.name,
+            "status": job.status,
+            "progress": job.progress,
+            "total_files": job.total_files,
+            "processed_files": job.processed_files,
+            "success_count": job.success_count,
+            "error_count": job.error_count,
+            "segmented_count": job.segmented_count,
+            "split_count": job.split_count,
+            "error_message": job.error_message,
+        }
+    )
@@ -1,79 +1,83 @@
 """
-Utilities for extracting files from ZIP archives during batch upload.
+Utilities for reading files out of ZIP archives during batch upload.
+
+Members are listed and streamed straight out of the archive instead of
+extracting the whole ZIP to a temporary directory first.
 """
 
 import os
-import zipfile
+import shutil
+
 
+def _is_candidate(file_info, extension, seen):
+    """Return True for file members with the given extension, skipping directories and macOS metadata files."""
+    return (
+        not file_info.filename.endswith("/")
+        and file_info.filename not in seen
+        and not os.path.basename(file_info.filename).startswith("._")
+        and file_info.filename.lower().endswith(extension)
+    )
 
-def extract_wav_files(wav_zip, temp_dir):
+
+def list_wav_members(zip_ref):
     """
-    Extract WAV files from a ZIP archive.
+    List the WAV file members of a ZIP archive.
 
     Args:
-        wav_zip: The uploaded ZIP file containing WAV files
-        temp_dir: Temporary directory to extract files to
+        zip_ref: An open zipfile.ZipFile
 
     Returns:
-        List of paths to extracted WAV files
+        List of member names of WAV files, in archive order
+    """
+    wav_members = []
+    seen = set()
+
+    for file_info in zip_ref.infolist():
+        if _is_candidate(file_info, ".wav", seen):
+            wav_members.append(file_info.filename)
+            seen.add(file_info.filename)
+
+    return wav_members
+
 
-    Raises:
-        Exception: If ZIP extraction fails
+def list_pickle_members(zip_ref):
     """
-    wav_files = []
-    processed_files = set()
+    Index the pickle file members of a ZIP archive by basename.
 
-    with zipfile.ZipFile(wav_zip, "r") as zip_ref:
-        for file_info in zip_ref.infolist():
-            # Skip directories, already processed files, and macOS metadata files
-            if (
-                file_info.filename.endswith("/")
-                or file_info.filename in processed_files
-                or os.path.basename(file_info.filename).startswith("._")
-            ):
-                continue
+    Args:
+        zip_ref: An open zipfile.ZipFile
+
+    Returns:
+        Dictionary mapping pickle basenames to their member names
+    """
+    pickle_members = {}
+    seen = set()
 
-            if file_info.filename.lower().endswith(".wav"):
-                zip_ref.extract(file_info, temp_dir)
-                extracted_path = os.path.join(temp_dir, file_info.filename)
-                wav_files.append(extracted_path)
-                processed_files.add(file_info.filename)
+    for file_info in zip_ref.infolist():
+        if _is_candidate(file_info, ".pickle", seen):
+            # Store with basename as key for matching
+            pickle_members[os.path.basename(file_info.filename)] = file_info.filename
+            seen.add(file_info.filename)
 
-    return wav_files
+    return pickle_members
 
 
-def extract_pickle_files(pickle_zip, temp_dir):
+def stream_member_to_file(zip_ref, member_name, dest_dir):
     """
-    Extract pickle files from a ZIP archive.
+    Decompress a single ZIP member to disk in fixed-size blocks.
 
     Args:
-        pickle_zip: The uploaded ZIP file containing pickle files
-        temp_dir: Temporary directory to extract files to
+        zip_ref: An open zipfile.ZipFile
+        member_name: Name of the member to write
+        dest_dir: Directory to write the member into (keeps the member's basename)
 
     Returns:
-        Dictionary mapping pickle basenames to their extracted paths
-
-    Raises:
-        Exception: If ZIP extraction fails
+        Path of the written file
     """
-    pickle_files_dict = {}
-    processed_files = set()
-
-    with zipfile.ZipFile(pickle_zip, "r") as zip_ref:
-        for file_info in zip_ref.infolist():
-            # Skip directories, already processed files, and macOS metadata files
-            if (
-                file_info.filename.endswith("/")
-                or file_info.filename in processed_files
-                or os.path.basename(file_info.filename).startswith("._")
-            ):
-                continue
-
-            if file_info.filename.lower().endswith(".pickle"):
-                zip_ref.extract(file_info, temp_dir)
-                pickle_path = os.path.join(temp_dir, file_info.filename)
-                # Store with basename as key for matching
-                pickle_files_dict[os.path.basename(file_info.filename)] = pickle_path
-                processed_files.add(file_info.filename)
-
-    return pickle_files_dict
+    os.makedirs(dest_dir, exist_ok=True)
+    dest_path = os.path.join(dest_dir, os.path.basename(member_name))
+
+    with zip_ref.open(member_name) as src, open(dest_path, "wb") as dest:
+        shutil.copyfileobj(src, dest, 1024 * 1024)
+
+    return dest_path
@@ -1,20 +1,22 @@
 """Batch classification operations views."""
 
 import logging
+import uuid
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db import models
+from django.db import transaction
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
 
-from battycoda_app.audio.task_modules.queue_processor import queue_classification_run
+from battycoda_app.audio.task_modules.queue_processor import kick_classification_queue
 from battycoda_app.models import Segment
 from battycoda_app.models.classification import ClassificationRun, Classifier
 from battycoda_app.models.organization import Species
 from battycoda_app.models.segmentation import Segmentation
+from battycoda_app.utils_modules.lookup_cache import get_available_classifiers
 
 logger = logging.getLogger(__name__)
 
@@ -198,28 +200,36 @@ def create_classification_for_species_view(request, species_id):
         segmentation_ids = segments.values_list("segmentation_id", flat=True).distinct()
         unique_segmentations = Segmentation.objects.filter(id__in=segmentation_ids).select_related("recording")
 
+        # The runs share a job group, so the queue classifies them as one job
+        # with batches spanning recordings (see run_multi_recording_classification)
+        job_group = uuid.uuid4()
         run_count = 0
-        for segmentation in unique_segmentations:
-            try:
-                run = ClassificationRun.objects.create(
-                    name=f"{run_name} - {segmentation.recording.name}",
-                    segmentation=segmentation,
-                    created_by=request.user,
-                    group=profile.group,
-                    algorithm_type=classifier.response_format,
-                    classifier=classifier,
-                    status="queued",
-                    progress=0.0,
-                )
-                queue_classification_run.delay(run.id)
-                run_count += 1
-            except Exception:
-                logger.exception(
-                    "Failed to create classification run for segmentation %s (recording: %s)",
-                    segmentation.id,
-                    segmentation.recording.name,
-                )
-                # Continue with other segmentations rather than failing entirely
+        with transaction.atomic():
+            for segmentation in unique_segmentations:
+                try:
+                    with transaction.atomic():
+                        ClassificationRun.objects.create(
+                            name=f"{run_name} - {segmentation.recording.name}",
+                            segmentation=segmentation,
+                            created_by=request.user,
+                            group=profile.group,
+                            algorithm_type=classifier.response_format,
+                            classifier=classifier,
+                            status="queued",
+                            progress=0.0,
+                            job_group=job_group,
+                        )
+                    run_count += 1
+                except Exception:
+                    logger.exception(
+                        "Failed to create classification run for segmentation %s (recording: %s)",
+                        segmentation.id,
+                        segmentation.recording.name,
+                    )
+                    # Continue with other segmentations rather than failing entirely
+
+            if run_count:
+                transaction.on_commit(kick_classification_queue)
 
         if run_count == 0:
             messages.error(request, "Failed to create any classification runs. Check logs for details.")
@@ -228,24 +238,12 @@ def create_classification_for_species_view(request, species_id):
         messages.success(
             request,
             f"Created {run_count} classification runs for {segments.count()} segments across {run_count} recordings. "
-            f"Runs have been queued and will be processed sequentially to prevent resource conflicts.",
+            f"They have been queued and will be classified together as one job.",
         )
         return _redirect_with_project(request, "battycoda_app:classification_home", project_id)
 
     # GET request: show classifier selection form
-    if profile.group:
-        classifiers = (
-            Classifier.objects.filter(is_active=True)
-            .filter(models.Q(group=profile.group) | models.Q(group__isnull=True))
-            .filter(models.Q(species=species) | models.Q(species__isnull=True))
-            .order_by("name")
-        )
-    else:
-        classifiers = (
-            Classifier.objects.filter(is_active=True, group__isnull=True)
-            .filter(models.Q(species=species) | models.Q(species__isnull=True))
-            .order_by("name")
-        )
+    classifiers = get_available_classifiers(profile.group_id, species.id)
 
     segment_filter = _get_segment_filter(profile, species, project_id, unclassified_only=True)
     unclassified_count = Segment.objects.filter(**segment_filter).count()
@@ -254,7 +252,7 @@ def create_classification_for_species_view(request, species_id):
         "species": species,
         "classifiers": classifiers,
         "unclassified_count": unclassified_count,
-        "default_classifier": classifiers.filter(name="R-direct Classifier").first(),
+        "default_classifier": next((c for c in classifiers if c.name == "R-direct Classifier"), None),
     }
 
     return render(request, "classification/create_species_classification.html", context)
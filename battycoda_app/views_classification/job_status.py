@@ -9,6 +9,7 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
 from battycoda_app.models.classification import ClassifierTrainingJob
+from battycoda_app.utils_modules.progress_reporter import apply_live_progress
 
 
 @login_required
@@ -73,6 +74,8 @@ def classifier_training_job_status_view(request, job_id):
     if job.created_by != request.user and (not profile.group or job.group != profile.group):
         return JsonResponse({"success": False, "error": "Permission denied"})
 
+    apply_live_progress(job)
+
     # Return basic status information for the job
     data = {
         "success": True,
@@ -2,12 +2,12 @@
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db import models
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
 from battycoda_app.models import Segmentation
 from battycoda_app.models.classification import CallProbability, ClassificationResult, ClassificationRun, Classifier
+from battycoda_app.utils_modules.lookup_cache import get_available_classifiers
 
 
 @login_required
@@ -93,21 +93,9 @@ def create_classification_run_view(request, segmentation_id=None):
 
         recording_species = segmentation.recording.species
 
-        if profile.group:
-            classifiers = (
-                Classifier.objects.filter(is_active=True)
-                .filter(models.Q(group=profile.group) | models.Q(group__isnull=True))
-                .filter(models.Q(species=recording_species) | models.Q(species__isnull=True))
-                .order_by("name")
-            )
-        else:
-            classifiers = (
-                Classifier.objects.filter(is_active=True, group__isnull=True)
-                .filter(models.Q(species=recording_species) | models.Q(species__isnull=True))
-                .order_by("name")
-            )
+        classifiers = get_available_classifiers(profile.group_id, recording_species.id)
 
-        if not classifiers.exists():
+        if not classifiers:
             messages.error(
                 request, f"No classifiers available for {recording_species.name}. Please contact an administrator."
             )
@@ -117,7 +105,7 @@ def create_classification_run_view(request, segmentation_id=None):
             "segmentation": segmentation,
             "classifiers": classifiers,
             "recording_species": recording_species,
-            "default_classifier": classifiers.filter(name="R-direct Classifier").first(),
+            "default_classifier": next((c for c in classifiers if c.name == "R-direct Classifier"), None),
         }
 
         return render(request, "classification/create_run.html", context)
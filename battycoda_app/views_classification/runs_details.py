@@ -15,9 +15,15 @@ from django.core.paginator import Paginator
 from django.http import FileResponse, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
-from battycoda_app.audio.task_modules.base import extract_audio_segment
+from battycoda_app.audio.task_modules.base import read_window
 from battycoda_app.models.classification import CallProbability, ClassificationResult, ClassificationRun
 from battycoda_app.models.organization import Call
+from battycoda_app.utils_modules.columnar_export import (
+    classification_results_table,
+    columnar_export_response,
+    parse_columnar_format,
+)
+from battycoda_app.utils_modules.progress_reporter import apply_live_progress
 
 logger = logging.getLogger(__name__)
 
@@ -86,6 +92,8 @@ def classification_run_status_view(request, run_id):
     if run.created_by != request.user and (not profile.group or run.group != profile.group):
         return JsonResponse({"success": False, "error": "Permission denied"}, status=403)
 
+    apply_live_progress(run)
+
     # Return the status
     return JsonResponse(
         {
@@ -135,6 +143,32 @@ def download_features_file_view(request, run_id):
         return redirect("battycoda_app:classification_run_detail", run_id=run_id)
 
 
+@login_required
+def export_classification_results_view(request, run_id):
+    """Download the results of a classification run with every call probability as Parquet or Arrow."""
+    run = get_object_or_404(ClassificationRun.objects.select_related("segmentation__recording"), id=run_id)
+
+    # Check permissions
+    profile = request.user.profile
+    if run.created_by != request.user and (not profile.group or run.group != profile.group):
+        messages.error(request, "You don't have permission to access this classification run.")
+        return redirect("battycoda_app:classification_home")
+
+    if run.status != "completed":
+        messages.error(request, "Classification run is not yet completed.")
+        return redirect("battycoda_app:classification_run_detail", run_id=run_id)
+
+    try:
+        export_format = parse_columnar_format(request.GET.get("format"))
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect("battycoda_app:classification_run_detail", run_id=run_id)
+
+    return columnar_export_response(
+        export_format, classification_results_table(run), f"classification_{run.name}_{run.id}"
+    )
+
+
 @login_required
 def download_segments_zip_view(request, run_id):
     """Download all segments from a classification run as a ZIP file."""
@@ -162,18 +196,19 @@ def download_segments_zip_view(request, run_id):
     # Create ZIP file in memory
     zip_buffer = BytesIO()
 
-    with zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        # Add each segment as a WAV file
-        for segment in segments:
+    with (
+        zipfile.ZipFile(zip_buffer, "w", zipfile.ZIP_DEFLATED) as zip_file,
+        sf.SoundFile(recording.wav_file.path) as sound_file,
+    ):
+        # Segments come in onset order, so the recording is read in one pass
+        # through a single handle, one segment at a time
+        for segment in segments.iterator():
             try:
-                # Extract audio segment
-                segment_data, sample_rate = extract_audio_segment(
-                    recording.wav_file.path, segment.onset, segment.offset
-                )
+                segment_data = read_window(sound_file, segment.onset, segment.offset)
 
                 # Create WAV file in memory
                 wav_buffer = BytesIO()
-                sf.write(wav_buffer, segment_data, samplerate=sample_rate, format="WAV")
+                sf.write(wav_buffer, segment_data, samplerate=sound_file.samplerate, format="WAV")
                 wav_buffer.seek(0)
 
                 # Add to ZIP with descriptive filename
@@ -1,102 +1,128 @@
 """Helper functions for task batch creation."""
 
-from django.db.models import OuterRef, Subquery
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Subquery
 
 from battycoda_app.models.classification import CallProbability, ClassificationResult
 from battycoda_app.models.task import Task, TaskBatch
+from battycoda_app.models.task_stats import record_created_tasks
 
+# Number of tasks inserted per bulk_create statement
+TASK_BULK_CREATE_BATCH_SIZE = 2000
 
-def create_task_batch_helper(run, batch_name, description, created_by, group, max_confidence=None):
+
+def get_task_candidates(run):
     """
-    Helper function to create a task batch from a classification run.
+    Get the classification results of a run that can become tasks, one row per segment.
+
+    Each row carries the segment times and the top call type and probability,
+    computed by a subquery. Segments that already have a task are left out by
+    an anti-join, so the whole selection is a single query.
 
     Args:
         run: ClassificationRun instance
-        batch_name: Name for the task batch
-        description: Description for the task batch
-        created_by: User creating the batch
-        group: Group for the batch
-        max_confidence: Optional confidence threshold (tasks with higher confidence are filtered out)
 
     Returns:
-        tuple: (batch, tasks_created, tasks_filtered) or (None, 0, 0) if no tasks created
+        ValuesQuerySet of dicts with segment_id, onset, offset, top_call and top_probability
     """
-    recording = run.segmentation.recording
-
-    batch = TaskBatch.objects.create(
-        name=batch_name,
-        description=description,
-        created_by=created_by,
-        wav_file_name=recording.wav_file.name if recording.wav_file else "",
-        wav_file=recording.wav_file,
-        species=recording.species,
-        project=recording.project,
-        group=group,
-        classification_run=run,
-    )
-
-    # Get all segment IDs that already have tasks (one query)
-    segments_with_tasks = set(
-        Task.objects.filter(source_segment__classification_results__classification_run=run).values_list(
-            "source_segment_id", flat=True
-        )
-    )
-
-    # Get the top probability for each result using a subquery (much faster than prefetch_related)
-    top_prob_subquery = (
-        CallProbability.objects.filter(classification_result=OuterRef("pk"))
-        .order_by("-probability")
-        .values("probability", "call__short_name")[:1]
-    )
+    top_prob_subquery = CallProbability.objects.filter(classification_result=OuterRef("pk")).order_by("-probability")
 
-    # Fetch results with just the max probability annotated
-    results = (
+    return (
         ClassificationResult.objects.filter(classification_run=run)
-        .select_related("segment")
         .annotate(
-            top_probability=Subquery(top_prob_subquery.values("probability")),
-            top_call=Subquery(top_prob_subquery.values("call__short_name")),
+            top_probability=Subquery(top_prob_subquery.values("probability")[:1]),
+            top_call=Subquery(top_prob_subquery.values("call__short_name")[:1]),
+            has_task=Exists(Task.objects.filter(source_segment=OuterRef("segment_id"))),
         )
+        .filter(has_task=False)
+        .order_by("segment__onset", "id")
+        .values("segment_id", "segment__onset", "segment__offset", "top_call", "top_probability")
     )
 
-    tasks_to_create = []
-    tasks_created = 0
-    tasks_filtered = 0
 
-    for result in results:
-        segment = result.segment
+def create_task_batch_helper(run, batch_name, description, created_by, group, max_confidence=None, keep_empty=False):
+    """
+    Helper function to create a task batch from a classification run.
 
-        # Skip if segment already has a task (no DB query)
-        if segment.id in segments_with_tasks:
-            continue
+    Candidate rows are streamed from get_task_candidates() and inserted with
+    chunked bulk_create, so large runs take a handful of queries in total.
+
+    Args:
+        run: ClassificationRun instance
+        batch_name: Name for the task batch
+        description: Description for the task batch
+        created_by: User creating the batch
+        group: Group for the batch
+        max_confidence: Optional confidence threshold (tasks with higher confidence are filtered out)
+        keep_empty: Keep the batch even if no tasks were created for it
 
-        # Use the annotated top probability (already fetched from DB)
-        if max_confidence is not None and result.top_probability and result.top_probability > max_confidence:
-            tasks_filtered += 1
-            continue
+    Returns:
+        tuple: (batch, tasks_created, tasks_filtered) or (None, 0, tasks_filtered) if no tasks created
+    """
+    recording = run.segmentation.recording
+    wav_file_name = recording.wav_file.name if recording.wav_file else ""
 
-        task_data = Task(
-            wav_file_name=recording.wav_file.name if recording.wav_file else "",
-            onset=segment.onset,
-            offset=segment.offset,
+    with transaction.atomic():
+        batch = TaskBatch.objects.create(
+            name=batch_name,
+            description=description,
+            created_by=created_by,
+            wav_file_name=wav_file_name,
+            wav_file=recording.wav_file,
             species=recording.species,
             project=recording.project,
-            batch=batch,
-            created_by=created_by,
             group=group,
-            label=result.top_call,
-            classification_result=result.top_call,
-            confidence=result.top_probability,
-            status="pending",
-            source_segment=segment,
+            classification_run=run,
         )
-        tasks_to_create.append(task_data)
-        tasks_created += 1
-
-    if tasks_created == 0:
-        batch.delete()
-        return None, 0, 0
 
-    Task.objects.bulk_create(tasks_to_create)
+        tasks_created = 0
+        tasks_filtered = 0
+        tasks_to_create = []
+
+        def flush():
+            Task.objects.bulk_create(tasks_to_create)
+            record_created_tasks(tasks_to_create)
+            tasks_to_create.clear()
+
+        for row in get_task_candidates(run).iterator(chunk_size=TASK_BULK_CREATE_BATCH_SIZE):
+            top_call, top_probability = row["top_call"], row["top_probability"]
+
+            # Skip if confidence threshold is set and this result's confidence is too high
+            if max_confidence is not None and top_probability and top_probability > max_confidence:
+                tasks_filtered += 1
+                continue
+
+            # Skip if call object is missing (broken foreign key)
+            if top_probability is not None and not top_call:
+                continue
+
+            tasks_to_create.append(
+                Task(
+                    wav_file_name=wav_file_name,
+                    onset=row["segment__onset"],
+                    offset=row["segment__offset"],
+                    species=recording.species,
+                    project=recording.project,
+                    batch=batch,
+                    created_by=created_by,
+                    group=group,
+                    label=top_call or "",
+                    classification_result=top_call or "",
+                    confidence=top_probability,
+                    status="pending",
+                    source_segment_id=row["segment_id"],
+                )
+            )
+            tasks_created += 1
+
+            if len(tasks_to_create) >= TASK_BULK_CREATE_BATCH_SIZE:
+                flush()
+
+        if tasks_to_create:
+            flush()
+
+        if tasks_created == 0 and not keep_empty:
+            batch.delete()
+            return None, 0, tasks_filtered
 
     return batch, tasks_created, tasks_filtered
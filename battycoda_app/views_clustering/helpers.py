@@ -1,6 +1,7 @@
 """Helper functions for clustering views."""
 
 from ..models.clustering import ClusteringAlgorithm
+from ..utils_modules.lookup_cache import CLUSTERING_ALGORITHMS, cached_lookup
 
 
 def get_available_algorithms(user):
@@ -9,18 +10,23 @@ def get_available_algorithms(user):
 
     Returns algorithms owned by the user's group plus global algorithms (no group).
     For users without a group, returns algorithms they created plus global ones.
+    The list is cached and invalidated whenever an algorithm is saved or deleted.
     """
     group = user.profile.group
 
-    if group:
-        user_algorithms = ClusteringAlgorithm.objects.filter(is_active=True, group=group).order_by("name")
-    else:
-        user_algorithms = ClusteringAlgorithm.objects.filter(is_active=True, created_by=user).order_by("name")
+    def compute():
+        if group:
+            user_algorithms = ClusteringAlgorithm.objects.filter(is_active=True, group=group).order_by("name")
+        else:
+            user_algorithms = ClusteringAlgorithm.objects.filter(is_active=True, created_by=user).order_by("name")
 
-    # Add global algorithms (those without a group) that aren't already included
-    user_algorithm_ids = [a.id for a in user_algorithms]
-    global_algorithms = ClusteringAlgorithm.objects.filter(is_active=True, group__isnull=True).exclude(
-        id__in=user_algorithm_ids
-    )
+        # Add global algorithms (those without a group) that aren't already included
+        user_algorithm_ids = [a.id for a in user_algorithms]
+        global_algorithms = ClusteringAlgorithm.objects.filter(is_active=True, group__isnull=True).exclude(
+            id__in=user_algorithm_ids
+        )
 
-    return list(user_algorithms) + list(global_algorithms)
+        return list(user_algorithms) + list(global_algorithms)
+
+    key = f"group:{group.id}" if group else f"user:{user.id}"
+    return cached_lookup(CLUSTERING_ALGORITHMS, key, compute)
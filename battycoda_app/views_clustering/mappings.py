@@ -10,6 +10,7 @@ from django.views.decorators.http import require_POST
 
 from ..models import Call
 from ..models.clustering import Cluster, ClusterCallMapping, ClusteringRun, SegmentCluster
+from ..utils_modules.columnar_export import COLUMNAR_FORMATS, cluster_assignments_table, columnar_export_response
 from .permissions import check_clustering_permission
 
 
@@ -47,7 +48,7 @@ def _generate_clusters_csv(clustering_run):
 
 @login_required
 def export_clusters(request, run_id):
-    """Export cluster data as streaming CSV."""
+    """Export cluster data as streaming CSV, or as Parquet/Arrow with ?format=parquet|arrow."""
     clustering_run = get_object_or_404(ClusteringRun, id=run_id)
 
     error = check_clustering_permission(
@@ -60,6 +61,10 @@ def export_clusters(request, run_id):
         messages.error(request, "Clustering run is not yet completed")
         return redirect("battycoda_app:clustering_run_detail", run_id=clustering_run.id)
 
+    export_format = request.GET.get("format", "csv")
+    if export_format in COLUMNAR_FORMATS:
+        return columnar_export_response(export_format, cluster_assignments_table(clustering_run), f"clusters_{run_id}")
+
     response = StreamingHttpResponse(_generate_clusters_csv(clustering_run), content_type="text/csv")
     response["Content-Disposition"] = f'attachment; filename="clusters_{run_id}.csv"'
     return response
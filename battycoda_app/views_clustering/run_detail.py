@@ -6,6 +6,7 @@ from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
 
 from ..models.clustering import Cluster, ClusteringRun
+from ..utils_modules.progress_reporter import apply_live_progress
 from ..utils_modules.validation import get_int_param
 from .permissions import check_clustering_permission
 
@@ -52,6 +53,8 @@ def clustering_run_status(request, run_id):
     if error:
         return error
 
+    apply_live_progress(clustering_run)
+
     return JsonResponse(
         {
             "status": clustering_run.status,
@@ -2,14 +2,16 @@
 Dashboard view for the BattyCoda application.
 """
 
+from collections import defaultdict
 from datetime import timedelta
 
-from django.db.models import Count
+from django.db.models import Count, Q, Sum
 from django.shortcuts import redirect, render
 from django.utils import timezone
 
 from .models.organization import Project
 from .models.task import Task, TaskBatch
+from .models.task_stats import DailyAnnotationCount, ProjectTaskCounter
 from .models.user import GroupInvitation
 
 
@@ -45,23 +47,24 @@ def _get_projects_with_tasks(profile):
     """Get projects that have pending tasks"""
     if profile.group:
         projects = Project.objects.filter(group=profile.group)
+        counters = ProjectTaskCounter.objects.filter(project__group=profile.group, group=profile.group)
     else:
         projects = Project.objects.filter(created_by=profile.user)
+        counters = ProjectTaskCounter.objects.filter(project__created_by=profile.user, created_by=profile.user)
+
+    # Task counts per project come from the rollup table in a single query
+    counts = {
+        row["project"]: (row["total"], row["done"])
+        for row in counters.values("project").annotate(total=Sum("total_count"), done=Sum("done_count"))
+    }
 
     projects_with_tasks = []
     for project in projects:
-        # Get tasks for this project
-        if profile.group:
-            tasks = Task.objects.filter(project=project, group=profile.group)
-        else:
-            tasks = Task.objects.filter(project=project, created_by=profile.user)
-
-        total_tasks = tasks.count()
-        if total_tasks == 0:
+        total_tasks, completed_tasks = counts.get(project.id, (0, 0))
+        if total_tasks <= 0:
             continue
 
-        pending_tasks = tasks.filter(is_done=False).count()
-        completed_tasks = total_tasks - pending_tasks
+        pending_tasks = total_tasks - completed_tasks
 
         if pending_tasks > 0:  # Only show projects with pending work
             progress_percentage = int((completed_tasks / total_tasks) * 100) if total_tasks > 0 else 0
@@ -74,115 +77,116 @@ def _get_projects_with_tasks(profile):
     return projects_with_tasks
 
 
+def _count_aggregates(today):
+    """Sum expressions for today's, this week's and all-time annotation counts"""
+    week_start = today - timedelta(days=today.weekday())
+    return {
+        "today": Sum("count", filter=Q(day=today), default=0),
+        "this_week": Sum("count", filter=Q(day__gte=week_start), default=0),
+        "total": Sum("count", default=0),
+    }
+
+
 def _get_my_work_stats(user, profile):
     """Get user's work statistics"""
     now = timezone.now()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_start = today_start - timedelta(days=today_start.weekday())
+    today = timezone.localdate()
 
-    # Get base query for user's tasks
+    # Get base query for user's tasks and daily annotation counts
     if profile.group:
         my_tasks = Task.objects.filter(annotated_by=user, group=profile.group)
+        my_days = DailyAnnotationCount.objects.filter(user=user, group=profile.group)
     else:
         my_tasks = Task.objects.filter(annotated_by=user)
+        my_days = DailyAnnotationCount.objects.filter(user=user)
 
     # Calculate stats
-    today = my_tasks.filter(annotated_at__gte=today_start, is_done=True).count()
-    this_week = my_tasks.filter(annotated_at__gte=week_start, is_done=True).count()
-    total = my_tasks.filter(is_done=True).count()
+    stats = my_days.aggregate(**_count_aggregates(today))
 
     # Calculate streak
     streak = _calculate_streak(user, profile)
 
     # Get recently worked on batches
-    recent_batches_data = (
+    recent_batches_data = list(
         my_tasks.filter(annotated_at__gte=now - timedelta(days=7), batch__isnull=False, is_done=True)
         .values("batch")
         .annotate(count=Count("id"))
         .order_by("-count")[:5]
     )
+    batches = TaskBatch.objects.select_related("project").in_bulk([row["batch"] for row in recent_batches_data])
 
-    recent_batches = []
-    for batch_data in recent_batches_data:
-        batch = TaskBatch.objects.select_related("project").get(id=batch_data["batch"])
-        recent_batches.append({"batch": batch, "count": batch_data["count"]})
-
-    return {"today": today, "this_week": this_week, "total": total, "streak": streak, "recent_batches": recent_batches}
-
-
-def _calculate_streak(user, profile):
-    """Calculate consecutive days of task completion"""
-    # Get base query
-    if profile.group:
-        tasks = Task.objects.filter(annotated_by=user, group=profile.group)
-    else:
-        tasks = Task.objects.filter(annotated_by=user)
-
-    # Get dates when user completed tasks
-    completed_dates = (
-        tasks.filter(is_done=True, annotated_at__isnull=False)
-        .values_list("annotated_at", flat=True)
-        .order_by("-annotated_at")
-    )
+    recent_batches = [{"batch": batches[row["batch"]], "count": row["count"]} for row in recent_batches_data]
 
-    if not completed_dates:
-        return 0
+    return {
+        "today": stats["today"],
+        "this_week": stats["this_week"],
+        "total": stats["total"],
+        "streak": streak,
+        "recent_batches": recent_batches,
+    }
 
-    # Convert to date objects and get unique dates
-    dates = sorted({dt.date() for dt in completed_dates}, reverse=True)
 
-    if not dates:
-        return 0
+def _streak_from_days(days):
+    """Count consecutive days of activity ending today or yesterday.
 
-    # Check if there's activity today or yesterday (streak is still alive)
-    today = timezone.now().date()
+    Args:
+        days: Distinct active dates, most recent first
+    """
+    today = timezone.localdate()
     yesterday = today - timedelta(days=1)
 
-    if dates[0] not in [today, yesterday]:
-        return 0  # Streak broken
-
-    # Count consecutive days
-    streak = 1
-    current_date = dates[0]
-
-    for date in dates[1:]:
-        expected_date = current_date - timedelta(days=1)
-        if date == expected_date:
-            streak += 1
-            current_date = date
-        else:
+    streak = 0
+    expected_date = None
+    for day in days:
+        if expected_date is None:
+            if day not in [today, yesterday]:
+                return 0  # Streak broken
+        elif day != expected_date:
             break
+        streak += 1
+        expected_date = day - timedelta(days=1)
 
     return streak
 
 
+def _calculate_streak(user, profile):
+    """Calculate consecutive days of task completion"""
+    days = DailyAnnotationCount.objects.filter(user=user, count__gt=0)
+    if profile.group:
+        days = days.filter(group=profile.group)
+
+    return _streak_from_days(days.values_list("day", flat=True).distinct().order_by("-day"))
+
+
 def _get_leaderboard(group, current_user):
     """Get leaderboard for the group"""
     from django.contrib.auth.models import User
 
-    now = timezone.now()
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    week_start = today_start - timedelta(days=today_start.weekday())
+    today = timezone.localdate()
 
     # Get all users in the group
     group_users = User.objects.filter(profile__group=group)
 
+    # One aggregate over the daily rollup for every member's counts
+    group_days = DailyAnnotationCount.objects.filter(group=group, user__profile__group=group)
+    counts = {row["user"]: row for row in group_days.values("user").annotate(**_count_aggregates(today))}
+
+    # One read of the active days for every member's streak
+    active_days = defaultdict(list)
+    for user_id, day in group_days.filter(count__gt=0).order_by("user", "-day").values_list("user", "day"):
+        active_days[user_id].append(day)
+
     leaderboard = []
     for user in group_users:
-        user_tasks = Task.objects.filter(annotated_by=user, group=group)
-
-        today = user_tasks.filter(annotated_at__gte=today_start, is_done=True).count()
-        this_week = user_tasks.filter(annotated_at__gte=week_start, is_done=True).count()
-        total = user_tasks.filter(is_done=True).count()
-        streak = _calculate_streak(user, user.profile)
+        user_counts = counts.get(user.id, {})
 
         leaderboard.append(
             {
                 "username": user.username,
-                "today": today,
-                "this_week": this_week,
-                "total": total,
-                "streak": streak,
+                "today": user_counts.get("today", 0),
+                "this_week": user_counts.get("this_week", 0),
+                "total": user_counts.get("total", 0),
+                "streak": _streak_from_days(active_days[user.id]),
                 "is_current_user": user == current_user,
             }
         )
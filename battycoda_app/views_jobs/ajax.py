@@ -6,9 +6,11 @@ from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 
 from battycoda_app.models import Segmentation
+from battycoda_app.models.batch_upload import BatchUploadJob
 from battycoda_app.models.classification import ClassificationRun, ClassifierTrainingJob
 from battycoda_app.models.clustering import ClusteringRun
 from battycoda_app.models.spectrogram import SpectrogramJob
+from battycoda_app.utils_modules.progress_reporter import apply_live_progress
 
 
 def job_status_api_view(request):
@@ -22,6 +24,7 @@ def job_status_api_view(request):
         "training_jobs": [],
         "clustering_jobs": [],
         "spectrogram_jobs": [],
+        "batch_upload_jobs": [],
     }
 
     if profile.group:
@@ -40,6 +43,9 @@ def job_status_api_view(request):
             spectrogram_jobs = SpectrogramJob.objects.filter(
                 recording__group=profile.group, status__in=["pending", "in_progress"]
             )
+            batch_upload_jobs = BatchUploadJob.objects.filter(
+                group=profile.group, status__in=["pending", "in_progress"]
+            )
         else:
             # Regular user sees only their own jobs
             segmentations = Segmentation.objects.filter(
@@ -58,6 +64,18 @@ def job_status_api_view(request):
             spectrogram_jobs = SpectrogramJob.objects.filter(
                 created_by=request.user, status__in=["pending", "in_progress"]
             )
+            batch_upload_jobs = BatchUploadJob.objects.filter(
+                created_by=request.user, status__in=["pending", "in_progress"]
+            )
+
+        segmentations = list(segmentations)
+        classification_runs = list(classification_runs)
+        training_jobs = list(training_jobs)
+        clustering_runs = list(clustering_runs)
+        spectrogram_jobs = list(spectrogram_jobs)
+
+        # Show the latest progress reported by the workers rather than the last one written to the database
+        apply_live_progress(*segmentations, *classification_runs, *training_jobs, *clustering_runs, *spectrogram_jobs)
 
         # Format segmentation jobs
         for seg in segmentations:
@@ -124,6 +142,19 @@ def job_status_api_view(request):
                 }
             )
 
+        # Format batch upload jobs
+        for job in batch_upload_jobs:
+            jobs_status["batch_upload_jobs"].append(
+                {
+                    "id": job.id,
+                    "name": f"Batch upload: {job.name}",
+                    "status": job.status,
+                    "created_at": job.created_at.isoformat(),
+                    "progress": job.progress,
+                    "url": "/recordings/",
+                }
+            )
+
     return JsonResponse(jobs_status)
 
 
@@ -201,6 +232,18 @@ def cancel_job_view(request, job_type, job_id):
                 job.save()
                 return JsonResponse({"success": True, "message": "Spectrogram job cancelled"})
 
+        elif job_type == "batch_upload":
+            job = BatchUploadJob.objects.get(id=job_id)
+            # Check permissions
+            if job.created_by != request.user and not (profile.is_current_group_admin and job.group == profile.group):
+                return JsonResponse({"success": False, "error": "Permission denied"})
+
+            # Cancel the job if possible; files already ingested are kept
+            if job.status in ["pending", "in_progress"]:
+                job.status = "cancelled"
+                job.save(update_fields=["status", "updated_at"])
+                return JsonResponse({"success": True, "message": "Batch upload job cancelled"})
+
         else:
             return JsonResponse({"success": False, "error": "Invalid job type"})
 
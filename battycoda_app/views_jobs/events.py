@@ -0,0 +1,138 @@
+"""
+Server-Sent Events stream of background job progress.
+
+Pages showing running jobs open an EventSource on this view instead of polling
+the job status views. Events come from the progress bus (see
+utils_modules/progress_bus.py).
+
+The view is async. In production it is served by the ASGI application
+(config/asgi.py, the battycoda-events service), where an open stream only
+waits on the event loop instead of holding a web server thread. Under WSGI,
+as with the development server, it falls back to a blocking stream, since
+Django would otherwise buffer the whole async stream before sending it.
+"""
+
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from redis.exceptions import RedisError
+
+from battycoda_app.utils_modules.progress_bus import subscribe, subscribe_async
+
+# Seconds between keep-alive comments, so proxies don't close an idle stream
+HEARTBEAT_SECONDS = 15
+
+# Delay before the browser reconnects after the stream ends, in milliseconds
+RECONNECT_MS = 2000
+
+
+def _parse_watched_jobs(values):
+    """Parse "type:id" job parameters into a set of (type, id) pairs."""
+    watched = set()
+    for value in values:
+        job_type, _, job_id = value.partition(":")
+        if job_id.isdigit():
+            watched.add((job_type, int(job_id)))
+    return watched
+
+
+def _format_event(message, user_id, show_group_jobs, watched):
+    """
+    Return the SSE message for a pub/sub message, or None if the user may not see it.
+
+    Group events are shown to group admins; other members only see their own
+    jobs and the jobs they are watching on a detail page.
+    """
+    data = message["data"].decode() if isinstance(message["data"], bytes) else message["data"]
+    event = json.loads(data)
+    if show_group_jobs or event.get("user_id") == user_id or (event.get("type"), event.get("id")) in watched:
+        return f"event: progress\ndata: {data}\n\n"
+    return None
+
+
+def _event_stream(pubsub, user_id, show_group_jobs, watched, duration):
+    """Yield SSE messages for the progress events a user may see, until duration seconds have passed."""
+    deadline = time.monotonic() + duration
+    try:
+        yield f"retry: {RECONNECT_MS}\n\n"
+        while time.monotonic() < deadline:
+            message = pubsub.get_message(timeout=HEARTBEAT_SECONDS)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            event = _format_event(message, user_id, show_group_jobs, watched)
+            if event:
+                yield event
+    except RedisError:
+        # The browser reconnects, and falls back to polling if Redis stays down
+        return
+    finally:
+        pubsub.close()
+
+
+async def _async_event_stream(pubsub, user_id, show_group_jobs, watched, duration):
+    """Async version of _event_stream, for the ASGI application."""
+    deadline = time.monotonic() + duration
+    try:
+        yield f"retry: {RECONNECT_MS}\n\n"
+        while time.monotonic() < deadline:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=HEARTBEAT_SECONDS)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+
+            event = _format_event(message, user_id, show_group_jobs, watched)
+            if event:
+                yield event
+    except RedisError:
+        return
+    finally:
+        await pubsub.aclose()
+
+
+def _stream_scope(user):
+    """Return the user's current group ID and whether they see all of its jobs."""
+    profile = user.profile
+    return profile.group_id, bool(profile.group_id and profile.is_current_group_admin)
+
+
+@login_required
+async def job_events_view(request):
+    """
+    Stream progress events for the user's jobs as Server-Sent Events.
+
+    Query parameters:
+        job: "type:id" of a job to follow regardless of who created it (repeatable)
+    """
+    user = await request.auser()
+    group_id, show_group_jobs = await sync_to_async(_stream_scope)(user)
+    watched = _parse_watched_jobs(request.GET.getlist("job"))
+
+    try:
+        if isinstance(request, ASGIRequest):
+            pubsub = await subscribe_async(user.id, group_id)
+            make_stream = _async_event_stream
+        else:
+            pubsub = await sync_to_async(subscribe)(user.id, group_id)
+            make_stream = _event_stream
+    except RedisError:
+        return JsonResponse({"success": False, "error": "Job events are unavailable"}, status=503)
+
+    stream = make_stream(
+        pubsub,
+        user.id,
+        show_group_jobs=show_group_jobs,
+        watched=watched,
+        duration=settings.JOB_EVENTS_STREAM_SECONDS,
+    )
+    response = StreamingHttpResponse(stream, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -6,6 +6,7 @@ from django.shortcuts import get_object_or_404, redirect, render
 from .forms import ProjectForm
 from .models.organization import Project
 from .models.task import Task, TaskBatch
+from .models.task_stats import forget_tasks
 
 # Set up logging
 
@@ -155,7 +156,8 @@ def delete_project_view(request, project_id):
                     # Store name for the success message
                     project_name = project.name
 
-                    # Delete the project
+                    # Take the project's tasks out of the dashboard rollups, then delete the project
+                    forget_tasks(Task.objects.filter(project=project))
                     project.delete()
 
                     messages.success(request, f"Successfully deleted project: {project_name}")
@@ -3,16 +3,15 @@ CRUD views for creating, editing, and deleting recordings.
 """
 
 import logging
-import os
 import tempfile
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 
+from .audio.modules.file_utils import create_recording_from_file
 from .audio.utils import get_audio_duration, split_audio_file
 from .forms import RecordingForm
 from .forms_edit import RecordingEditForm
@@ -73,31 +72,21 @@ def create_recording_view(request):
 
                         # Create a recording for each chunk
                         for i, chunk_path in enumerate(chunk_paths):
-                            with open(chunk_path, "rb") as chunk_file:
-                                chunk_file_name = os.path.basename(chunk_path)
-                                chunk_django_file = SimpleUploadedFile(
-                                    chunk_file_name, chunk_file.read(), content_type="audio/wav"
-                                )
-
-                                # Create fresh recording for each chunk
-                                recording = Recording(
-                                    name=f"{original_name} (Part {i + 1}/{len(chunk_paths)})",
-                                    wav_file=chunk_django_file,
-                                    description=description,
-                                    recorded_date=recorded_date,
-                                    location=location,
-                                    equipment=equipment,
-                                    environmental_conditions=environmental_conditions,
-                                    species=species,
-                                    project=project,
-                                    created_by=request.user,
-                                    group=profile.group,
-                                )
-                                recording.save()
-                                recording.file_ready = True
-                                recording.save(update_fields=["file_ready"])
-
-                                recordings_created.append(recording)
+                            # Move the chunk into storage instead of reading it into memory
+                            recording = create_recording_from_file(
+                                chunk_path,
+                                name=f"{original_name} (Part {i + 1}/{len(chunk_paths)})",
+                                description=description,
+                                recorded_date=recorded_date,
+                                location=location,
+                                equipment=equipment,
+                                environmental_conditions=environmental_conditions,
+                                species=species,
+                                project=project,
+                                created_by=request.user,
+                                group=profile.group,
+                            )
+                            recordings_created.append(recording)
 
                         # Clean up chunk files
                         for chunk_path in chunk_paths:
@@ -8,7 +8,7 @@ from django.shortcuts import get_object_or_404, redirect, render
 
 from .models import Recording
 from .models.organization import Project
-from .views_recordings_duplicates import has_duplicate_recordings
+from .utils_modules.recording_utils import has_duplicate_recordings
 from .views_segmentation.spectrogram_data import get_spectrogram_status
 
 
@@ -4,10 +4,9 @@ Views for detecting and managing duplicate recordings.
 
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count
 from django.shortcuts import redirect, render
 
-from .models.recording import Recording
+from .utils_modules.recording_utils import get_duplicate_recording_groups
 
 
 @login_required
@@ -24,37 +23,22 @@ def detect_duplicate_recordings_view(request):
         messages.error(request, "You must be assigned to a group to perform this action.")
         return redirect("battycoda_app:recording_list")
 
-    # Get all recordings in the group
-    recordings = Recording.objects.filter(group=profile.group)
+    # Group recordings with identical audio content, whatever their names
+    duplicate_groups = get_duplicate_recording_groups(profile.group)
 
-    # Find duplicates based on recording name and duration
-    # First, we'll group them by name and duration and count occurrences
-    duplicate_groups = (
-        recordings.exclude(duration__isnull=True)  # Skip recordings without duration
-        .values("name", "duration")  # Group by name and duration
-        .annotate(count=Count("id"))  # Count occurrences
-        .filter(count__gt=1)  # Keep only groups with more than one recording
-    )
-
-    # Get the actual recording objects for each duplicate group
-    duplicate_recordings = []
-    for group in duplicate_groups:
-        recordings_in_group = Recording.objects.filter(
-            group=profile.group, name=group["name"], duration=group["duration"]
-        ).order_by("-created_at")  # Most recent first
-
-        duplicate_recordings.append(
-            {
-                "name": group["name"],
-                "duration": group["duration"],
-                "count": group["count"],
-                "recordings": recordings_in_group,
-            }
-        )
+    duplicate_recordings = [
+        {
+            "name": recordings[0].name,
+            "duration": recordings[0].duration,
+            "count": len(recordings),
+            "recordings": recordings,  # Most recent first
+        }
+        for recordings in duplicate_groups
+    ]
 
     context = {
         "duplicate_recordings": duplicate_recordings,
-        "total_duplicate_count": sum(group["count"] - 1 for group in duplicate_groups),
+        "total_duplicate_count": sum(len(recordings) - 1 for recordings in duplicate_groups),
     }
 
     return render(request, "recordings/duplicate_recordings.html", context)
@@ -90,17 +74,3 @@ def remove_duplicate_recordings(request):
     )
 
     return redirect("battycoda_app:recording_list")
-
-
-def has_duplicate_recordings(group):
-    """Check if a group has any duplicate recordings"""
-    duplicates_exist = (
-        Recording.objects.filter(group=group)
-        .exclude(duration__isnull=True)
-        .values("name", "duration")
-        .annotate(count=Count("id"))
-        .filter(count__gt=1)
-        .exists()
-    )
-
-    return duplicates_exist
@@ -0,0 +1,139 @@
+"""
+Compact segment data endpoint for the segmentation editor.
+
+Serves segment IDs and onset/offset times as typed columns instead of
+embedding a JSON list of every segment in the page template.
+"""
+
+import hashlib
+import json
+import struct
+
+import numpy as np
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Max
+from django.http import HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, redirect
+from django.utils.cache import get_conditional_response
+
+from battycoda_app.models import Segment, Segmentation
+from battycoda_app.utils_modules.columnar_export import (
+    columnar_export_response,
+    parse_columnar_format,
+    segmentation_table,
+)
+from battycoda_app.utils_modules.validation import safe_float
+
+
+def get_segments_etag(segmentation):
+    """Build an ETag that changes whenever segments are added, edited or removed.
+
+    Segment saves bump segmentation.updated_at; the count and latest segment
+    update catch bulk inserts and deletes that bypass Segment.save().
+    """
+    stats = Segment.objects.filter(segmentation=segmentation).aggregate(count=Count("id"), latest=Max("updated_at"))
+    latest = stats["latest"].isoformat() if stats["latest"] else ""
+    fingerprint = f"{segmentation.id}:{segmentation.updated_at.isoformat()}:{stats['count']}:{latest}"
+    return f'"{hashlib.md5(fingerprint.encode()).hexdigest()}"'
+
+
+def get_segment_arrays(segmentation, start=None, end=None):
+    """Return (ids, onsets, offsets) numpy arrays for a segmentation, ordered by onset.
+
+    Args:
+        segmentation: Segmentation model instance
+        start: Optional window start in seconds; segments ending before it are skipped
+        end: Optional window end in seconds; segments starting after it are skipped
+    """
+    queryset = Segment.objects.filter(segmentation=segmentation)
+    if start is not None:
+        queryset = queryset.filter(offset__gt=start)
+    if end is not None:
+        queryset = queryset.filter(onset__lt=end)
+
+    rows = queryset.order_by("onset").values_list("id", "onset", "offset").iterator(chunk_size=10000)
+    data = np.fromiter(rows, dtype=[("id", "<i8"), ("onset", "<f8"), ("offset", "<f8")])
+    return data["id"], data["onset"], data["offset"]
+
+
+@login_required
+def segmentation_segments_data_view(request, segmentation_id):
+    """
+    API endpoint serving all segments of a segmentation as typed arrays.
+
+    Optional URL parameters:
+    - start / end: Only return segments overlapping this time window (seconds)
+    - format: "json" (default) for columnar JSON, "binary" for packed arrays
+
+    Binary format: [4 bytes: metadata length][metadata JSON][int64 ids][float64 onsets][float64 offsets],
+    all little-endian. Responses carry an ETag so unchanged segmentations revalidate with a 304.
+    """
+    segmentation = get_object_or_404(Segmentation.objects.select_related("recording"), id=segmentation_id)
+    recording = segmentation.recording
+
+    # Check permissions
+    profile = request.user.profile
+    if recording.created_by != request.user and (not profile.group or recording.group != profile.group):
+        return JsonResponse({"success": False, "error": "Permission denied"}, status=403)
+
+    start = safe_float(request.GET.get("start"))
+    end = safe_float(request.GET.get("end"))
+    output_format = request.GET.get("format", "json")
+
+    etag = get_segments_etag(segmentation)
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    ids, onsets, offsets = get_segment_arrays(segmentation, start=start, end=end)
+
+    if output_format == "binary":
+        metadata = {"segmentation_id": segmentation.id, "count": int(len(ids)), "start": start, "end": end}
+        metadata_json = json.dumps(metadata).encode("utf-8")
+
+        response = HttpResponse(content_type="application/octet-stream")
+        response.write(struct.pack("<I", len(metadata_json)))
+        response.write(metadata_json)
+        response.write(ids.tobytes())
+        response.write(onsets.tobytes())
+        response.write(offsets.tobytes())
+    else:
+        response = JsonResponse(
+            {
+                "success": True,
+                "segmentation_id": segmentation.id,
+                "count": int(len(ids)),
+                "ids": ids.tolist(),
+                "onsets": onsets.tolist(),
+                "offsets": offsets.tolist(),
+            }
+        )
+
+    # Private per-user data that must be revalidated, but can be served from cache on a 304
+    response["Cache-Control"] = "private, no-cache"
+    response["ETag"] = etag
+    return response
+
+
+@login_required
+def export_segmentation_view(request, segmentation_id):
+    """Download the segments of a segmentation as a Parquet (default) or Arrow file (?format=arrow)."""
+    segmentation = get_object_or_404(Segmentation.objects.select_related("recording"), id=segmentation_id)
+    recording = segmentation.recording
+
+    # Check permissions
+    profile = request.user.profile
+    if recording.created_by != request.user and (not profile.group or recording.group != profile.group):
+        messages.error(request, "You don't have permission to export this segmentation.")
+        return redirect("battycoda_app:segmentation_list")
+
+    try:
+        export_format = parse_columnar_format(request.GET.get("format"))
+    except ValueError as e:
+        messages.error(request, str(e))
+        return redirect("battycoda_app:segmentation_detail", segmentation_id=segmentation.id)
+
+    return columnar_export_response(
+        export_format, segmentation_table(segmentation), f"segments_{recording.name}_{segmentation.id}"
+    )
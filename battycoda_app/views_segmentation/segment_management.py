@@ -4,11 +4,10 @@ Views for managing segmentations (list, create, detail, delete).
 Individual segment CRUD operations are in segment_crud.py.
 """
 
-import json
-
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 
 from battycoda_app.models import Recording, Segment, Segmentation
 
@@ -105,12 +104,8 @@ def segmentation_detail_view(request, segmentation_id):
         "manually_edited": active_segmentation.manually_edited,
     }
 
-    # Load all segments for JavaScript (frontend handles filtering/pagination)
-    # For very large segmentations, we limit to first 10000 segments to avoid memory issues
-    all_segments = segments_queryset[:10000]
-    segments_json = []
-    for segment in all_segments:
-        segments_json.append({"id": segment.id, "onset": segment.onset, "offset": segment.offset})
+    # Segments themselves are loaded by the frontend from segmentation_segments_data
+    # (columnar, ETag-cached), so the page renders the same regardless of segment count
 
     # Get total segment count for context
     total_segments_count = segments_queryset.count()
@@ -120,7 +115,7 @@ def segmentation_detail_view(request, segmentation_id):
 
     context = {
         "recording": recording,
-        "segments_json": json.dumps(segments_json),
+        "segments_data_url": reverse("battycoda_app:segmentation_segments_data", args=[segmentation.id]),
         "total_segments_count": total_segments_count,
         "active_segmentation": segmentation_info,
         "segmentation": segmentation,
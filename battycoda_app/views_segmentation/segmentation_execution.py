@@ -7,6 +7,7 @@ from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from battycoda_app.audio.modules.segmentation_preview import PREVIEW_MAX_DURATION
 from battycoda_app.models import Recording, Segmentation, SegmentationAlgorithm
 
 
@@ -198,6 +199,7 @@ def auto_segment_recording_view(request, recording_id, algorithm_id=None):
         "smooth_window": algorithm.default_smooth_window if algorithm else 3,
         "threshold_factor": algorithm.default_threshold_factor if algorithm else 0.5,
         "existing_segmentation": existing_segmentation,
+        "preview_max_duration": f"{PREVIEW_MAX_DURATION:g}",
     }
 
     return render(request, "segmentations/auto_segment.html", context)
@@ -1,221 +1,145 @@
 """
 Views for previewing segmentation results on audio recordings.
-"""
 
-import concurrent.futures
-import uuid
+The preview runs entirely in memory on a short slice of the recording (see
+audio.modules.segmentation_preview); nothing is written to the database.
+"""
 
-# Import librosa with caching disabled
-import librosa
-import soundfile as sf
 from django.contrib.auth.decorators import login_required
-from django.core.files.base import ContentFile
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.http import urlencode
 
-from battycoda_app.models import Recording
+from battycoda_app.audio.modules.segmentation_preview import PREVIEW_MAX_DURATION, get_segmentation_preview
+from battycoda_app.models import Recording, SegmentationAlgorithm
 from battycoda_app.utils_modules.validation import safe_float, safe_int
 
-# Cache directories are configured in settings.py
+# Request parameters that select the analysed slice; the spectrogram URL repeats them
+SLICE_PARAMS = ("algorithm", "start_time", "duration", "low_freq", "high_freq")
+
+
+def _get_preview_recording(request, recording_id):
+    """Return the recording if the user may preview it, else None."""
+    recording = get_object_or_404(Recording.all_objects, id=recording_id)
+    profile = request.user.profile
+    if recording.created_by != request.user and (not profile.group or recording.group != profile.group):
+        return None
+    return recording
+
+
+def _parse_slice_params(params, profile):
+    """
+    Validate the parameters that select the analysed slice.
+
+    Returns:
+        dict: start_time, duration, algorithm_type, low_freq and high_freq
+
+    Raises:
+        ValueError: If a parameter is invalid
+    """
+    start_time = safe_float(params.get("start_time"), default=0.0)
+    duration = safe_float(params.get("duration"), default=1.0)
+    low_freq = safe_int(params.get("low_freq"))
+    high_freq = safe_int(params.get("high_freq"))
+
+    if start_time < 0:
+        raise ValueError("Start time must be non-negative")
+    if duration <= 0 or duration > PREVIEW_MAX_DURATION:
+        raise ValueError(f"Duration must be between 0 and {PREVIEW_MAX_DURATION:g} seconds")
+    if low_freq is not None and low_freq <= 0:
+        raise ValueError("Low frequency must be positive")
+    if high_freq is not None and high_freq <= 0:
+        raise ValueError("High frequency must be positive")
+    if low_freq is not None and high_freq is not None and low_freq >= high_freq:
+        raise ValueError("Low frequency must be less than high frequency")
+
+    algorithm_id = safe_int(params.get("algorithm"))
+    if algorithm_id is None:
+        raise ValueError("Algorithm is required")
+    try:
+        algorithm = SegmentationAlgorithm.objects.get(id=algorithm_id, is_active=True)
+    except SegmentationAlgorithm.DoesNotExist:
+        raise ValueError(f"Algorithm with ID {algorithm_id} not found") from None
+    if algorithm.group and (not profile.group or algorithm.group != profile.group):
+        raise ValueError("You don't have permission to use this algorithm")
+
+    return {
+        "start_time": start_time,
+        "duration": duration,
+        "algorithm_type": algorithm.algorithm_type,
+        "low_freq": low_freq,
+        "high_freq": high_freq,
+    }
+
+
+def _load_preview(recording, slice_params):
+    if not recording.wav_file:
+        raise ValueError("Recording has no audio file")
+    return get_segmentation_preview(recording.id, recording.wav_file.path, **slice_params)
 
 
 @login_required
-def create_preview_recording_view(request, recording_id):
+def segmentation_preview_view(request, recording_id):
     """
-    Create a hidden preview recording with a 10-second audio segment,
-    then redirect to the segmentation detail view for maximum code reuse.
+    Segment a slice of a recording in memory and return the detected segments as JSON.
+
+    The filtered envelope of the slice is cached, so repeated requests that only
+    change threshold_factor, min_duration_ms or smooth_window return quickly.
     """
     if request.method != "POST":
         return JsonResponse({"success": False, "error": "Only POST requests allowed"}, status=405)
 
-    # Get the original recording
-    recording = get_object_or_404(Recording.all_objects, id=recording_id)  # Use all_objects in case original is hidden
-
-    # Check permissions
-    profile = request.user.profile
-    if recording.created_by != request.user and (not profile.group or recording.group != profile.group):
+    recording = _get_preview_recording(request, recording_id)
+    if recording is None:
         return JsonResponse({"success": False, "error": "Permission denied"}, status=403)
 
     try:
-        # Get parameters
-        start_time = float(request.POST.get("start_time", 0))
-        duration = float(request.POST.get("duration", 1.0))
-
-        # Get segmentation parameters
-        algorithm_id = request.POST.get("algorithm")
+        slice_params = _parse_slice_params(request.POST, request.user.profile)
         min_duration_ms = safe_float(request.POST.get("min_duration_ms"), default=10)
         smooth_window = safe_int(request.POST.get("smooth_window"), default=3)
-        threshold_factor = float(request.POST.get("threshold_factor", 0.5))
+        threshold_factor = safe_float(request.POST.get("threshold_factor"), default=0.5)
 
-        # Get bandpass filter parameters
-        low_freq = safe_int(request.POST.get("low_freq"))
-        high_freq = safe_int(request.POST.get("high_freq"))
-
-        # Validate parameters
-        if start_time < 0:
-            raise ValueError("Start time must be non-negative")
-        if duration <= 0 or duration > 60:
-            raise ValueError("Duration must be between 0 and 60 seconds")
         if min_duration_ms <= 0:
             raise ValueError("Minimum duration must be positive")
         if smooth_window < 1:
             raise ValueError("Smooth window must be at least 1 sample")
         if threshold_factor <= 0 or threshold_factor > 10:
             raise ValueError("Threshold factor must be between 0 and 10")
-        if low_freq is not None and low_freq <= 0:
-            raise ValueError("Low frequency must be positive")
-        if high_freq is not None and high_freq <= 0:
-            raise ValueError("High frequency must be positive")
-        if low_freq is not None and high_freq is not None and low_freq >= high_freq:
-            raise ValueError("Low frequency must be less than high frequency")
-
-        # Get and validate algorithm
-        if not algorithm_id:
-            raise ValueError("Algorithm is required")
-
-        from battycoda_app.models import SegmentationAlgorithm
-
-        try:
-            algorithm = SegmentationAlgorithm.objects.get(id=int(algorithm_id), is_active=True)
-        except SegmentationAlgorithm.DoesNotExist:
-            raise ValueError(f"Algorithm with ID {algorithm_id} not found") from None
-
-        # Check algorithm access permission
-        if algorithm.group and (not profile.group or algorithm.group != profile.group):
-            raise ValueError("You don't have permission to use this algorithm")
-
-        # Load the audio segment
-        audio_path = recording.wav_file.path
-        y, sr = librosa.load(audio_path, sr=None, offset=start_time, duration=duration)
-
-        if len(y) == 0:
-            return JsonResponse({"success": False, "error": "No audio data in the selected time range"})
-
-        # Calculate actual duration from loaded audio
-        actual_duration = len(y) / sr
-
-        # Create temporary audio file in memory
-        import io
-
-        audio_buffer = io.BytesIO()
-        sf.write(audio_buffer, y, sr, format="WAV", subtype="PCM_16")
-        audio_buffer.seek(0)
-        audio_content = ContentFile(audio_buffer.read())
-
-        # Create hidden preview recording
-        preview_name = f"Preview {recording.name} ({start_time:.1f}s-{start_time + actual_duration:.1f}s)"
-        preview_filename = f"preview_{uuid.uuid4().hex}.wav"
-
-        hidden_recording = Recording.all_objects.create(
-            name=preview_name,
-            description=f"Preview of {recording.name} from {start_time:.1f}s to {start_time + actual_duration:.1f}s",
-            duration=actual_duration,  # Use actual duration from loaded audio
-            sample_rate=int(sr),  # Ensure it's an integer
-            file_ready=True,
-            hidden=True,  # Mark as hidden so it doesn't appear in normal lists
-            species=recording.species,
-            project=recording.project,
-            group=recording.group,
-            created_by=request.user,
-            # Copy metadata
-            recorded_date=recording.recorded_date,
-            location=recording.location,
-            equipment=recording.equipment,
-            environmental_conditions=recording.environmental_conditions,
-        )
-
-        # Save the audio file - ensure it's saved properly
-        hidden_recording.wav_file.save(preview_filename, audio_content, save=False)
-        hidden_recording.save()  # Save the recording after file is attached
-
-        # Create a segmentation for the hidden recording
-        from battycoda_app.models import Segmentation
-
-        preview_segmentation = Segmentation.objects.create(
-            name=f"Preview Segmentation for {preview_name}",
-            recording=hidden_recording,
-            algorithm=algorithm,
-            created_by=request.user,
-            status="in_progress",  # Will be updated when task starts
-            progress=0,
-        )
-
-        # Run spectrogram generation and segmentation in parallel
-        def generate_spectrogram_for_recording():
-            """Generate HDF5 spectrogram for the preview recording."""
-            try:
-                from celery import current_app
-
-                # Call the existing task synchronously (not via Celery delay)
-                task = current_app.tasks[
-                    "battycoda_app.audio.task_modules.spectrogram.hdf5_generation.generate_recording_spectrogram"
-                ]
-                result = task(hidden_recording.id)
-
-                if result.get("status") == "success":
-                    return True
-                else:
-                    print(f"Warning: Spectrogram generation returned non-success: {result}")
-                    return False
-
-            except Exception as e:
-                print(f"Warning: Failed to generate spectrogram for preview recording: {e}")
-                return False
-
-        def run_segmentation_task():
-            """Run segmentation task for the preview recording."""
-            try:
-                from battycoda_app.audio.task_modules.segmentation_tasks import auto_segment_recording_task
-
-                # Run segmentation task directly
-                result = auto_segment_recording_task(
-                    hidden_recording.id,
-                    preview_segmentation.id,
-                    min_duration_ms,
-                    smooth_window,
-                    threshold_factor,
-                    low_freq,
-                    high_freq,
-                )
-
-                # Check the result
-                if result.get("status") != "success":
-                    raise ValueError(f"Segmentation failed: {result.get('message', 'Unknown error')}")
-
-                return result
-
-            except Exception as e:
-                # If segmentation fails, mark as failed
-                preview_segmentation.status = "failed"
-                preview_segmentation.save()
-                raise ValueError(f"Failed to complete segmentation task: {str(e)}") from e
-
-        # Run both tasks in parallel using ThreadPoolExecutor
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            # Submit both tasks
-            spectrogram_future = executor.submit(generate_spectrogram_for_recording)
-            segmentation_future = executor.submit(run_segmentation_task)
-
-            # Wait for both to complete
-            spectrogram_future.result(timeout=60)
-            segmentation_future.result(timeout=60)
-
-        # Redirect to the segmentation detail view
-        segmentation_url = reverse(
-            "battycoda_app:segmentation_detail", kwargs={"segmentation_id": preview_segmentation.id}
-        )
-        return JsonResponse(
-            {
-                "success": True,
-                "preview_url": segmentation_url,
-                "preview_recording_id": hidden_recording.id,
-                "preview_segmentation_id": preview_segmentation.id,
-                "message": "Preview recording created successfully",
-            }
-        )
 
+        preview = _load_preview(recording, slice_params)
+        onsets, offsets = preview.segment(threshold_factor, min_duration_ms, smooth_window)
     except ValueError as e:
         return JsonResponse({"success": False, "error": f"Invalid parameter: {str(e)}"}, status=400)
     except Exception as e:
         return JsonResponse({"success": False, "error": f"Failed to create preview: {str(e)}"}, status=500)
+
+    query = urlencode({key: request.POST[key] for key in SLICE_PARAMS if request.POST.get(key)})
+    spectrogram_url = reverse("battycoda_app:segmentation_preview_spectrogram", kwargs={"recording_id": recording.id})
+    return JsonResponse(
+        {
+            "success": True,
+            "start_time": preview.start_time,
+            "duration": preview.duration,
+            "onsets": onsets,
+            "offsets": offsets,
+            "spectrogram_url": f"{spectrogram_url}?{query}",
+        }
+    )
+
+
+@login_required
+def segmentation_preview_spectrogram_view(request, recording_id):
+    """Return the spectrogram PNG of a preview slice."""
+    recording = _get_preview_recording(request, recording_id)
+    if recording is None:
+        return HttpResponse("Permission denied", status=403)
+
+    try:
+        preview = _load_preview(recording, _parse_slice_params(request.GET, request.user.profile))
+    except ValueError as e:
+        return HttpResponse(f"Invalid parameter: {str(e)}", status=400)
+
+    response = HttpResponse(preview.spectrogram_png, content_type="image/png")
+    response["Cache-Control"] = "private, max-age=3600"
+    return response
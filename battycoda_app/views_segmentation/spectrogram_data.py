@@ -13,6 +13,7 @@ from django.shortcuts import get_object_or_404
 
 from battycoda_app.models import SpectrogramJob
 from battycoda_app.models.recording import Recording
+from battycoda_app.utils_modules.progress_reporter import apply_live_progress
 
 
 def get_spectrogram_status(recording):
@@ -42,6 +43,7 @@ def get_spectrogram_status(recording):
         active_job = SpectrogramJob.objects.filter(recording=recording, status__in=["pending", "in_progress"]).first()
 
         if active_job:
+            apply_live_progress(active_job)
             return {"status": "generating", "url": None, "job": active_job, "progress": active_job.progress}
 
         # Check for completed jobs with file
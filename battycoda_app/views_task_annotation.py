@@ -8,6 +8,7 @@ from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 
 from .models.task import Task
+from .utils_modules.lookup_cache import get_species_calls
 from .utils_modules.path_utils import convert_path_to_os_specific
 
 
@@ -109,19 +110,15 @@ def task_annotation_view(request, task_id):
         call_types.append(task.label)
         call_descriptions[task.label] = "Automatic classification result"
 
-    # Get call types from the species
-    # Get calls from the database
-    calls = species_obj.calls.all()
-    if calls.exists():
-        for call in calls:
-            # Skip if this call type was already added from the task label
-            if call.short_name in call_types:
-                continue
-
-            call_types.append(call.short_name)
-            # Use long_name as the description if available
-            description = call.long_name if call.long_name else ""
-            call_descriptions[call.short_name] = description
+    # Get call types from the species (cached, see utils_modules/lookup_cache.py)
+    for short_name, long_name in get_species_calls(species_obj.id):
+        # Skip if this call type was already added from the task label
+        if short_name in call_types:
+            continue
+
+        call_types.append(short_name)
+        # Use long_name as the description if available
+        call_descriptions[short_name] = long_name or ""
 
     # Note: We don't need to add a fallback "Unknown" here because the template
     # always renders an "Unknown" option at the bottom of the call type list.
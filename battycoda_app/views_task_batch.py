@@ -8,6 +8,8 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
 from django.db import DatabaseError, models
+from django.db.models import Value
+from django.db.models.functions import Coalesce, NullIf
 from django.http import HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
@@ -15,6 +17,8 @@ from django.utils import timezone
 
 from .models.organization import Project
 from .models.task import Task, TaskBatch
+from .utils_modules.columnar_export import COLUMNAR_FORMATS, columnar_export_response, task_batch_table
+from .utils_modules.lookup_cache import get_species_calls
 from .utils_modules.task_export_utils import generate_tasks_csv
 
 logger = logging.getLogger(__name__)
@@ -31,36 +35,111 @@ def user_can_access_batch(user, batch):
     return profile.group and batch.group == profile.group
 
 
-def get_available_call_types(batch):
+# Tasks rendered with the review page, and returned per request by the review tasks endpoint
+REVIEW_PAGE_SIZE = 48
+
+# Columns the review cards need, loaded with only()
+REVIEW_TASK_FIELDS = (
+    "id",
+    "onset",
+    "offset",
+    "label",
+    "classification_result",
+    "confidence",
+    "wav_file_name",
+    "batch",
+    "species__name",
+    "project__name",
+    "annotated_by__username",
+)
+
+
+def annotate_display_label(tasks):
+    """Annotate tasks with the label shown for them: the expert label, or the classification result without one."""
+    return tasks.annotate(display_label=Coalesce(NullIf("label", Value("")), "classification_result"))
+
+
+def get_call_type_counts(batch):
+    """Count the tasks of a batch per displayed label with a single aggregate query.
+
+    Returns a dict of call type -> task count; unlabeled tasks are counted under None.
+    """
+    counts = {}
+    rows = (
+        annotate_display_label(Task.objects.filter(batch=batch))
+        .order_by()
+        .values_list("display_label")
+        .annotate(count=models.Count("id"))
+    )
+    for call_type, count in rows:
+        counts[call_type or None] = counts.get(call_type or None, 0) + count
+    return counts
+
+
+def get_available_call_types(batch, call_type_counts=None):
     """Collect all available call types for a batch.
 
-    Returns a sorted list starting with 'all', followed by call types from
-    the species definition, then any additional types found in task data.
+    Returns a list starting with 'all', followed by the sorted call types from
+    the species definition and any additional types found in task data.
     """
-    available = ["all"]
+    if call_type_counts is None:
+        call_type_counts = get_call_type_counts(batch)
+
+    call_types = {call_type for call_type in call_type_counts if call_type}
 
     # Add call types from species definition
     if batch.species:
-        species_calls = list(batch.species.calls.values_list("short_name", flat=True))
-        available.extend(species_calls)
+        call_types.update(short_name for short_name, _ in get_species_calls(batch.species_id) if short_name)
+
+    return ["all"] + sorted(call_types)
+
 
-    # Add call types found in task data (efficient query for just these columns)
-    task_call_types = set()
-    for label, classification_result in batch.tasks.values_list("label", "classification_result"):
-        if label:
-            task_call_types.add(label)
-        if classification_result:
-            task_call_types.add(classification_result)
+def get_review_tasks_page(batch, call_type="all", after_id=None, limit=None):
+    """Return one page of the tasks shown on the review page, using keyset pagination.
 
-    # Merge in any types not already present
-    for call_type in task_call_types:
-        if call_type not in available:
-            available.append(call_type)
+    Tasks are ordered by ID and a page starts after the last ID of the previous
+    one, so every page is an index range scan on (batch, id) however deep into
+    the batch it is, unlike OFFSET pagination.
 
-    # Remove None values and sort (keeping 'all' handling simple by filtering)
-    available = [ct for ct in available if ct]
-    available.sort()
-    return available
+    Args:
+        batch: The TaskBatch to page through
+        call_type: Only include tasks displayed with this label, or "all"
+        after_id: ID of the last task of the previous page
+        limit: Page size (defaults to REVIEW_PAGE_SIZE)
+
+    Returns:
+        tuple: (list of Task objects annotated with display_label,
+                ID to pass as after_id for the next page, or None on the last page)
+    """
+    limit = limit or REVIEW_PAGE_SIZE
+    tasks = annotate_display_label(Task.objects.filter(batch=batch))
+    if call_type != "all":
+        tasks = tasks.filter(display_label=call_type)
+    if after_id:
+        tasks = tasks.filter(id__gt=after_id)
+
+    tasks = list(
+        tasks.select_related("species", "project", "annotated_by").only(*REVIEW_TASK_FIELDS).order_by("id")[: limit + 1]
+    )
+    has_more = len(tasks) > limit
+    tasks = tasks[:limit]
+    return tasks, tasks[-1].id if has_more else None
+
+
+def review_task_data(task, batch, username):
+    """Serialize a task for a review card."""
+    # All tasks of the page share the batch; avoid loading it once per task
+    task.batch = batch
+    return {
+        "id": task.id,
+        "onset": task.onset,
+        "offset": task.offset,
+        "display_label": task.display_label or "",
+        "confidence": task.confidence,
+        "annotated_by": task.annotated_by.username if task.annotated_by else None,
+        "spectrogram_url": build_task_spectrogram_url(task, username),
+        "annotation_url": reverse("battycoda_app:annotate_task", args=[task.id]),
+    }
 
 
 def build_task_spectrogram_url(task, fallback_username):
@@ -173,7 +252,7 @@ def task_batch_detail_view(request, batch_id):
 
 @login_required
 def export_task_batch_view(request, batch_id):
-    """Export task batch results to CSV"""
+    """Export task batch results to CSV, or to Parquet/Arrow with ?format=parquet|arrow"""
     # Get the batch by ID
     batch = get_object_or_404(TaskBatch, id=batch_id)
 
@@ -181,6 +260,13 @@ def export_task_batch_view(request, batch_id):
         messages.error(request, "You don't have permission to export this batch.")
         return redirect("battycoda_app:task_batch_list")
 
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    export_format = request.GET.get("format", "csv")
+    if export_format in COLUMNAR_FORMATS:
+        return columnar_export_response(
+            export_format, task_batch_table(batch), f"taskbatch_{batch.id}_{batch.name.replace(' ', '_')}_{timestamp}"
+        )
+
     # Get tasks with ascending ID order
     tasks = Task.objects.filter(batch=batch).order_by("id")
 
@@ -188,7 +274,6 @@ def export_task_batch_view(request, batch_id):
     csv_content = generate_tasks_csv(tasks)
 
     # Create HTTP response
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"taskbatch_{batch.id}_{batch.name.replace(' ', '_')}_{timestamp}.csv"
     response = HttpResponse(content_type="text/csv")
     response["Content-Disposition"] = f'attachment; filename="{filename}"'
@@ -217,8 +302,12 @@ def check_taskbatch_name(request):
 
 @login_required
 def task_batch_review_view(request, batch_id):
-    """Interface for reviewing and relabeling tasks in a batch by call type"""
-    batch = get_object_or_404(TaskBatch, id=batch_id)
+    """Interface for reviewing and relabeling tasks in a batch by call type
+
+    Only the first page of tasks is rendered; the page loads the rest from
+    task_batch_review_tasks_view as the user scrolls.
+    """
+    batch = get_object_or_404(TaskBatch.objects.select_related("species", "project"), id=batch_id)
 
     if not user_can_access_batch(request.user, batch):
         messages.error(request, "You don't have permission to view this batch.")
@@ -226,34 +315,22 @@ def task_batch_review_view(request, batch_id):
 
     selected_call_type = request.GET.get("call_type", "all")
 
-    # Get tasks, filtered by call type if specified
-    tasks = Task.objects.filter(batch=batch).order_by("id")
-    if selected_call_type != "all":
-        tasks = tasks.filter(
-            models.Q(label=selected_call_type)
-            | models.Q(label__isnull=True, classification_result=selected_call_type)
-            | models.Q(label="", classification_result=selected_call_type)
-        )
-
-    available_call_types = get_available_call_types(batch)
+    call_type_counts = get_call_type_counts(batch)
+    available_call_types = get_available_call_types(batch, call_type_counts)
+    total_count = sum(call_type_counts.values())
 
-    # Build spectrogram data for each task
-    tasks_with_spectrograms = [
-        {
-            "task": task,
-            "spectrogram_url": build_task_spectrogram_url(task, request.user.username),
-            "display_label": task.label or task.classification_result,
-            "confidence": task.confidence,
-            "annotation_url": reverse("battycoda_app:annotate_task", args=[task.id]),
-        }
-        for task in tasks
-    ]
+    tasks, next_after = get_review_tasks_page(batch, selected_call_type)
 
     context = {
         "batch": batch,
-        "tasks_with_spectrograms": tasks_with_spectrograms,
-        "available_call_types": available_call_types,
+        "tasks_with_spectrograms": [review_task_data(task, batch, request.user.username) for task in tasks],
+        "next_after": next_after,
+        "call_type_options": [
+            (call_type, total_count if call_type == "all" else call_type_counts.get(call_type, 0))
+            for call_type in available_call_types
+        ],
         "selected_call_type": selected_call_type,
+        "selected_count": total_count if selected_call_type == "all" else call_type_counts.get(selected_call_type, 0),
         "species": batch.species,
         "all_call_types_for_dropdown": available_call_types[1:],  # Exclude 'all' for relabeling dropdown
     }
@@ -261,6 +338,30 @@ def task_batch_review_view(request, batch_id):
     return render(request, "tasks/batch_review.html", context)
 
 
+@login_required
+def task_batch_review_tasks_view(request, batch_id):
+    """Return a page of review cards as JSON, starting after the task ID given as ?after="""
+    batch = get_object_or_404(TaskBatch.objects.select_related("species", "project"), id=batch_id)
+
+    if not user_can_access_batch(request.user, batch):
+        return JsonResponse({"success": False, "error": "Permission denied"}, status=403)
+
+    try:
+        after_id = int(request.GET.get("after") or 0)
+    except ValueError:
+        return JsonResponse({"success": False, "error": "Invalid after parameter"}, status=400)
+
+    tasks, next_after = get_review_tasks_page(batch, request.GET.get("call_type", "all"), after_id)
+
+    return JsonResponse(
+        {
+            "success": True,
+            "tasks": [review_task_data(task, batch, request.user.username) for task in tasks],
+            "next_after": next_after,
+        }
+    )
+
+
 @login_required
 def relabel_task_ajax(request):
     """AJAX endpoint for relabeling a task"""
@@ -11,6 +11,7 @@ from django.urls import reverse
 from django.views.decorators.http import require_http_methods
 
 from .models.task import Task, TaskBatch
+from .models.task_stats import forget_tasks
 
 
 @login_required
@@ -32,8 +33,10 @@ def delete_task_batch_view(request, batch_id):
 
     try:
         with transaction.atomic():
-            # Delete all tasks in the batch first
-            Task.objects.filter(batch=batch).delete()
+            # Delete all tasks in the batch first, keeping the dashboard rollups in step
+            batch_tasks = Task.objects.filter(batch=batch)
+            forget_tasks(batch_tasks)
+            batch_tasks.delete()
 
             # Delete the batch itself
             batch.delete()
@@ -1,15 +1,14 @@
-from datetime import timedelta
-
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, redirect
-from django.utils import timezone
+from django.urls import reverse
 
 from .models.task import Task, TaskBatch
+from .utils_modules.validation import get_int_param, safe_int
 
-# Stale lock timeout in minutes
-STALE_LOCK_MINUTES = 30
+# Upper bound on how many tasks a single prefetch request may return
+MAX_PREFETCH_TASKS = 20
 
 
 def _filter_by_user_access(queryset, user):
@@ -22,14 +21,7 @@ def _filter_by_user_access(queryset, user):
 
 def _get_available_tasks(user):
     """Get undone tasks available to the user (not locked by others)."""
-    stale_time = timezone.now() - timedelta(minutes=STALE_LOCK_MINUTES)
-    tasks = Task.objects.filter(is_done=False).filter(
-        Q(status="pending")
-        | Q(in_progress_by=user)
-        | Q(in_progress_since__lt=stale_time)
-        | Q(in_progress_by__isnull=True)
-    )
-    return _filter_by_user_access(tasks, user)
+    return Task.available_to(user)
 
 
 @login_required
@@ -44,8 +36,8 @@ def get_next_task_from_batch_view(request, batch_id):
         messages.error(request, "You don't have permission to annotate tasks from this batch.")
         return redirect("battycoda_app:task_batch_list")
 
-    # Find the first undone task from this batch that's not locked by another user
-    next_task = _get_available_tasks(request.user).filter(batch=batch).order_by("created_at").first()
+    # Claim the first undone task from this batch that's not locked by another user
+    next_task = Task.claim_next(_get_available_tasks(request.user).filter(batch=batch), request.user)
 
     if next_task:
         # Redirect to the annotation interface with the task ID
@@ -88,7 +80,7 @@ def get_next_task_view(request):
     if recent_task and recent_task.batch:
         # Look for undone tasks from the same batch
         same_batch_tasks = tasks_query.filter(batch=recent_task.batch)
-        next_task = same_batch_tasks.order_by("created_at").first()
+        next_task = Task.claim_next(same_batch_tasks, request.user)
 
         if next_task:
             # If coming from a completed batch AND it's a different batch, store that info for notification
@@ -105,11 +97,11 @@ def get_next_task_view(request):
     task = None
     if recent_task and recent_task.batch and recent_task.batch.project:
         same_project_tasks = tasks_query.filter(batch__project=recent_task.batch.project)
-        task = same_project_tasks.order_by("created_at").first()
+        task = Task.claim_next(same_project_tasks, request.user)
 
     # Fall back to any task if no tasks found from same project
     if not task:
-        task = tasks_query.order_by("created_at").first()
+        task = Task.claim_next(tasks_query, request.user)
 
     if task:
         # If coming from a completed batch AND it's a different batch, store that info for notification
@@ -184,7 +176,7 @@ def skip_to_next_batch_view(request, current_task_id):
 
         # Try each batch in order until we find one with an available task
         for batch in forward_batches + wrap_batches:
-            task = _get_available_tasks(request.user).filter(batch=batch).order_by("created_at").first()
+            task = Task.claim_next(_get_available_tasks(request.user).filter(batch=batch), request.user)
             if task:
                 return batch, task
         return None, None
@@ -208,3 +200,71 @@ def skip_to_next_batch_view(request, current_task_id):
         request, f'No other batches with undone tasks found. Staying in current batch "{current_batch.name}".'
     )
     return redirect("battycoda_app:annotate_task", task_id=current_task_id)
+
+
+@login_required
+def prefetch_tasks_view(request):
+    """Return the next N available tasks with their render URLs so the annotation UI can prefetch them.
+
+    Optional URL parameters:
+    - count: Number of tasks to return (default: 5, max: MAX_PREFETCH_TASKS)
+    - batch: Only return tasks from this batch
+    - project: Only return tasks from this project
+    - exclude: Comma-separated task IDs to skip (e.g. the task currently open)
+    - warm: 1 to render spectrograms and audio snippets in the background
+    """
+    count = get_int_param(request, "count", default=5, min_val=1, max_val=MAX_PREFETCH_TASKS)
+    tasks_query = _get_available_tasks(request.user)
+
+    batch_id = safe_int(request.GET.get("batch"))
+    if batch_id is not None:
+        batch = get_object_or_404(TaskBatch, id=batch_id)
+        profile = request.user.profile
+        has_access = (profile.group and batch.group == profile.group) or batch.created_by == request.user
+        if not has_access:
+            return JsonResponse({"success": False, "error": "Permission denied"}, status=403)
+        tasks_query = tasks_query.filter(batch=batch)
+
+    project_id = safe_int(request.GET.get("project"))
+    if project_id is not None:
+        tasks_query = tasks_query.filter(project_id=project_id)
+
+    exclude_ids = [safe_int(value) for value in request.GET.get("exclude", "").split(",")]
+    exclude_ids = [task_id for task_id in exclude_ids if task_id is not None]
+    if exclude_ids:
+        tasks_query = tasks_query.exclude(id__in=exclude_ids)
+
+    tasks = list(
+        tasks_query.order_by("created_at").only("id", "batch_id", "onset", "offset", "label", "status")[:count]
+    )
+
+    results = []
+    for task in tasks:
+        spectrogram_url = reverse("battycoda_app:task_spectrogram", args=[task.id])
+        snippet_url = reverse("battycoda_app:task_audio_snippet", args=[task.id])
+        results.append(
+            {
+                "id": task.id,
+                "batch_id": task.batch_id,
+                "onset": task.onset,
+                "offset": task.offset,
+                "label": task.label,
+                "status": task.status,
+                "annotate_url": reverse("battycoda_app:annotate_task", args=[task.id]),
+                "spectrogram_urls": {
+                    "detail": f"{spectrogram_url}?overview=0",
+                    "overview": f"{spectrogram_url}?overview=1",
+                },
+                "audio_snippet_url": f"{snippet_url}?channel=0&overview=False",
+            }
+        )
+
+    warming = False
+    if tasks and request.GET.get("warm") == "1":
+        from .tasks import warm_task_renders
+
+        colormap_name = getattr(request.user.profile, "spectrogram_colormap", "roseus")
+        warm_task_renders.delay([task.id for task in tasks], colormap_name)
+        warming = True
+
+    return JsonResponse({"success": True, "tasks": results, "warming": warming})
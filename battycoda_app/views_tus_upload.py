@@ -15,18 +15,17 @@ import uuid
 
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.http import HttpResponse, JsonResponse
 from django.urls import reverse
 from django.views.decorators.csrf import csrf_exempt
 
-from .audio.modules.file_utils import AudioFileError
+from .audio.modules.file_utils import AudioFileError, create_recording_from_file
 from .audio.utils import get_audio_duration, split_audio_file
 from .models.organization import Project, Species
-from .models.recording import Recording
 from .models.tus_upload import TusUpload
 from .models.user import UserProfile
 from .utils_modules.cleanup import safe_remove_file
+from .utils_modules.recording_utils import find_duplicate_recording
 
 logger = logging.getLogger(__name__)
 
@@ -85,10 +84,31 @@ def _error(status, message):
     return _set_headers(resp, _tus_headers())
 
 
+class DuplicateUploadError(Exception):
+    """Raised when every recording a finished upload would create already exists."""
+
+    def __init__(self, recording):
+        super().__init__(f"Duplicate of recording {recording.id}")
+        self.recording = recording
+
+
+def _duplicate_error(recording):
+    """Return the response for an upload whose audio is already stored as recording.
+
+    Uses 422 rather than 409: tus clients retry 409 responses as offset conflicts.
+    """
+    message = f'This audio has already been uploaded as recording "{recording.name}"'
+    resp = JsonResponse({"error": message, "recording_id": recording.id}, status=422)
+    return _set_headers(resp, _tus_headers({"X-Error": message, "X-Recording-Id": str(recording.id)}))
+
+
 def _finalize_upload(tus_upload):
     """Convert a completed TUS upload into one or more Recording objects.
 
     Mirrors the logic in create_recording_view for consistency.
+
+    Raises:
+        DuplicateUploadError: If the audio is already stored in the user's group
     """
     meta = tus_upload.metadata_json or {}
     user = tus_upload.user
@@ -121,68 +141,51 @@ def _finalize_upload(tus_upload):
 
     temp_path = tus_upload.temp_file_path
     recordings_created = []
+    recording_fields = {
+        "description": description,
+        "recorded_date": recorded_date,
+        "location": location,
+        "equipment": equipment,
+        "environmental_conditions": environmental_conditions,
+        "species": species,
+        "project": project,
+        "created_by": user,
+        "group": group,
+    }
 
+    chunk_paths = []
     try:
+        # (path, stored filename, recording name) of each recording to create
+        files = [(temp_path, tus_upload.filename or "upload.wav", recording_name)]
         if split_long_files:
             try:
                 duration = get_audio_duration(temp_path)
                 if duration > 60:
                     chunk_paths = split_audio_file(temp_path, chunk_duration_seconds=60)
-                    for i, chunk_path in enumerate(chunk_paths):
-                        with open(chunk_path, "rb") as f:
-                            django_file = SimpleUploadedFile(
-                                os.path.basename(chunk_path), f.read(), content_type="audio/wav"
-                            )
-                            recording = Recording(
-                                name=f"{recording_name} (Part {i + 1}/{len(chunk_paths)})",
-                                wav_file=django_file,
-                                description=description,
-                                recorded_date=recorded_date,
-                                location=location,
-                                equipment=equipment,
-                                environmental_conditions=environmental_conditions,
-                                species=species,
-                                project=project,
-                                created_by=user,
-                                group=group,
-                            )
-                            recording.save()
-                            recording.file_ready = True
-                            recording.save(update_fields=["file_ready"])
-                            recordings_created.append(recording)
-
-                    # Clean up chunks
-                    for chunk_path in chunk_paths:
-                        safe_remove_file(chunk_path, "audio chunk file")
-
-                    safe_remove_file(temp_path, "TUS temp file")
-                    tus_upload.delete()
-                    return recordings_created
+                    files = [
+                        (
+                            chunk_path,
+                            os.path.basename(chunk_path),
+                            f"{recording_name} (Part {i + 1}/{len(chunk_paths)})",
+                        )
+                        for i, chunk_path in enumerate(chunk_paths)
+                    ]
             except (IOError, OSError, AudioFileError) as e:
                 logger.debug(f"TUS finalize: split not possible, normal processing: {e}")
 
-        # Single recording (no split, or split failed, or file <= 60s)
-        with open(temp_path, "rb") as f:
-            django_file = SimpleUploadedFile(tus_upload.filename or "upload.wav", f.read(), content_type="audio/wav")
-            recording = Recording(
-                name=recording_name,
-                wav_file=django_file,
-                description=description,
-                recorded_date=recorded_date,
-                location=location,
-                equipment=equipment,
-                environmental_conditions=environmental_conditions,
-                species=species,
-                project=project,
-                created_by=user,
-                group=group,
-            )
-            recording.save()
-            recording.file_ready = True
-            recording.save(update_fields=["file_ready"])
+        # Reject a re-upload before any recording (and its spectrogram job) is created
+        checks = [find_duplicate_recording(path, group, user) for path, _, _ in files]
+        if all(duplicate for duplicate, _ in checks):
+            raise DuplicateUploadError(checks[0][0])
+
+        for (path, filename, name), (_, fingerprint) in zip(files, checks, strict=True):
+            recording = create_recording_from_file(path, filename, name=name, **fingerprint, **recording_fields)
             recordings_created.append(recording)
 
     finally:
+        # Clean up any chunks that were not moved into place
+        for chunk_path in chunk_paths:
+            safe_remove_file(chunk_path, "audio chunk file")
         safe_remove_file(temp_path, "TUS temp file")
         # Delete TusUpload record if it still exists
         try:
@@ -295,7 +298,10 @@ def _handle_create(request):
 
     # If upload completed in one shot, finalize
     if tus_upload.is_complete:
-        result = _finalize_upload(tus_upload)
+        try:
+            result = _finalize_upload(tus_upload)
+        except DuplicateUploadError as e:
+            return _duplicate_error(e.recording)
         if result:
             # Return redirect info in a custom header
             if len(result) == 1:
@@ -380,7 +386,10 @@ def _handle_patch(request, upload_id):
     }
 
     if is_complete:
-        result = _finalize_upload(tus_upload)
+        try:
+            result = _finalize_upload(tus_upload)
+        except DuplicateUploadError as e:
+            return _duplicate_error(e.recording)
         if result:
             if len(result) == 1:
                 headers["X-Recording-Id"] = str(result[0].id)
@@ -73,6 +73,7 @@ app.autodiscover_tasks(
         "battycoda_app.audio.task_modules.training_tasks",
         "battycoda_app.audio.task_modules.clustering.tasks",
         "battycoda_app.audio.task_modules.queue_processor",
+        "battycoda_app.audio.task_modules.batch_upload_tasks",
     ]
 )
 
@@ -80,7 +81,8 @@ app.autodiscover_tasks(
 app.conf.beat_schedule = {
     "process-classification-queue": {
         "task": "battycoda_app.audio.task_modules.queue_processor.process_classification_queue",
-        "schedule": 30.0,  # Run every 30 seconds
+        # Every 30 seconds; runs are normally started as soon as the previous one finishes
+        "schedule": 30.0,
     },
     "weekly-database-backup": {
         "task": "battycoda_app.tasks.backup_database_to_s3",
@@ -98,6 +100,10 @@ app.conf.beat_schedule = {
         "task": "battycoda_app.tasks.cleanup_stale_classifier_tmp",
         "schedule": 3600.0,  # Run every hour
     },
+    "cleanup-expired-batch-exports": {
+        "task": "battycoda_app.tasks.cleanup_expired_batch_exports",
+        "schedule": 3600.0,  # Run every hour
+    },
 }
 app.conf.timezone = "UTC"
 
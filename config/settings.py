@@ -265,6 +265,19 @@ os.makedirs(TUS_UPLOAD_DIR, exist_ok=True)
 TUS_MAX_SIZE = int(os.environ.get("TUS_MAX_SIZE_MB", 2048)) * 1024 * 1024  # Default 2 GB
 TUS_EXPIRY_HOURS = int(os.environ.get("TUS_EXPIRY_HOURS", 24))
 
+# Batch ZIP uploads are stored here until their Celery ingestion job finishes
+BATCH_UPLOAD_DIR = os.path.join(str(MEDIA_ROOT), "batch_uploads")
+os.makedirs(BATCH_UPLOAD_DIR, exist_ok=True)
+# Number of WAV files ingested concurrently by one batch upload job
+BATCH_UPLOAD_WORKERS = int(os.environ.get("BATCH_UPLOAD_WORKERS", 4))
+# Number of source WAV files read concurrently when building classifier training data
+TRAINING_DATA_WORKERS = int(os.environ.get("TRAINING_DATA_WORKERS", 4))
+
+# Archives written by background batch export jobs, removed after BATCH_EXPORT_EXPIRY_HOURS
+BATCH_EXPORT_DIR = os.path.join(str(MEDIA_ROOT), "batch_exports")
+os.makedirs(BATCH_EXPORT_DIR, exist_ok=True)
+BATCH_EXPORT_EXPIRY_HOURS = int(os.environ.get("BATCH_EXPORT_EXPIRY_HOURS", 72))
+
 # Celery configuration
 CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
@@ -273,6 +286,61 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 
+# Each workload has its own queue, consumed by its own workers (see scripts/celery_worker.sh
+# for their concurrency and prefetch), so a long clustering or training job can't hold up
+# the spectrograms of new uploads. Unrouted tasks go to the io queue.
+CELERY_TASK_DEFAULT_QUEUE = "io"
+CELERY_TASK_ROUTES = {
+    "battycoda_app.audio.task_modules.spectrogram.*": {"queue": "spectrogram"},
+    "battycoda_app.tasks.warm_task_renders": {"queue": "spectrogram"},
+    "battycoda_app.audio.task_modules.segmentation_tasks.*": {"queue": "cpu-heavy"},
+    "battycoda_app.audio.task_modules.clustering_tasks.*": {"queue": "cpu-heavy"},
+    "battycoda_app.audio.task_modules.batch_upload_tasks.*": {"queue": "cpu-heavy"},
+    # Read whole audio files (duration and SHA-256) or write large exports
+    "battycoda_app.tasks.calculate_audio_duration": {"queue": "cpu-heavy"},
+    "battycoda_app.tasks.create_task_batches_for_species_task": {"queue": "cpu-heavy"},
+    "battycoda_app.tasks.export_completed_batches_task": {"queue": "cpu-heavy"},
+    "battycoda_app.audio.task_modules.classification.*": {"queue": "r-server"},
+    "battycoda_app.audio.task_modules.training_tasks.*": {"queue": "r-server"},
+    "battycoda_app.tasks.backup_database_to_s3": {"queue": "maintenance"},
+    "battycoda_app.tasks.check_disk_usage": {"queue": "maintenance"},
+    "battycoda_app.tasks.cleanup_*": {"queue": "maintenance"},
+    "battycoda_app.tasks.remove_duplicate_recordings_task": {"queue": "maintenance"},
+}
+# Most tasks run for minutes; a worker process reserves one at a time so queued
+# tasks aren't held by a busy process while another one is idle
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Classification runs that may run at once per classifier backend: "dummy" for the
+# built-in dummy classifier, otherwise the classifier's R server URL. Backends not
+# listed get CLASSIFICATION_SLOTS_DEFAULT (see audio/task_modules/queue_processor.py).
+CLASSIFICATION_SLOTS_DEFAULT = int(os.environ.get("CLASSIFICATION_SLOTS", 2))
+CLASSIFICATION_SLOTS = {"dummy": 4}
+# Seconds without a heartbeat (or, before the first one, since dispatch) after which a
+# run whose worker died (e.g. was killed) stops holding a slot
+CLASSIFICATION_SLOT_TIMEOUT = int(os.environ.get("CLASSIFICATION_SLOT_TIMEOUT", 6 * 3600))
+
+# Redis used to publish job progress events to the browser (see utils_modules/progress_bus.py)
+PROGRESS_BUS_URL = os.environ.get("PROGRESS_BUS_URL", CELERY_BROKER_URL)
+# Seconds a job events stream stays open before the browser reconnects
+JOB_EVENTS_STREAM_SECONDS = int(os.environ.get("JOB_EVENTS_STREAM_SECONDS", 300))
+
+# Shared cache for lookups and live job progress (see utils_modules/lookup_cache.py).
+# Redis, so the web and worker processes see the same entries; tests use a per-process cache.
+CACHE_URL = os.environ.get("CACHE_URL", "redis://redis:6379/1")
+if DJANGO_TEST_MODE:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+            "KEY_PREFIX": "battycoda",
+            "TIMEOUT": 300,
+            "OPTIONS": {"socket_connect_timeout": 2, "socket_timeout": 2},
+        }
+    }
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
@@ -0,0 +1,69 @@
+#!/bin/bash
+# scripts/celery_worker.sh - Start Celery workers for BattyCoda's task queues
+#
+# Tasks are routed to one queue per workload (CELERY_TASK_ROUTES in
+# config/settings.py). Each queue gets its own worker, with a concurrency and
+# prefetch suited to its tasks:
+#
+#   io           short database and file tasks (the default queue)
+#   spectrogram  HDF5 spectrograms of new recordings and task renders
+#   cpu-heavy    segmentation, clustering, batch uploads and other tasks reading
+#                whole audio files or writing large exports
+#   r-server     classification and training, bounded by the R server
+#   maintenance  backups, periodic cleanup and duplicate removal
+#
+# Usage:
+#   ./scripts/celery_worker.sh spectrogram      # One worker for one queue
+#   ./scripts/celery_worker.sh all              # One worker per queue, stopped together
+#
+# Extra Celery options can be passed in CELERY_WORKER_OPTS; the concurrency of a
+# queue can be overridden with e.g. CELERY_CONCURRENCY_CPU_HEAVY=4.
+
+set -e
+
+QUEUES=(io spectrogram cpu-heavy r-server maintenance)
+
+# Concurrency and prefetch multiplier per queue
+declare -A CONCURRENCY=([io]=4 [spectrogram]=2 [cpu-heavy]=2 [r-server]=2 [maintenance]=1)
+declare -A PREFETCH=([io]=4 [spectrogram]=1 [cpu-heavy]=1 [r-server]=1 [maintenance]=1)
+
+start_worker() {
+    local queue="$1"
+    local override="CELERY_CONCURRENCY_${queue//-/_}"
+    override="${override^^}"
+
+    exec celery -A config worker \
+        --queues="$queue" \
+        --hostname="$queue@%h" \
+        --concurrency="${!override:-${CONCURRENCY[$queue]}}" \
+        --prefetch-multiplier="${PREFETCH[$queue]}" \
+        --loglevel=info \
+        $CELERY_WORKER_OPTS
+}
+
+# Change to project root directory
+cd "$(dirname "$0")/.."
+
+if [ "$1" != "all" ]; then
+    if [ -z "$1" ] || [ -z "${CONCURRENCY[$1]}" ]; then
+        echo "Usage: $0 {all|$(IFS="|"; echo "${QUEUES[*]}")}" >&2
+        exit 1
+    fi
+    start_worker "$1"
+fi
+
+# One worker per queue; if any of them exits, stop the others so the
+# supervisor (systemd, honcho) restarts the whole set
+pids=()
+for queue in "${QUEUES[@]}"; do
+    start_worker "$queue" &
+    pids+=($!)
+done
+
+trap 'kill -TERM "${pids[@]}" 2>/dev/null' TERM INT
+set +e
+wait -n
+status=$?
+kill -TERM "${pids[@]}" 2>/dev/null
+wait
+exit $status
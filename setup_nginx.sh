@@ -50,7 +50,7 @@ if [ -f "$CERT_PATH" ] && [ -f "$KEY_PATH" ]; then
 
 # HTTPS server - serves content
 server {
-    listen 443 ssl;
+    listen 443 ssl http2;
     server_name $DOMAIN_NAME www.$DOMAIN_NAME;
     client_max_body_size ${MAX_UPLOAD_SIZE_MB}M;
 
@@ -119,6 +119,20 @@ cat >> /etc/nginx/sites-available/battycoda.conf << EOF
         proxy_set_header Tus-Resumable \$http_tus_resumable;
     }
 
+    # Job events (Server-Sent Events): served by the ASGI app, unbuffered, long-lived
+    location /jobs/api/events/ {
+        proxy_pass http://127.0.0.1:8002;
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_buffering off;
+        proxy_cache off;
+        proxy_read_timeout 360s;
+        proxy_set_header Host \$host;
+        proxy_set_header X-Real-IP \$remote_addr;
+        proxy_set_header X-Forwarded-For \$proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto \$scheme;
+    }
+
     location / {
         proxy_pass http://127.0.0.1:8000;
         proxy_set_header Host \$host;
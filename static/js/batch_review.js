@@ -1,12 +1,18 @@
 /**
  * Batch Review Module
- * Handles filtering and relabeling tasks in the batch review interface
+ * Handles filtering, infinite scrolling and relabeling tasks in the batch review interface
  */
 import { getPageData, getCsrfToken } from './utils/page-data.js';
 import { escapeHtml } from './utils/html.js';
 
 // Module state (initialized lazily)
 let relabelTaskUrl = null;
+let reviewTasksUrl = null;
+let selectedCallType = 'all';
+let loadingMore = false;
+
+// Start loading the next page this far before the end of the list comes into view
+const LOAD_MORE_MARGIN = '800px';
 
 /**
  * Filter tasks by call type - redirects to URL with call_type parameter
@@ -60,10 +66,14 @@ export function relabelTask(selectElement) {
         // Show success message
         showToast('Task relabeled successfully', 'success');
 
-        // Reload the page to reflect changes
-        setTimeout(() => {
-          window.location.reload();
-        }, 1000);
+        // Update the card in place; reloading would drop the pages loaded so far
+        const card = selectElement.closest('.review-task');
+        if (card) {
+          card.querySelector('[data-field="label"]').textContent = newLabel;
+          card.querySelector('[data-field="annotated"]').hidden = false;
+          card.querySelector('[data-field="classified"]').hidden = true;
+        }
+        selectElement.value = '';
       } else {
         showToast('Error: ' + data.error, 'error');
         selectElement.value = ''; // Reset dropdown
@@ -76,6 +86,106 @@ export function relabelTask(selectElement) {
     });
 }
 
+/**
+ * Fill a copy of the review card template with a task returned by the review tasks endpoint
+ * @param {HTMLTemplateElement} template - The card template
+ * @param {Object} task - Serialized task
+ * @returns {DocumentFragment} The filled-in card
+ */
+export function renderTaskCard(template, task) {
+  const card = template.content.cloneNode(true);
+  const field = (name) => card.querySelector(`[data-field="${name}"]`);
+
+  field('id').textContent = task.id;
+  if (task.confidence) {
+    field('confidence').textContent = task.confidence.toFixed(2);
+    field('confidence').hidden = false;
+  }
+
+  const image = field('spectrogram');
+  image.src = task.spectrogram_url;
+  image.alt = `Spectrogram for Task ${task.id}`;
+
+  field('time').textContent = `${task.onset.toFixed(3)}s - ${task.offset.toFixed(3)}s`;
+  field('label').textContent = task.display_label || 'Unlabeled';
+  if (task.annotated_by) {
+    field('annotated').title = `Annotated by ${task.annotated_by}`;
+    field('annotated').hidden = false;
+    field('classified').hidden = true;
+  }
+
+  card.querySelector('.relabel-dropdown').setAttribute('data-task-id', task.id);
+  field('annotation-link').href = task.annotation_url;
+  return card;
+}
+
+/**
+ * Load the next page of tasks and append their cards to the list
+ */
+export function loadMoreTasks() {
+  const loadMore = document.getElementById('review-load-more');
+  const after = loadMore?.dataset.nextAfter;
+  if (!after || loadingMore) {
+    return Promise.resolve();
+  }
+  loadingMore = true;
+
+  const url = new URL(reviewTasksUrl, window.location.origin);
+  url.searchParams.set('call_type', selectedCallType);
+  url.searchParams.set('after', after);
+
+  return fetch(url)
+    .then((response) => response.json())
+    .then((data) => {
+      if (!data.success) {
+        throw new Error(data.error);
+      }
+
+      const template = document.getElementById('review-task-card-template');
+      const container = document.getElementById('review-tasks');
+      data.tasks.forEach((task) => container.appendChild(renderTaskCard(template, task)));
+
+      loadMore.dataset.nextAfter = data.next_after ?? '';
+      loadMore.hidden = !data.next_after;
+    })
+    .catch((error) => {
+      showToast('Error loading tasks: ' + error.message, 'error');
+    })
+    .finally(() => {
+      loadingMore = false;
+    });
+}
+
+/**
+ * Load further pages as the end of the list scrolls into view
+ */
+function setupInfiniteScroll() {
+  const loadMore = document.getElementById('review-load-more');
+  if (!loadMore) {
+    return;
+  }
+
+  document.getElementById('review-load-more-button')?.addEventListener('click', loadMoreTasks);
+
+  if ('IntersectionObserver' in window) {
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+          // Keep loading while the end of the list stays in view
+          loadMoreTasks().then(() => {
+            if (!loadMore.hidden) {
+              observer.unobserve(loadMore);
+              observer.observe(loadMore);
+            }
+          });
+        }
+      },
+      { rootMargin: LOAD_MORE_MARGIN }
+    );
+    observer.observe(loadMore);
+  }
+}
+
 /**
  * Show a toast notification
  * @param {string} message - The message to display
@@ -106,9 +216,11 @@ export function showToast(message, type) {
  * Sets up event listeners for filter and relabel functionality
  */
 export function initialize() {
-  // Pre-fetch page data for relabel URL
+  // Pre-fetch page data for the relabel and review task URLs
   const pageData = getPageData();
   relabelTaskUrl = pageData.relabelTaskUrl;
+  reviewTasksUrl = pageData.reviewTasksUrl;
+  selectedCallType = pageData.selectedCallType || 'all';
 
   // Set up call type filter listener
   const callTypeFilter = document.getElementById('call-type-filter');
@@ -116,13 +228,17 @@ export function initialize() {
     callTypeFilter.addEventListener('change', filterByCallType);
   }
 
-  // Set up relabel dropdown listeners (multiple dropdowns on page)
-  const relabelDropdowns = document.querySelectorAll('.relabel-dropdown');
-  relabelDropdowns.forEach((dropdown) => {
-    dropdown.addEventListener('change', function () {
-      relabelTask(this);
+  // Set up one relabel listener for all dropdowns, including those of cards loaded later
+  const reviewTasks = document.getElementById('review-tasks');
+  if (reviewTasks) {
+    reviewTasks.addEventListener('change', (event) => {
+      if (event.target.classList.contains('relabel-dropdown')) {
+        relabelTask(event.target);
+      }
     });
-  });
+  }
+
+  setupInfiniteScroll();
 }
 
 // Auto-initialize when DOM is ready
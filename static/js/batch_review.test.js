@@ -0,0 +1,128 @@
+/**
+ * Tests for batch_review.js
+ */
+
+import { describe, it, expect, beforeEach, vi } from 'vitest';
+
+vi.mock('./utils/page-data.js', () => ({
+  getPageData: vi.fn(() => ({})),
+  getCsrfToken: vi.fn(() => 'token'),
+}));
+
+import { getPageData } from './utils/page-data.js';
+import { initialize, loadMoreTasks, renderTaskCard } from './batch_review.js';
+
+const CARD_TEMPLATE = `
+  <template id="review-task-card-template">
+    <div class="review-task">
+      <span data-field="id"></span>
+      <span data-field="confidence" hidden></span>
+      <img data-field="spectrogram" loading="lazy">
+      <span data-field="time"></span>
+      <span data-field="label"></span>
+      <i data-field="annotated" hidden></i>
+      <i data-field="classified"></i>
+      <select class="relabel-dropdown" data-task-id=""></select>
+      <a data-field="annotation-link"></a>
+    </div>
+  </template>
+`;
+
+const TASK = {
+  id: 42,
+  onset: 1.5,
+  offset: 1.625,
+  display_label: 'echo',
+  confidence: 0.876,
+  annotated_by: 'alice',
+  spectrogram_url: '/spectrogram/?onset=1.5',
+  annotation_url: '/tasks/annotate/42/',
+};
+
+describe('batch_review', () => {
+  beforeEach(() => {
+    document.body.innerHTML = '';
+    vi.clearAllMocks();
+  });
+
+  describe('renderTaskCard', () => {
+    it('fills in every field of the card', () => {
+      document.body.innerHTML = CARD_TEMPLATE;
+      const template = document.getElementById('review-task-card-template');
+
+      const container = document.createElement('div');
+      container.appendChild(renderTaskCard(template, TASK));
+      const field = (name) => container.querySelector(`[data-field="${name}"]`);
+
+      expect(field('id').textContent).toBe('42');
+      expect(field('confidence').textContent).toBe('0.88');
+      expect(field('confidence').hidden).toBe(false);
+      expect(field('spectrogram').getAttribute('src')).toBe('/spectrogram/?onset=1.5');
+      expect(field('time').textContent).toBe('1.500s - 1.625s');
+      expect(field('label').textContent).toBe('echo');
+      expect(field('annotated').hidden).toBe(false);
+      expect(field('classified').hidden).toBe(true);
+      expect(container.querySelector('.relabel-dropdown').dataset.taskId).toBe('42');
+      expect(field('annotation-link').getAttribute('href')).toBe('/tasks/annotate/42/');
+    });
+
+    it('shows unlabeled classifier results without a confidence badge', () => {
+      document.body.innerHTML = CARD_TEMPLATE;
+      const template = document.getElementById('review-task-card-template');
+
+      const container = document.createElement('div');
+      container.appendChild(
+        renderTaskCard(template, { ...TASK, display_label: '', confidence: null, annotated_by: null })
+      );
+      const field = (name) => container.querySelector(`[data-field="${name}"]`);
+
+      expect(field('label').textContent).toBe('Unlabeled');
+      expect(field('confidence').hidden).toBe(true);
+      expect(field('annotated').hidden).toBe(true);
+      expect(field('classified').hidden).toBe(false);
+    });
+  });
+
+  describe('loadMoreTasks', () => {
+    beforeEach(() => {
+      document.body.innerHTML = `
+        <div id="review-tasks"></div>
+        <div id="review-load-more" data-next-after="10"></div>
+        ${CARD_TEMPLATE}
+      `;
+      getPageData.mockReturnValue({
+        reviewTasksUrl: '/tasks/batches/1/review/tasks/',
+        selectedCallType: 'echo',
+      });
+      initialize();
+    });
+
+    it('appends the next page and advances the cursor', async () => {
+      global.fetch = vi.fn(() =>
+        Promise.resolve({ json: () => Promise.resolve({ success: true, tasks: [TASK], next_after: 42 }) })
+      );
+
+      await loadMoreTasks();
+
+      const url = new URL(global.fetch.mock.calls[0][0]);
+      expect(url.pathname).toBe('/tasks/batches/1/review/tasks/');
+      expect(url.searchParams.get('after')).toBe('10');
+      expect(url.searchParams.get('call_type')).toBe('echo');
+      expect(document.querySelectorAll('#review-tasks .review-task')).toHaveLength(1);
+      expect(document.getElementById('review-load-more').dataset.nextAfter).toBe('42');
+      expect(document.getElementById('review-load-more').hidden).toBe(false);
+    });
+
+    it('hides the loader after the last page', async () => {
+      global.fetch = vi.fn(() =>
+        Promise.resolve({ json: () => Promise.resolve({ success: true, tasks: [], next_after: null }) })
+      );
+
+      await loadMoreTasks();
+
+      expect(document.getElementById('review-load-more').hidden).toBe(true);
+      await loadMoreTasks();
+      expect(global.fetch).toHaveBeenCalledTimes(1);
+    });
+  });
+});
@@ -2,6 +2,7 @@
  * Classification Job Detail Page Script
  *
  * Handles auto-refresh of progress bar for in-progress classifier training jobs.
+ * Progress arrives over the job events stream, with polling as a fallback.
  *
  * Expected data attributes on #job-detail-data:
  * - data-job-id: The ID of the job
@@ -16,12 +17,14 @@
  *      data-status-url="/automation/classifiers/{{ job.id }}/status/"
  *      hidden>
  * </div>
- * <script src="{% static 'js/pages/classification-job-detail.js' %}"></script>
+ * <script src="{% static 'js/pages/classification-job-detail.js' %}" type="module"></script>
  * ```
  *
  * @module pages/classification-job-detail
  */
 
+import { watchJobProgress } from '../utils/job-events.js';
+
 /**
  * Initialize job detail auto-refresh functionality.
  */
@@ -45,37 +48,47 @@ function initJobDetailAutoRefresh() {
     return;
   }
 
-  // Check status every 5 seconds
-  const statusInterval = setInterval(function () {
-    fetch(statusUrl)
-      .then((response) => response.json())
-      .then((data) => {
-        if (data.success) {
-          // Update progress bar
-          const progressBar = document.querySelector('.progress-bar');
-          const progressText = document.querySelector('.d-flex span');
+  function showProgress(data) {
+    const progressBar = document.querySelector('.progress-bar');
+    const progressText = document.querySelector('.d-flex span');
 
-          if (progressBar) {
-            progressBar.style.width = `${data.progress}%`;
-            progressBar.setAttribute('aria-valuenow', data.progress);
-            progressBar.textContent = `${data.progress.toFixed(1)}%`;
-          }
+    if (progressBar) {
+      progressBar.style.width = `${data.progress}%`;
+      progressBar.setAttribute('aria-valuenow', data.progress);
+      progressBar.textContent = `${data.progress.toFixed(1)}%`;
+    }
 
-          if (progressText) {
-            progressText.textContent = `${data.progress.toFixed(1)}%`;
-          }
+    if (progressText) {
+      progressText.textContent = `${data.progress.toFixed(1)}%`;
+    }
 
-          // If status changed, reload page
-          if (data.status !== jobStatus) {
-            clearInterval(statusInterval);
-            window.location.reload();
+    // If status changed, reload page
+    if (data.status !== jobStatus) {
+      window.location.reload();
+    }
+  }
+
+  // Poll every 5 seconds only if the job events stream is unavailable
+  function startPolling() {
+    setInterval(function () {
+      fetch(statusUrl)
+        .then((response) => response.json())
+        .then((data) => {
+          if (data.success) {
+            showProgress(data);
           }
-        }
-      })
-      .catch((error) => {
-        console.error('Error fetching job status:', error);
-      });
-  }, 5000);
+        })
+        .catch((error) => {
+          console.error('Error fetching job status:', error);
+        });
+    }, 5000);
+  }
+
+  watchJobProgress({
+    jobs: [{ type: 'training', id: pageData.dataset.jobId }],
+    onEvent: showProgress,
+    onUnavailable: startPolling,
+  });
 }
 
 // Initialize when DOM is ready
@@ -2,14 +2,18 @@
  * Clustering Run Detail Page Script
  *
  * Handles auto-refresh of progress for in-progress clustering runs.
+ * Progress arrives over the job events stream, with polling as a fallback.
  *
  * Expected data attributes on #clustering-run-detail-data:
+ * - data-run-id: The ID of the run
  * - data-run-status-url: URL for fetching the current run's status
  * - data-is-processing: Whether the run is currently processing ("true" or "false")
  *
  * @module pages/clustering-run-detail
  */
 
+import { watchJobProgress } from '../utils/job-events.js';
+
 /**
  * Initialize the clustering run detail functionality.
  */
@@ -35,32 +39,41 @@ function initClusteringRunDetail() {
   }
 
   /**
-   * Refresh progress for the current run.
+   * Show the progress of the current run.
    */
-  function updateProgress() {
-    $.get(runStatusUrl, function (data) {
-      if (data.progress !== undefined) {
-        // Update the progress bar
-        const progress = data.progress;
-        $('.progress-bar').css('width', `${progress}%`);
-        $('.progress-bar').attr('aria-valuenow', progress);
-        $('.progress-bar').text(`${progress.toFixed(1)}%`);
+  function showProgress(data) {
+    if (data.progress !== undefined && data.progress !== null) {
+      // Update the progress bar
+      const progress = data.progress;
+      $('.progress-bar').css('width', `${progress}%`);
+      $('.progress-bar').attr('aria-valuenow', progress);
+      $('.progress-bar').text(`${progress.toFixed(1)}%`);
 
-        // Update progress message
-        if (data.progress_message) {
-          $('#progress-message').text(data.progress_message);
-        }
+      // Update progress message (status view: progress_message, progress event: message)
+      const message = data.progress_message || data.message;
+      if (message) {
+        $('#progress-message').text(message);
+      }
 
-        // If status has changed, reload the page
-        if (data.status !== 'in_progress' && data.status !== 'pending') {
-          location.reload();
-        }
+      // If status has changed, reload the page
+      if (data.status !== 'in_progress' && data.status !== 'pending') {
+        location.reload();
       }
-    });
+    }
+  }
+
+  // Poll every 3 seconds only if the job events stream is unavailable
+  function startPolling() {
+    setInterval(function () {
+      $.get(runStatusUrl, showProgress);
+    }, 3000);
   }
 
-  // Update progress every 3 seconds
-  setInterval(updateProgress, 3000);
+  watchJobProgress({
+    jobs: [{ type: 'clustering', id: pageData.dataset.runId }],
+    onEvent: showProgress,
+    onUnavailable: startPolling,
+  });
 }
 
 // Initialize when DOM is ready
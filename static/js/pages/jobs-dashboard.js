@@ -2,6 +2,8 @@
  * Jobs Dashboard Page Script
  *
  * Handles auto-refresh of job counters, manual refresh, and job cancellation.
+ * Counters are refreshed when a job changes status on the job events stream;
+ * they are polled every 30 seconds only if the stream is unavailable.
  * Reads configuration from #jobs-page-data data attributes.
  *
  * Expected data attributes on #jobs-page-data:
@@ -12,6 +14,8 @@
  * @module pages/jobs-dashboard
  */
 
+import { watchJobProgress } from '../utils/job-events.js';
+
 /**
  * Initialize the jobs dashboard functionality.
  */
@@ -33,7 +37,10 @@ function initJobsDashboard() {
   }
 
   let autoRefreshInterval = null;
+  let autoRefreshStream = null;
   let autoRefreshEnabled = true;
+  // Last status seen for each job; counters only change when a status does
+  const jobStatuses = new Map();
 
   const refreshButton = document.getElementById('refresh-jobs');
   const autoRefreshToggle = document.getElementById('auto-refresh-toggle');
@@ -67,6 +74,35 @@ function initJobsDashboard() {
       });
   }
 
+  /**
+   * Follow job events, refreshing the counters when a job changes status.
+   */
+  function startAutoRefresh() {
+    autoRefreshStream = watchJobProgress({
+      onEvent(event) {
+        const key = `${event.type}:${event.id}`;
+        if (jobStatuses.get(key) !== event.status) {
+          jobStatuses.set(key, event.status);
+          refreshJobsData();
+        }
+      },
+      onUnavailable() {
+        autoRefreshInterval = setInterval(refreshJobsData, 30000);
+      },
+    });
+  }
+
+  function stopAutoRefresh() {
+    if (autoRefreshStream) {
+      autoRefreshStream.close();
+      autoRefreshStream = null;
+    }
+    if (autoRefreshInterval) {
+      clearInterval(autoRefreshInterval);
+      autoRefreshInterval = null;
+    }
+  }
+
   // Manual refresh
   if (refreshButton) {
     refreshButton.addEventListener('click', function () {
@@ -86,25 +122,20 @@ function initJobsDashboard() {
         autoRefreshToggle.classList.remove('btn-outline-secondary');
         autoRefreshToggle.classList.add('btn-outline-success');
 
-        // Start auto-refresh every 30 seconds
-        autoRefreshInterval = setInterval(refreshJobsData, 30000);
+        startAutoRefresh();
       } else {
         autoRefreshToggle.innerHTML = '<i class="fas fa-play"></i> Auto-refresh: OFF';
         autoRefreshToggle.classList.remove('btn-outline-success');
         autoRefreshToggle.classList.add('btn-outline-secondary');
 
-        // Stop auto-refresh
-        if (autoRefreshInterval) {
-          clearInterval(autoRefreshInterval);
-          autoRefreshInterval = null;
-        }
+        stopAutoRefresh();
       }
     });
   }
 
   // Start auto-refresh by default
   if (autoRefreshEnabled) {
-    autoRefreshInterval = setInterval(refreshJobsData, 30000);
+    startAutoRefresh();
   }
 
   // Job cancellation
@@ -1,8 +1,10 @@
 /**
  * Segmentation Parameters Module
  *
- * Handles fetching and displaying segmentation jobs with adaptive polling.
- * Polls more frequently when jobs are in progress, less frequently when idle.
+ * Handles fetching and displaying segmentation jobs. The list is refreshed
+ * when segmentation progress arrives on the job events stream; if the stream is
+ * unavailable it falls back to adaptive polling, more frequently when jobs are
+ * in progress and less frequently when idle.
  *
  * Usage:
  * Include this script with URL configuration:
@@ -11,14 +13,23 @@
  *   "jobsStatusUrl": "{% url 'battycoda_app:segmentation_jobs_status' %}"
  * }
  * </script>
- * <script src="{% static 'js/pages/segmentation-params.js' %}"></script>
+ * <script src="{% static 'js/pages/segmentation-params.js' %}" type="module"></script>
  */
 
+import { debounce } from '../utils/debounce.js';
+import { watchJobProgress } from '../utils/job-events.js';
+
 // Polling configuration
 const ACTIVE_POLLING_INTERVAL = 5000; // 5 seconds when active jobs are running
 const IDLE_POLLING_INTERVAL = 30000; // 30 seconds when no active jobs
 
+// Delay that batches a burst of progress events into one refresh
+const EVENT_REFRESH_DELAY = 1000;
+
 let refreshInterval = null;
+// Whether the job events stream drives the refreshes (polling is the fallback)
+let streaming = false;
+let lastJobs = [];
 
 /**
  * Get configuration from page data
@@ -251,13 +262,30 @@ function updateJobsDisplay(data) {
   }
 }
 
+/**
+ * Fetch the jobs and update the display without showing the loading state
+ * @returns {Promise<Object|null>} The response data, or null on error
+ */
+function refreshJobs() {
+  const config = getConfig();
+  return fetch(config.jobsStatusUrl)
+    .then((response) => response.json())
+    .then((data) => {
+      lastJobs = data.jobs || [];
+      updateJobsDisplay(data);
+      return data;
+    })
+    .catch((error) => {
+      console.error('Error in auto-refresh:', error);
+      return null;
+    });
+}
+
 /**
  * Update polling frequency based on job status
  * @param {Array} jobs - Array of job objects
  */
 function updatePollingFrequency(jobs) {
-  const config = getConfig();
-
   // Clear existing interval
   if (refreshInterval) {
     clearInterval(refreshInterval);
@@ -269,22 +297,15 @@ function updatePollingFrequency(jobs) {
 
   // Create new interval
   refreshInterval = setInterval(function () {
-    fetch(config.jobsStatusUrl)
-      .then((response) => response.json())
-      .then((data) => {
-        updateJobsDisplay(data);
+    refreshJobs().then((data) => {
+      // Check if polling frequency needs to change
+      const currentlyHasActiveJobs =
+        data && data.jobs && data.jobs.some((job) => job.status === 'in_progress');
 
-        // Check if polling frequency needs to change
-        const currentlyHasActiveJobs =
-          data.jobs && data.jobs.some((job) => job.status === 'in_progress');
-
-        if (hasInProgressJobs !== currentlyHasActiveJobs) {
-          updatePollingFrequency(data.jobs);
-        }
-      })
-      .catch((error) => {
-        console.error('Error in auto-refresh:', error);
-      });
+      if (data && hasInProgressJobs !== currentlyHasActiveJobs) {
+        updatePollingFrequency(data.jobs);
+      }
+    });
   }, interval);
 
   console.log(
@@ -311,8 +332,11 @@ function fetchSegmentationJobs() {
       return response.json();
     })
     .then((data) => {
+      lastJobs = data.jobs || [];
       updateJobsDisplay(data);
-      updatePollingFrequency(data.jobs);
+      if (!streaming) {
+        updatePollingFrequency(data.jobs);
+      }
     })
     .catch((error) => {
       console.error('Error fetching segmentations:', error);
@@ -348,6 +372,21 @@ function fetchSegmentationJobs() {
  * Initialize the segmentation params module
  */
 function init() {
+  // Follow segmentation progress; poll only if the stream is unavailable
+  const refreshSoon = debounce(refreshJobs, EVENT_REFRESH_DELAY);
+  streaming = true;
+  watchJobProgress({
+    onEvent(event) {
+      if (event.type === 'segmentation') {
+        refreshSoon();
+      }
+    },
+    onUnavailable() {
+      streaming = false;
+      updatePollingFrequency(lastJobs);
+    },
+  });
+
   // Initial jobs fetch
   fetchSegmentationJobs();
 
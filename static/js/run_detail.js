@@ -3,40 +3,70 @@
  * Handles auto-refresh progress, search filtering, and probability highlighting
  */
 
+import { watchJobProgress } from './utils/job-events.js';
+
 /**
- * Set up auto-refresh for in-progress classification runs
+ * Set up auto-refresh for in-progress classification runs.
+ * Progress arrives over the job events stream; the status URL is polled only
+ * when the stream is unavailable.
  * @param {Object} options - Configuration options
  * @param {string} options.statusUrl - URL to fetch status updates
  * @param {HTMLElement} options.progressBar - Progress bar element
- * @param {number} [options.refreshInterval=3000] - Refresh interval in ms
- * @returns {number|null} - Interval ID or null if not started
+ * @param {number|string} [options.runId] - ID of the run, to follow its progress events
+ * @param {number} [options.refreshInterval=3000] - Polling interval in ms
+ * @returns {Object|null} - Handle with a close() method, or null if not started
  */
 export function setupAutoRefresh(options = {}) {
-  const { statusUrl, progressBar, refreshInterval = 3000 } = options;
+  const { statusUrl, progressBar, runId, refreshInterval = 3000 } = options;
 
   if (!statusUrl || !progressBar) {
     return null;
   }
 
-  return setInterval(function () {
-    fetch(statusUrl)
-      .then((response) => response.json())
-      .then((data) => {
-        if (data.success) {
-          progressBar.style.width = `${data.progress}%`;
-          progressBar.setAttribute('aria-valuenow', data.progress);
-          progressBar.textContent = `${data.progress.toFixed(1)}%`;
-
-          if (data.status !== 'in_progress') {
-            // Status changed - reload page to show final state
-            window.location.reload();
+  function showProgress(data) {
+    progressBar.style.width = `${data.progress}%`;
+    progressBar.setAttribute('aria-valuenow', data.progress);
+    progressBar.textContent = `${data.progress.toFixed(1)}%`;
+
+    if (data.status !== 'in_progress') {
+      // Status changed - reload page to show final state
+      window.location.reload();
+    }
+  }
+
+  let pollTimer = null;
+  function startPolling() {
+    pollTimer = setInterval(function () {
+      fetch(statusUrl)
+        .then((response) => response.json())
+        .then((data) => {
+          if (data.success) {
+            showProgress(data);
           }
-        }
-      })
-      .catch((error) => {
-        console.error('Error fetching status:', error);
-      });
-  }, refreshInterval);
+        })
+        .catch((error) => {
+          console.error('Error fetching status:', error);
+        });
+    }, refreshInterval);
+  }
+
+  let stream = null;
+  if (runId) {
+    stream = watchJobProgress({
+      jobs: [{ type: 'classification', id: runId }],
+      onEvent: showProgress,
+      onUnavailable: startPolling,
+    });
+  } else {
+    startPolling();
+  }
+
+  return {
+    close() {
+      if (stream) stream.close();
+      clearInterval(pollTimer);
+    },
+  };
 }
 
 /**
@@ -124,10 +154,11 @@ export function initialize() {
   if (statusBadge && statusBadge.classList.contains('bg-info')) {
     const runConfig = document.getElementById('run-config');
     const statusUrl = runConfig?.dataset.statusUrl;
+    const runId = runConfig?.dataset.runId;
     const progressBar = document.querySelector('.progress-bar');
 
     if (statusUrl && progressBar) {
-      setupAutoRefresh({ statusUrl, progressBar });
+      setupAutoRefresh({ statusUrl, progressBar, runId });
     } else if (!statusUrl) {
       console.warn('Status URL not found in run-config');
     }
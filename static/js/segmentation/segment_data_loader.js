@@ -0,0 +1,26 @@
+/**
+ * Segment data loader
+ *
+ * Fetches a segmentation's segments from the columnar segments endpoint.
+ * The endpoint sends an ETag, so unchanged segmentations revalidate
+ * with a 304 and are served from the browser cache.
+ */
+
+/**
+ * Load all segments of a segmentation.
+ *
+ * The editor needs every segment, not just the visible ones, for its
+ * paginated and searchable segment list.
+ *
+ * @param {string} url - Segments data endpoint URL
+ * @returns {Promise<Array<{id: number, onset: number, offset: number}>>} Segments sorted by onset
+ */
+export async function fetchSegments(url) {
+  const response = await fetch(url, { credentials: 'same-origin' });
+  if (!response.ok) {
+    throw new Error(`Failed to load segments (HTTP ${response.status})`);
+  }
+
+  const data = await response.json();
+  return data.ids.map((id, i) => ({ id, onset: data.onsets[i], offset: data.offsets[i] }));
+}
@@ -7,6 +7,7 @@
 import { SegmentCRUD } from './segment_crud.js';
 import { SegmentDisplay } from './segment_display.js';
 import { SegmentSearchPagination } from './segment_search_pagination.js';
+import { fetchSegments } from './segment_data_loader.js';
 import { escapeHtml } from '../utils/html.js';
 
 export class SegmentManager {
@@ -18,6 +19,7 @@ export class SegmentManager {
    * @param {string} options.csrfToken - CSRF token for requests
    * @param {boolean} [options.readOnly] - Whether the manager is read-only
    * @param {Array} [options.segments] - Initial segments
+   * @param {string} [options.segmentsUrl] - Endpoint to load segments from (used when no initial segments)
    * @param {Object} [options.urls] - URL templates for API endpoints
    * @param {string} [options.urls.add] - URL template for adding segments
    * @param {string} [options.urls.edit] - URL template for editing segments
@@ -42,19 +44,30 @@ export class SegmentManager {
 
     // Debug logging
     console.log('SegmentManager initialized with', this.segments.length, 'segments');
-    console.log('Initial segments:', this.segments);
     console.log('Read-only mode:', this.readOnly);
 
     // Initialize
     this.initializeEventHandlers();
     this.initializeSearchAndPagination();
 
-    // Wait for waveform player to be ready before updating display
-    this.waitForWaveformPlayer().then(() => {
+    // Load segments (if not passed in) and wait for the waveform player before updating display
+    const segmentsLoaded =
+      options.segmentsUrl && !options.segments ? this.loadSegments(options.segmentsUrl) : Promise.resolve();
+    Promise.all([segmentsLoaded, this.waitForWaveformPlayer()]).then(() => {
       this.updateDisplay();
     });
   }
 
+  // Load segments from the segments data endpoint
+  async loadSegments(url) {
+    try {
+      this.segments = await fetchSegments(url);
+      console.log('Loaded', this.segments.length, 'segments');
+    } catch (error) {
+      this.showMessage('danger', `Error loading segments: ${error.message}`);
+    }
+  }
+
   // Wait for player to be ready
   async waitForWaveformPlayer() {
     return new Promise((resolve) => {
@@ -1,69 +1,224 @@
-document.addEventListener('DOMContentLoaded', function () {
-  console.log('Segmentation preview script loaded');
-  const previewBtn = document.getElementById('previewBtn');
-  console.log('Preview button found:', previewBtn);
+/**
+ * Segmentation preview on the auto-segment page.
+ *
+ * The server keeps the analysed preview window in memory, so once a preview is
+ * shown the threshold and minimum duration sliders re-request it as they move
+ * and the detected segments are redrawn over the spectrogram in place.
+ */
 
-  if (!previewBtn) {
-    console.log('Preview button not found, exiting');
-    return;
+import { getCsrfToken } from './utils/page-data.js';
+import { debounce } from './utils/debounce.js';
+
+// Delay between slider movement and the preview request
+const SLIDER_DELAY_MS = 100;
+
+// Form inputs whose changes re-run a visible preview
+const PARAMETER_INPUTS = [
+  'min_duration_ms',
+  'smooth_window',
+  'threshold_factor',
+  'low_freq',
+  'high_freq',
+  'preview_start_time',
+  'preview_duration',
+];
+
+const BUTTON_LABEL = '<i class="fas fa-search"></i> Preview Segmentation';
+
+let previewBtn = null;
+let activeRequest = null;
+
+/**
+ * Collect the preview parameters from the segmentation form.
+ * @returns {FormData|null} The request body, or null if no algorithm is selected
+ */
+export function buildPreviewForm() {
+  const selectedAlgorithm = document.querySelector('input[name="algorithm"]:checked');
+  if (!selectedAlgorithm) {
+    return null;
   }
+  const value = (id, fallback) => document.getElementById(id)?.value || fallback;
 
-  previewBtn.addEventListener('click', function () {
-    const selectedAlgorithm = document.querySelector('input[name="algorithm"]:checked');
-    if (!selectedAlgorithm) {
-      alert('Please select an algorithm first.');
-      return;
-    }
+  const formData = new FormData();
+  formData.append('algorithm', selectedAlgorithm.value);
+  formData.append('start_time', value('preview_start_time', 0));
+  formData.append('duration', value('preview_duration', 2));
+  formData.append('min_duration_ms', value('min_duration_ms', 5));
+  formData.append('smooth_window', value('smooth_window', 10));
+  formData.append('threshold_factor', value('threshold_factor', 2.0));
+  const lowFreq = value('low_freq', '');
+  const highFreq = value('high_freq', '');
+  if (lowFreq) formData.append('low_freq', lowFreq);
+  if (highFreq) formData.append('high_freq', highFreq);
+  return formData;
+}
 
-    const startTime = document.getElementById('preview_start_time').value || 0;
-    const minDuration = document.getElementById('min_duration_ms')?.value || 5;
-    const smoothWindow = document.getElementById('smooth_window')?.value || 10;
-    const thresholdFactor = document.getElementById('threshold_factor')?.value || 2.0;
-    const lowFreq = document.getElementById('low_freq')?.value || '';
-    const highFreq = document.getElementById('high_freq')?.value || '';
-
-    const formData = new FormData();
-    formData.append('algorithm', selectedAlgorithm.value);
-    formData.append('start_time', startTime);
-    formData.append('duration', '2.0');
-    formData.append('min_duration_ms', minDuration);
-    formData.append('smooth_window', smoothWindow);
-    formData.append('threshold_factor', thresholdFactor);
-    if (lowFreq) formData.append('low_freq', lowFreq);
-    if (highFreq) formData.append('high_freq', highFreq);
-    formData.append(
-      'csrfmiddlewaretoken',
-      document.querySelector('[name=csrfmiddlewaretoken]').value
-    );
-
-    const previewUrl = previewBtn.dataset.previewUrl;
-    if (!previewUrl) {
-      console.error('Preview URL not found in data attributes');
-      return;
-    }
+/**
+ * Show a preview response: spectrogram, segment overlay, statistics and list.
+ * @param {Object} data - JSON response of the segmentation preview view
+ */
+export function renderPreview(data) {
+  const { start_time: startTime, duration, onsets, offsets } = data;
 
-    previewBtn.disabled = true;
-    previewBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Creating Preview...';
+  const image = document.getElementById('previewSpectrogram');
+  // The spectrogram only changes with the window or filter band
+  if (image.getAttribute('src') !== data.spectrogram_url) {
+    image.setAttribute('src', data.spectrogram_url);
+  }
+
+  const overlay = document.getElementById('previewSegmentOverlay');
+  const list = document.getElementById('previewSegmentsList');
+  const overlayFragment = document.createDocumentFragment();
+  const listFragment = document.createDocumentFragment();
+  let totalDuration = 0;
+
+  onsets.forEach((onset, i) => {
+    const offset = offsets[i];
+    totalDuration += offset - onset;
+
+    const box = document.createElement('div');
+    box.className = 'preview-segment position-absolute top-0 h-100';
+    box.style.left = `${((onset - startTime) / duration) * 100}%`;
+    box.style.width = `${((offset - onset) / duration) * 100}%`;
+    box.style.backgroundColor = 'rgba(255, 193, 7, 0.35)';
+    box.style.borderLeft = '1px solid #ffc107';
+    box.title = `Segment ${i + 1}`;
+    overlayFragment.appendChild(box);
+
+    const item = document.createElement('li');
+    const lengthMs = ((offset - onset) * 1000).toFixed(1);
+    item.textContent = `${i + 1}. ${onset.toFixed(3)}s - ${offset.toFixed(3)}s (${lengthMs} ms)`;
+    listFragment.appendChild(item);
+  });
+
+  overlay.replaceChildren(overlayFragment);
+  list.replaceChildren(listFragment);
+
+  const count = onsets.length;
+  document.getElementById('previewTimeRange').textContent =
+    `${startTime.toFixed(2)}s - ${(startTime + duration).toFixed(2)}s`;
+  document.getElementById('previewSegmentCount').textContent = count;
+  document.getElementById('previewDensity').textContent = (count / duration).toFixed(2);
+  document.getElementById('previewAvgDuration').textContent = count
+    ? (totalDuration / count).toFixed(4)
+    : '0';
+
+  document.getElementById('previewResultsCard').hidden = false;
+}
+
+/**
+ * Request a preview with the current parameters and render it.
+ * A newer request aborts the one still in flight.
+ * @returns {Promise<Object|null>} The response data, or null if it was superseded or failed
+ */
+export async function requestPreview() {
+  const formData = buildPreviewForm();
+  if (!formData) {
+    alert('Please select an algorithm first.');
+    return null;
+  }
+
+  if (activeRequest) {
+    activeRequest.abort();
+  }
+  const controller = new AbortController();
+  activeRequest = controller;
 
-    fetch(previewUrl, {
+  try {
+    const response = await fetch(previewBtn.dataset.previewUrl, {
       method: 'POST',
       body: formData,
-    })
-      .then((response) => response.json())
-      .then((data) => {
-        if (data.success) {
-          window.location.href = data.preview_url;
-        } else {
-          alert('Preview failed: ' + data.error);
-          previewBtn.disabled = false;
-          previewBtn.innerHTML = '<i class="fas fa-search"></i> Preview Segmentation';
-        }
-      })
-      .catch((error) => {
-        console.error('Error:', error);
-        alert('An error occurred while creating preview.');
-        previewBtn.disabled = false;
-        previewBtn.innerHTML = '<i class="fas fa-search"></i> Preview Segmentation';
-      });
+      headers: { 'X-CSRFToken': getCsrfToken() },
+      signal: controller.signal,
+    });
+    const data = await response.json();
+    if (!data.success) {
+      alert('Preview failed: ' + data.error);
+      return null;
+    }
+    renderPreview(data);
+    return data;
+  } catch (error) {
+    if (error.name !== 'AbortError') {
+      console.error('Error:', error);
+      alert('An error occurred while creating preview.');
+    }
+    return null;
+  } finally {
+    if (activeRequest === controller) {
+      activeRequest = null;
+    }
+  }
+}
+
+function previewVisible() {
+  return !document.getElementById('previewResultsCard').hidden;
+}
+
+/**
+ * Bind a range slider to the form input named by its data-target, mirroring
+ * the value both ways.
+ */
+function bindSlider(slider, valueLabel, onChange) {
+  const input = document.getElementById(slider.dataset.target);
+  if (!input) {
+    return;
+  }
+  slider.value = input.value;
+  valueLabel.textContent = input.value;
+
+  slider.addEventListener('input', () => {
+    input.value = slider.value;
+    valueLabel.textContent = slider.value;
+    onChange();
   });
-});
+  input.addEventListener('input', () => {
+    slider.value = input.value;
+    valueLabel.textContent = input.value;
+  });
+}
+
+export function initialize() {
+  previewBtn = document.getElementById('previewBtn');
+  if (!previewBtn) {
+    return;
+  }
+
+  previewBtn.addEventListener('click', async () => {
+    previewBtn.disabled = true;
+    previewBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Creating Preview...';
+    await requestPreview();
+    previewBtn.disabled = false;
+    previewBtn.innerHTML = BUTTON_LABEL;
+  });
+
+  const refresh = debounce(() => {
+    if (previewVisible()) {
+      requestPreview();
+    }
+  }, SLIDER_DELAY_MS);
+
+  bindSlider(
+    document.getElementById('previewThresholdSlider'),
+    document.getElementById('previewThresholdValue'),
+    refresh
+  );
+  bindSlider(
+    document.getElementById('previewMinDurationSlider'),
+    document.getElementById('previewMinDurationValue'),
+    refresh
+  );
+
+  PARAMETER_INPUTS.forEach((id) =>
+    document.getElementById(id)?.addEventListener('change', refresh)
+  );
+  document
+    .querySelectorAll('input[name="algorithm"]')
+    .forEach((radio) => radio.addEventListener('change', refresh));
+}
+
+if (document.readyState === 'loading') {
+  document.addEventListener('DOMContentLoaded', initialize);
+} else {
+  initialize();
+}
@@ -0,0 +1,127 @@
+/**
+ * Tests for segmentation_preview.js
+ */
+
+import { describe, it, expect, beforeEach, vi } from 'vitest';
+
+vi.mock('./utils/page-data.js', () => ({
+  getCsrfToken: vi.fn(() => 'token'),
+}));
+
+import {
+  buildPreviewForm,
+  initialize,
+  renderPreview,
+  requestPreview,
+} from './segmentation_preview.js';
+
+const PAGE = `
+  <input type="radio" name="algorithm" value="3" checked>
+  <input id="min_duration_ms" value="5">
+  <input id="smooth_window" value="10">
+  <input id="threshold_factor" value="2.5">
+  <input id="low_freq" value="10000">
+  <input id="high_freq" value="">
+  <input id="preview_start_time" value="1">
+  <input id="preview_duration" value="2">
+  <button id="previewBtn" data-preview-url="/recordings/7/segmentation-preview/"></button>
+  <div id="previewResultsCard" hidden>
+    <img id="previewSpectrogram">
+    <div id="previewSegmentOverlay"></div>
+    <input type="range" id="previewThresholdSlider" data-target="threshold_factor" min="0.1" max="10" step="0.1">
+    <span id="previewThresholdValue"></span>
+    <input type="range" id="previewMinDurationSlider" data-target="min_duration_ms" min="0.1" max="100" step="0.1">
+    <span id="previewMinDurationValue"></span>
+    <span id="previewTimeRange"></span>
+    <span id="previewSegmentCount"></span>
+    <span id="previewDensity"></span>
+    <span id="previewAvgDuration"></span>
+    <ul id="previewSegmentsList"></ul>
+  </div>
+`;
+
+const PREVIEW = {
+  success: true,
+  start_time: 1,
+  duration: 2,
+  onsets: [1.5, 2.0],
+  offsets: [1.6, 2.5],
+  spectrogram_url: '/recordings/7/segmentation-preview/spectrogram/?start_time=1',
+};
+
+describe('segmentation_preview', () => {
+  beforeEach(() => {
+    document.body.innerHTML = PAGE;
+    vi.clearAllMocks();
+  });
+
+  describe('buildPreviewForm', () => {
+    it('collects the slice and segmentation parameters', () => {
+      const form = buildPreviewForm();
+
+      expect(form.get('algorithm')).toBe('3');
+      expect(form.get('start_time')).toBe('1');
+      expect(form.get('duration')).toBe('2');
+      expect(form.get('threshold_factor')).toBe('2.5');
+      expect(form.get('low_freq')).toBe('10000');
+      expect(form.has('high_freq')).toBe(false);
+    });
+
+    it('returns null without a selected algorithm', () => {
+      document.querySelector('input[name="algorithm"]').checked = false;
+      expect(buildPreviewForm()).toBeNull();
+    });
+  });
+
+  describe('renderPreview', () => {
+    it('draws the segments over the spectrogram and fills in the statistics', () => {
+      renderPreview(PREVIEW);
+
+      const boxes = document.querySelectorAll('#previewSegmentOverlay .preview-segment');
+      expect(boxes).toHaveLength(2);
+      expect(parseFloat(boxes[0].style.left)).toBeCloseTo(25);
+      expect(parseFloat(boxes[1].style.width)).toBeCloseTo(25);
+      const image = document.getElementById('previewSpectrogram');
+      expect(image.getAttribute('src')).toBe(PREVIEW.spectrogram_url);
+      expect(document.getElementById('previewSegmentCount').textContent).toBe('2');
+      expect(document.getElementById('previewDensity').textContent).toBe('1.00');
+      expect(document.querySelectorAll('#previewSegmentsList li')).toHaveLength(2);
+      expect(document.getElementById('previewResultsCard').hidden).toBe(false);
+    });
+
+    it('replaces the previous segments', () => {
+      renderPreview(PREVIEW);
+      renderPreview({ ...PREVIEW, onsets: [], offsets: [] });
+
+      expect(document.querySelectorAll('#previewSegmentOverlay .preview-segment')).toHaveLength(0);
+      expect(document.getElementById('previewAvgDuration').textContent).toBe('0');
+    });
+  });
+
+  describe('requestPreview', () => {
+    it('posts the parameters and renders the response', async () => {
+      initialize();
+      global.fetch = vi.fn(() => Promise.resolve({ json: () => Promise.resolve(PREVIEW) }));
+
+      const data = await requestPreview();
+
+      expect(data).toEqual(PREVIEW);
+      const [url, options] = global.fetch.mock.calls[0];
+      expect(url).toBe('/recordings/7/segmentation-preview/');
+      expect(options.headers['X-CSRFToken']).toBe('token');
+      expect(document.querySelectorAll('#previewSegmentOverlay .preview-segment')).toHaveLength(2);
+    });
+
+    it('mirrors slider movement into the form inputs', () => {
+      initialize();
+      const slider = document.getElementById('previewThresholdSlider');
+      expect(slider.value).toBe('2.5');
+
+      slider.value = '4';
+      slider.dispatchEvent(new Event('input'));
+
+      expect(document.getElementById('threshold_factor').value).toBe('4');
+      expect(document.getElementById('previewThresholdValue').textContent).toBe('4');
+    });
+  });
+});
@@ -24,6 +24,9 @@ export function initialize() {
 
   // Check for batch switch notification
   checkBatchSwitchNotification();
+
+  // Warm up the tasks the annotator is likely to open next
+  prefetchNextTasks();
 }
 
 // Auto-initialize when DOM is ready
@@ -185,6 +188,44 @@ export function initSpectrogramViewer() {
   updateSpectrogram();
 }
 
+/**
+ * Prefetch the next few tasks so switching after "Mark as Done" is instant.
+ *
+ * Asks the server to render their spectrograms and audio snippets in the
+ * background, and preloads the spectrogram images into the browser cache.
+ */
+export function prefetchNextTasks(count = 3) {
+  if (!taskConfig || !taskConfig.prefetchUrl) {
+    return;
+  }
+
+  const params = new URLSearchParams({
+    count: String(count),
+    exclude: String(taskConfig.taskId),
+    warm: '1',
+  });
+  if (taskConfig.batchId) {
+    params.set('batch', String(taskConfig.batchId));
+  }
+
+  const isOverview = localStorage.getItem('taskAnnotationViewPreference') === 'overview';
+
+  fetch(`${taskConfig.prefetchUrl}?${params.toString()}`, { credentials: 'same-origin' })
+    .then((response) => (response.ok ? response.json() : null))
+    .then((data) => {
+      if (!data || !data.success) {
+        return;
+      }
+      data.tasks.forEach((task) => {
+        const img = new Image();
+        img.src = isOverview ? task.spectrogram_urls.overview : task.spectrogram_urls.detail;
+      });
+    })
+    .catch((error) => {
+      console.debug('Task prefetch failed:', error);
+    });
+}
+
 /**
  * Initialize form behavior for the task annotation
  */
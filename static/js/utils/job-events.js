@@ -0,0 +1,78 @@
+/**
+ * Job progress events
+ *
+ * Follows background job progress over the Server-Sent Events stream of the
+ * progress bus (the job_events view), so pages don't have to poll the job
+ * status views. When the stream is unavailable, the page's own polling takes
+ * over through the onUnavailable callback.
+ */
+
+import { getPageData } from './page-data.js';
+
+// Consecutive connection errors after which the stream is given up
+const MAX_STREAM_ERRORS = 3;
+
+/**
+ * Follow job progress events.
+ * @param {Object} options
+ * @param {Array<{type: string, id: (number|string)}>} [options.jobs] - Jobs to follow; omit to
+ *   receive every event visible to the user
+ * @param {Function} options.onEvent - Called with each progress event
+ *   ({type, id, status, progress, message, name, user_id, group_id})
+ * @param {Function} [options.onUnavailable] - Called once if the stream can't be used
+ * @param {string} [options.eventsUrl] - Stream URL (defaults to data-job-events-url of #page-data)
+ * @returns {{close: Function}} Handle to stop following
+ */
+export function watchJobProgress({ jobs = null, onEvent, onUnavailable = null, eventsUrl = null }) {
+  const url = eventsUrl || getPageData().jobEventsUrl;
+  let source = null;
+  let unavailable = false;
+
+  function giveUp() {
+    if (source) {
+      source.close();
+    }
+    if (!unavailable) {
+      unavailable = true;
+      if (onUnavailable) onUnavailable();
+    }
+  }
+
+  if (!url || typeof EventSource === 'undefined') {
+    giveUp();
+    return { close() {} };
+  }
+
+  const streamUrl = new URL(url, window.location.origin);
+  (jobs || []).forEach((job) => streamUrl.searchParams.append('job', `${job.type}:${job.id}`));
+
+  const isFollowed = (event) =>
+    !jobs || jobs.some((job) => job.type === event.type && String(job.id) === String(event.id));
+
+  let errors = 0;
+  source = new EventSource(streamUrl.toString());
+
+  source.addEventListener('open', () => {
+    errors = 0;
+  });
+  source.addEventListener('progress', (message) => {
+    const event = JSON.parse(message.data);
+    if (isFollowed(event)) {
+      onEvent(event);
+    }
+  });
+  source.addEventListener('error', () => {
+    // The stream ends periodically and the browser reconnects; only give up
+    // when it refuses to (e.g. a 503) or keeps failing
+    errors += 1;
+    if (source.readyState === EventSource.CLOSED || errors >= MAX_STREAM_ERRORS) {
+      giveUp();
+    }
+  });
+
+  return {
+    close() {
+      source.close();
+    },
+  };
+}
@@ -0,0 +1,105 @@
+/**
+ * Tests for job-events.js utility module
+ */
+
+import { describe, it, expect, beforeEach, afterEach, vi } from 'vitest';
+import { watchJobProgress } from './job-events.js';
+
+class FakeEventSource {
+  static CONNECTING = 0;
+  static OPEN = 1;
+  static CLOSED = 2;
+  static instances = [];
+
+  constructor(url) {
+    this.url = url;
+    this.readyState = FakeEventSource.CONNECTING;
+    this.listeners = {};
+    FakeEventSource.instances.push(this);
+  }
+
+  addEventListener(type, listener) {
+    (this.listeners[type] ||= []).push(listener);
+  }
+
+  emit(type, event = {}) {
+    (this.listeners[type] || []).forEach((listener) => listener(event));
+  }
+
+  close() {
+    this.readyState = FakeEventSource.CLOSED;
+  }
+}
+
+const progress = (event) => ({ data: JSON.stringify(event) });
+
+describe('job-events utility', () => {
+  beforeEach(() => {
+    FakeEventSource.instances = [];
+    vi.stubGlobal('EventSource', FakeEventSource);
+    document.body.innerHTML = '<div id="page-data" data-job-events-url="/jobs/api/events/"></div>';
+  });
+
+  afterEach(() => {
+    vi.unstubAllGlobals();
+  });
+
+  it('subscribes to the followed jobs and ignores other events', () => {
+    const onEvent = vi.fn();
+    watchJobProgress({ jobs: [{ type: 'clustering', id: '7' }], onEvent });
+
+    const source = FakeEventSource.instances[0];
+    expect(new URL(source.url).searchParams.getAll('job')).toEqual(['clustering:7']);
+
+    source.emit('progress', progress({ type: 'clustering', id: 8, status: 'in_progress' }));
+    source.emit('progress', progress({ type: 'clustering', id: 7, status: 'in_progress' }));
+
+    expect(onEvent).toHaveBeenCalledTimes(1);
+    expect(onEvent.mock.calls[0][0].id).toBe(7);
+  });
+
+  it('passes every event through when no jobs are given', () => {
+    const onEvent = vi.fn();
+    watchJobProgress({ onEvent });
+
+    FakeEventSource.instances[0].emit('progress', progress({ type: 'training', id: 1 }));
+
+    expect(onEvent).toHaveBeenCalledTimes(1);
+  });
+
+  it('falls back when the stream is refused', () => {
+    const onUnavailable = vi.fn();
+    watchJobProgress({ onEvent: vi.fn(), onUnavailable });
+
+    const source = FakeEventSource.instances[0];
+    source.readyState = FakeEventSource.CLOSED;
+    source.emit('error');
+    source.emit('error');
+
+    expect(onUnavailable).toHaveBeenCalledTimes(1);
+  });
+
+  it('keeps the stream through a reconnect', () => {
+    const onUnavailable = vi.fn();
+    watchJobProgress({ onEvent: vi.fn(), onUnavailable });
+
+    const source = FakeEventSource.instances[0];
+    source.emit('error');
+    source.emit('open');
+    source.emit('error');
+    source.emit('open');
+    source.emit('error');
+
+    expect(onUnavailable).not.toHaveBeenCalled();
+    expect(source.readyState).not.toBe(FakeEventSource.CLOSED);
+  });
+
+  it('falls back without EventSource support', () => {
+    vi.stubGlobal('EventSource', undefined);
+    const onUnavailable = vi.fn();
+
+    watchJobProgress({ onEvent: vi.fn(), onUnavailable });
+
+    expect(onUnavailable).toHaveBeenCalledTimes(1);
+  });
+});
@@ -22,6 +22,7 @@ echo "Installing BattyCoda systemd services..."
 # List of service files to install
 SERVICES=(
     "battycoda.service"
+    "battycoda-events.service"
     "battycoda-celery.service"
     "battycoda-celery-beat.service"
     "battycoda-failure-notify@.service"
@@ -48,4 +49,4 @@ ls -la /etc/systemd/system/battycoda*.service
 
 echo ""
 echo "To restart services, run:"
-echo "  sudo systemctl restart battycoda battycoda-celery battycoda-celery-beat"
+echo "  sudo systemctl restart battycoda battycoda-events battycoda-celery battycoda-celery-beat"